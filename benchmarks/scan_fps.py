@@ -0,0 +1,99 @@
+"""Camera scanning benchmark: decode frames per second and time to first hit, plus barcode rendering.
+
+Run from the repository root:
+
+    python benchmarks/scan_fps.py [--video PATH] [--workers N]
+
+Without --video it records its own test video first: 300 noisy 1280x720
+frames with a receipt's QR code and Code128 strip in the centre from frame
+--appear on, like a receipt brought up to a camera. Each pipeline setting is
+then run twice through rocket_pos.scanning.scan_video: over the whole video
+(throughput) and until the first code is read (latency). This is the same
+call the Hardware settings "Benchmark Camera Scanning" panel makes with the
+saved settings. The last section times rendering the receipt barcodes.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rocket_pos.scanning import barcode_image, decoder_backend, image_data_uri, scan_video  # noqa: E402
+
+TRANSACTION_ID = "TXN-20260101-0042"
+
+def record_test_video(path, frames=300, appear=150, size=(1280, 720), fps=30):
+    """Write the synthetic receipt video to path (MJPG .avi)"""
+    import cv2
+
+    width, height = size
+    qr = np.asarray(barcode_image(TRANSACTION_ID, "qr", scale=3))
+    strip = np.asarray(barcode_image(TRANSACTION_ID, "code128", scale=2, height=60))
+    rng = np.random.default_rng(42)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, size)
+    try:
+        for index in range(frames):
+            frame = rng.integers(90, 170, (height, width), dtype=np.uint8)
+            if index >= appear:
+                top, left = (height - qr.shape[0] - strip.shape[0] - 10) // 2, (width - qr.shape[1]) // 2
+                frame[top:top + qr.shape[0], left:left + qr.shape[1]] = qr
+                top += qr.shape[0] + 10
+                left = (width - strip.shape[1]) // 2
+                frame[top:top + strip.shape[0], left:left + strip.shape[1]] = strip
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+    finally:
+        writer.release()
+
+def pipeline_configs(workers):
+    configs = [
+        ("every full frame, 1 thread", dict(frame_skip=0, roi=None, max_width=None, workers=1)),
+        ("skip 2", dict(frame_skip=2, roi=None, max_width=None, workers=1)),
+        ("skip 2 + ROI 0.6 + 640px", dict(frame_skip=2, roi=0.6, max_width=640, workers=1)),
+    ]
+    if workers > 1:
+        configs.append((f"skip 2 + ROI 0.6 + 640px, {workers} threads",
+                        dict(frame_skip=2, roi=0.6, max_width=640, workers=workers)))
+    return configs
+
+def render_rate(symbology, seconds=1.0):
+    """Receipt barcodes rendered to PNG data URIs per second"""
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        image_data_uri(barcode_image(TRANSACTION_ID, symbology))
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", help="a recorded video to decode instead of the generated one")
+    parser.add_argument("--appear", type=int, default=150, help="frame the code appears on in the generated video")
+    parser.add_argument("--workers", type=int, default=4, help="threads for the last pipeline setting")
+    args = parser.parse_args()
+
+    print(f"Decoder: {decoder_backend()}, CPUs: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as workdir:
+        video = args.video
+        if not video:
+            video = os.path.join(workdir, "receipt_scan.avi")
+            record_test_video(video, appear=args.appear)
+            print(f"Generated 300 frames at 1280x720, code from frame {args.appear}")
+
+        for label, options in pipeline_configs(args.workers):
+            throughput = scan_video(video, stop_on_first=False, **options)
+            first = scan_video(video, stop_on_first=True, **options)
+            hit = f"first hit {first['seconds']:.1f}s at frame {first['frames_read']}" if first['codes'] else "no hit"
+            print(f"{label:<40} {throughput['fps']:6.1f} fps  "
+                  f"({throughput['frames_decoded']}/{throughput['frames_read']} decoded)  {hit}  "
+                  f"codes: {', '.join(throughput['codes']) or 'none'}")
+
+    for symbology in ("code128", "qr"):
+        print(f"Render {symbology:<8} {render_rate(symbology):8.0f} per second")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""POS scan benchmark: wall time of the rerun that adds a scanned item and renders the cart.
+
+Run from the repository root:
+
+    python benchmarks/scan_latency.py [--root PATH] [--products N] [--scans N]
+
+A fresh data directory in a temporary folder is filled with a synthetic store
+(--products products in stock, loyalty customers and a sales history of the
+same size), then app.py is driven with streamlit.testing's AppTest: log in,
+open the POS terminal in scan mode and type --scans barcodes into the manual
+barcode field, one rerun each. The time of each of those reruns is the
+server-side scan-to-render latency. --root runs the app of another checkout
+(e.g. a git worktree of an older commit) against the same store, so the
+numbers can be compared before and after a change.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def write_store(products):
+    """Write the synthetic store into ./data"""
+    os.makedirs("data", exist_ok=True)
+    barcodes = [f"{100000 + i}" for i in range(products)]
+    files = {
+        "products.json": {barcode: {'name': f"Product {barcode}", 'price': 10.0, 'cost': 4.0, 'category': "Liquids",
+                                    'description': ""} for barcode in barcodes},
+        "inventory.json": {barcode: {'quantity': 1000, 'reorder_point': 10} for barcode in barcodes},
+        "transactions.json": {
+            f"T{i}": {'transaction_id': f"T{i}", 'date': f"2026-01-{i % 28 + 1:02d} 12:00:00", 'cashier': "admin",
+                      'items': {barcodes[i]: {'name': f"Product {barcodes[i]}", 'price': 10.0, 'quantity': 1}},
+                      'subtotal': 10.0, 'tax': 0.0, 'total': 10.0, 'net_amount': 10.0, 'payment_method': "Cash"}
+            for i in range(products)
+        },
+    }
+    for name, data in files.items():
+        with open(os.path.join("data", name), 'w') as f:
+            json.dump(data, f)
+    return barcodes
+
+def scan_timings(app, barcodes, scans):
+    """Seconds per scan rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=120)
+    at.run()
+    at.text_input[0].input("admin")
+    at.text_input[1].input("admin123")
+    at.button[0].click()
+    at.run()
+    at.session_state["shift_started"] = True
+    at.session_state["shift_id"] = "benchmark"
+    at.sidebar.radio[0].set_value("POS Terminal")
+    at.run()
+
+    timings = []
+    for barcode in barcodes[:scans]:
+        at.text_input(key="manual_barcode_input").input(barcode)
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=ROOT, help="checkout whose app.py to run")
+    parser.add_argument("--products", type=int, default=2000, help="products (and past sales) in the store")
+    parser.add_argument("--scans", type=int, default=20, help="barcodes to scan")
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    sys.path.insert(0, root)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            barcodes = write_store(args.products)
+            timings = scan_timings(os.path.join(root, "app.py"), barcodes, args.scans)
+        finally:
+            os.chdir(ROOT)
+
+    # The first scan also imports and renders the cart widgets for the first time
+    print(f"{root}: {args.products} products, {args.scans} scans")
+    print(f"first scan      {timings[0] * 1000:8.1f} ms")
+    print(f"median of rest  {statistics.median(timings[1:]) * 1000:8.1f} ms")
+    print(f"max of rest     {max(timings[1:]) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
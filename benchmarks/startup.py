@@ -0,0 +1,103 @@
+"""Startup benchmark: import cost, login first paint and page-switch reruns.
+
+Run from the repository root:
+
+    python benchmarks/startup.py [--runs N]
+
+Everything runs against a fresh data directory in a temporary folder, so the
+numbers are for an empty store and the real data/ is never touched. The first
+section imports the modules app.py needs for the login page in a new
+interpreter and lists the heavy libraries they load beyond Streamlit's own. The rest drives app.py
+with streamlit.testing's AppTest: the first run (bootstrap and login paint),
+then one rerun per page, first visit (page module imported) and revisit.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+sys.path.insert(0, ROOT)
+
+ENTRY_MODULES = ["rocket_pos.core", "rocket_pos.hardware", "rocket_pos.navigation", "rocket_pos.views.login"]
+HEAVY_MODULES = ["pandas", "fpdf", "PIL", "matplotlib", "plotly"]
+
+# Streamlit is imported first: its own cost and imports are the same with or without this app
+IMPORT_PROBE = f"""
+import sys, time
+import streamlit
+already = set(sys.modules)
+start = time.perf_counter()
+for name in {ENTRY_MODULES!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(elapsed, *[name for name in {HEAVY_MODULES!r} if name in sys.modules and name not in already])
+"""
+
+def import_cost():
+    """(seconds to import the login-page modules, heavy modules they pulled in beyond streamlit's)"""
+    result = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True,
+                            check=True)
+    elapsed, *heavy = result.stdout.split()
+    return float(elapsed), heavy
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - start
+
+def app_timings(pages):
+    """{label: seconds} for the first paint, login and every page switch"""
+    from streamlit.testing.v1 import AppTest
+
+    timings = {}
+    at = AppTest.from_file(APP, default_timeout=120)
+    timings["first paint (login)"] = timed_run(at)
+
+    at.text_input[0].input("admin")
+    at.text_input[1].input("admin123")
+    at.button[0].click()
+    timings["log in (dashboard)"] = timed_run(at)
+
+    # Skip the start-of-shift prompt so every page renders its content
+    at.session_state["shift_started"] = True
+    at.session_state["shift_id"] = "benchmark"
+    for visit in ("first visit", "revisit"):
+        for page in pages:
+            at.sidebar.radio[0].set_value(page)
+            timings[f"{page} ({visit})"] = timed_run(at)
+    return timings
+
+def main():
+    from rocket_pos.navigation import PAGE_REGISTRY
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="import probes to take the median of")
+    parser.add_argument("--pages", nargs="*", default=list(PAGE_REGISTRY), help="pages to switch to")
+    args = parser.parse_args()
+
+    probes = [import_cost() for _ in range(args.runs)]
+    print(f"Import of {', '.join(ENTRY_MODULES)}: {statistics.median(p[0] for p in probes) * 1000:.0f} ms "
+          f"(median of {args.runs})")
+    print(f"Heavy modules loaded by it: {', '.join(probes[0][1]) or 'none'}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            timings = app_timings(args.pages)
+        finally:
+            os.chdir(ROOT)
+
+    width = max(len(label) for label in timings)
+    for label, seconds in timings.items():
+        print(f"{label:<{width}}  {seconds * 1000:8.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""ROCKET VAPE POS application package."""
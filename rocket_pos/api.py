@@ -0,0 +1,263 @@
+"""Local HTTP/JSON API over rocket_pos.services, for scripts, load tests and other front-ends.
+
+Run from the directory that holds data/ (same as the Streamlit app):
+
+    python -m rocket_pos.api --port 8765
+
+Requests authenticate with HTTP Basic using POS user accounts. Connections are
+kept alive (HTTP/1.1), so a client can push many sales over one socket. A
+shift_id in a request body must be an open shift of the authenticated user.
+
+    GET  /health
+    GET  /products/<barcode>
+    GET  /stock[?barcode=a,b]
+    GET  /customers?phone=...|id=...
+    POST /sales/quote                       {items, offer, discount, customer_id, points, payment_method}
+    POST /sales                             same as quote + amount_tendered, shift_id, idempotency_key
+    POST /purchase-orders/<po_id>/receive   {items, notes, mark_as_complete}       (manager)
+    POST /outdoor-orders/<order_id>/deliver {shift_id}                               (cashier)
+    POST /returns                           {transaction_id, items, return_option, refund_method,
+                                             exchange_products, notes, shift_id}
+    POST /customers/<customer_id>/points    {points, reason, mode, expected_version} (manager)
+    POST /customers/<customer_id>/rewards/<reward_id>  {expected_version}
+    GET  /backups/<file name>               streams a .zip/.posbak backup file     (admin)
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import shutil
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from rocket_pos import services
+from rocket_pos.backups import ARCHIVE_SUFFIX
+from rocket_pos.core import BACKUP_DIR, SHIFTS_FILE, ensure_data_store, load_data_snapshot, verify_user
+from rocket_pos.services import ServiceError
+
+ROUTES = []
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+def route(method, pattern, role=None):
+    """Register a handler(user, body, query, *path_params) for METHOD + path regex"""
+    def register(func):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), role, func))
+        return func
+    return register
+
+def _has_role(user, role):
+    if role == 'admin':
+        return user.get('role') == 'admin'
+    if role == 'manager':
+        return user.get('role') in ['admin', 'manager']
+    if role == 'cashier':
+        return user.get('role') in ['admin', 'manager', 'cashier']
+    return True
+
+def _own_shift(user, body):
+    """body's shift_id, which must be an open shift of the calling user (or None)"""
+    shift_id = body.get('shift_id')
+    if shift_id is None:
+        return None
+    shift = load_data_snapshot(SHIFTS_FILE).get(shift_id)
+    if not shift or shift.get('status') != 'active' or shift.get('user_id') != user['username']:
+        raise ServiceError(f"Shift {shift_id} is not an open shift of {user['username']}")
+    return shift_id
+
+@route('GET', '/health')
+def health(user, body, query):
+    return {'status': 'ok', 'user': user['username']}
+
+@route('GET', '/products/([^/]+)')
+def product(user, body, query, barcode):
+    return services.get_product(barcode)
+
+@route('GET', '/stock')
+def stock(user, body, query):
+    barcodes = query.get('barcode', [''])[0]
+    return services.get_stock(barcodes.split(',') if barcodes else None)
+
+@route('GET', '/customers')
+def customer(user, body, query):
+    return services.find_customer(phone=query.get('phone', [None])[0], customer_id=query.get('id', [None])[0])
+
+def _quote(body):
+    return services.price_sale(
+        body.get('items', {}),
+        offer_name=body.get('offer'),
+        discount_name=body.get('discount'),
+        customer_id=body.get('customer_id'),
+        points=body.get('points', 0),
+        payment_method=body.get('payment_method', 'Cash')
+    )
+
+@route('POST', '/sales/quote')
+def quote_sale(user, body, query):
+    return _quote(body)
+
+@route('POST', '/sales')
+def create_sale(user, body, query):
+    # A retried request returns the sale it already made, even though re-quoting it could now fail on stock
+    key = body.get('idempotency_key')
+    if key:
+        replay = services.replayed_sale(key, body.get('items', {}))
+        if replay:
+            return replay
+    pricing = _quote(body)
+    amount_tendered = body.get('amount_tendered', pricing['amount_due'])
+    return services.commit_sale(pricing, amount_tendered, user['username'], _own_shift(user, body), key)
+
+@route('POST', '/purchase-orders/([^/]+)/receive', role='manager')
+def receive_po(user, body, query, po_id):
+    return services.receive_purchase_order(
+        po_id, body.get('items', []), body.get('notes', ''), user['username'], body.get('mark_as_complete', False)
+    )
+
+@route('POST', '/outdoor-orders/([^/]+)/deliver', role='cashier')
+def deliver_order(user, body, query, order_id):
+    return services.deliver_outdoor_order(order_id, user['username'], _own_shift(user, body))
+
+@route('POST', '/returns')
+def create_return(user, body, query):
+    return services.process_return(
+        body.get('transaction_id'),
+        body.get('items', {}),
+        user['username'],
+        return_option=body.get('return_option', 'Refund'),
+        refund_method=body.get('refund_method'),
+        exchange_products=body.get('exchange_products'),
+        notes=body.get('notes', ''),
+        shift_id=_own_shift(user, body)
+    )
+
+@route('POST', '/customers/([^/]+)/points', role='manager')
+def adjust_points(user, body, query, customer_id):
+    return services.adjust_customer_points(
+        customer_id, body.get('points', 0), body.get('reason', 'API adjustment'), body.get('mode', 'add'),
+        user['username'], body.get('expected_version')
+    )
+
+@route('POST', '/customers/([^/]+)/rewards/([^/]+)')
+def redeem_reward(user, body, query, customer_id, reward_id):
+    customer, redemption = services.redeem_reward(customer_id, reward_id, user['username'],
+                                                  body.get('expected_version'))
+    return {'customer': customer, 'redemption': redemption}
+
+@route('GET', '/backups/([^/]+)', role='admin')
+def download_backup(user, body, query, filename):
+    # Returned as an open file; the handler streams it instead of JSON-encoding it
+    path = os.path.join(BACKUP_DIR, os.path.basename(filename))
+    if not filename.endswith(('.zip', ARCHIVE_SUFFIX)) or not os.path.isfile(path):
+        raise ServiceError(f"Backup {filename} not found")
+    return open(path, 'rb')
+
+class APIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    server_version = "RocketPOS"
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_file(self, fileobj):
+        with fileobj:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Disposition", f'attachment; filename="{os.path.basename(fileobj.name)}"')
+            self.send_header("Content-Length", str(os.fstat(fileobj.fileno()).st_size))
+            self.end_headers()
+            shutil.copyfileobj(fileobj, self.wfile, 1 << 20)
+
+    def _authenticate(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return None
+        try:
+            username, password = base64.b64decode(header[6:]).decode().split(":", 1)
+        except (ValueError, UnicodeDecodeError):
+            return None
+        user = verify_user(username, password)
+        if not user or not user.get('active', True):
+            return None
+        return {'username': username, 'role': user.get('role')}
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        user = self._authenticate()
+        if not user:
+            # The challenge makes a browser ask for the login, so backup links work from the app
+            self._send(401, {'error': 'Invalid username or password'},
+                       {'WWW-Authenticate': 'Basic realm="ROCKET VAPE POS"'})
+            return
+
+        for route_method, pattern, role, func in ROUTES:
+            match = pattern.match(url.path)
+            if route_method != method or not match:
+                continue
+            if not _has_role(user, role):
+                self._send(403, {'error': "You don't have permission to do this"})
+                return
+            try:
+                body = json.loads(raw) if raw else {}
+                result = func(user, body, parse_qs(url.query), *match.groups())
+                if hasattr(result, 'read'):
+                    self._send_file(result)
+                else:
+                    self._send(200, result)
+            except json.JSONDecodeError:
+                self._send(400, {'error': 'Request body is not valid JSON'})
+            except ServiceError as e:
+                self._send(422, {'error': str(e)})
+            except Exception as e:
+                self._send(500, {'error': f"Internal error: {str(e)}"})
+            return
+
+        self._send(404, {'error': f"No route for {method} {url.path}"})
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, quiet=False):
+    ensure_data_store()
+    server = ThreadingHTTPServer((host, port), APIHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="ROCKET VAPE POS local API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="Don't log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"ROCKET VAPE POS API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,777 @@
+"""Backup storage: content-addressed snapshots and checksummed archives.
+
+Each data file is split into content-defined chunks on line boundaries, every
+chunk is stored once under backups/chunks/<sha256> (zlib-compressed), and a
+snapshot is just a manifest listing the chunks of each file. Appending or
+editing records only changes the chunks around the edit, so an hourly snapshot
+of a large transactions.json writes a few chunks instead of the whole file.
+
+With write journaling enabled (settings 'write_journal'), every save_data() also
+appends the file's new chunk list to backups/journal.jsonl, so the store can be
+rebuilt as of any moment: the last snapshot before it plus the journal after it.
+Writes inside a data_transaction() are journaled when it commits, so the
+journal never holds a version that was rolled back.
+
+BackupScheduler takes "auto_" snapshots in a background thread at the interval
+in settings['backup_schedule'] and thins them out grandfather-father-son style
+(newest per hour/day/week/month). Every backup event is appended to
+backups/backup_log.jsonl, which is read from the end.
+
+Full archives (.posbak) are a tar stream cut into 1 MiB blocks that are gzipped
+on a thread pool and written in order as members of one multi-member gzip file,
+with a SHA-256 per data file in the manifest so they can be verified by streaming.
+"""
+
+import collections
+import contextlib
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from rocket_pos.core import DATA_DIR, BACKUP_DIR, DATA_FILE_SUFFIXES, SETTINGS_FILE, load_data
+
+CHUNK_DIR = os.path.join(BACKUP_DIR, "chunks")
+SNAPSHOT_DIR = os.path.join(BACKUP_DIR, "snapshots")
+SNAPSHOT_FORMAT = "chunked-1"
+JOURNAL_FILE = os.path.join(BACKUP_DIR, "journal.jsonl")
+LOG_FILE = os.path.join(BACKUP_DIR, "backup_log.jsonl")
+
+# Held from storing chunks until the manifest or journal line that references them is
+# written, and for all of collect_garbage(), so GC never sees a stored but unreferenced
+# chunk. Taken inside DATA_LOCK (save_data journals while holding it), never around it.
+STORE_LOCK = threading.RLock()
+
+# Chunk boundaries fall after a line whose crc32 has its low bits clear, once the
+# chunk is at least CHUNK_MIN_SIZE; CHUNK_MAX_SIZE caps chunks without newlines
+CHUNK_MIN_SIZE = 16 * 1024
+CHUNK_MAX_SIZE = 256 * 1024
+CHUNK_BOUNDARY_MASK = (1 << 10) - 1
+
+def chunk_boundaries(data):
+    """Yield (start, end) offsets of the content-defined chunks of a bytes-like object"""
+    size = len(data)
+    start = 0
+    while start < size:
+        end = None
+        pos = data.find(b'\n', start + CHUNK_MIN_SIZE - 1)
+        if pos != -1:
+            # Split/hash the candidate lines in C; only the scan for the first match runs in Python
+            lines = data[pos + 1:start + CHUNK_MAX_SIZE].split(b'\n')[:-1]
+            offset = pos + 1
+            for line, crc in zip(lines, map(zlib.crc32, lines)):
+                offset += len(line) + 1
+                if not crc & CHUNK_BOUNDARY_MASK:
+                    end = offset
+                    break
+        if end is None:
+            end = min(start + CHUNK_MAX_SIZE, size)
+        yield start, end
+        start = end
+
+def _chunk_path(digest):
+    return os.path.join(CHUNK_DIR, digest[:2], digest[2:])
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def store_chunk(data):
+    """Store a chunk if it's new; returns (digest, bytes written)"""
+    digest = hashlib.sha256(data).hexdigest()
+    path = _chunk_path(digest)
+    if os.path.exists(path):
+        return digest, 0
+    compressed = zlib.compress(data, 6)
+    _write_atomic(path, compressed)
+    return digest, len(compressed)
+
+def read_chunk(digest):
+    with open(_chunk_path(digest), 'rb') as f:
+        data = zlib.decompress(f.read())
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise ValueError(f"Chunk {digest[:12]} is corrupted")
+    return data
+
+def _data_files():
+    files = []
+    for root, _, names in os.walk(DATA_DIR):
+        for name in names:
+            if name.endswith(DATA_FILE_SUFFIXES):
+                files.append(os.path.relpath(os.path.join(root, name), DATA_DIR))
+    return sorted(files)
+
+def _snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.json")
+
+def list_snapshots():
+    """All snapshot manifests, newest first"""
+    snapshots = []
+    if not os.path.exists(SNAPSHOT_DIR):
+        return snapshots
+    for filename in os.listdir(SNAPSHOT_DIR):
+        if filename.endswith('.json'):
+            try:
+                with open(os.path.join(SNAPSHOT_DIR, filename), 'r') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                continue
+    snapshots.sort(key=lambda s: s['timestamp'], reverse=True)
+    return snapshots
+
+def load_snapshot(name):
+    with open(_snapshot_path(name), 'r') as f:
+        return json.load(f)
+
+def _chunk_file(path):
+    """Split one file into stored chunks; returns (digests, bytes written, new chunk count)"""
+    digests, written, new_chunks = [], 0, 0
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digests, written, new_chunks
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in chunk_boundaries(data):
+                digest, size = store_chunk(data[start:end])
+                digests.append(digest)
+                if size:
+                    written += size
+                    new_chunks += 1
+    return digests, written, new_chunks
+
+def create_snapshot(name, created_by="system", lock=None):
+    """Snapshot every JSON file in DATA_DIR, writing only chunks the store doesn't have yet.
+
+    Files whose size and mtime match the previous snapshot reuse its chunk list
+    without being read. With `lock` (the lock data writes take), the data is frozen
+    while holding it - changed files are copied aside - and chunked after it is
+    released, so writers wait only for a stat and a file copy. Returns the
+    manifest, including a 'stats' summary.
+    """
+    if not re.fullmatch(r"[\w.-]+", name):
+        raise ValueError("Snapshot name may only contain letters, digits, '_', '-' and '.'")
+    if os.path.exists(_snapshot_path(name)):
+        raise ValueError(f"A snapshot named '{name}' already exists")
+
+    previous = list_snapshots()
+    previous_files = previous[0]['files'] if previous else {}
+    frozen_dir = os.path.join(BACKUP_DIR, f".frozen_{name}")
+
+    manifest = {
+        'name': name,
+        'timestamp': datetime.datetime.now().isoformat(),
+        'format': SNAPSHOT_FORMAT,
+        'created_by': created_by,
+        'files': {}
+    }
+    stats = {'logical_size': 0, 'chunk_count': 0, 'new_chunks': 0, 'delta_size': 0, 'reused_files': 0}
+
+    to_chunk = {}
+    with lock or contextlib.nullcontext():
+        for rel_path in _data_files():
+            path = os.path.join(DATA_DIR, rel_path)
+            stat = os.stat(path)
+            entry = previous_files.get(rel_path)
+            if (entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                    and all(os.path.exists(_chunk_path(d)) for d in entry['chunks'])):
+                digests = entry['chunks']
+                stats['reused_files'] += 1
+            else:
+                digests = None
+                if lock:
+                    to_chunk[rel_path] = os.path.join(frozen_dir, rel_path)
+                    os.makedirs(os.path.dirname(to_chunk[rel_path]), exist_ok=True)
+                    shutil.copyfile(path, to_chunk[rel_path])
+                else:
+                    to_chunk[rel_path] = path
+
+            manifest['files'][rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'chunks': digests}
+            stats['logical_size'] += stat.st_size
+
+    with STORE_LOCK:
+        try:
+            for rel_path, path in to_chunk.items():
+                digests, written, new_chunks = _chunk_file(path)
+                manifest['files'][rel_path]['chunks'] = digests
+                stats['delta_size'] += written
+                stats['new_chunks'] += new_chunks
+        finally:
+            shutil.rmtree(frozen_dir, ignore_errors=True)
+
+        # Chunks reused from the previous snapshot may have been collected since they were checked
+        # (that snapshot deleted in between); store the file again as it is now
+        for rel_path, entry in manifest['files'].items():
+            if rel_path not in to_chunk and not all(os.path.exists(_chunk_path(d)) for d in entry['chunks']):
+                path = os.path.join(DATA_DIR, rel_path)
+                stat = os.stat(path)
+                digests, written, new_chunks = _chunk_file(path)
+                entry.update({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'chunks': digests})
+                stats['reused_files'] -= 1
+                stats['delta_size'] += written
+                stats['new_chunks'] += new_chunks
+        stats['chunk_count'] = sum(len(entry['chunks']) for entry in manifest['files'].values())
+
+        manifest['stats'] = stats
+        # Manifest goes last, so a snapshot only exists once all of its chunks do
+        _write_atomic(_snapshot_path(name), json.dumps(manifest, indent=2).encode())
+    return manifest
+
+def iter_snapshot_file(manifest, rel_path):
+    """Yield the verified chunks of one file in a snapshot"""
+    for digest in manifest['files'][rel_path]['chunks']:
+        yield read_chunk(digest)
+
+def _legacy_manifest(manifest):
+    # Same shape as create_complete_backup's manifest, so restore_backup() accepts the output
+    return {
+        'name': manifest['name'],
+        'timestamp': manifest['timestamp'],
+        'version': '1.0',
+        'created_by': manifest.get('created_by', 'system'),
+        'files': list(manifest['files'])
+    }
+
+def _write_files(files, target_dir):
+    # files: {rel_path: {'size', 'chunks'}}
+    for rel_path, entry in files.items():
+        dst_path = os.path.join(target_dir, rel_path)
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        with open(dst_path, 'wb') as f:
+            for digest in entry['chunks']:
+                f.write(read_chunk(digest))
+        if os.path.getsize(dst_path) != entry['size']:
+            raise ValueError(f"{rel_path} did not reassemble to its original size")
+
+def restore_snapshot_files(name, target_dir):
+    """Reassemble a snapshot's files (plus a backup manifest.json) under target_dir"""
+    manifest = load_snapshot(name)
+    _write_files(manifest['files'], target_dir)
+    with open(os.path.join(target_dir, 'manifest.json'), 'w') as f:
+        json.dump(_legacy_manifest(manifest), f, indent=2)
+    return manifest
+
+# Write journal
+def journal_file(path):
+    """Record the current content of a data file in the write journal"""
+    rel_path = os.path.relpath(path, DATA_DIR)
+    if rel_path.startswith(os.pardir):
+        return
+    with STORE_LOCK:
+        digests, _, _ = _chunk_file(path)
+        entry = {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'file': rel_path,
+            'size': os.path.getsize(path),
+            'chunks': digests
+        }
+        # One line per write; its chunks are already stored, so a torn last line is the only crash damage
+        with open(JOURNAL_FILE, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+def read_journal():
+    """Journal entries in write order, skipping a line torn by a crash"""
+    if not os.path.exists(JOURNAL_FILE):
+        return
+    with open(JOURNAL_FILE, 'r') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def journal_stats():
+    """Entry count and the time span the journal covers"""
+    count, first, last = 0, None, None
+    for entry in read_journal():
+        count += 1
+        first = first or entry['timestamp']
+        last = entry['timestamp']
+    return {'entries': count, 'first': first, 'last': last}
+
+def restore_point_in_time_files(until, target_dir):
+    """Reassemble the data files as they were at `until` (a datetime) under target_dir.
+    
+    Starts from the newest snapshot taken at or before that time and replays the
+    journal entries written after the snapshot, up to `until`. Returns
+    (base snapshot name, number of journal entries replayed).
+    """
+    until = until.isoformat()
+    base = next((s for s in list_snapshots() if s['timestamp'] <= until), None)
+    if base is None:
+        raise ValueError("There is no snapshot from before that time to replay the journal onto")
+    
+    files = dict(base['files'])
+    replayed = 0
+    for entry in read_journal():
+        if base['timestamp'] < entry['timestamp'] <= until:
+            files[entry['file']] = entry
+            replayed += 1
+    
+    _write_files(files, target_dir)
+    manifest = {
+        'name': f"{base['name']}+journal",
+        'timestamp': until,
+        'version': '1.0',
+        'created_by': base.get('created_by', 'system'),
+        'files': list(files)
+    }
+    with open(os.path.join(target_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return base['name'], replayed
+
+def prune_journal():
+    """Drop journal entries older than the oldest snapshot (nothing to replay them onto); returns the count"""
+    with STORE_LOCK:  # an append landing mid-rewrite would be lost
+        snapshots = list_snapshots()
+        if not os.path.exists(JOURNAL_FILE):
+            return 0
+        oldest = snapshots[-1]['timestamp'] if snapshots else None
+        kept, dropped = [], 0
+        for entry in read_journal():
+            if oldest and entry['timestamp'] > oldest:
+                kept.append(entry)
+            else:
+                dropped += 1
+        if dropped:
+            _write_atomic(JOURNAL_FILE, ''.join(json.dumps(entry) + '\n' for entry in kept).encode())
+        return dropped
+
+def export_snapshot_zip(name, fileobj):
+    """Write a snapshot as a regular ZIP backup (restorable through the upload form)"""
+    manifest = load_snapshot(name)
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for rel_path in manifest['files']:
+            with zipf.open(rel_path, 'w') as f:
+                for data in iter_snapshot_file(manifest, rel_path):
+                    f.write(data)
+        zipf.writestr('manifest.json', json.dumps(_legacy_manifest(manifest), indent=2))
+    return manifest
+
+def delete_snapshot(name):
+    """Remove a snapshot manifest; its chunks are freed by the next collect_garbage()"""
+    os.remove(_snapshot_path(name))
+
+def store_stats():
+    """Totals across all snapshots: logical bytes, bytes stored in the chunk store, dedup ratio"""
+    logical = sum(s.get('stats', {}).get('logical_size', 0) for s in list_snapshots())
+    stored, chunks = 0, 0
+    if os.path.exists(CHUNK_DIR):
+        for root, _, names in os.walk(CHUNK_DIR):
+            for name in names:
+                if not name.endswith('.tmp'):
+                    stored += os.path.getsize(os.path.join(root, name))
+                    chunks += 1
+    return {
+        'logical_size': logical,
+        'stored_size': stored,
+        'chunk_count': chunks,
+        'dedup_ratio': logical / stored if stored else 0
+    }
+
+def prune_snapshots(keep_last):
+    """Delete all but the newest keep_last snapshots (and the journal before them); returns the deleted names"""
+    deleted = []
+    for snapshot in list_snapshots()[keep_last:]:
+        delete_snapshot(snapshot['name'])
+        deleted.append(snapshot['name'])
+    prune_journal()
+    return deleted
+
+def collect_garbage():
+    """Delete chunks no snapshot or journal entry references any more; returns (chunks removed, bytes freed).
+
+    Runs under STORE_LOCK, so no chunk is between being stored and being
+    referenced. Files written since it started are left for the next run.
+    """
+    with STORE_LOCK:
+        started = time.time()
+        referenced = set()
+        for snapshot in list_snapshots():
+            for entry in snapshot['files'].values():
+                referenced.update(entry['chunks'])
+        for entry in read_journal():
+            referenced.update(entry['chunks'])
+
+        removed, freed = 0, 0
+        if not os.path.exists(CHUNK_DIR):
+            return removed, freed
+        for root, _, names in os.walk(CHUNK_DIR):
+            for name in names:
+                path = os.path.join(root, name)
+                digest = os.path.basename(root) + name
+                if not (name.endswith('.tmp') or digest not in referenced):
+                    continue
+                try:
+                    stat = os.stat(path)
+                    if stat.st_mtime >= started:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                freed += stat.st_size
+                removed += 1
+        return removed, freed
+
+# Durable backup log
+def append_log(entry):
+    """Append one event to the backup log and flush it to disk"""
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    with open(LOG_FILE, 'a') as f:
+        f.write(json.dumps(entry, default=str) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_log_tail(limit=50):
+    """The newest `limit` log entries, newest first, reading only the end of the file"""
+    if not os.path.exists(LOG_FILE):
+        return []
+    with open(LOG_FILE, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        data = b''
+        while end > 0 and data.count(b'\n') <= limit:
+            start = max(0, end - 64 * 1024)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    entries = []
+    for line in reversed(data.splitlines()[-limit:]):
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+def migrate_legacy_log(legacy_path):
+    """Move the old capped backup_logs.json (inside the data dir) into the append-only log"""
+    if not os.path.exists(legacy_path):
+        return
+    try:
+        with open(legacy_path, 'r') as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        entries = []
+    if not os.path.exists(LOG_FILE):
+        for entry in entries:
+            append_log(entry)
+    os.remove(legacy_path)
+
+# Scheduled snapshots
+AUTO_PREFIX = "auto_"
+SCHEDULE_DEFAULTS = {
+    'enabled': False,
+    'interval_minutes': 60,
+    'keep_hourly': 24,
+    'keep_daily': 7,
+    'keep_weekly': 4,
+    'keep_monthly': 12
+}
+
+# GFS tiers: how a snapshot's timestamp is bucketed for each retention setting
+RETENTION_TIERS = {
+    'keep_hourly': lambda ts: ts.strftime("%Y-%m-%d %H"),
+    'keep_daily': lambda ts: ts.date(),
+    'keep_weekly': lambda ts: ts.isocalendar()[:2],
+    'keep_monthly': lambda ts: (ts.year, ts.month)
+}
+
+def schedule_settings():
+    return {**SCHEDULE_DEFAULTS, **load_data(SETTINGS_FILE).get('backup_schedule', {})}
+
+def gfs_keep(snapshots, policy):
+    """Names to keep: for each tier, the newest snapshot in each of its N most recent periods"""
+    keep = set()
+    for tier, bucket_of in RETENTION_TIERS.items():
+        buckets = set()
+        for snapshot in sorted(snapshots, key=lambda s: s['timestamp'], reverse=True):
+            bucket = bucket_of(datetime.datetime.fromisoformat(snapshot['timestamp']))
+            if bucket in buckets:
+                continue
+            if len(buckets) >= policy.get(tier, 0):
+                break
+            buckets.add(bucket)
+            keep.add(snapshot['name'])
+    return keep
+
+def apply_retention(policy):
+    """Delete scheduled snapshots the GFS policy doesn't keep; manual snapshots are never touched.
+    
+    Returns (deleted names, chunks removed, bytes freed).
+    """
+    auto = [s for s in list_snapshots() if s['name'].startswith(AUTO_PREFIX)]
+    keep = gfs_keep(auto, policy)
+    deleted = []
+    for snapshot in auto:
+        if snapshot['name'] not in keep:
+            delete_snapshot(snapshot['name'])
+            deleted.append(snapshot['name'])
+    if deleted:
+        prune_journal()
+    removed, freed = collect_garbage() if deleted else (0, 0)
+    return deleted, removed, freed
+
+class BackupScheduler:
+    """Background thread taking scheduled snapshots, one per server process.
+    
+    Snapshots freeze the data under `lock` (the lock every data write takes), so
+    they are consistent without holding up sales while chunking. `status` is
+    for the UI.
+    """
+
+    def __init__(self, lock, poll_seconds=30):
+        self.lock = lock
+        self.poll_seconds = poll_seconds
+        self.wake = threading.Event()
+        self.run_requested = False
+        self.thread = threading.Thread(target=self._loop, name="backup-scheduler", daemon=True)
+        self.status = {'state': 'idle', 'last_run': None, 'last_result': None, 'last_error': None, 'next_run': None}
+
+    def start(self):
+        self.thread.start()
+
+    def run_now(self):
+        """Ask the thread to take a snapshot right away (returns immediately)"""
+        self.run_requested = True
+        self.wake.set()
+
+    def _loop(self):
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                self.status['last_error'] = str(e)
+            self.wake.wait(self.poll_seconds)
+            self.wake.clear()
+
+    def next_run(self, policy):
+        auto = [s for s in list_snapshots() if s['name'].startswith(AUTO_PREFIX)]
+        if not auto:
+            return datetime.datetime.now()
+        last = datetime.datetime.fromisoformat(auto[0]['timestamp'])
+        return last + datetime.timedelta(minutes=policy['interval_minutes'])
+
+    def tick(self):
+        policy = schedule_settings()
+        if policy['enabled']:
+            self.status['next_run'] = self.next_run(policy)
+        else:
+            self.status['next_run'] = None
+        
+        if self.run_requested or (policy['enabled'] and datetime.datetime.now() >= self.status['next_run']):
+            self.run_requested = False
+            self.run_once(policy)
+            if policy['enabled']:
+                self.status['next_run'] = self.next_run(policy)
+
+    def run_once(self, policy):
+        name = f"{AUTO_PREFIX}{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        suffix = 1
+        while os.path.exists(_snapshot_path(name)):
+            suffix += 1
+            name = f"{name.rsplit('-', 1)[0]}-{suffix}"
+        self.status['state'] = 'running'
+        append_log({'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'action': 'scheduled_snapshot',
+                    'backup_name': name, 'state': 'started', 'user': 'scheduler'})
+        entry = {'action': 'scheduled_snapshot', 'backup_name': name, 'backup_path': SNAPSHOT_DIR,
+                 'user': 'scheduler', 'state': 'finished'}
+        started = time.perf_counter()
+        try:
+            manifest = create_snapshot(name, created_by='scheduler', lock=self.lock)
+            deleted, removed, freed = apply_retention(policy)
+            seconds = time.perf_counter() - started
+            entry.update({
+                'success': True,
+                'bytes': manifest['stats']['logical_size'],
+                'delta_size': manifest['stats']['delta_size'],
+                'seconds': round(seconds, 3),
+                'throughput_mb_s': round(manifest['stats']['logical_size'] / seconds / 1e6, 2) if seconds > 0 else 0.0,
+                'pruned': deleted,
+                'chunks_removed': removed,
+                'bytes_freed': freed
+            })
+            self.status['last_error'] = None
+        except Exception as e:
+            entry.update({'success': False, 'error': str(e)})
+            self.status['last_error'] = str(e)
+        entry['timestamp'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        append_log(entry)
+        self.status.update(state='idle', last_run=entry['timestamp'], last_result=entry)
+        return entry
+
+# Checksummed archives
+ARCHIVE_SUFFIX = ".posbak"
+ARCHIVE_BLOCK_SIZE = 1 << 20
+COPY_BUFFER_SIZE = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+
+def copy_with_sha256(src, dst):
+    """Copy one binary file object to another; returns (sha256 hex digest, bytes copied)"""
+    digest = hashlib.sha256()
+    copied = 0
+    for block in iter(lambda: src.read(COPY_BUFFER_SIZE), b''):
+        digest.update(block)
+        dst.write(block)
+        copied += len(block)
+    return digest.hexdigest(), copied
+
+def file_sha256(fileobj):
+    digest, _ = copy_with_sha256(fileobj, _NullWriter())
+    return digest
+
+class _NullWriter:
+    def write(self, data):
+        return len(data)
+
+class _HashingReader:
+    """Read-through wrapper that hashes whatever tarfile pulls from the source file"""
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.digest = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.digest.update(data)
+        return data
+
+class ParallelGzipWriter:
+    """Write-only file object that gzips fixed-size blocks on a thread pool.
+
+    Blocks are written to the underlying file in order, each as its own gzip
+    member, so the output is a regular (multi-member) .gz that gzip/GzipFile read
+    as one stream. zlib releases the GIL while compressing, so blocks compress in
+    parallel; at most two blocks per worker are in flight to bound memory.
+    """
+
+    def __init__(self, fileobj, workers=None, level=6):
+        self.fileobj = fileobj
+        self.level = level
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.executor = ThreadPoolExecutor(self.workers)
+        self.pending = collections.deque()
+        self.buffer = bytearray()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def write(self, data):
+        self.buffer += data
+        self.bytes_in += len(data)
+        while len(self.buffer) >= ARCHIVE_BLOCK_SIZE:
+            self._submit(bytes(self.buffer[:ARCHIVE_BLOCK_SIZE]))
+            del self.buffer[:ARCHIVE_BLOCK_SIZE]
+        return len(data)
+
+    def _submit(self, block):
+        self.pending.append(self.executor.submit(gzip.compress, block, self.level, mtime=0))
+        while len(self.pending) > self.workers * 2:
+            self._write_next()
+
+    def _write_next(self):
+        member = self.pending.popleft().result()
+        self.fileobj.write(member)
+        self.bytes_out += len(member)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.buffer:
+            self._submit(bytes(self.buffer))
+            self.buffer.clear()
+        while self.pending:
+            self._write_next()
+        self.executor.shutdown()
+
+def write_archive(path, files, manifest, workers=None):
+    """Stream files [(source path, archive name)] into a .posbak archive.
+
+    Adds 'checksums' (SHA-256 per file) to the manifest, which is stored as the
+    last member. Returns (bytes read, bytes written).
+    """
+    checksums = {}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as out:
+        writer = ParallelGzipWriter(out, workers)
+        with tarfile.open(fileobj=writer, mode='w|') as tar:
+            for src_path, arcname in files:
+                with open(src_path, 'rb') as f:
+                    info = tar.gettarinfo(arcname=arcname, fileobj=f)
+                    reader = _HashingReader(f)
+                    tar.addfile(info, reader)
+                checksums[arcname] = reader.digest.hexdigest()
+            
+            manifest['checksums'] = checksums
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo('manifest.json')
+            info.size = len(data)
+            info.mtime = int(datetime.datetime.now().timestamp())
+            tar.addfile(info, io.BytesIO(data))
+        writer.close()
+    os.replace(tmp_path, path)
+    return writer.bytes_in, writer.bytes_out
+
+def is_archive(path):
+    """True for a .posbak (gzip) archive"""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(2) == GZIP_MAGIC
+
+def _safe_member_name(name):
+    return (name.endswith(DATA_FILE_SUFFIXES) and not os.path.isabs(name)
+            and '..' not in name.replace('\\', '/').split('/'))
+
+def read_archive(path, target_dir=None):
+    """Stream through a .posbak archive, checking every file against the manifest.
+
+    With target_dir, files are also extracted there. Nothing is held in memory
+    beyond one copy buffer. Returns the manifest; raises ValueError (or a gzip/tar
+    error for a damaged stream) on a bad archive.
+    """
+    digests = {}
+    manifest = None
+    with gzip.open(path, 'rb') as gz, tarfile.open(fileobj=gz, mode='r|') as tar:
+        for member in tar:
+            if not member.isfile() or not _safe_member_name(member.name):
+                raise ValueError(f"Unexpected entry in archive: {member.name}")
+            src = tar.extractfile(member)
+            if member.name == 'manifest.json':
+                manifest = json.load(src)
+                continue
+            if target_dir:
+                dst_path = os.path.join(target_dir, member.name)
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                with open(dst_path, 'wb') as dst:
+                    digests[member.name], _ = copy_with_sha256(src, dst)
+            else:
+                digests[member.name] = file_sha256(src)
+    
+    if manifest is None:
+        raise ValueError("Invalid backup: manifest file missing")
+    check_checksums(manifest, digests)
+    if target_dir:
+        with open(os.path.join(target_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+    return manifest
+
+def check_checksums(manifest, digests):
+    """Compare computed {name: sha256} against the manifest; backups without checksums pass"""
+    expected = manifest.get('checksums')
+    if expected is None:
+        return
+    for name, digest in expected.items():
+        if name not in digests:
+            raise ValueError(f"{name} is missing from the backup")
+        if digests[name] != digest:
+            raise ValueError(f"{name} failed its SHA-256 check")
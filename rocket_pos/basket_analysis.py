@@ -0,0 +1,161 @@
+"""Market-basket analysis: which products (or categories) sell together.
+
+Each sale's line items (sales_history.py) are reduced to its distinct item
+codes, sorted and stored back to back with an offsets array - a sparse
+sale x item incidence matrix in CSR form. Itemsets are counted by basket size:
+the baskets holding s items are gathered into an s-wide matrix, and one
+index template per size yields all their k-item combinations at once, so
+counting pairs over millions of lines is a few array operations and a sort.
+
+Itemsets beyond pairs come from a bounded Apriori. Level k only looks at items
+in a frequent (k-1)-itemset. It only counts candidates whose every
+(k-1)-subset was frequent, and it stops at MAX_ITEMSET_SIZE. Baskets with more
+than MAX_BASKET_ITEMS distinct items (bulk or wholesale orders) still count
+towards item support but not towards itemsets.
+
+For a pair A, B: support is the share of sales holding both. confidence(A->B)
+is the share of sales with A that also hold B. lift is support over what
+independent items would give; above 1 means they sell together more than
+chance.
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from rocket_pos.core import PRODUCTS_FILE, TRANSACTIONS_FILE, data_version, load_data_snapshot, snapshot_cache
+from rocket_pos.sales_history import sales_frames
+
+MAX_BASKET_ITEMS = 30
+MAX_ITEMSET_SIZE = 3
+DEFAULT_MIN_COUNT = 3
+LEVELS = {"product": "Products", "category": "Categories"}
+
+def _baskets(start_date, end_date, level):
+    """(item labels, offsets, codes): each sale's distinct item codes, sorted, in CSR form"""
+    sales, lines = sales_frames()
+    dates = sales['date']
+    in_range = ((dates >= pd.Timestamp(start_date)) & (dates < pd.Timestamp(end_date) + pd.Timedelta(days=1))).to_numpy()
+    lines = lines[in_range[lines['sale'].to_numpy()] & (lines['quantity'] > 0).to_numpy()]
+
+    items = lines['barcode']
+    if level == "category":
+        products = load_data_snapshot(PRODUCTS_FILE)
+        items = items.map({barcode: product.get('category') or 'Uncategorized'
+                           for barcode, product in products.items()}).fillna('Uncategorized')
+    codes, labels = pd.factorize(items, sort=True)
+
+    # One entry per (sale, item): the sparse incidence matrix, row-major
+    entries = np.unique(lines['sale'].to_numpy().astype(np.int64) * max(len(labels), 1) + codes)
+    rows, codes = np.divmod(entries, max(len(labels), 1))
+    _, sizes = np.unique(rows, return_counts=True)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    return np.asarray(labels, dtype=object), offsets, codes
+
+def _itemsets(offsets, codes, k, keep):
+    """(n, k) array of every k-combination of kept items within each basket, each row ascending"""
+    kept = keep[codes]
+    sizes = np.add.reduceat(kept.astype(np.int64), offsets[:-1]) if len(codes) else np.zeros(0, dtype=np.int64)
+    codes = codes[kept]
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    found = [np.empty((0, k), dtype=np.int64)]
+    for size in np.unique(sizes):
+        if size < k or size > MAX_BASKET_ITEMS:
+            continue
+        starts = offsets[:-1][sizes == size]
+        baskets = codes[starts[:, None] + np.arange(size)]
+        template = np.asarray(list(combinations(range(size), k)))
+        found.append(baskets[:, template].reshape(-1, k))
+    return np.concatenate(found)
+
+def _keys(itemsets, n_items):
+    """One int64 per itemset (rows ascending), for counting and lookups"""
+    keys = np.zeros(len(itemsets), dtype=np.int64)
+    for column in range(itemsets.shape[1]):
+        keys = keys * n_items + itemsets[:, column]
+    return keys
+
+def _build_affinity(start_date, end_date, level, min_count, max_size):
+    labels, offsets, codes = _baskets(start_date, end_date, level)
+    baskets, n_items = len(offsets) - 1, len(labels)
+    item_counts = np.bincount(codes, minlength=n_items)
+    result = {'baskets': baskets, 'pairs': pd.DataFrame(), 'itemsets': pd.DataFrame()}
+    if baskets == 0:
+        return result
+
+    # Apriori: level k counts only candidates whose (k-1)-subsets were all frequent
+    frequent = {1: np.flatnonzero(item_counts >= min_count)}
+    counted = {}
+    for k in range(2, max_size + 1):
+        keep = np.zeros(n_items, dtype=bool)
+        keep[np.unique(frequent[k - 1])] = True
+        candidates = _itemsets(offsets, codes, k, keep)
+        if k > 2:
+            for dropped in range(k):
+                subsets = np.delete(candidates, dropped, axis=1)
+                candidates = candidates[np.isin(_keys(subsets, n_items), counted[k - 1][0])]
+        if not len(candidates):
+            break
+        keys, counts = np.unique(_keys(candidates, n_items), return_counts=True)
+        keys, counts = keys[counts >= min_count], counts[counts >= min_count]
+        if not len(keys):
+            break
+        # Decode the frequent keys back to item codes
+        itemsets = np.empty((len(keys), k), dtype=np.int64)
+        remaining = keys.copy()
+        for column in range(k - 1, -1, -1):
+            remaining, itemsets[:, column] = np.divmod(remaining, n_items)
+        frequent[k] = itemsets
+        counted[k] = (keys, counts, itemsets)
+
+    support = item_counts / baskets
+    if 2 in counted:
+        _, counts, pairs = counted[2]
+        a, b = pairs[:, 0], pairs[:, 1]
+        pair_support = counts / baskets
+        result['pairs'] = pd.DataFrame({
+            'item_a': labels[a],
+            'item_b': labels[b],
+            'count': counts,
+            'support': pair_support,
+            'confidence_ab': counts / item_counts[a],
+            'confidence_ba': counts / item_counts[b],
+            'lift': pair_support / (support[a] * support[b]),
+        }).sort_values(['lift', 'count'], ascending=False, ignore_index=True)
+
+    larger = []
+    for k in range(3, max_size + 1):
+        if k not in counted:
+            break
+        _, counts, itemsets = counted[k]
+        larger.append(pd.DataFrame({
+            'items': labels[itemsets].tolist(),
+            'size': k,
+            'count': counts,
+            'support': counts / baskets,
+            'lift': counts / baskets / np.prod(support[itemsets], axis=1),
+        }))
+    if larger:
+        result['itemsets'] = pd.concat(larger).sort_values(['lift', 'count'], ascending=False, ignore_index=True)
+    return result
+
+@snapshot_cache(max_entries=8)
+def _cached_affinity(versions, start_date, end_date, level, min_count, max_size):
+    return _build_affinity(start_date, end_date, level, min_count, max_size)
+
+def product_affinity(start_date, end_date, level="product", min_count=DEFAULT_MIN_COUNT, max_size=2):
+    """Items that sell together in sales between two dates.
+
+    level is 'product' (items are barcodes) or 'category'. Returns a dict with
+    'baskets' (sales counted), 'pairs' (item_a, item_b, count, support,
+    confidence_ab, confidence_ba, lift; strongest lift first) and, when
+    max_size > 2, 'itemsets' (items, size, count, support, lift) for frequent
+    itemsets up to max_size (capped at MAX_ITEMSET_SIZE). Only itemsets in at
+    least min_count sales are kept. Cached per version of the sales (and the
+    products, for categories); callers must not mutate the result.
+    """
+    files = [TRANSACTIONS_FILE, PRODUCTS_FILE] if level == "category" else [TRANSACTIONS_FILE]
+    versions = tuple(data_version(file) for file in files)
+    return _cached_affinity(versions, start_date, end_date, level, max(int(min_count), 1),
+                            min(max(int(max_size), 2), MAX_ITEMSET_SIZE))
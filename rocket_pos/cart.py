@@ -0,0 +1,219 @@
+"""Incremental shopping cart pricing for the POS terminal."""
+
+# Offer types whose discount depends on a single cart line
+LINE_OFFER_TYPES = ('bogo', 'special_price', 'percentage_discount', 'fixed_discount')
+
+class Cart:
+    """Cart lines plus cached per-line totals, subtotal and offer discount.
+
+    Every mutation adjusts the cached totals by the delta of the line it touches
+    (and re-prices a bundle offer only if that line is part of the bundle), so
+    rendering the totals never walks the whole cart. `lines` keeps the same shape
+    as the old session cart dict and is what ends up in transaction['items'].
+    """
+
+    def __init__(self):
+        self.lines = {}
+        self.line_totals = {}
+        self.subtotal = 0.0
+        self.tax_rate = 0.0
+        self.offer = None
+        self.offer_line_discounts = {}
+        self.bundle_discount = 0.0
+        self.offer_discount = 0.0
+
+    def __bool__(self):
+        return bool(self.lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __contains__(self, barcode):
+        return barcode in self.lines
+
+    def items(self):
+        return self.lines.items()
+
+    # Line mutations
+    def add(self, barcode, product, quantity=1):
+        if barcode in self.lines:
+            self.set_quantity(barcode, self.lines[barcode]['quantity'] + quantity)
+            return
+        self.lines[barcode] = {
+            'name': product['name'],
+            'price': product['price'],
+            'quantity': quantity,
+            'description': product.get('description', ''),
+            'brand': product.get('brand')
+        }
+        self.line_totals[barcode] = 0.0
+        self._update_line(barcode)
+
+    def set_quantity(self, barcode, quantity):
+        if barcode not in self.lines or self.lines[barcode]['quantity'] == quantity:
+            return
+        self.lines[barcode]['quantity'] = quantity
+        self._update_line(barcode)
+
+    def remove(self, barcode):
+        if barcode not in self.lines:
+            return
+        del self.lines[barcode]
+        self.subtotal -= self.line_totals.pop(barcode)
+        self.offer_discount -= self.offer_line_discounts.pop(barcode, 0.0)
+        if self._in_bundle(barcode):
+            self._update_bundle()
+        if not self.lines:
+            # Drop accumulated float drift once the cart is empty
+            self.subtotal = 0.0
+            self.offer_discount = 0.0
+
+    def clear(self):
+        self.__init__()
+
+    def _update_line(self, barcode):
+        line = self.lines[barcode]
+        total = line['price'] * line['quantity']
+        self.subtotal += total - self.line_totals[barcode]
+        self.line_totals[barcode] = total
+
+        if self.offer and self.offer['type'] in LINE_OFFER_TYPES:
+            discount = self._line_offer_discount(barcode)
+            self.offer_discount += discount - self.offer_line_discounts.get(barcode, 0.0)
+            self.offer_line_discounts[barcode] = discount
+        elif self._in_bundle(barcode):
+            self._update_bundle()
+
+    # Tax and offers
+    def set_tax_rate(self, tax_rate):
+        self.tax_rate = tax_rate
+
+    def set_offer(self, offer):
+        """Select the active offer (or None); re-prices the cart only when the offer changed"""
+        if offer == self.offer:
+            return
+        self.offer = dict(offer) if offer else None
+        self.offer_line_discounts = {}
+        self.bundle_discount = 0.0
+        self.offer_discount = 0.0
+        if not self.offer:
+            return
+        if self.offer['type'] in LINE_OFFER_TYPES:
+            for barcode in self.lines:
+                discount = self._line_offer_discount(barcode)
+                self.offer_line_discounts[barcode] = discount
+                self.offer_discount += discount
+        elif self.offer['type'] == 'bundle':
+            self._update_bundle()
+
+    def _offer_applies_to(self, barcode):
+        return self.offer.get('apply_to_all', False) or barcode in self.offer.get('products', [])
+
+    def _line_offer_discount(self, barcode):
+        offer = self.offer
+        item = self.lines[barcode]
+
+        if offer['type'] == 'bogo':
+            # Buy One Get One Free offer
+            if self._offer_applies_to(barcode) and item['quantity'] >= offer['buy_quantity']:
+                free_qty = (item['quantity'] // offer['buy_quantity']) * offer['get_quantity']
+                return free_qty * item['price']
+
+        elif offer['type'] == 'special_price':
+            # Special price offer
+            if barcode == offer.get('product'):
+                return (item['price'] - offer.get('special_price', 0)) * item['quantity']
+
+        elif offer['type'] == 'percentage_discount':
+            if self._offer_applies_to(barcode):
+                return self.line_totals[barcode] * offer.get('discount_percent', 0) / 100
+
+        elif offer['type'] == 'fixed_discount':
+            if self._offer_applies_to(barcode):
+                return offer.get('discount_amount', 0) * item['quantity']
+
+        return 0.0
+
+    def _in_bundle(self, barcode):
+        return bool(self.offer) and self.offer['type'] == 'bundle' and barcode in self.offer.get('products', [])
+
+    def _update_bundle(self):
+        # Bundle offer - only applies when every bundle product is in the cart
+        bundle_products = self.offer.get('products', [])
+        discount = 0.0
+        if all(barcode in self.lines for barcode in bundle_products):
+            original_price = sum(self.line_totals[barcode] for barcode in bundle_products)
+            discount = original_price - self.offer.get('bundle_price', 0)
+        self.offer_discount += discount - self.bundle_discount
+        self.bundle_discount = discount
+
+    # Pricing
+    @property
+    def tax(self):
+        return self.subtotal * self.tax_rate
+
+    @property
+    def total_before_discounts(self):
+        return self.subtotal + self.tax
+
+    def discount_base(self, barcodes=None):
+        """Amount a manual discount works from: the total after offers, or just the given lines (with tax)"""
+        if barcodes is None:
+            return self.total_before_discounts - self.offer_discount
+        return sum(self.line_totals[barcode] * (1 + self.tax_rate) - self.offer_line_discounts.get(barcode, 0.0)
+                   for barcode in barcodes if barcode in self.lines)
+
+    def pricing(self, discount=None, loyalty_rate=0.0, points=0, points_value=0.01, points_per_dollar=1,
+                customer_id=None, payment_method=None, payment_charge_percent=0.0, discount_lines=None):
+        """Pricing breakdown for the cart as it stands, as a new plain dict.
+
+        discount_lines limits the manual discount to those lines (None: the whole
+        cart); see rocket_pos.discount_rules. Works only from the cached totals,
+        so it is cheap to call on every rerun. process_sale commits the returned
+        dict as is; it can be pickled, copied and JSON-serialized, and changing it
+        never touches the cart.
+        """
+        total_before_discounts = self.total_before_discounts
+        total_after_offers = total_before_discounts - self.offer_discount
+
+        manual_discount = 0.0
+        if discount:
+            base = max(self.discount_base(discount_lines), 0.0)
+            if discount['type'] == 'percentage':
+                manual_discount = base * (discount['value'] / 100)
+            else:
+                # A fixed amount can't take off more than the lines it covers
+                manual_discount = min(discount['value'], base)
+        total_after_discounts = total_after_offers - manual_discount
+
+        loyalty_discount = total_after_discounts * loyalty_rate if customer_id else 0.0
+        points = points if customer_id else 0
+        points_discount = points * points_value
+        net_amount = max(total_after_discounts - loyalty_discount - points_discount, 0)
+
+        payment_charge_amount = net_amount * (payment_charge_percent / 100)
+
+        return {
+            'items': {barcode: dict(line) for barcode, line in self.lines.items()},
+            'subtotal': self.subtotal,
+            'tax_rate': self.tax_rate,
+            'tax': self.tax,
+            'total_before_discounts': total_before_discounts,
+            'offer': self.offer['name'] if self.offer else None,
+            'offer_discount': self.offer_discount,
+            'discount': discount['name'] if discount else None,
+            'discount_lines': list(discount_lines) if discount and discount_lines is not None else None,
+            'manual_discount': manual_discount,
+            'total_after_discounts': total_after_discounts,
+            'customer_id': customer_id,
+            'loyalty_discount': loyalty_discount,
+            'points_redeemed': points,
+            'points_discount': points_discount,
+            'total_discount': self.offer_discount + manual_discount + loyalty_discount + points_discount,
+            'net_amount': net_amount,
+            'loyalty_points_earned': int(net_amount * points_per_dollar) if customer_id else 0,
+            'payment_method': payment_method,
+            'payment_charge_percent': payment_charge_percent,
+            'payment_charge_amount': payment_charge_amount,
+            'amount_due': net_amount + payment_charge_amount
+        }
@@ -0,0 +1,167 @@
+"""Cash drawer ledger: day segments of drawer movements plus a materialized balance.
+
+Every movement is one JSON line appended to data/cash_ledger/<YYYY-MM-DD>.jsonl,
+so recording a cash sale never rewrites the history. cash_drawer.json only holds
+the running balance and entry count. Installs that still have the old
+cash_drawer['transactions'] list are split into segments on first use.
+"""
+
+import datetime
+import json
+import os
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    CASH_DRAWER_FILE,
+    TRANSACTIONS_FILE,
+    append_data,
+    load_data,
+    load_data_lines,
+    save_data,
+)
+from rocket_pos.returns_log import load_returns
+
+LEDGER_DIR = os.path.join(DATA_DIR, "cash_ledger")
+LEDGER_VERSION = 1
+
+def _segment_path(day):
+    return os.path.join(LEDGER_DIR, f"{day}.jsonl")
+
+def _segment_days():
+    if not os.path.exists(LEDGER_DIR):
+        return []
+    return sorted(name[:-len(".jsonl")] for name in os.listdir(LEDGER_DIR) if name.endswith(".jsonl"))
+
+def load_drawer():
+    """cash_drawer.json in ledger form (migrating the legacy entry list if it's still there)"""
+    with DATA_LOCK:
+        drawer = load_data(CASH_DRAWER_FILE)
+        if 'transactions' in drawer or 'ledger_version' not in drawer:
+            drawer = migrate_cash_drawer(drawer)
+    return drawer
+
+def migrate_cash_drawer(drawer):
+    """Split the legacy cash_drawer['transactions'] list into day segments.
+
+    Segments are written whole (not appended), so re-running after a crash
+    produces the same files; the list is only dropped once they all exist.
+    """
+    entries = drawer.get('transactions', [])
+
+    # Old entries carry a transaction_id/return_id but no shift - recover it from the records
+    shift_of = {}
+    if entries:
+        for transaction_id, transaction in load_data(TRANSACTIONS_FILE).items():
+            shift_of[('transaction_id', transaction_id)] = transaction.get('shift_id')
+        for return_id, return_record in load_returns().items():
+            shift_of[('return_id', return_id)] = return_record.get('shift_id')
+
+    segments = {}
+    for entry in entries:
+        entry = dict(entry)
+        if 'shift_id' not in entry:
+            key = ('transaction_id', entry['transaction_id']) if 'transaction_id' in entry else ('return_id', entry.get('return_id'))
+            entry['shift_id'] = shift_of.get(key)
+        segments.setdefault(entry.get('date', '')[:10] or 'undated', []).append(entry)
+
+    os.makedirs(LEDGER_DIR, exist_ok=True)
+    for day, day_entries in segments.items():
+        tmp_path = f"{_segment_path(day)}.tmp"
+        with open(tmp_path, 'w') as f:
+            for entry in day_entries:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp_path, _segment_path(day))
+
+    balance = drawer.get('current_balance', 0.0)
+    migrated = {
+        'current_balance': balance,
+        # Whatever the old balance held beyond its entries, so rebuilds match it
+        'opening_balance': balance - sum(entry.get('amount', 0) for entry in entries),
+        'entry_count': len(entries),
+        'last_entry': entries[-1].get('date') if entries else None,
+        'ledger_version': LEDGER_VERSION
+    }
+    save_data(migrated, CASH_DRAWER_FILE)
+    return migrated
+
+def record_cash(entry_type, amount, username, shift_id=None, date=None, **refs):
+    """Append one drawer movement (positive = cash in) and update the balance; returns the entry.
+
+    refs are the ids the movement belongs to, e.g. transaction_id=... or return_id=...
+    """
+    date = date or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    entry = {
+        'type': entry_type,
+        'amount': amount,
+        'date': date,
+        **refs,
+        'processed_by': username,
+        'shift_id': shift_id
+    }
+    with DATA_LOCK:
+        drawer = load_drawer()
+        append_data(entry, _segment_path(date[:10]))
+        drawer['current_balance'] = drawer.get('current_balance', 0.0) + amount
+        drawer['entry_count'] = drawer.get('entry_count', 0) + 1
+        drawer['last_entry'] = date
+        save_data(drawer, CASH_DRAWER_FILE)
+    return entry
+
+def iter_entries(start_date=None, end_date=None):
+    """Drawer movements oldest first, reading only the segments for [start_date, end_date] (inclusive)"""
+    load_drawer()
+    start = str(start_date) if start_date else None
+    end = str(end_date) if end_date else None
+    for day in _segment_days():
+        if (start and day < start) or (end and day > end):
+            continue
+        yield from load_data_lines(_segment_path(day))
+
+def summarize(entries):
+    """Cash in/out, net and per-type totals for a set of drawer movements"""
+    summary = {'entries': 0, 'cash_in': 0.0, 'cash_out': 0.0, 'net': 0.0, 'by_type': {}}
+    for entry in entries:
+        amount = entry.get('amount', 0)
+        summary['entries'] += 1
+        summary['net'] += amount
+        if amount >= 0:
+            summary['cash_in'] += amount
+        else:
+            summary['cash_out'] += -amount
+        by_type = summary['by_type'].setdefault(entry.get('type', 'unknown'), {'count': 0, 'total': 0.0})
+        by_type['count'] += 1
+        by_type['total'] += amount
+    return summary
+
+def reconcile_range(start_date, end_date):
+    """Drawer summary for a date range (datetime.date or 'YYYY-MM-DD', inclusive)"""
+    return summarize(iter_entries(start_date, end_date))
+
+def reconcile_shift(shift):
+    """Drawer summary for one shift, reading only the days the shift spans.
+
+    'expected_cash' is what should be in the drawer: starting cash plus the net movement.
+    """
+    start = shift['start_time'][:10]
+    end = (shift.get('end_time') or datetime.datetime.now().strftime("%Y-%m-%d"))[:10]
+    summary = summarize(e for e in iter_entries(start, end) if e.get('shift_id') == shift['shift_id'])
+    summary['expected_cash'] = shift.get('starting_cash', 0) + summary['net']
+    return summary
+
+def verify_balance():
+    """(materialized balance, balance recomputed from every segment) - these should match"""
+    drawer = load_drawer()
+    computed = drawer.get('opening_balance', 0.0) + sum(entry.get('amount', 0) for entry in iter_entries())
+    return drawer.get('current_balance', 0.0), computed
+
+def rebuild_balance():
+    """Reset the materialized balance from the segments (after a crash between append and update)"""
+    with DATA_LOCK:
+        drawer = load_drawer()
+        entries = list(iter_entries())
+        drawer['current_balance'] = drawer.get('opening_balance', 0.0) + sum(entry.get('amount', 0) for entry in entries)
+        drawer['entry_count'] = len(entries)
+        drawer['last_entry'] = entries[-1].get('date') if entries else None
+        save_data(drawer, CASH_DRAWER_FILE)
+    return drawer
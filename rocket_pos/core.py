@@ -0,0 +1,667 @@
+"""Constants, data access, authentication and one-time bootstrap shared by every page."""
+
+import streamlit as st
+import time
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+import pytz
+
+from rocket_pos.cart import Cart
+
+# Constants
+DATA_DIR = "data"
+BACKUP_DIR = "backups"
+TEMPLATE_DIR = "templates"
+USERS_FILE = os.path.join(DATA_DIR, "users.json")
+PRODUCTS_FILE = os.path.join(DATA_DIR, "products.json")
+INVENTORY_FILE = os.path.join(DATA_DIR, "inventory.json")
+TRANSACTIONS_FILE = os.path.join(DATA_DIR, "transactions.json")
+DISCOUNTS_FILE = os.path.join(DATA_DIR, "discounts.json")
+OFFERS_FILE = os.path.join(DATA_DIR, "offers.json")
+LOYALTY_FILE = os.path.join(DATA_DIR, "loyalty.json")
+CATEGORIES_FILE = os.path.join(DATA_DIR, "categories.json")
+SETTINGS_FILE = os.path.join(DATA_DIR, "settings.json")
+SUPPLIERS_FILE = os.path.join(DATA_DIR, "suppliers.json")
+SHIFTS_FILE = os.path.join(DATA_DIR, "shifts.json")
+CASH_DRAWER_FILE = os.path.join(DATA_DIR, "cash_drawer.json")
+RETURNS_FILE = os.path.join(DATA_DIR, "returns.json")
+PURCHASE_ORDERS_FILE = os.path.join(DATA_DIR, "purchase_orders.json")
+BRANDS_FILE = os.path.join(DATA_DIR, "brands.json")
+OUTDOOR_ORDERS_FILE = os.path.join(DATA_DIR, "outdoor_orders.json")
+META_FILE = os.path.join(DATA_DIR, "meta.json")
+# Append-only logs (append_data) are .jsonl; backups carry both kinds
+DATA_FILE_SUFFIXES = ('.json', '.jsonl')
+# A restore is built in STAGING_DIR and swapped in; the old data dir passes through PREVIOUS_DIR
+STAGING_DIR = f"{DATA_DIR}.staging"
+PREVIOUS_DIR = f"{DATA_DIR}.previous"
+RESTORE_MARKER = ".restore_complete"
+# Undo log of the open data_transaction(); outside DATA_DIR so backups and restores never carry it
+UNDO_DIR = f"{DATA_DIR}.undo"
+UNDO_LOG = "undo.jsonl"
+COMMITTED_LOG = "committed.jsonl"  # the undo log renamed at commit: files still to be journaled
+
+# Held by every data file write and by multi-file operations (services), and by
+# snapshots while they read, so a backup never sees a half-written file or sale
+DATA_LOCK = threading.RLock()
+SCHEMA_VERSION = 1
+
+# Authentication functions
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def verify_user(username, password):
+    users = load_data(USERS_FILE)
+    if username in users:
+        if users[username]["password"] == hash_password(password):
+            return users[username]
+    return None
+
+def get_current_user_role():
+    if 'user_info' in st.session_state:
+        return st.session_state.user_info.get('role')
+    return None
+
+def is_admin():
+    return get_current_user_role() == 'admin'
+
+def is_manager():
+    return get_current_user_role() in ['admin', 'manager']
+
+def is_cashier():
+    return get_current_user_role() in ['admin', 'manager', 'cashier']
+
+# Data loading and saving functions
+def load_data(file):
+    try:
+        with open(file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_data(data, file):
+    with DATA_LOCK:
+        _log_before_write(file)
+        # Written aside and renamed over, so the file is never seen half-written
+        tmp_path = f"{file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, file)
+        _journal_write(file)
+
+def append_data(record, file):
+    """Append one record as a JSON line to a log-style data file (O(1), unlike save_data's rewrite)"""
+    with DATA_LOCK:
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        _log_before_write(file, append=True)
+        with open(file, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        _journal_write(file)
+
+def append_data_lines(records, file):
+    """append_data() for several records in one write"""
+    if not records:
+        return
+    with DATA_LOCK:
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        _log_before_write(file, append=True)
+        with open(file, 'a') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+        _journal_write(file)
+
+def load_data_lines(file):
+    """Records of an append_data() log, skipping a line torn by a crash"""
+    records = []
+    try:
+        with open(file, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+def _journal_write(file):
+    if _undo_files is not None:
+        return  # journaled when the data_transaction() commits, so a rolled-back write never is
+    if load_data_snapshot(SETTINGS_FILE).get('write_journal'):
+        # Imported here because rocket_pos.backups imports this module
+        from rocket_pos.backups import journal_file
+        try:
+            journal_file(file)
+        except Exception as e:
+            # The write itself succeeded; only point-in-time recovery loses this version
+            st.warning(f"Could not journal {os.path.basename(file)}: {str(e)}")
+
+def data_version(file):
+    """Cheap change marker for a data file: (mtime_ns, size), or None if it doesn't exist"""
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Caches of values derived from data files, keyed by data_version(); a restore drops them all
+_SNAPSHOT_CACHES = []
+
+def snapshot_cache(max_entries):
+    """st.cache_resource for data-derived values, registered so clear_data_snapshots() can drop them"""
+    def decorate(func):
+        cached = st.cache_resource(show_spinner=False, max_entries=max_entries)(func)
+        _SNAPSHOT_CACHES.append(cached)
+        return cached
+    return decorate
+
+def clear_data_snapshots():
+    """Forget every cached read of the data files, e.g. after the data directory is swapped out"""
+    for cached in _SNAPSHOT_CACHES:
+        cached.clear()
+
+@snapshot_cache(max_entries=64)
+def _load_data_version(file, version):
+    return load_data(file)
+
+def load_data_snapshot(file):
+    """Read-only copy of a data file shared across reruns and sessions.
+    
+    Reparsed only when data_version() changes, so render paths can call it freely.
+    Callers must not mutate the result - use load_data() for load-modify-save.
+    """
+    return _load_data_version(file, data_version(file))
+
+# Multi-file commits: the writes inside data_transaction() land together or not at all
+_undo_files = None  # files already in the open transaction's undo log, or None
+
+def _log_before_write(file, append=False):
+    """Record file's current version in the open data_transaction()'s undo log (first write only)"""
+    if _undo_files is None or file in _undo_files:
+        return
+    entry = {'file': file, 'link': None, 'size': None}
+    if os.path.exists(file):
+        if append:
+            # Appends only add to the end, so the old length is enough to undo them.
+            # (A file is either appended to or rewritten, never both in one transaction.)
+            entry['size'] = os.path.getsize(file)
+        else:
+            # save_data() renames a new file over this one, so a hard link keeps the old version
+            entry['link'] = os.path.join(UNDO_DIR, str(len(_undo_files)))
+            try:
+                os.link(file, entry['link'])
+            except OSError:
+                shutil.copy2(file, entry['link'])
+    # On disk before the file changes, so a crash after this point can always be undone
+    with open(os.path.join(UNDO_DIR, UNDO_LOG), 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    _undo_files.add(file)
+
+@contextlib.contextmanager
+def data_transaction():
+    """Make every data file write in the block one atomic unit.
+
+    If the block raises, each file it wrote is put back as it was before
+    re-raising; if the process dies first, recover_data_transaction() does the
+    same on the next start. The write journal only gets the files once the block
+    has committed. Holds DATA_LOCK throughout, and a nested block is part of the
+    enclosing one.
+    """
+    global _undo_files
+    with DATA_LOCK:
+        if _undo_files is not None:
+            yield
+            return
+
+        recover_data_transaction()
+        os.makedirs(UNDO_DIR)
+        _undo_files = set()
+        try:
+            yield
+        except BaseException:
+            _undo_files = None
+            recover_data_transaction()
+            raise
+
+        try:
+            for file in _undo_files:
+                if os.path.exists(file):
+                    _fsync_path(file)
+            written = _undo_files
+            if written:
+                # The commit point; the renamed log lists the files to journal if we die before that
+                os.replace(os.path.join(UNDO_DIR, UNDO_LOG), os.path.join(UNDO_DIR, COMMITTED_LOG))
+        finally:
+            _undo_files = None
+        _journal_committed(written)
+        shutil.rmtree(UNDO_DIR, ignore_errors=True)
+
+def _journal_committed(files):
+    for file in sorted(files):
+        if os.path.exists(file):
+            _journal_write(file)
+
+def recover_data_transaction():
+    """Undo the writes of a data_transaction() that didn't finish; returns what was done, or None"""
+    log_path = os.path.join(UNDO_DIR, UNDO_LOG)
+    if not os.path.exists(log_path):
+        committed_path = os.path.join(UNDO_DIR, COMMITTED_LOG)
+        if os.path.exists(committed_path):
+            # Committed, then died before journaling the writes
+            _journal_committed({entry['file'] for entry in load_data_lines(committed_path)})
+        if os.path.exists(UNDO_DIR):
+            shutil.rmtree(UNDO_DIR)  # committed, then died before cleaning up
+        return None
+
+    # A torn last line was never acted on: its file is written only after the line is synced
+    entries = load_data_lines(log_path)
+    for entry in reversed(entries):
+        file = entry['file']
+        if entry['link']:
+            os.replace(entry['link'], file)
+        elif entry['size'] is not None:
+            if not os.path.exists(file):
+                continue
+            with open(file, 'r+') as f:
+                f.truncate(entry['size'])
+        elif os.path.exists(file):
+            os.remove(file)  # created by the transaction
+    # Nothing to journal: the transaction's writes never reached the journal
+    shutil.rmtree(UNDO_DIR)
+    return f"rolled back an unfinished commit of {len(entries)} file(s)"
+
+# Initialize empty data files if they don't exist
+def ensure_default_user():
+    """Ensure the default admin user exists"""
+    users = load_data(USERS_FILE)
+    
+    # Check if admin user exists and has correct password
+    if "admin" not in users:
+        # Create default admin user
+        users["admin"] = {
+            "username": "admin",
+            "password": hash_password("admin123"),
+            "role": "admin",
+            "full_name": "Administrator",
+            "email": "admin@supermarket.com",
+            "active": True,
+            "date_created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "created_by": "system"
+        }
+        save_data(users, USERS_FILE)
+        print("Default admin user created")
+
+def get_default_data():
+    """Default contents for every data file, keyed by file path"""
+    return {
+        USERS_FILE: {
+            "admin": {
+                "username": "admin",
+                "password": hash_password("admin123"),
+                "role": "admin",
+                "full_name": "Administrator",
+                "email": "admin@supermarket.com",
+                "active": True,
+                "date_created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "created_by": "system"
+            }
+        },
+        PRODUCTS_FILE: {},
+        INVENTORY_FILE: {},
+        TRANSACTIONS_FILE: {},
+        DISCOUNTS_FILE: {},
+        OFFERS_FILE: {},
+        LOYALTY_FILE: {
+            "tiers": {},
+            "customers": {},
+            "rewards": {}
+        },
+        CATEGORIES_FILE: {
+            "categories": [],
+            "subcategories": {}
+        },
+        SETTINGS_FILE: {
+            "store_name": "Supermarket POS",
+            "store_address": "",
+            "store_phone": "",
+            "store_email": "",
+            "store_logo": "",
+            "tax_rate": 0.0,
+            "tax_inclusive": False,
+            "receipt_template": "Simple",
+            "theme": "Light",
+            "session_timeout": 30,
+            "printer_name": "Browser Printer",
+            "barcode_scanner": "keyboard",
+            "timezone": "UTC",
+            "currency_symbol": "$",
+            "decimal_places": 2,
+            "auto_logout": True,
+            "cash_drawer_enabled": False,
+            "cash_drawer_command": "",
+            "barcode_scanner_port": "auto",
+            "receipt_header": "",
+            "receipt_footer": "",
+            "receipt_print_logo": False
+        },
+        SUPPLIERS_FILE: {},
+        SHIFTS_FILE: {},
+        CASH_DRAWER_FILE: {
+            "current_balance": 0.0,
+            "opening_balance": 0.0,
+            "entry_count": 0,
+            "last_entry": None,
+            "ledger_version": 1
+        },
+        RETURNS_FILE: {},
+        PURCHASE_ORDERS_FILE: {},
+        BRANDS_FILE: {
+            "brands": [],
+            "brand_products": {}
+        },
+        OUTDOOR_ORDERS_FILE: {
+            "orders": {},
+            "delivery_charges": {
+                "standard": 5.0,
+                "express": 10.0,
+                "free_threshold": 50.0
+            }
+        }
+    }
+
+def initialize_empty_data():
+    """Initialize all data files with default values"""
+    # Ensure data directory exists
+    os.makedirs(DATA_DIR, exist_ok=True)
+    
+    default_data = get_default_data()
+    
+    for file, data in default_data.items():
+        if not os.path.exists(file):
+            # Create parent directories if they don't exist
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            with open(file, 'w') as f:
+                json.dump(data, f, indent=4)
+            print(f"Created {file} with default data")
+
+def _set_aside_corrupt(file):
+    """Rename a data file that isn't valid JSON to <file>.corrupt-<timestamp>; returns the new path"""
+    corrupt = f"{file}.corrupt-{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.replace(file, corrupt)
+    return corrupt
+
+def migrate_data_files():
+    """Fill in top-level keys added to the default data since the files were created.
+    
+    A file that isn't valid JSON is renamed aside (never overwritten) and
+    started afresh from its defaults; the corrupt copy is left for recovery.
+    """
+    migrated = []
+    for file, defaults in get_default_data().items():
+        try:
+            with open(file, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except json.JSONDecodeError as e:
+            print(f"Data directory: {file} is not valid JSON ({e}); moved to {_set_aside_corrupt(file)}")
+            save_data(defaults, file)
+            migrated.append(file)
+            continue
+        if file == USERS_FILE:
+            continue
+        missing = [key for key in defaults if key not in data]
+        if missing:
+            for key in missing:
+                data[key] = defaults[key]
+            save_data(data, file)
+            migrated.append(file)
+    return migrated
+
+# Atomic restore: stage a complete data directory, then swap it in
+def _fsync_path(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # directories can't be opened on Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def stage_data_dir():
+    """Start a restore: a fresh copy of DATA_DIR to overlay restored files on; returns its path"""
+    if os.path.exists(STAGING_DIR):
+        shutil.rmtree(STAGING_DIR)
+    shutil.copytree(DATA_DIR, STAGING_DIR)
+    return STAGING_DIR
+
+def swap_in_staged_data():
+    """Replace DATA_DIR with the fully built STAGING_DIR.
+    
+    The marker file commits the staged directory; after that the swap is two
+    renames, and recover_data_dir() finishes it if the process dies in between.
+    Returns where the previous data directory was archived.
+    """
+    for root, _, files in os.walk(STAGING_DIR):
+        for file in files:
+            _fsync_path(os.path.join(root, file))
+    with open(os.path.join(STAGING_DIR, RESTORE_MARKER), 'w') as f:
+        f.write(datetime.datetime.now().isoformat())
+        f.flush()
+        os.fsync(f.fileno())
+    _fsync_path(STAGING_DIR)
+    return _finish_swap()
+
+def _finish_swap():
+    if os.path.exists(DATA_DIR):
+        if os.path.exists(PREVIOUS_DIR):
+            # Left over from an earlier restore - DATA_DIR is the newer of the two
+            _archive_previous_data()
+        os.rename(DATA_DIR, PREVIOUS_DIR)
+    os.rename(STAGING_DIR, DATA_DIR)
+    _fsync_path(os.path.dirname(os.path.abspath(DATA_DIR)))
+    os.remove(os.path.join(DATA_DIR, RESTORE_MARKER))
+    return _archive_previous_data()
+
+def _archive_previous_data():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    archive_dir = os.path.join(BACKUP_DIR, "pre_restore_backup", timestamp)
+    os.makedirs(os.path.dirname(archive_dir), exist_ok=True)
+    shutil.move(PREVIOUS_DIR, archive_dir)
+    return archive_dir
+
+def recover_data_dir():
+    """Finish or discard a restore that was interrupted; returns what was done, or None"""
+    if os.path.exists(os.path.join(STAGING_DIR, RESTORE_MARKER)):
+        _finish_swap()
+        return "completed an interrupted restore"
+    
+    action = None
+    if os.path.exists(STAGING_DIR):
+        # Never committed - the live data was not touched
+        shutil.rmtree(STAGING_DIR)
+        action = "discarded an incomplete restore"
+    if not os.path.exists(DATA_DIR) and os.path.exists(PREVIOUS_DIR):
+        os.rename(PREVIOUS_DIR, DATA_DIR)
+        action = "rolled back an interrupted restore"
+    if os.path.exists(os.path.join(DATA_DIR, RESTORE_MARKER)):
+        os.remove(os.path.join(DATA_DIR, RESTORE_MARKER))
+    if os.path.exists(PREVIOUS_DIR):
+        _archive_previous_data()
+    return action
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_data_store():
+    """One-time, per-process setup of the data directory.
+    
+    Cached with st.cache_resource so it runs once per server start instead of
+    on every rerun; main() only performs a cheap schema version check.
+    """
+    # Before anything can create an empty data dir in place of a half-swapped one
+    recovered = recover_data_dir()
+    if recovered:
+        print(f"Data directory: {recovered}")
+    recovered = recover_data_transaction()
+    if recovered:
+        print(f"Data directory: {recovered}")
+    
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    os.makedirs(TEMPLATE_DIR, exist_ok=True)
+    
+    initialize_empty_data()
+    migrated = migrate_data_files()
+    ensure_default_user()
+    initialize_loyalty_settings()
+    
+    # Move returns to their log, backfill the stock log (which slims inventory.json) before anything loads
+    # inventory to save back, and move cost layers and COGS totals from older layouts before the first sale writes them.
+    # Imported here because these modules import this one
+    from rocket_pos.costing import ensure_cogs_aggregates, ensure_cost_layers
+    from rocket_pos.returns_log import ensure_returns_log
+    from rocket_pos.stock_ledger import ensure_stock_ledger
+    ensure_returns_log()
+    ensure_stock_ledger()
+    ensure_cost_layers()
+    ensure_cogs_aggregates()
+    
+    meta = load_data(META_FILE)
+    if meta.get('schema_version') != SCHEMA_VERSION or migrated:
+        meta['previous_schema_version'] = meta.get('schema_version')
+        meta['schema_version'] = SCHEMA_VERSION
+        meta['migrated_at'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        meta['migrated_files'] = [os.path.basename(f) for f in migrated]
+        save_data(meta, META_FILE)
+    
+    # Parse the files every page reads into the shared snapshot cache ahead of the first page load
+    for file in (SETTINGS_FILE, PRODUCTS_FILE, INVENTORY_FILE):
+        load_data_snapshot(file)
+    from rocket_pos.transaction_index import ensure_transaction_index
+    ensure_transaction_index()  # and build the receipt index ahead of the first return
+    
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'meta_mtime': os.path.getmtime(META_FILE),
+        'bootstrapped_at': time.time()
+    }
+
+@st.cache_resource(show_spinner=False)
+def backup_scheduler():
+    """The background backup scheduler, started once per server process"""
+    # Imported here because rocket_pos.backups imports this module
+    from rocket_pos.backups import BackupScheduler, migrate_legacy_log
+    migrate_legacy_log(os.path.join(DATA_DIR, "backup_logs.json"))
+    scheduler = BackupScheduler(DATA_LOCK)
+    scheduler.start()
+    return scheduler
+
+def ensure_data_store():
+    """Per-rerun check that the bootstrapped data directory is still current"""
+    state = bootstrap_data_store()
+    try:
+        meta_mtime = os.path.getmtime(META_FILE)
+    except OSError:
+        meta_mtime = None
+    
+    if meta_mtime != state['meta_mtime']:
+        # meta.json changed on disk (e.g. a restore) - only re-bootstrap if the version differs
+        if load_data(META_FILE).get('schema_version') != SCHEMA_VERSION:
+            bootstrap_data_store.clear()
+            state = bootstrap_data_store()
+        else:
+            state['meta_mtime'] = meta_mtime
+    return state
+
+# Utility functions
+def generate_barcode():
+    return str(uuid.uuid4().int)[:12]
+
+def generate_short_id():
+    return str(uuid.uuid4())[:8]
+
+def format_currency(amount):
+    settings = load_data_snapshot(SETTINGS_FILE)
+    symbol = settings.get('currency_symbol', '$')
+    decimals = settings.get('decimal_places', 2)
+    return f"{symbol}{amount:.{decimals}f}"
+
+def get_current_datetime():
+    settings = load_data_snapshot(SETTINGS_FILE)
+    tz = pytz.timezone(settings.get('timezone', 'UTC'))
+    return datetime.datetime.now(tz)
+
+# Session state initialization
+def init_session_state():
+    """Seed per-session defaults; cheap enough to call on every rerun"""
+    defaults = {
+        'user_info': None,
+        'cart': Cart(),
+        'current_page': "Login",
+        'shift_started': False,
+        'shift_id': None,
+        'last_activity': time.time(),
+        'barcode_scanner_setup': False,
+        'scanned_barcode': None,
+        'scanner_status': "Not Connected",
+        'pos_mode': 'scan',
+        'selected_category': None,
+        'selected_subcategory': None,
+        'return_reason': "",
+        'po_supplier': None,
+        'po_items': [],
+        'outdoor_cart': {},
+        'selected_brand': None
+    }
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+# Add this function to initialize loyalty settings if they don't exist
+def initialize_loyalty_settings():
+    loyalty_data = load_data(LOYALTY_FILE)
+    if 'settings' in loyalty_data and 'tiers' in loyalty_data:
+        return
+    
+    if 'settings' not in loyalty_data:
+        loyalty_data['settings'] = {
+            'points_per_dollar': 1,  # 1 point per $1 spent
+            'points_value': 0.01,    # 1 point = $0.01
+            'signup_bonus': 100,     # 100 points for signing up
+            'min_redemption': 100,   # Minimum 100 points to redeem
+            'points_expiry_days': 365  # Points expire after 1 year
+        }
+    
+    if 'tiers' not in loyalty_data:
+        loyalty_data['tiers'] = {
+            'Bronze': {
+                'min_points': 0,
+                'discount': 0.0,
+                'benefits': ['Basic rewards']
+            },
+            'Silver': {
+                'min_points': 1000,
+                'discount': 0.05,  # 5% discount
+                'benefits': ['5% discount', 'Early access to sales']
+            },
+            'Gold': {
+                'min_points': 5000,
+                'discount': 0.10,  # 10% discount
+                'benefits': ['10% discount', 'Free delivery', 'Birthday rewards']
+            },
+            'Platinum': {
+                'min_points': 10000,
+                'discount': 0.15,  # 15% discount
+                'benefits': ['15% discount', 'Personal shopper', 'VIP events']
+            }
+        }
+    
+    save_data(loyalty_data, LOYALTY_FILE)
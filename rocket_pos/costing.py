@@ -0,0 +1,303 @@
+"""Inventory cost layers and incrementally maintained COGS aggregates.
+
+Stock comes in as cost layers (PO receipts, returns) and goes out through them
+(sales, deliveries, exchanges), FIFO or weighted-average per the 'cost_method'
+setting. The cost each sold line consumed is stamped on the line as 'unit_cost',
+and revenue/COGS are added to per-day totals (with product and category
+breakdowns) in data/cogs_daily/<YYYY-MM-DD>.json, so a P&L for any period reads
+its day files instead of re-walking every transaction at today's product cost.
+
+Layers are spread over BUCKETS files in data/cost_layers/ by a hash of the
+barcode, so a sale rewrites the buckets of the products it sold and that day's
+totals, not every product's layers and the whole month.
+"""
+
+import datetime
+import os
+import shutil
+import zlib
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    PRODUCTS_FILE,
+    TRANSACTIONS_FILE,
+    SETTINGS_FILE,
+    load_data,
+    save_data,
+)
+from rocket_pos.returns_log import load_returns
+
+COST_LAYERS_DIR = os.path.join(DATA_DIR, "cost_layers")
+COGS_DIR = os.path.join(DATA_DIR, "cogs_daily")
+# Earlier layouts: every product's layers in one file, and one aggregates file per month
+LEGACY_COST_LAYERS_FILE = os.path.join(DATA_DIR, "cost_layers.json")
+LEGACY_COGS_DIR = os.path.join(DATA_DIR, "cogs")
+BUCKETS = 64
+COST_METHODS = {"fifo": "FIFO (first in, first out)", "average": "Weighted average"}
+
+def cost_method():
+    method = load_data(SETTINGS_FILE).get('cost_method', 'fifo')
+    return method if method in COST_METHODS else 'fifo'
+
+# Cost layers: {barcode: [{'quantity', 'unit_cost', 'date', 'source'}, ...]} oldest first.
+# Under 'average' a product keeps a single layer holding the weighted-average cost.
+def _bucket_path(barcode, layers_dir=COST_LAYERS_DIR):
+    return os.path.join(layers_dir, f"{zlib.crc32(barcode.encode()) % BUCKETS:02d}.json")
+
+def ensure_cost_layers():
+    """Split a cost_layers.json from before the buckets into them (built aside and swapped in)"""
+    if os.path.isdir(COST_LAYERS_DIR) or not os.path.exists(LEGACY_COST_LAYERS_FILE):
+        return
+    with DATA_LOCK:
+        build_dir = f"{COST_LAYERS_DIR}.rebuild"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+        buckets = {}
+        for barcode, product_layers in load_data(LEGACY_COST_LAYERS_FILE).items():
+            buckets.setdefault(_bucket_path(barcode, build_dir), {})[barcode] = product_layers
+        for path, bucket in buckets.items():
+            save_data(bucket, path)
+        os.replace(build_dir, COST_LAYERS_DIR)
+        os.remove(LEGACY_COST_LAYERS_FILE)
+
+def load_cost_layers(barcodes=None):
+    """Layers of the buckets holding barcodes (every product's when None)"""
+    ensure_cost_layers()
+    if barcodes is None:
+        names = os.listdir(COST_LAYERS_DIR) if os.path.isdir(COST_LAYERS_DIR) else []
+        paths = [os.path.join(COST_LAYERS_DIR, name) for name in names]
+    else:
+        paths = {_bucket_path(barcode) for barcode in barcodes}
+    layers = {}
+    for path in paths:
+        layers.update(load_data(path))
+    return layers
+
+def save_cost_layers(layers):
+    """Write back layers from load_cost_layers(): only the buckets they hold are rewritten"""
+    buckets = {}
+    for barcode, product_layers in layers.items():
+        buckets.setdefault(_bucket_path(barcode), {})[barcode] = product_layers
+    os.makedirs(COST_LAYERS_DIR, exist_ok=True)
+    for path, bucket in buckets.items():
+        save_data(bucket, path)
+
+def _product_layers(layers, barcode, on_hand, fallback_cost):
+    """A product's layers, opened from its current stock at catalogue cost the first time it's seen"""
+    if barcode not in layers:
+        layers[barcode] = []
+        if on_hand > 0:
+            layers[barcode].append({'quantity': on_hand, 'unit_cost': fallback_cost, 'date': None, 'source': 'opening'})
+    return layers[barcode]
+
+def _average(product_layers, date, source):
+    quantity = sum(layer['quantity'] for layer in product_layers)
+    if quantity <= 0:
+        return product_layers
+    value = sum(layer['quantity'] * layer['unit_cost'] for layer in product_layers)
+    return [{'quantity': quantity, 'unit_cost': value / quantity, 'date': date, 'source': source}]
+
+def add_layer(layers, barcode, quantity, unit_cost, on_hand, fallback_cost, date, source, method, oldest=False):
+    """Put stock in at unit_cost (oldest=True for returns, which go back in front of newer receipts)"""
+    product_layers = _product_layers(layers, barcode, on_hand, fallback_cost)
+    layer = {'quantity': quantity, 'unit_cost': unit_cost, 'date': date, 'source': source}
+    if oldest:
+        product_layers.insert(0, layer)
+    else:
+        product_layers.append(layer)
+    if method == 'average':
+        layers[barcode] = _average(product_layers, date, source)
+
+def consume(layers, barcode, quantity, on_hand, fallback_cost):
+    """Take quantity out of the oldest layers; returns its total cost.
+
+    Stock the layers don't know about (manual inventory edits) is costed at the
+    last layer's cost, or the catalogue cost if there are no layers left.
+    """
+    product_layers = _product_layers(layers, barcode, on_hand, fallback_cost)
+    remaining = quantity
+    total_cost = 0.0
+    last_cost = fallback_cost
+    while remaining > 0 and product_layers:
+        layer = product_layers[0]
+        last_cost = layer['unit_cost']
+        taken = min(remaining, layer['quantity'])
+        total_cost += taken * layer['unit_cost']
+        remaining -= taken
+        layer['quantity'] -= taken
+        if layer['quantity'] <= 0:
+            product_layers.pop(0)
+    return total_cost + remaining * last_cost
+
+def stock_value(layers):
+    """{barcode: (quantity, value)} of the stock held in cost layers"""
+    return {
+        barcode: (sum(layer['quantity'] for layer in product_layers),
+                  sum(layer['quantity'] * layer['unit_cost'] for layer in product_layers))
+        for barcode, product_layers in layers.items()
+    }
+
+# Operations called by services inside their data_transaction(), before inventory quantities change
+def cost_sale_lines(items, inventory, products, date):
+    """Consume stock for sold lines and stamp each with 'unit_cost'; books them as sales"""
+    layers = load_cost_layers(items)
+    for barcode, item in items.items():
+        product = products.get(barcode, {})
+        on_hand = inventory.get(barcode, {}).get('quantity', 0)
+        total_cost = consume(layers, barcode, item['quantity'], on_hand, product.get('cost', 0))
+        item['unit_cost'] = total_cost / item['quantity'] if item['quantity'] else product.get('cost', 0)
+    save_cost_layers(layers)
+    record_lines(date, 'sale', items, products)
+
+def cost_receipt(received_items, inventory, products, date, source):
+    """Add a layer per received PO line at its PO cost"""
+    method = cost_method()
+    layers = load_cost_layers(item['barcode'] for item in received_items)
+    for item in received_items:
+        if item['received_quantity'] <= 0:
+            continue
+        barcode = item['barcode']
+        fallback_cost = products.get(barcode, {}).get('cost', 0)
+        on_hand = inventory.get(barcode, {}).get('quantity', 0)
+        add_layer(layers, barcode, item['received_quantity'], item.get('cost', fallback_cost),
+                  on_hand, fallback_cost, date, source, method)
+    save_cost_layers(layers)
+
+def cost_return(items, exchange_items, inventory, products, date, source):
+    """Restock returned lines at the cost they were sold at, and cost any exchange lines.
+
+    items carry the original line's 'unit_cost'; exchange_items are stamped like sales.
+    """
+    method = cost_method()
+    layers = load_cost_layers(list(items) + [item['barcode'] for item in exchange_items.values()])
+    for barcode, item in items.items():
+        fallback_cost = products.get(barcode, {}).get('cost', 0)
+        item.setdefault('unit_cost', fallback_cost)
+        on_hand = inventory.get(barcode, {}).get('quantity', 0)
+        add_layer(layers, barcode, item['quantity'], item['unit_cost'], on_hand, fallback_cost,
+                  date, source, method, oldest=True)
+    for item in exchange_items.values():
+        barcode = item['barcode']
+        fallback_cost = products.get(barcode, {}).get('cost', 0)
+        on_hand = inventory.get(barcode, {}).get('quantity', 0)
+        total_cost = consume(layers, barcode, item['quantity'], on_hand, fallback_cost)
+        item['unit_cost'] = total_cost / item['quantity'] if item['quantity'] else fallback_cost
+    save_cost_layers(layers)
+    record_lines(date, 'return', items, products)
+    record_lines(date, 'sale', exchange_items, products)
+
+# COGS aggregates: one file per day, holding the day's totals broken down by product
+# and category. Sales and returns are kept apart, as the P&L shows both.
+AGGREGATE_FIELDS = ('revenue', 'cogs', 'quantity', 'returns_revenue', 'returns_cogs', 'returns_quantity')
+
+def _empty_totals():
+    return {field: 0 for field in AGGREGATE_FIELDS}
+
+def _empty_day():
+    return dict(_empty_totals(), products={}, categories={})
+
+def _day_path(day, cogs_dir=COGS_DIR):
+    return os.path.join(cogs_dir, f"{day}.json")
+
+def _add_lines(day, kind, items, products):
+    prefix = 'returns_' if kind == 'return' else ''
+    for barcode, item in items.items():
+        product = products.get(barcode, {})
+        quantity = item.get('quantity', 0)
+        revenue = quantity * item.get('price', 0)
+        cogs = quantity * item.get('unit_cost', product.get('cost', 0))
+        product_totals = day['products'].setdefault(barcode, dict(_empty_totals(), name=item.get('name', product.get('name', 'Unknown'))))
+        category_totals = day['categories'].setdefault(product.get('category', 'Uncategorized'), _empty_totals())
+        for totals in (day, product_totals, category_totals):
+            totals[f'{prefix}revenue'] += revenue
+            totals[f'{prefix}cogs'] += cogs
+            totals[f'{prefix}quantity'] += quantity
+
+def record_lines(date, kind, items, products):
+    """Add sold ('sale') or returned ('return') lines to the day's aggregates"""
+    if not items:
+        return
+    with DATA_LOCK:
+        ensure_cogs_aggregates()
+        path = _day_path(date[:10])
+        day = load_data(path) or _empty_day()
+        _add_lines(day, kind, items, products)
+        save_data(day, path)
+
+def _exchange_lines(return_record):
+    return {item['barcode']: item for item in return_record.get('exchange_products', [])}
+
+def rebuild_cogs_aggregates():
+    """Recompute every day file from transactions and returns.
+
+    Lines sold before cost layers existed have no 'unit_cost' and are costed at
+    the product's current cost, as the old report did. Built aside and swapped in.
+    """
+    with DATA_LOCK:
+        products = load_data(PRODUCTS_FILE)
+        days = {}
+        for transaction in load_data(TRANSACTIONS_FILE).values():
+            date = transaction.get('date', '')
+            if len(date) >= 10:
+                _add_lines(days.setdefault(date[:10], _empty_day()), 'sale', transaction.get('items', {}), products)
+        for return_record in load_returns().values():
+            date = return_record.get('return_date', '')
+            if len(date) >= 10:
+                day = days.setdefault(date[:10], _empty_day())
+                _add_lines(day, 'return', return_record.get('items', {}), products)
+                _add_lines(day, 'sale', _exchange_lines(return_record), products)
+
+        build_dir = f"{COGS_DIR}.rebuild"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+        for day, totals in days.items():
+            save_data(totals, _day_path(day, build_dir))
+        shutil.rmtree(COGS_DIR, ignore_errors=True)
+        os.replace(build_dir, COGS_DIR)
+        shutil.rmtree(LEGACY_COGS_DIR, ignore_errors=True)
+
+def ensure_cogs_aggregates():
+    """Build the aggregates from history the first time they're needed"""
+    if not os.path.isdir(COGS_DIR):
+        rebuild_cogs_aggregates()
+
+def cogs_day_files(start_date, end_date):
+    """{'YYYY-MM-DD': path} of the day files in [start_date, end_date] (days without sales have none)"""
+    ensure_cogs_aggregates()
+    start, end = str(start_date), str(end_date)
+    days = sorted(name[:-len('.json')] for name in os.listdir(COGS_DIR) if name.endswith('.json'))
+    return {day: _day_path(day) for day in days if start <= day <= end}
+
+def cogs_summary(start_date, end_date):
+    """Revenue, COGS and returns for [start_date, end_date], read from the day aggregates.
+
+    Returns the period totals plus 'products', 'categories' (sales only, as before)
+    and 'daily' ({date: {'revenue', 'cogs', 'profit'}} net of returns).
+    """
+    summary = dict(_empty_totals(), products={}, categories={}, daily={})
+    current = start_date
+    while current <= end_date:
+        summary['daily'][current] = {'revenue': 0, 'cogs': 0, 'profit': 0}
+        current += datetime.timedelta(days=1)
+
+    for day, path in cogs_day_files(start_date, end_date).items():
+        totals = load_data(path)
+        for field in AGGREGATE_FIELDS:
+            summary[field] += totals[field]
+        for barcode, product_totals in totals['products'].items():
+            merged = summary['products'].setdefault(barcode, dict(_empty_totals(), name=product_totals['name']))
+            for field in AGGREGATE_FIELDS:
+                merged[field] += product_totals[field]
+        for category, category_totals in totals['categories'].items():
+            merged = summary['categories'].setdefault(category, _empty_totals())
+            for field in AGGREGATE_FIELDS:
+                merged[field] += category_totals[field]
+        revenue = totals['revenue'] - totals['returns_revenue']
+        cogs = totals['cogs'] - totals['returns_cogs']
+        summary['daily'][datetime.date.fromisoformat(day)] = {'revenue': revenue, 'cogs': cogs, 'profit': revenue - cogs}
+
+    # Only products/categories that sold in the period, as the report always showed
+    summary['products'] = {k: v for k, v in summary['products'].items() if v['quantity']}
+    summary['categories'] = {k: v for k, v in summary['categories'].items() if v['quantity']}
+    return summary
@@ -0,0 +1,192 @@
+"""Customer analytics: RFM scores, lifetime value and churn risk per loyalty customer.
+
+Every customer is scored in one vectorised pass over the sales history
+(sales_history.py): recency (days since their last purchase), frequency
+(purchases), monetary value (spend net of refunds), tenure, average basket and
+units, their typical days between purchases, and from those a churn risk (how
+overdue their next visit is) and an expected spend over the next CLV_HORIZON_DAYS.
+Recency, frequency and monetary value are scored 1-5 by quintile among the
+customers who have bought, and the scores place each customer in a segment.
+Results are cached per version of the files they read.
+
+The same pass recounts total_spent and visit_count, the lifetime counters
+record_purchase() keeps on each account; rebuild_lifetime_counters() writes
+them back where they have drifted.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from rocket_pos.core import LOYALTY_FILE, TRANSACTIONS_FILE, data_version, load_data_snapshot, snapshot_cache
+from rocket_pos.points_ledger import rebuild_counters
+from rocket_pos.returns_log import load_returns, returns_version
+from rocket_pos.sales_history import sales_frames
+
+CLV_HORIZON_DAYS = 365
+DEFAULT_PURCHASE_INTERVAL = 30
+# Checked in order; a customer lands in the first segment whose rule matches
+SEGMENTS = [
+    ("New", "One purchase, made recently"),
+    ("Champions", "Bought recently, buy often and spend the most"),
+    ("Loyal", "Regular customers with good spend"),
+    ("Promising", "Recent customers with modest spend"),
+    ("At Risk", "Used to buy often or spend well, not seen lately"),
+    ("Hibernating", "Few, small and old purchases"),
+    ("No Purchases", "Enrolled but never bought"),
+]
+
+@snapshot_cache(max_entries=2)
+def _refunds(version):
+    """Refunded amount per transaction id"""
+    refunds = {}
+    for return_record in load_returns().values():
+        transaction_id = return_record.get('transaction_id')
+        if transaction_id:
+            refunds[transaction_id] = refunds.get(transaction_id, 0) + return_record.get('total_refund', 0)
+    return pd.Series(refunds, dtype=float)
+
+def _customer_sales():
+    """Sales that belong to a customer, with 'refund' joined on"""
+    sales, _ = sales_frames()
+    sales = sales[(sales['customer_id'] != '') & sales['date'].notna()]
+    refunds = _refunds(returns_version())
+    return sales.assign(refund=sales['transaction_id'].map(refunds).fillna(0.0).to_numpy())
+
+def _quintile_scores(values, ascending=True):
+    """1-5 by quintile of rank (5 = highest values, or lowest when not ascending)"""
+    ranks = values.rank(method='average', pct=True, ascending=ascending)
+    return np.ceil(ranks * 5).clip(1, 5).astype(int)
+
+def _build_analytics(today):
+    sales = _customer_sales()
+    per_customer = sales.groupby('customer_id').agg(
+        first_purchase=('date', 'min'),
+        last_purchase=('date', 'max'),
+        frequency=('total', 'size'),
+        lifetime_spent=('total', 'sum'),
+        refunds=('refund', 'sum'),
+        discounts=('discount', 'sum'),
+        units=('units', 'sum'),
+    )
+
+    profiles = load_data_snapshot(LOYALTY_FILE).get('customers', {})
+    customers = pd.DataFrame({
+        'name': [profile.get('name', '') for profile in profiles.values()],
+        'phone': [profile.get('phone', '') for profile in profiles.values()],
+        'email': [profile.get('email', '') for profile in profiles.values()],
+        'date_joined': [profile.get('date_joined') for profile in profiles.values()],
+    }, index=pd.Index(list(profiles), dtype=object))
+    customers.index.name = 'customer_id'
+    # Sales of deleted customers are dropped: there is no one left to target
+    analytics = customers.join(per_customer, how='left')
+    analytics['frequency'] = analytics['frequency'].fillna(0).astype(int)
+    analytics[['lifetime_spent', 'refunds', 'discounts', 'units']] = \
+        analytics[['lifetime_spent', 'refunds', 'discounts', 'units']].fillna(0.0)
+
+    today = pd.Timestamp(today)
+    # object, not float64, when there are no customers - .str needs it
+    joined = pd.to_datetime(analytics['date_joined'].astype(object).str[:10], format="%Y-%m-%d", errors='coerce')
+    started = pd.concat([joined, analytics['first_purchase'].dt.normalize()], axis=1).min(axis=1)
+    bought = analytics['frequency'] > 0
+
+    analytics['monetary'] = analytics['lifetime_spent'] - analytics['refunds']
+    analytics['recency_days'] = (today - analytics['last_purchase'].dt.normalize()).dt.days.where(bought)
+    analytics['tenure_days'] = (today - started).dt.days.fillna(0).clip(lower=0).astype(int)
+    purchases = analytics['frequency'].where(bought)
+    analytics['avg_basket'] = (analytics['monetary'] / purchases).fillna(0.0)
+    analytics['avg_units'] = (analytics['units'] / purchases).fillna(0.0)
+
+    # Typical days between purchases; one-time buyers get the store-wide median
+    span_days = (analytics['last_purchase'] - analytics['first_purchase']).dt.total_seconds() / 86400
+    interval = (span_days / (analytics['frequency'] - 1)).where(analytics['frequency'] > 1)
+    typical = interval[interval > 0].median()
+    typical = typical if pd.notna(typical) else DEFAULT_PURCHASE_INTERVAL
+    analytics['purchase_interval'] = interval.where(interval > 0, typical).where(bought)
+
+    # If the customer kept buying at their usual rate, the chance they'd have been back by now
+    analytics['churn_risk'] = (1 - np.exp(-analytics['recency_days'] / analytics['purchase_interval'])).fillna(1.0)
+    expected_visits = CLV_HORIZON_DAYS / analytics['purchase_interval']
+    analytics['clv'] = (analytics['avg_basket'].clip(lower=0) * expected_visits
+                        * (1 - analytics['churn_risk'])).fillna(0.0)
+
+    # RFM quintiles among customers who have bought (recent = high R)
+    scores = analytics.loc[bought]
+    analytics['r_score'] = _quintile_scores(scores['recency_days'], ascending=False)
+    analytics['f_score'] = _quintile_scores(scores['frequency'])
+    analytics['m_score'] = _quintile_scores(scores['monetary'])
+    analytics[['r_score', 'f_score', 'm_score']] = analytics[['r_score', 'f_score', 'm_score']].fillna(0).astype(int)
+    analytics['rfm'] = (analytics['r_score'] * 100 + analytics['f_score'] * 10
+                        + analytics['m_score']).astype(str).where(bought, '')
+
+    recency, value = analytics['r_score'], np.round((analytics['f_score'] + analytics['m_score']) / 2)
+    rules = [
+        bought & (recency >= 4) & (analytics['frequency'] == 1),
+        bought & (recency >= 4) & (value >= 4),
+        bought & (recency >= 3) & (value >= 3),
+        bought & (recency >= 3),
+        bought & (value >= 3),
+        bought,
+    ]
+    analytics['segment'] = np.select(rules, [name for name, _ in SEGMENTS[:-1]], default=SEGMENTS[-1][0])
+
+    analytics['first_purchase'] = analytics['first_purchase'].dt.strftime("%Y-%m-%d")
+    analytics['last_purchase'] = analytics['last_purchase'].dt.strftime("%Y-%m-%d")
+    analytics['churn_risk'] = analytics['churn_risk'].round(3)
+    for column in ('monetary', 'avg_basket', 'avg_units', 'purchase_interval', 'clv'):
+        analytics[column] = analytics[column].round(2)
+    return analytics.drop(columns=['units'])
+
+@snapshot_cache(max_entries=4)
+def _cached_analytics(versions, today):
+    return _build_analytics(today)
+
+def customer_analytics():
+    """One row per loyalty customer (indexed by customer_id) as of today.
+
+    Columns: name, phone, email, date_joined, first_purchase, last_purchase,
+    frequency, lifetime_spent (gross, as counted by total_spent), refunds,
+    discounts, monetary (net of refunds), recency_days, tenure_days,
+    avg_basket, avg_units, purchase_interval, churn_risk (0-1), clv,
+    r_score/f_score/m_score (1-5, 0 without purchases), rfm and segment.
+    Cached until sales, returns or customers change; callers must not mutate it.
+    """
+    versions = (data_version(TRANSACTIONS_FILE), returns_version(), data_version(LOYALTY_FILE))
+    return _cached_analytics(versions, datetime.date.today())
+
+def customer_spend(start_date, end_date):
+    """Per-customer transactions, total_spent, discounts_received and last_purchase for sales in a date range"""
+    sales = _customer_sales()
+    in_range = sales[(sales['date'] >= pd.Timestamp(start_date))
+                     & (sales['date'] < pd.Timestamp(end_date) + pd.Timedelta(days=1))]
+    spend = in_range.groupby('customer_id').agg(
+        transactions=('total', 'size'),
+        total_spent=('total', 'sum'),
+        discounts_received=('discount', 'sum'),
+        last_purchase=('date', 'max'),
+    )
+    spend['last_purchase'] = spend['last_purchase'].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return spend
+
+@snapshot_cache(max_entries=2)
+def _lifetime_counters(version):
+    sales, _ = sales_frames()
+    counted = sales[sales['customer_id'] != ''].groupby('customer_id')['total'].agg(['sum', 'size'])
+    return {customer_id: (round(spent, 2), int(visits))
+            for customer_id, spent, visits in zip(counted.index, counted['sum'], counted['size'])}
+
+def lifetime_counters():
+    """{customer_id: (total_spent, visit_count)} recounted from every saved sale"""
+    return _lifetime_counters(data_version(TRANSACTIONS_FILE))
+
+def rebuild_lifetime_counters():
+    """Recount every customer's total_spent and visit_count from the sales; returns how many were corrected"""
+    return rebuild_counters(lifetime_counters)
+
+def segment_export(analytics, segments):
+    """CSV of the customers in the given segments, for campaign tools"""
+    columns = ['name', 'phone', 'email', 'segment', 'rfm', 'recency_days', 'frequency', 'monetary',
+               'avg_basket', 'churn_risk', 'clv', 'last_purchase']
+    chosen = analytics[analytics['segment'].isin(segments)].sort_values('clv', ascending=False)
+    return chosen[columns].to_csv(index_label='customer_id')
@@ -0,0 +1,81 @@
+"""Which discounts apply to a cart: date windows, categories and products.
+
+A discount is live from its start_date to its end_date (inclusive) and covers
+all products, specific categories or specific products ('apply_to'). The
+active discounts are compiled once per version of discounts.json and
+products.json into a DiscountIndex. Category scopes are expanded to barcodes
+there, so finding the discounts for a cart line is one dict lookup, and a cart
+is evaluated in O(lines). Results are cached per cart signature: the set of
+barcodes in the cart, the day, and the versions the index was compiled from.
+Quantities don't change which discounts apply, so they aren't part of the key.
+"""
+
+from rocket_pos.core import (DISCOUNTS_FILE, PRODUCTS_FILE, data_version, get_current_datetime, load_data_snapshot,
+                            snapshot_cache)
+
+ALL_PRODUCTS = "All Products"
+SPECIFIC_CATEGORIES = "Specific Categories"
+SPECIFIC_PRODUCTS = "Specific Products"
+
+class DiscountIndex:
+    """Active discounts keyed for per-line lookups"""
+
+    def __init__(self, discounts, products):
+        self.discounts = {}
+        self.storewide = []
+        self.by_barcode = {}
+        category_barcodes = {}
+        for barcode, product in products.items():
+            category_barcodes.setdefault(product.get('category'), []).append(barcode)
+
+        for discount_id, discount in discounts.items():
+            if not discount.get('active'):
+                continue
+            self.discounts[discount_id] = discount
+            scope = discount.get('apply_to', ALL_PRODUCTS)
+            if scope == SPECIFIC_PRODUCTS:
+                barcodes = discount.get('products', [])
+            elif scope == SPECIFIC_CATEGORIES:
+                barcodes = [barcode for category in discount.get('categories', [])
+                            for barcode in category_barcodes.get(category, [])]
+            else:
+                self.storewide.append(discount_id)
+                continue
+            for barcode in dict.fromkeys(barcodes):
+                self.by_barcode.setdefault(barcode, []).append(discount_id)
+
+    def is_live(self, discount_id, day):
+        """Whether the discount's date window (YYYY-MM-DD, inclusive; missing = open) covers day"""
+        discount = self.discounts[discount_id]
+        return (discount.get('start_date') or day) <= day <= (discount.get('end_date') or day)
+
+    def applicable(self, barcodes, day):
+        """{discount_id: eligible barcodes, or None for the whole cart} for a cart holding barcodes on day"""
+        if not barcodes:
+            return {}
+        applicable = {discount_id: None for discount_id in self.storewide if self.is_live(discount_id, day)}
+        for barcode in barcodes:
+            for discount_id in self.by_barcode.get(barcode, ()):
+                if self.is_live(discount_id, day):
+                    applicable.setdefault(discount_id, []).append(barcode)
+        return applicable
+
+@snapshot_cache(max_entries=2)
+def _discount_index(versions):
+    return DiscountIndex(load_data_snapshot(DISCOUNTS_FILE), load_data_snapshot(PRODUCTS_FILE))
+
+@snapshot_cache(max_entries=256)
+def _cart_discounts(versions, day, barcodes):
+    index = _discount_index(versions)
+    return {discount_id: (index.discounts[discount_id], tuple(lines) if lines is not None else None)
+            for discount_id, lines in index.applicable(barcodes, day).items()}
+
+def applicable_discounts(barcodes, day=None):
+    """{discount_id: (discount, eligible barcodes or None for the whole cart)} for the barcodes in a cart.
+
+    day defaults to today. Cached per cart signature; callers must not mutate
+    the result.
+    """
+    versions = (data_version(DISCOUNTS_FILE), data_version(PRODUCTS_FILE))
+    day = day or get_current_datetime().strftime("%Y-%m-%d")
+    return _cart_discounts(versions, day, tuple(sorted(barcodes)))
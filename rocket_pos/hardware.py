@@ -0,0 +1,342 @@
+"""Receipt printer, cash drawer and barcode scanner integration."""
+
+import streamlit as st
+import collections
+import time
+import os
+import subprocess
+import threading
+import platform
+import serial
+import serial.tools.list_ports
+
+from rocket_pos.core import SETTINGS_FILE, load_data
+
+# Hardware functions
+def get_available_printers():
+    printers = []
+    try:
+        if platform.system() == "Windows":
+            try:
+                result = subprocess.run(['wmic', 'printer', 'get', 'name'], capture_output=True, text=True)
+                if result.returncode == 0:
+                    printers = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+            except:
+                pass
+        else:
+            try:
+                result = subprocess.run(['lpstat', '-a'], capture_output=True, text=True)
+                if result.returncode == 0:
+                    printers = [line.split()[0] for line in result.stdout.splitlines()]
+            except:
+                pass
+    except:
+        printers = ["No printers found"]
+    return printers if printers else ["No printers found"]
+
+def get_available_com_ports():
+    ports = serial.tools.list_ports.comports()
+    return [port.device for port in ports] + ["auto"]
+
+def print_receipt(receipt_text, barcode_value=None):
+    """Print a receipt; barcode_value (a transaction ID) adds the barcodes set in 'receipt_barcode'"""
+    # Imported here so starting the app doesn't load the barcode/OpenCV stack
+    from rocket_pos.scanning import image_data_uri, receipt_barcodes
+    
+    settings = load_data(SETTINGS_FILE)
+    barcodes = receipt_barcodes(barcode_value, settings.get('receipt_barcode', 'both')) if barcode_value else []
+    
+    # 1. Browser-based printing
+    try:
+        barcode_html = "".join(f'<div style="text-align:center"><img src="{image_data_uri(image)}"/></div>' for image in barcodes)
+        js = f"""
+        <script>
+        function printReceipt() {{
+            var win = window.open('', '', 'height=400,width=600');
+            win.document.write(`<pre>{receipt_text}</pre>{barcode_html}`);
+            win.document.close();
+            win.print();
+            setTimeout(() => win.close(), 500);
+        }}
+        printReceipt();
+        </script>
+        """
+        st.components.v1.html(js, height=0)
+        return True
+    except:
+        pass
+    
+    # 2. PDF fallback
+    try:
+        import fpdf as FPDF
+        pdf = FPDF.FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        
+        # Add store header if enabled
+        if settings.get('receipt_print_logo', False) and 'store_logo' in settings and os.path.exists(settings['store_logo']):
+            try:
+                pdf.image(settings['store_logo'], x=10, y=8, w=30)
+                pdf.ln(20)  # Move down after logo
+            except:
+                pass
+        
+        # Add receipt content
+        for line in receipt_text.split('\n'):
+            pdf.cell(0, 10, line, ln=1)
+        for image in barcodes:
+            pdf.image(image, x=10, w=image.width * 0.25)
+            pdf.ln(5)
+        
+        pdf_path = "receipt.pdf"
+        pdf.output(pdf_path)
+        
+        # Open PDF for printing
+        if platform.system() == "Windows":
+            os.startfile(pdf_path, "print")
+        elif platform.system() == "Darwin":  # macOS
+            subprocess.run(["lp", pdf_path])
+        else:  # Linux
+            subprocess.run(["lp", pdf_path])
+        
+        return True
+    except Exception as e:
+        st.error(f"Printing failed: {str(e)}")
+        return False
+
+def open_cash_drawer():
+    settings = load_data(SETTINGS_FILE)
+    
+    # If cash drawer is not enabled in settings, try to open it anyway
+    if not settings.get('cash_drawer_enabled', False):
+        st.warning("Cash drawer is not enabled in settings, but attempting to open anyway...")
+    
+    # Try the configured command first
+    command = settings.get('cash_drawer_command', '')
+    if command:
+        try:
+            result = subprocess.run(command, shell=True, capture_output=True, text=True)
+            if result.returncode == 0:
+                return True
+            else:
+                st.warning(f"Configured command failed: {result.stderr}")
+        except Exception as e:
+            st.warning(f"Failed to execute configured command: {str(e)}")
+    
+    # If configured command fails or doesn't exist, try common cash drawer commands
+    st.info("Trying alternative methods to open cash drawer...")
+    
+    # Common cash drawer commands for different systems
+    common_commands = [
+        # ESC/POS commands for most receipt printers
+        'echo -e "\x1B\x70\x00\x19\xFA" > /dev/usb/lp0',  # USB printer
+        'echo -e "\x1B\x70\x00\x19\xFA" > /dev/ttyUSB0',  # Serial printer
+        'echo -e "\x1B\x70\x00\x19\xFA" | lpr',           # Network printer
+        
+        # Windows commands
+        'echo %FF% > LPT1',                              # Parallel port
+        'powershell -command "$x=[char]27+[char]112+[char]0+[char]25+[char]250; $port= new-Object System.IO.Ports.SerialPort COM1,9600,None,8,one; $port.open(); $port.write($x); $port.close()"',
+        
+        # Generic system commands
+        'echo -e "\x1B\x70\x00\x19\xFA" > /dev/ttyS0',   # Serial port 1
+        'echo -e "\x1B\x70\x00\x19\xFA" > /dev/ttyS1',   # Serial port 2
+    ]
+    
+    # Try each command until one works
+    for cmd in common_commands:
+        try:
+            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=5)
+            if result.returncode == 0:
+                st.success(f"Cash drawer opened using: {cmd}")
+                return True
+        except (subprocess.TimeoutExpired, Exception):
+            continue
+    
+    # If all else fails, try a platform-specific approach
+    try:
+        if platform.system() == "Windows":
+            # Try to access parallel port directly
+            try:
+                import win32file
+                handle = win32file.CreateFile("LPT1", win32file.GENERIC_WRITE, 0, None, win32file.OPEN_EXISTING, 0, None)
+                win32file.WriteFile(handle, b'\x1B\x70\x00\x19\xFA')
+                win32file.CloseHandle(handle)
+                st.success("Cash drawer opened using direct parallel port access")
+                return True
+            except ImportError:
+                st.warning("pywin32 module not available for direct port access")
+            except Exception as e:
+                st.warning(f"Direct parallel port access failed: {str(e)}")
+        
+        elif platform.system() in ["Linux", "Darwin"]:  # Linux or macOS
+            # Try to find and use any available printer
+            try:
+                # List available printers
+                if platform.system() == "Linux":
+                    printers = subprocess.run(['lpstat', '-a'], capture_output=True, text=True)
+                    if printers.returncode == 0:
+                        printer_name = printers.stdout.split()[0] if printers.stdout else "printer"
+                        subprocess.run(f'echo -e "\x1B\x70\x00\x19\xFA" | lpr -P {printer_name}', shell=True)
+                        st.success(f"Cash drawer opened using printer: {printer_name}")
+                        return True
+                else:  # macOS
+                    subprocess.run('echo -e "\x1B\x70\x00\x19\xFA" | lpr', shell=True)
+                    st.success("Cash drawer opened using default printer")
+                    return True
+            except Exception as e:
+                st.warning(f"Printer access failed: {str(e)}")
+    
+    except Exception as e:
+        st.error(f"All cash drawer opening methods failed: {str(e)}")
+    
+    # Final fallback - show instructions to user
+    st.error("""
+    ❌ Could not automatically open cash drawer.
+    
+    Please try one of these manual solutions:
+    1. Press the physical button on your cash drawer
+    2. Use the manual key to open it
+    3. Check your cash drawer connections and power
+    4. Configure the correct cash drawer command in System Settings
+    """)
+    
+    return False
+
+# Improved Barcode Scanner
+class BarcodeScanner:
+    def __init__(self):
+        self.scanner = None
+        self.scanner_thread = None
+        self.running = False
+        self.last_barcode = ""
+        self.last_scan_time = 0
+        self.scan_buffer = ""
+    
+    def init_serial_scanner(self, port='auto'):
+        if port == 'auto':
+            ports = serial.tools.list_ports.comports()
+            if not ports:
+                st.warning("No serial ports found")
+                return False
+            port = ports[0].device
+        
+        try:
+            self.scanner = serial.Serial(
+                port=port,
+                baudrate=9600,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+                timeout=1,
+                xonxoff=False,
+                rtscts=False,
+                dsrdtr=False
+            )
+            return True
+        except Exception as e:
+            st.error(f"Failed to open serial port {port}: {str(e)}")
+            return False
+    
+    def start_serial_scanning(self):
+        self.running = True
+        while self.running:
+            try:
+                if self.scanner.in_waiting > 0:
+                    data = self.scanner.readline().decode('utf-8').strip()
+                    if data:
+                        self.last_barcode = data
+                        self.last_scan_time = time.time()
+                        st.session_state.scanned_barcode = data
+            except Exception as e:
+                time.sleep(0.1)
+    
+    def stop_scanning(self):
+        self.running = False
+        if self.scanner and hasattr(self.scanner, 'close'):
+            self.scanner.close()
+        if self.scanner_thread and self.scanner_thread.is_alive():
+            self.scanner_thread.join()
+    
+    def get_barcode(self):
+        if time.time() - self.last_scan_time < 1:  # 1 second debounce
+            barcode = self.last_barcode
+            self.last_barcode = ""
+            return barcode
+        return None
+
+# Initialize barcode scanner
+barcode_scanner = BarcodeScanner()
+
+def setup_barcode_scanner():
+    settings = load_data(SETTINGS_FILE)
+    scanner_type = settings.get('barcode_scanner', 'keyboard')
+    port = settings.get('barcode_scanner_port', 'auto')
+    
+    if scanner_type == 'serial':
+        if barcode_scanner.init_serial_scanner(port):
+            barcode_scanner.scanner_thread = threading.Thread(
+                target=barcode_scanner.start_serial_scanning, 
+                daemon=True
+            )
+            barcode_scanner.scanner_thread.start()
+            st.session_state.barcode_scanner_setup = True
+            st.session_state.scanner_status = "Connected"
+        else:
+            st.session_state.scanner_status = "Disconnected"
+    else:
+        st.session_state.scanner_status = "Keyboard Mode"
+
+# Camera scanning: browser camera or photo upload, plus the local camera/video source in settings
+LOCAL_CAMERA_TIMEOUT = 10
+# Photos remembered as already decoded; a widget only ever holds its latest photo, so a few is plenty
+SEEN_PHOTOS = 8
+
+def camera_scan_panel(key):
+    """Scan widgets; returns the codes decoded this run (each photo is only decoded once)"""
+    from rocket_pos.scanning import ScanError, decode_image, decoder_backend, scan_settings, scan_video
+    
+    if decoder_backend() is None:
+        st.info("Camera scanning needs pyzbar (with the zbar library) or opencv-python-headless")
+        return []
+    
+    settings = load_data(SETTINGS_FILE)
+    seen = st.session_state.setdefault(f"{key}_seen", collections.deque(maxlen=SEEN_PHOTOS))
+    codes = []
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        photo = st.camera_input("Camera", key=f"{key}_camera")
+    with col2:
+        upload = st.file_uploader("Or upload a photo", type=['jpg', 'jpeg', 'png'], key=f"{key}_upload")
+        local_scan = st.button("Scan with Local Camera", key=f"{key}_local",
+                               help=f"Reads camera/video source {settings.get('camera_source', '0')} for up to {LOCAL_CAMERA_TIMEOUT}s")
+    
+    for image in (photo, upload):
+        if image is None:
+            continue
+        data = image.getvalue()
+        marker = f"{len(data)}:{hash(data)}"
+        if marker in seen:
+            continue
+        seen.append(marker)
+        try:
+            found = decode_image(data)
+        except Exception as e:
+            st.error(f"Could not read the photo: {str(e)}")
+            continue
+        if not found:
+            st.warning("No barcode found in the photo - try again closer and in focus")
+        codes += found
+    
+    if local_scan:
+        try:
+            with st.spinner("Scanning..."):
+                result = scan_video(settings.get('camera_source', '0'), timeout=LOCAL_CAMERA_TIMEOUT,
+                                    **scan_settings(settings))
+            if not result['codes']:
+                st.warning("No barcode found - hold it closer to the camera and try again")
+            codes += result['codes']
+        except ScanError as e:
+            st.error(str(e))
+    
+    return codes
@@ -0,0 +1,164 @@
+"""Loyalty points bookkeeping used by the POS and the loyalty pages."""
+
+import streamlit as st
+import datetime
+
+from rocket_pos.core import (
+    TRANSACTIONS_FILE,
+    LOYALTY_FILE,
+    load_data,
+)
+from rocket_pos.outdoor_orders import customer_has_live_orders
+from rocket_pos.points_ledger import (
+    PointsError,
+    apply_points,
+    customer_state,
+    expire_all_points,
+    record_purchase,
+    set_points,
+)
+
+def safe_customer_lookup(phone=None, customer_id=None):
+    """
+    Safe customer lookup that prevents accidental deletion
+    Returns customer data (with current points and tier) if found, None otherwise
+    """
+    loyalty_data = load_data(LOYALTY_FILE)
+    customers = loyalty_data.get('customers', {})
+    
+    if customer_id and customer_id in customers:
+        return customer_state(customer_id, customers[customer_id])
+    
+    if phone:
+        for cust_id, customer in customers.items():
+            if customer.get('phone') == phone:
+                return customer_state(cust_id, customer)
+    
+    return None
+
+def validate_customer_deletion(customer_id):
+    """
+    Validate if a customer can be safely deleted
+    Returns (can_delete, reason)
+    """
+    loyalty_data = load_data(LOYALTY_FILE)
+    customers = loyalty_data.get('customers', {})
+    
+    if customer_id not in customers:
+        return False, "Customer not found"
+    
+    customer = customer_state(customer_id, customers[customer_id])
+    
+    # Check if customer has transaction history
+    transactions = load_data(TRANSACTIONS_FILE)
+    has_transactions = any(t.get('customer_id') == customer_id for t in transactions.values())
+    
+    if has_transactions:
+        return False, "Customer has transaction history and cannot be deleted"
+    
+    # Check if customer has active points
+    if customer.get('points', 0) > 0:
+        return False, "Customer has active loyalty points"
+    
+    # Check if customer has pending orders
+    # The live outdoor orders file only holds pending and approved orders
+    if customer_has_live_orders(customer_id):
+        return False, "Customer has pending outdoor orders"
+    
+    return True, "Customer can be deleted"
+
+# NEW POINT MANAGEMENT FUNCTIONS
+# Balances, expiry batches, tiers and counters live in rocket_pos.points_ledger;
+# these keep the bool-returning helpers the pages call.
+def process_expired_points():
+    """Expire points for all customers (does the work at most once a day)"""
+    expire_all_points()
+
+def get_next_expiry_date(customer):
+    """Get the next expiry date for a customer's points (from customer_state())"""
+    point_breakdown = customer.get('point_breakdown', {})
+    expiry_batches = point_breakdown.get('expiry_batches', [])
+    
+    if not expiry_batches:
+        return None
+    
+    # Find the earliest expiry date
+    expiry_dates = [datetime.datetime.strptime(batch['expiry_date'], "%Y-%m-%d").date() for batch in expiry_batches]
+    next_expiry = min(expiry_dates)
+    
+    return next_expiry.strftime("%Y-%m-%d")
+
+def add_points_to_customer(customer_id, points, reason, source="manual_addition", user=None):
+    """Add points to customer with proper expiry tracking"""
+    try:
+        apply_points(customer_id, points, 'adjust', reason, user=user, source=source)
+    except PointsError:
+        return False
+    return True
+
+def subtract_points_from_customer(customer_id, points, reason, user=None):
+    """Subtract points from customer using FIFO method"""
+    try:
+        apply_points(customer_id, -points, 'adjust', reason, user=user)
+    except PointsError:
+        return False
+    return True
+
+def set_customer_points(customer_id, points, reason, user=None):
+    """Set customer points to a specific value"""
+    try:
+        set_points(customer_id, points, reason, user=user)
+    except PointsError:
+        return False
+    return True
+
+# LOYALTY FUNCTIONS FOR POS INTEGRATION
+def apply_loyalty_discount(customer_id, transaction_total):
+    """Apply loyalty discount based on customer's tier"""
+    loyalty_data = load_data(LOYALTY_FILE)
+    customers = loyalty_data.get('customers', {})
+    tiers = loyalty_data.get('tiers', {})
+    
+    if customer_id not in customers:
+        return 0
+    
+    customer = customer_state(customer_id, customers[customer_id])
+    tier_name = customer.get('tier', 'Bronze')
+    
+    if tier_name in tiers:
+        discount_percent = tiers[tier_name].get('discount', 0)
+        return transaction_total * discount_percent
+    
+    return 0
+
+def calculate_loyalty_points(customer_id, transaction_total):
+    """Calculate loyalty points earned from a transaction"""
+    loyalty_data = load_data(LOYALTY_FILE)
+    settings = loyalty_data.get('settings', {})
+    
+    points_per_dollar = settings.get('points_per_dollar', 1)
+    return int(transaction_total * points_per_dollar)
+
+def redeem_loyalty_points(customer_id, points_to_redeem):
+    """Redeem loyalty points for a customer"""
+    loyalty_data = load_data(LOYALTY_FILE)
+    
+    try:
+        apply_points(customer_id, -points_to_redeem, 'redeem', "reward_redemption",
+                     user=st.session_state.user_info['username'])
+    except PointsError as e:
+        return False, str(e)
+    
+    # Calculate discount value
+    settings = loyalty_data.get('settings', {})
+    points_value = settings.get('points_value', 0.01)
+    return True, points_to_redeem * points_value
+
+def update_customer_loyalty(customer_id, transaction_total, points_earned, points_redeemed, discount_amount):
+    """Update customer loyalty data after a transaction"""
+    try:
+        # Redeemed points are taken by redeem_loyalty_points(); this adds the earned ones and counts the visit
+        record_purchase(customer_id, points_earned, 0, transaction_total, None,
+                        datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    except PointsError:
+        return
@@ -0,0 +1,119 @@
+"""Sidebar navigation and the lazily imported page registry."""
+
+import importlib
+import time
+
+import streamlit as st
+
+from rocket_pos.core import SETTINGS_FILE, is_admin, is_cashier, is_manager, load_data
+from rocket_pos.shifts import start_shift
+
+# Page name -> (module, function). Modules are only imported when the page is first selected,
+# so a rerun never pays for pages the user hasn't visited.
+PAGE_REGISTRY = {
+    "Dashboard": ("rocket_pos.views.home", "dashboard_content"),
+    "Profit and Loss": ("rocket_pos.views.profit_loss", "profit_loss_statement"),
+    "Transaction History": ("rocket_pos.views.transactions", "transaction_history"),
+    "POS Terminal": ("rocket_pos.views.pos", "pos_terminal"),
+    "Product Management": ("rocket_pos.views.products", "product_management"),
+    "Inventory Management": ("rocket_pos.views.inventory", "inventory_management"),
+    "User Management": ("rocket_pos.views.users", "user_management"),
+    "Discounts & Promotions": ("rocket_pos.views.discounts", "discounts_management"),
+    "Offers Management": ("rocket_pos.views.offers", "offers_management"),
+    "Loyalty Program": ("rocket_pos.views.loyalty", "loyalty_management"),
+    "Categories": ("rocket_pos.views.categories", "categories_management"),
+    "Brands": ("rocket_pos.views.brands", "brands_management"),
+    "Suppliers": ("rocket_pos.views.suppliers", "suppliers_management"),
+    "Purchase Orders": ("rocket_pos.views.purchase_orders", "purchase_orders_management"),
+    "Outdoor Sales": ("rocket_pos.views.outdoor_orders", "outdoor_sales_portal"),
+    "Reports & Analytics": ("rocket_pos.views.reports", "reports_analytics"),
+    "Shifts Management": ("rocket_pos.views.shifts", "shifts_management"),
+    "Returns & Refunds": ("rocket_pos.views.returns", "returns_management"),
+    "System Settings": ("rocket_pos.views.settings", "system_settings"),
+    "Backup & Restore": ("rocket_pos.views.backup", "backup_restore")
+}
+
+CASHIER_PAGE_REGISTRY = {
+    "Dashboard": ("rocket_pos.views.home", "cashier_dashboard"),
+    "POS Terminal": ("rocket_pos.views.pos", "pos_terminal"),
+    "Shifts Management": ("rocket_pos.views.shifts", "shifts_management"),
+    "Returns & Refunds": ("rocket_pos.views.returns", "returns_management"),
+    "Outdoor Sales": ("rocket_pos.views.outdoor_orders", "outdoor_sales_portal"),
+    "Loyality Customer": ("rocket_pos.views.cashier_loyalty", "cashier_loyalty_management"),
+    "Transaction History": ("rocket_pos.views.transactions", "cashier_transaction_history")
+}
+
+def load_page(entry):
+    """Resolve a registry entry to its page function, importing the module on first use"""
+    module_name, function_name = entry
+    return getattr(importlib.import_module(module_name), function_name)
+
+def open_page(page):
+    """Switch the sidebar to page and rerun, e.g. after a report prefills a form there"""
+    st.session_state.open_page = page
+    st.rerun()
+
+def dashboard():
+    settings = load_data(SETTINGS_FILE)
+    if settings.get('auto_logout', True):
+        inactive_time = time.time() - st.session_state.last_activity
+        timeout_minutes = settings.get('session_timeout', 30)
+        if inactive_time > timeout_minutes * 60:
+            st.session_state.user_info = None
+            st.session_state.current_page = "Login"
+            st.rerun()
+    
+    st.session_state.last_activity = time.time()
+    
+    st.title("ROCKET VAPE POS ")
+    st.sidebar.title("Navigation")
+    
+    # Shift management for cashiers - IMPROVED INPUT
+    if is_cashier() and not st.session_state.shift_started:
+        with st.sidebar:
+            st.subheader("Shift Management")
+            
+            # Use text input for manual entry but validate as number
+            cash_input = st.text_input(
+                "Starting Cash Amount", 
+                value="0.00",
+                help="Enter the starting cash amount (numbers only)"
+            )
+            if st.button("Start Shift", key="start_shift_btn"):
+                try:
+                    starting_cash = float(cash_input)
+                    if starting_cash < 0:
+                        st.sidebar.error("Cash amount cannot be negative")
+                    else:
+                        start_shift(starting_cash)
+                        st.sidebar.success("Shift started successfully")
+                        st.rerun()
+                except ValueError:
+                    st.sidebar.error("Please enter a valid number for starting cash")
+    
+    # Navigation
+    pages = dict(PAGE_REGISTRY)
+    if is_admin():
+        pass  # All pages already included
+    elif is_manager():
+        pages.pop("User Management", None)
+        pages.pop("Backup & Restore", None)
+    elif is_cashier():
+        pages = dict(CASHIER_PAGE_REGISTRY)
+    
+    # Another page asked to open this one (see open_page)
+    requested_page = st.session_state.pop('open_page', None)
+    if requested_page in pages:
+        st.session_state.nav_page = requested_page
+    selected_page = st.sidebar.radio("Go to", list(pages.keys()), key="nav_page")
+    
+    if st.sidebar.button("Logout"):
+        if is_cashier() and st.session_state.shift_started:
+            st.warning("Please end your shift before logging out")
+        else:
+            st.session_state.user_info = None
+            st.session_state.current_page = "Login"
+            st.rerun()
+    
+    # Display selected page - its module is imported the first time it is opened
+    load_page(pages[selected_page])()
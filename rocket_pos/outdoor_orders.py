@@ -0,0 +1,171 @@
+"""Outdoor order queues: a small live file plus dated archive segments.
+
+outdoor_orders.json only holds orders still in play (pending_approval and
+approved) with a queue of ids per status, so the approval and delivery tabs
+read their queue directly and a state change rewrites a file the size of the
+queues, not of the history. Delivered and rejected orders are appended to
+data/outdoor_orders_archive/<YYYY-MM-DD>.jsonl for the day they closed, and
+each creator's archived orders are listed in by_user/<username>.jsonl there
+for My Orders. Live files that still hold closed orders (older installs, or a
+crash between archiving and saving) are archived on first use.
+"""
+
+import os
+import re
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    OUTDOOR_ORDERS_FILE,
+    append_data_lines,
+    load_data,
+    load_data_lines,
+    load_data_snapshot,
+    save_data,
+)
+
+LIVE_STATUSES = ('pending_approval', 'approved')
+ARCHIVE_DIR = os.path.join(DATA_DIR, "outdoor_orders_archive")
+DEFAULT_DELIVERY_CHARGES = {"standard": 5.0, "express": 10.0, "free_threshold": 50.0}
+
+def _segment_path(day):
+    return os.path.join(ARCHIVE_DIR, f"{day}.jsonl")
+
+def _user_index_path(username):
+    # Lines carry the username too, so two names mapping to one file can't mix
+    return os.path.join(ARCHIVE_DIR, "by_user", f"{re.sub(r'[^A-Za-z0-9_.-]', '_', username or 'unknown')}.jsonl")
+
+def _closed_day(order):
+    closed = order.get('delivery_date') or order.get('approved_date') or order.get('created_date') or ''
+    return closed[:10] or 'undated'
+
+def _build_queues(orders):
+    queues = {status: [] for status in LIVE_STATUSES}
+    for order in sorted(orders.values(), key=lambda o: o.get('created_date', '')):
+        queues[order['status']].append(order['order_id'])
+    return queues
+
+def _archive(orders):
+    """Append closed orders to their day segments and their creators' indexes"""
+    by_day, by_user = {}, {}
+    for order in orders:
+        day = _closed_day(order)
+        by_day.setdefault(day, []).append(order)
+        by_user.setdefault(_user_index_path(order.get('created_by')), []).append(_order_entry(order, day))
+    for day, day_orders in by_day.items():
+        append_data_lines(day_orders, _segment_path(day))
+    for path, entries in by_user.items():
+        append_data_lines(entries, path)
+
+def load_live_orders():
+    """outdoor_orders.json for a load-modify-save, with closed orders archived out of it"""
+    with DATA_LOCK:
+        data = load_data(OUTDOOR_ORDERS_FILE)
+        orders = data.setdefault('orders', {})
+        data.setdefault('delivery_charges', dict(DEFAULT_DELIVERY_CHARGES))
+        closed = [order for order in orders.values() if order.get('status') not in LIVE_STATUSES]
+        if closed or 'queues' not in data:
+            # Re-archiving after a crash can duplicate an order in the archive; readers keep the last copy
+            _archive(closed)
+            for order in closed:
+                del orders[order['order_id']]
+            data['queues'] = _build_queues(orders)
+            save_data(data, OUTDOOR_ORDERS_FILE)
+    return data
+
+def live_orders():
+    """Read-only live file for render paths"""
+    data = load_data_snapshot(OUTDOOR_ORDERS_FILE)
+    if 'queues' not in data:
+        data = load_live_orders()
+    return data
+
+def queue(status):
+    """Live orders with a status, oldest first"""
+    data = live_orders()
+    return [data['orders'][order_id] for order_id in data['queues'].get(status, []) if order_id in data['orders']]
+
+def add_order(order):
+    """Put a new order on the pending_approval queue"""
+    with DATA_LOCK:
+        data = load_live_orders()
+        data['orders'][order['order_id']] = order
+        data['queues'][order['status']].append(order['order_id'])
+        save_data(data, OUTDOOR_ORDERS_FILE)
+    return order
+
+def set_order_status(order_id, status, username, date, from_status=None):
+    """Move a live order to a new status; closed orders go to the archive.
+
+    Returns the updated order, or None if the order isn't live (unknown or
+    already closed) or isn't in from_status when that is given.
+    """
+    with DATA_LOCK:
+        data = load_live_orders()
+        order = data['orders'].get(order_id)
+        if order is None or from_status not in (None, order['status']):
+            return None
+        data['queues'][order['status']].remove(order_id)
+        order['status'] = status
+        if status == 'delivered':
+            order['delivered_by'] = username
+            order['delivery_date'] = date
+        else:
+            order['approved_by'] = username
+            order['approved_date'] = date
+
+        if status in LIVE_STATUSES:
+            data['queues'][status].append(order_id)
+        else:
+            _archive([order])
+            del data['orders'][order_id]
+        save_data(data, OUTDOOR_ORDERS_FILE)
+    return order
+
+def save_delivery_charges(delivery_charges):
+    with DATA_LOCK:
+        data = load_live_orders()
+        data['delivery_charges'] = delivery_charges
+        save_data(data, OUTDOOR_ORDERS_FILE)
+
+def _order_entry(order, day=None):
+    return {
+        'order_id': order['order_id'],
+        'created_by': order.get('created_by'),
+        'status': order['status'],
+        'created_date': order.get('created_date'),
+        'total': order.get('total', 0),
+        'day': day
+    }
+
+def user_order_entries(username, status=None):
+    """Summaries ('order_id', 'status', 'created_date', 'total', 'day') of a user's orders, live and archived.
+
+    Live orders have day None. Sort and page these, then load_orders() the page.
+    """
+    entries = {order['order_id']: _order_entry(order) for order in live_orders()['orders'].values()
+               if order.get('created_by') == username and status in (None, order['status'])}
+    if status not in LIVE_STATUSES:
+        for entry in load_data_lines(_user_index_path(username)):
+            if entry.get('created_by') == username and status in (None, entry['status']):
+                entries.setdefault(entry['order_id'], entry)
+    return list(entries.values())
+
+def load_orders(entries):
+    """Full orders for user_order_entries() summaries, reading each archive day once"""
+    live = live_orders()['orders']
+    orders, days = {}, {}
+    for entry in entries:
+        if entry['day'] is None:
+            if entry['order_id'] in live:
+                orders[entry['order_id']] = live[entry['order_id']]
+        else:
+            days.setdefault(entry['day'], set()).add(entry['order_id'])
+    for day, order_ids in days.items():
+        for order in load_data_lines(_segment_path(day)):
+            if order['order_id'] in order_ids:
+                orders[order['order_id']] = order
+    return [orders[entry['order_id']] for entry in entries if entry['order_id'] in orders]
+
+def customer_has_live_orders(customer_id):
+    return any(order.get('customer_id') == customer_id for order in live_orders()['orders'].values())
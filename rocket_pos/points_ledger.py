@@ -0,0 +1,431 @@
+"""Loyalty points accounts: an append-only ledger plus a materialized balance per customer.
+
+Each customer's points live in an account (balance, FIFO expiry batches, tier,
+total_spent, visit_count, last_activity and a version) kept in
+data/points/accounts/, spread over BUCKETS files by a hash of the customer id,
+so a change rewrites one small bucket instead of loyalty.json. Every change is
+also appended to the ledger bucket data/points/ledger/<bucket>.jsonl, one line
+per change with the delta and the balance after it; the deltas of a customer's
+lines add up to their balance. The tier is settled against the tier
+thresholds (rocket_pos.tiers) on every write.
+
+Changes run under the data lock inside data_transaction() and check the
+balance there, so two tills can't both spend the same points. A caller acting
+on a balance it showed the user passes the version it read (expected_version)
+and gets PointsConflict if the account has changed since. Expired batches are
+dropped whenever an account is written and left out of every read; expiry
+doesn't move the version.
+
+A customer without an account yet is adopted on first change: the points,
+point_breakdown, tier and counters on their loyalty.json profile become the
+opening state, and their points_history/expiry_history become 'migrated'
+ledger lines. Once an account exists those profile fields are not read again.
+"""
+
+import datetime
+import os
+import zlib
+from contextlib import contextmanager
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    LOYALTY_FILE,
+    append_data_lines,
+    data_transaction,
+    get_current_datetime,
+    load_data,
+    load_data_lines,
+    load_data_snapshot,
+    save_data,
+)
+from rocket_pos.tiers import TierTable, tier_downgrade_rule, tier_table
+
+POINTS_DIR = os.path.join(DATA_DIR, "points")
+ACCOUNTS_DIR = os.path.join(POINTS_DIR, "accounts")
+LEDGER_DIR = os.path.join(POINTS_DIR, "ledger")
+REDEMPTIONS_FILE = os.path.join(POINTS_DIR, "redemptions.jsonl")
+META_FILE = os.path.join(POINTS_DIR, "meta.json")
+BUCKETS = 1024
+EXPIRY_WARNING_DAYS = 30
+NEVER_EXPIRES = "9999-12-31"
+
+class PointsError(Exception):
+    """A points change that can't be made (unknown customer, not enough points)"""
+
+class PointsConflict(PointsError):
+    """The account changed since the caller read it"""
+
+def _bucket(customer_id):
+    return f"{zlib.crc32(customer_id.encode()) % BUCKETS:04d}"
+
+def _account_path(customer_id):
+    return os.path.join(ACCOUNTS_DIR, f"{_bucket(customer_id)}.json")
+
+def _ledger_path(customer_id):
+    return os.path.join(LEDGER_DIR, f"{_bucket(customer_id)}.jsonl")
+
+def _now():
+    return get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+
+def _expiry_days():
+    return load_data_snapshot(LOYALTY_FILE).get('settings', {}).get('points_expiry_days', 365)
+
+def _expiry_date(date):
+    days = _expiry_days()
+    if not days:
+        return NEVER_EXPIRES  # the settings page's "0 means points never expire"
+    return (datetime.datetime.strptime(date[:10], "%Y-%m-%d")
+            + datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+
+def _consume(batches, points):
+    """Take points from the batches that expire first"""
+    batches.sort(key=lambda batch: batch['expiry_date'])
+    while points > 0 and batches:
+        taken = min(points, batches[0]['points'])
+        batches[0]['points'] -= taken
+        points -= taken
+        if batches[0]['points'] <= 0:
+            batches.pop(0)
+
+def _opening_account(profile, date):
+    """Account state from a loyalty.json profile that has no account yet"""
+    points = profile.get('points', 0)
+    batches = [{
+        'points': batch['points'],
+        'expiry_date': batch['expiry_date'],
+        'earned_date': batch.get('earned_date'),
+        'source': batch.get('source')
+    } for batch in profile.get('point_breakdown', {}).get('expiry_batches', []) if batch.get('points', 0) > 0]
+    # Sales used to add points without a batch, so the profile's points are what count
+    batched = sum(batch['points'] for batch in batches)
+    if batched > points:
+        _consume(batches, batched - points)
+    elif batched < points:
+        batches.append({'points': points - batched, 'expiry_date': _expiry_date(date),
+                        'earned_date': date, 'source': 'opening'})
+    return {
+        'balance': points,
+        'version': 0,
+        'batches': sorted(batches, key=lambda batch: batch['expiry_date']),
+        'tier': profile.get('tier', 'Bronze'),
+        'total_spent': profile.get('total_spent', 0),
+        'visit_count': profile.get('visit_count', 0),
+        'last_activity': profile.get('last_activity')
+    }
+
+def _migrated_lines(customer_id, profile, balance, date):
+    """Ledger lines for a profile's legacy history, ending in an 'opening' line at balance on date"""
+    history = []
+    for entry in profile.get('points_history', []):
+        delta = entry.get('points_added', 0) - entry.get('points_subtracted', 0)
+        history.append((entry.get('date', ''), delta, entry.get('reason', ''), entry.get('total_after')))
+    for entry in profile.get('expiry_history', []):
+        history.append((entry.get('processed_date', ''), -entry.get('points_expired', 0), 'expired', None))
+    history.sort(key=lambda entry: entry[0])
+
+    lines, total = [], 0
+    for date, delta, reason, balance_after in history:
+        total += delta
+        lines.append({'customer_id': customer_id, 'version': 0, 'type': 'migrated', 'delta': delta,
+                      'balance': balance_after if balance_after is not None else total,
+                      'reason': reason, 'ref': None, 'date': date, 'user': None})
+    lines.append({'customer_id': customer_id, 'version': 0, 'type': 'opening', 'delta': balance - total,
+                  'balance': balance, 'reason': 'Opening balance', 'ref': None, 'date': date, 'user': None})
+    return lines
+
+def _downgrade_now():
+    return tier_downgrade_rule(load_data_snapshot(LOYALTY_FILE).get('settings', {})) == "immediate"
+
+def _expire(account, customer_id, date, lines):
+    """Drop batches that expired before date's day, recording an 'expire' line"""
+    today = date[:10]
+    expired = sum(batch['points'] for batch in account['batches'] if batch['expiry_date'] < today)
+    if expired:
+        account['batches'] = [batch for batch in account['batches'] if batch['expiry_date'] >= today]
+        account['balance'] -= expired
+        lines.append({'customer_id': customer_id, 'version': account['version'], 'type': 'expire',
+                      'delta': -expired, 'balance': account['balance'], 'reason': 'Points expired',
+                      'ref': None, 'date': date, 'user': None})
+    return expired
+
+def _post(account, lines, customer_id, entry_type, delta, reason, date, user=None, ref=None, source=None):
+    """Apply one change to a loaded account and queue its ledger line"""
+    if delta > 0:
+        account['batches'].append({'points': delta, 'expiry_date': _expiry_date(date),
+                                   'earned_date': date, 'source': source or entry_type})
+    elif delta < 0:
+        if -delta > account['balance']:
+            raise PointsError("Not enough points")
+        _consume(account['batches'], -delta)
+    account['balance'] += delta
+    account['version'] += 1
+    account['last_activity'] = date
+    lines.append({'customer_id': customer_id, 'version': account['version'], 'type': entry_type,
+                  'delta': delta, 'balance': account['balance'], 'reason': reason, 'ref': ref,
+                  'date': date, 'user': user})
+
+@contextmanager
+def _locked_account(customer_id, expected_version=None, date=None):
+    """Yield (account, ledger lines) for changing; both are written when the block exits"""
+    date = date or _now()
+    with data_transaction():
+        path = _account_path(customer_id)
+        bucket = load_data(path)
+        account, lines = bucket.get(customer_id), []
+        if account is None:
+            profile = load_data_snapshot(LOYALTY_FILE).get('customers', {}).get(customer_id)
+            if profile is None:
+                raise PointsError("Customer not found")
+            account = _opening_account(profile, date)
+            lines = _migrated_lines(customer_id, profile, account['balance'], date)
+        _expire(account, customer_id, date, lines)
+        if expected_version is not None and expected_version != account['version']:
+            raise PointsConflict("The customer's points changed since they were shown; check the balance and try again")
+
+        yield account, lines
+
+        account['tier'] = tier_table().settle(account['tier'], account['balance'], _downgrade_now())
+        bucket[customer_id] = account
+        os.makedirs(ACCOUNTS_DIR, exist_ok=True)
+        os.makedirs(LEDGER_DIR, exist_ok=True)
+        append_data_lines(lines, _ledger_path(customer_id))
+        save_data(bucket, path)
+
+def apply_points(customer_id, delta, entry_type, reason, user=None, ref=None, source=None, expected_version=None):
+    """Add (delta > 0) or take (delta < 0) points; returns the account.
+
+    entry_type is the ledger line's type ('adjust', 'redeem', 'reward', ...).
+    Raises PointsError when the customer is unknown or the balance is too low,
+    and PointsConflict when expected_version is given and no longer current.
+    """
+    with _locked_account(customer_id, expected_version) as (account, lines):
+        _post(account, lines, customer_id, entry_type, delta, reason, _now(), user, ref, source)
+    return account
+
+def set_points(customer_id, points, reason, user=None, expected_version=None):
+    """Set the balance to points with one adjusting line; returns the account"""
+    with _locked_account(customer_id, expected_version) as (account, lines):
+        if points != account['balance']:
+            _post(account, lines, customer_id, 'adjust', points - account['balance'], reason, _now(), user,
+                  source='manual_set')
+    return account
+
+def record_purchase(customer_id, earned, redeemed, amount, ref, date, user=None, expected_version=None):
+    """Redeem and earn a sale's points and count the visit in one write; returns the account.
+
+    Call inside the sale's data_transaction(), so a PointsError (not enough points
+    left, e.g. another till spent them first) rolls the whole sale back.
+    """
+    with _locked_account(customer_id, expected_version, date) as (account, lines):
+        if redeemed:
+            _post(account, lines, customer_id, 'redeem', -redeemed, 'Redeemed at checkout', date, user, ref)
+        if earned:
+            _post(account, lines, customer_id, 'earn', earned, 'Purchase reward', date, user, ref, 'purchase')
+        account['total_spent'] = account.get('total_spent', 0) + amount
+        account['visit_count'] = account.get('visit_count', 0) + 1
+        account['last_activity'] = date
+    return account
+
+def record_redemption(customer_id, reward_id, reward, user, expected_version=None):
+    """Spend a reward's points and log the redemption; returns (account, redemption)"""
+    date = _now()
+    redemption = {
+        'customer_id': customer_id,
+        'reward_id': reward_id,
+        'reward_name': reward.get('name', 'Unknown'),
+        'points_used': reward.get('points', 0),
+        'date_redeemed': date,
+        'redeemed_by': user
+    }
+    with _locked_account(customer_id, expected_version, date) as (account, lines):
+        _post(account, lines, customer_id, 'reward', -redemption['points_used'],
+              f"Reward: {redemption['reward_name']}", date, user, reward_id)
+        os.makedirs(POINTS_DIR, exist_ok=True)
+        append_data_lines([redemption], REDEMPTIONS_FILE)
+    return account, redemption
+
+def expire_all_points():
+    """Write expiry for every account, at most once a day; returns points expired"""
+    date = _now()
+    if load_data_snapshot(META_FILE).get('expired_on') == date[:10] or not os.path.isdir(ACCOUNTS_DIR):
+        return 0
+    expired = 0
+    table, downgrade = tier_table(), _downgrade_now()
+    for name in sorted(os.listdir(ACCOUNTS_DIR)):
+        path = os.path.join(ACCOUNTS_DIR, name)
+        # One transaction per bucket, so tills only wait for one bucket at a time
+        with data_transaction():
+            bucket, lines = load_data(path), []
+            for customer_id, account in bucket.items():
+                points = _expire(account, customer_id, date, lines)
+                if points:
+                    expired += points
+                    account['tier'] = table.settle(account['tier'], account['balance'], downgrade)
+            if lines:
+                append_data_lines(lines, os.path.join(LEDGER_DIR, name.replace('.json', '.jsonl')))
+                save_data(bucket, path)
+    with DATA_LOCK:
+        save_data({'expired_on': date[:10]}, META_FILE)
+    return expired
+
+def _live_balance(account, today):
+    return sum(batch['points'] for batch in account['batches'] if batch['expiry_date'] >= today)
+
+def retier_customers(loyalty_data):
+    """Re-evaluate every customer's tier against loyalty_data's tiers, and save loyalty_data.
+
+    A review: customers also move down unless the tier_downgrade rule is
+    'never'. Customers without an account have their profile's tier updated in
+    loyalty_data before it is saved (along with whatever else the caller
+    changed in it); accounts are then updated one bucket at a time, each bucket
+    settled in one vectorized pass. Returns [{'from', 'to', 'customers'}] for
+    the tiers customers moved between.
+    """
+    table = TierTable(loyalty_data.get('tiers', {}))
+    downgrade = tier_downgrade_rule(loyalty_data.get('settings', {})) != "never"
+    date = _now()
+    today = date[:10]
+    names = sorted(os.listdir(ACCOUNTS_DIR)) if os.path.isdir(ACCOUNTS_DIR) else []
+    moves = {}
+
+    def settle(tiers, balances):
+        new_tiers = table.settle_many(tiers, balances, downgrade)
+        for old, new in zip(tiers, new_tiers):
+            if old != new:
+                moves[(old, new)] = moves.get((old, new), 0) + 1
+        return new_tiers
+
+    # Customers adopted after this read open their account from the updated profile
+    adopted = set()
+    for name in names:
+        adopted.update(load_data(os.path.join(ACCOUNTS_DIR, name)))
+    profiles = [profile for customer_id, profile in loyalty_data.get('customers', {}).items()
+                if customer_id not in adopted]
+    new_tiers = settle([profile.get('tier') for profile in profiles],
+                       [_live_balance(_opening_account(profile, date), today) for profile in profiles])
+    for profile, tier in zip(profiles, new_tiers):
+        profile['tier'] = tier
+    with DATA_LOCK:
+        save_data(loyalty_data, LOYALTY_FILE)
+
+    for name in names:
+        path = os.path.join(ACCOUNTS_DIR, name)
+        with data_transaction():
+            bucket = load_data(path)
+            accounts = list(bucket.values())
+            new_tiers = settle([account['tier'] for account in accounts],
+                               [_live_balance(account, today) for account in accounts])
+            if any(account['tier'] != tier for account, tier in zip(accounts, new_tiers)):
+                for account, tier in zip(accounts, new_tiers):
+                    account['tier'] = tier
+                save_data(bucket, path)
+
+    return [{'from': old, 'to': new, 'customers': count} for (old, new), count in sorted(moves.items(), key=str)]
+
+def _recount(record, counters, customer_id):
+    """Set record's total_spent/visit_count from counters; True if they changed"""
+    total_spent, visit_count = counters.get(customer_id, (0, 0))
+    if round(record.get('total_spent', 0), 2) == total_spent and record.get('visit_count', 0) == visit_count:
+        return False
+    record['total_spent'] = total_spent
+    record['visit_count'] = visit_count
+    return True
+
+def rebuild_counters(recount):
+    """Overwrite drifted total_spent and visit_count; returns how many customers changed.
+
+    recount() returns {customer_id: (total_spent, visit_count)} from the saved
+    sales. It is called again under each write's lock, so a sale committed
+    while the rebuild runs is counted rather than overwritten; it should be
+    cached per version of the sales. Profiles without an account are fixed in
+    loyalty.json, then accounts one bucket at a time. The points version is
+    not moved: the counters aren't part of the balance a till acts on.
+    """
+    changed = 0
+    with DATA_LOCK:
+        adopted = set()
+        names = sorted(os.listdir(ACCOUNTS_DIR)) if os.path.isdir(ACCOUNTS_DIR) else []
+        for name in names:
+            adopted.update(load_data(os.path.join(ACCOUNTS_DIR, name)))
+        loyalty_data = load_data(LOYALTY_FILE)
+        counters = recount()
+        profiles_changed = sum(_recount(profile, counters, customer_id)
+                               for customer_id, profile in loyalty_data.get('customers', {}).items()
+                               if customer_id not in adopted)
+        if profiles_changed:
+            save_data(loyalty_data, LOYALTY_FILE)
+        changed += profiles_changed
+
+    for name in names:
+        path = os.path.join(ACCOUNTS_DIR, name)
+        with data_transaction():
+            bucket, counters = load_data(path), recount()
+            bucket_changed = sum(_recount(account, counters, customer_id) for customer_id, account in bucket.items())
+            if bucket_changed:
+                save_data(bucket, path)
+            changed += bucket_changed
+    return changed
+
+# Reads: loyalty.json profiles with the account fields laid over them
+def _state(customer_id, profile, account, date):
+    if account is None:
+        account = _opening_account(profile, date)
+    today = date[:10]
+    warn_by = (datetime.datetime.strptime(today, "%Y-%m-%d")
+               + datetime.timedelta(days=EXPIRY_WARNING_DAYS)).strftime("%Y-%m-%d")
+    batches = [batch for batch in account['batches'] if batch['expiry_date'] >= today]
+    balance = sum(batch['points'] for batch in batches)
+    return dict(
+        profile,
+        points=balance,
+        points_version=account['version'],
+        tier=account['tier'],
+        total_spent=account.get('total_spent', 0),
+        visit_count=account.get('visit_count', 0),
+        last_activity=account.get('last_activity'),
+        point_breakdown={
+            'available': balance,
+            'pending_expiry': sum(batch['points'] for batch in batches if batch['expiry_date'] <= warn_by),
+            'expiry_batches': batches
+        }
+    )
+
+def customer_state(customer_id, profile):
+    """profile with its current points, tier, counters and points_version (read-only)"""
+    account = load_data(_account_path(customer_id)).get(customer_id)
+    return _state(customer_id, profile, account, _now())
+
+def customer_states(customers):
+    """customer_state() for a {customer_id: profile} dict, reading each bucket once"""
+    date = _now()
+    buckets = {}
+    states = {}
+    for customer_id, profile in customers.items():
+        path = _account_path(customer_id)
+        if path not in buckets:
+            # Plain reads: a thousand buckets would push the hot files out of the snapshot cache
+            buckets[path] = load_data(path)
+        states[customer_id] = _state(customer_id, profile, buckets[path].get(customer_id), date)
+    return states
+
+def points_history(customer_id, page=1, page_size=20):
+    """(ledger lines newest first for one page, total lines) of a customer's points"""
+    lines = [line for line in load_data_lines(_ledger_path(customer_id)) if line['customer_id'] == customer_id]
+    if not lines:
+        # Not adopted yet: show what adoption would import
+        profile = load_data_snapshot(LOYALTY_FILE).get('customers', {}).get(customer_id)
+        if profile:
+            date = _now()
+            lines = _migrated_lines(customer_id, profile, _opening_account(profile, date)['balance'], date)
+    lines.reverse()
+    return lines[(page - 1) * page_size:page * page_size], len(lines)
+
+def redemption_history(page=1, page_size=50):
+    """(reward redemptions newest first for one page, total) from the log and legacy profiles"""
+    redemptions = load_data_lines(REDEMPTIONS_FILE)
+    customers = load_data_snapshot(LOYALTY_FILE).get('customers', {})
+    for customer_id, customer in customers.items():
+        redemptions += [dict(redemption, customer_id=customer_id) for redemption in customer.get('redemptions', [])]
+    redemptions.sort(key=lambda redemption: redemption.get('date_redeemed', ''), reverse=True)
+    return redemptions[(page - 1) * page_size:page * page_size], len(redemptions)
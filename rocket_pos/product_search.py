@@ -0,0 +1,139 @@
+"""Product search and the search-as-you-type product picker.
+
+Pages that pick products used to send the whole catalog to the browser as
+selectbox options on every rerun. The picker instead sends the top few matches
+for what has been typed, plus whatever is already chosen, and keeps the
+selection in session state as barcodes.
+
+The search runs on a ProductIndex, built once per version of products.json.
+Barcodes and lower-cased names are kept sorted, so prefix matches are a
+bisect. Everything else is found with str.find over one newline-joined
+"name barcode" string. Matches are produced lazily, best first, so asking for
+the top N stops after N hits however big the catalog is.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import streamlit as st
+
+from rocket_pos.core import PRODUCTS_FILE, data_version, load_data_snapshot, snapshot_cache
+
+PICKER_LIMIT = 25
+
+def _prefixed(keys, values, prefix):
+    """values whose sorted key starts with prefix"""
+    i = bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix):
+        yield values[i]
+        i += 1
+
+class ProductIndex:
+    """Catalog search: exact barcode, barcode prefix, name prefix, then anywhere in name or barcode"""
+
+    def __init__(self, products):
+        self.labels = {barcode: f"{product.get('name', '')} ({barcode})" for barcode, product in products.items()}
+        by_barcode = sorted((barcode.lower(), barcode) for barcode in products)
+        self._barcode_keys = [key for key, _ in by_barcode]
+        self._barcodes = [barcode for _, barcode in by_barcode]
+        by_name = sorted((str(product.get('name', '')).lower(), barcode) for barcode, product in products.items())
+        self._name_keys = [key for key, _ in by_name]
+        self.order = [barcode for _, barcode in by_name]
+
+        # One "name barcode" line per product, in name order; _starts[i] is where line i begins
+        self._entries = [f"{name} {barcode.lower()}" for name, barcode in by_name]
+        self._haystack = "\n".join(self._entries)
+        self._starts = []
+        position = 0
+        for entry in self._entries:
+            self._starts.append(position)
+            position += len(entry) + 1
+
+    def label(self, barcode):
+        return self.labels.get(barcode, barcode)
+
+    def search(self, term):
+        """Barcodes matching term, best first (may repeat); the whole catalog by name when term is blank"""
+        term = (term or "").strip()
+        if not term:
+            yield from self.order
+            return
+        lowered = term.lower()
+        if term in self.labels:
+            yield term
+        yield from _prefixed(self._barcode_keys, self._barcodes, lowered)
+        yield from _prefixed(self._name_keys, self.order, lowered)
+
+        # Anywhere: scan for the longest word (the last, on ties), then check the rest on that line
+        words = lowered.split()
+        longest = max(reversed(words), key=len)
+        others = [word for word in words if word is not longest]
+        position = self._haystack.find(longest)
+        while position != -1:
+            line = bisect_right(self._starts, position) - 1
+            if all(word in self._entries[line] for word in others):
+                yield self.order[line]
+            if line + 1 == len(self._starts):
+                break
+            position = self._haystack.find(longest, self._starts[line + 1])
+
+@snapshot_cache(max_entries=2)
+def _product_index(version):
+    return ProductIndex(load_data_snapshot(PRODUCTS_FILE))
+
+def product_index():
+    """The ProductIndex for products.json as it stands"""
+    return _product_index(data_version(PRODUCTS_FILE))
+
+def search_products(term, limit=PICKER_LIMIT, within=None):
+    """Up to limit barcodes matching term, best first; within limits the result to a set of barcodes"""
+    found, seen = [], set()
+    if limit <= 0:
+        return found
+    for barcode in product_index().search(term):
+        if barcode in seen or (within is not None and barcode not in within):
+            continue
+        seen.add(barcode)
+        found.append(barcode)
+        if len(found) == limit:
+            break
+    return found
+
+def product_picker(label, key, multiple=False, default=None, within=None, limit=PICKER_LIMIT,
+                   max_selections=None, help=None):
+    """Search box plus a selectbox (or multiselect) of the best matches; returns the chosen barcode(s).
+
+    Single pickers return a barcode or "", multiple pickers a list of barcodes.
+    The choice is kept in st.session_state[key] across searches (pop it to
+    clear the picker); default seeds it the first time. within restricts the
+    choice to a set of barcodes. Use it outside st.form: a search typed in a
+    form only applies when the form is submitted.
+    """
+    index = product_index()
+    if key not in st.session_state:
+        st.session_state[key] = list(default or []) if multiple else (default or "")
+    chosen = st.session_state[key]
+    chosen = [barcode for barcode in chosen if barcode in index.labels] if multiple else \
+        (chosen if chosen in index.labels else "")
+
+    term = st.text_input(f"🔍 Search {label.rstrip('*')}", key=f"{key}_search",
+                         placeholder="Type a name or barcode")
+    matches = search_products(term, limit, within)
+    kept = chosen if multiple else [barcode for barcode in [chosen] if barcode]
+    options = {index.label(barcode): barcode for barcode in kept + matches}
+
+    if multiple:
+        picked = st.multiselect(label, list(options.keys()), default=[index.label(b) for b in kept],
+                                max_selections=max_selections, help=help, key=f"{key}_choice")
+        chosen = [options[option] for option in picked]
+    else:
+        labels = [""] + list(options.keys())
+        picked = st.selectbox(label, labels, index=labels.index(index.label(chosen)) if chosen else 0,
+                              help=help, key=f"{key}_choice")
+        chosen = options.get(picked, "")
+
+    if len(matches) == limit:
+        st.caption(f"Showing the first {limit} matches - keep typing to narrow them down")
+    elif term and not matches:
+        st.caption("No products match that search")
+    st.session_state[key] = chosen
+    return chosen
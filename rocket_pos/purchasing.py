@@ -0,0 +1,131 @@
+"""Purchase order documents and stock receiving."""
+
+import streamlit as st
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    SETTINGS_FILE,
+    SUPPLIERS_FILE,
+    PURCHASE_ORDERS_FILE,
+    format_currency,
+    generate_short_id,
+    get_current_datetime,
+    load_data,
+    save_data,
+)
+from rocket_pos.services import ServiceError, receive_purchase_order
+
+def generate_purchase_order(supplier_id, items, status='pending'):
+    suppliers = load_data(SUPPLIERS_FILE)
+    products = load_data(PRODUCTS_FILE)
+    purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+    
+    if supplier_id not in suppliers:
+        return None
+    
+    supplier = suppliers[supplier_id]
+    po_id = generate_short_id()
+    
+    # Calculate totals
+    total_cost = 0
+    for item in items:
+        product = products.get(item['barcode'], {})
+        total_cost += item['quantity'] * product.get('cost', 0)
+    
+    # Create PO
+    purchase_orders[po_id] = {
+        'po_id': po_id,
+        'supplier_id': supplier_id,
+        'supplier_name': supplier['name'],
+        'date_created': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+        'created_by': st.session_state.user_info['username'],
+        'items': items,
+        'total_cost': total_cost,
+        'status': status,
+        'date_received': None,
+        'received_by': None
+    }
+    
+    save_data(purchase_orders, PURCHASE_ORDERS_FILE)
+    return po_id
+
+def generate_draft_purchase_orders(plan):
+    """One draft PO per supplier from the reorder suggestions of a replenishment plan.
+
+    Returns (created PO ids, number of suggested items left out for want of a supplier).
+    """
+    suggestions = plan[plan['reorder'] & (plan['quantity'] > 0)]
+    po_ids = []
+    for supplier_id, lines in suggestions.dropna(subset=['supplier_id']).groupby('supplier_id'):
+        items = [{
+            'barcode': barcode,
+            'name': line['name'],
+            'quantity': int(line['quantity']),
+            'cost': line['cost']
+        } for barcode, line in lines.iterrows()]
+        po_id = generate_purchase_order(supplier_id, items, status='draft')
+        if po_id:
+            po_ids.append(po_id)
+    return po_ids, int(suggestions['supplier_id'].isna().sum())
+
+def approve_draft_po(po_id):
+    """Turn a draft PO into a pending one, ready to send and receive"""
+    purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+    po = purchase_orders.get(po_id)
+    if not po or po['status'] != 'draft':
+        return False
+    po['status'] = 'pending'
+    po['approved_by'] = st.session_state.user_info['username']
+    po['date_approved'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+    save_data(purchase_orders, PURCHASE_ORDERS_FILE)
+    return True
+
+def discard_draft_po(po_id):
+    purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+    if purchase_orders.get(po_id, {}).get('status') != 'draft':
+        return False
+    del purchase_orders[po_id]
+    save_data(purchase_orders, PURCHASE_ORDERS_FILE)
+    return True
+
+def generate_po_report(po_id):
+    purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+    products = load_data(PRODUCTS_FILE)
+    settings = load_data(SETTINGS_FILE)
+    
+    if po_id not in purchase_orders:
+        return None
+    
+    po = purchase_orders[po_id]
+    
+    report = f"PURCHASE ORDER #{po_id}\n"
+    report += f"{settings.get('store_name', 'Supermarket POS')}\n"
+    report += f"Date: {po['date_created']}\n"
+    report += "=" * 50 + "\n"
+    report += f"Supplier: {po['supplier_name']}\n"
+    report += f"Created by: {po['created_by']}\n"
+    report += "=" * 50 + "\n"
+    report += "ITEMS:\n"
+    report += "Barcode\tProduct\tQty\tUnit Cost\tTotal\n"
+    
+    for item in po['items']:
+        product = products.get(item['barcode'], {'name': 'Unknown', 'cost': 0})
+        report += f"{item['barcode']}\t{product['name']}\t{item['quantity']}\t"
+        report += f"{format_currency(product.get('cost', 0))}\t"
+        report += f"{format_currency(item['quantity'] * product.get('cost', 0))}\n"
+    
+    report += "=" * 50 + "\n"
+    report += f"TOTAL COST: {format_currency(po['total_cost'])}\n"
+    report += f"STATUS: {po['status'].upper()}\n"
+    
+    if po['status'] == 'received':
+        report += f"Received on: {po['date_received']} by {po['received_by']}\n"
+    
+    return report
+
+def process_received_po(po_id, received_items, notes, mark_as_complete=False):
+    try:
+        receive_purchase_order(po_id, received_items, notes, st.session_state.user_info['username'], mark_as_complete)
+    except ServiceError:
+        return False
+    return True
@@ -0,0 +1,67 @@
+"""Plain-text sales receipts."""
+
+import streamlit as st
+import time
+
+from rocket_pos.core import SETTINGS_FILE, format_currency, load_data
+from rocket_pos.hardware import print_receipt
+
+def print_all_receipts(transactions):
+    """Print receipts for all transactions"""
+    success_count = 0
+    total_count = len(transactions)
+    
+    with st.spinner(f"Printing {total_count} receipts..."):
+        for transaction_id, transaction in transactions:
+            receipt_text = generate_receipt(transaction)
+            if print_receipt(receipt_text, transaction_id):
+                success_count += 1
+            # Add a small delay to avoid overwhelming the printer
+            time.sleep(0.5)
+    
+    if success_count == total_count:
+        st.success(f"Successfully printed {success_count} receipts")
+    else:
+        st.warning(f"Printed {success_count} of {total_count} receipts. Some may have failed.")
+
+def generate_receipt(transaction):
+    settings = load_data(SETTINGS_FILE)
+    receipt = ""
+    
+    # Header
+    receipt += f"{settings.get('store_name', 'Supermarket POS')}\n"
+    receipt += f"{settings.get('store_address', '')}\n"
+    receipt += f"{settings.get('store_phone', '')}\n"
+    receipt += "=" * 40 + "\n"
+    
+    if settings.get('receipt_header', ''):
+        receipt += f"{settings['receipt_header']}\n"
+        receipt += "=" * 40 + "\n"
+    
+    receipt += f"Date: {transaction['date']}\n"
+    receipt += f"Cashier: {transaction['cashier']}\n"
+    receipt += f"Transaction ID: {transaction['transaction_id']}\n"
+    receipt += "=" * 40 + "\n"
+    
+    # Items
+    for barcode, item in transaction['items'].items():
+        receipt += f"{item['name']} x{item['quantity']}: {format_currency(item['price'] * item['quantity'])}\n"
+    
+    receipt += "=" * 40 + "\n"
+    receipt += f"Subtotal: {format_currency(transaction['subtotal'])}\n"
+    receipt += f"Tax: {format_currency(transaction['tax'])}\n"
+    if transaction['discount'] != 0:
+        receipt += f"Discount: -{format_currency(abs(transaction['discount']))}\n"
+    receipt += f"Total: {format_currency(transaction['total'])}\n"
+    receipt += f"Payment Method: {transaction['payment_method']}\n"
+    receipt += f"Amount Tendered: {format_currency(transaction['amount_tendered'])}\n"
+    receipt += f"Change: {format_currency(transaction['change'])}\n"
+    receipt += "=" * 40 + "\n"
+    
+    if settings.get('receipt_footer', ''):
+        receipt += f"{settings['receipt_footer']}\n"
+        receipt += "=" * 40 + "\n"
+    
+    receipt += "Thank you for shopping with us!\n"
+    
+    return receipt
@@ -0,0 +1,165 @@
+"""Sales-velocity replenishment: what to reorder, how much, and from which supplier.
+
+Units sold per SKU per day come from the COGS day aggregates (costing.py), so
+the whole catalogue is scored in one vectorised pass over the lookback window:
+an exponentially weighted average of daily sales (velocity), the ratio of a
+fast to a slow EWMA (trend), days of cover, and a suggested order that brings
+stock on hand plus on order up to the supplier's lead time plus the review
+period, rounded up to the supplier's minimum order quantity. The static
+reorder_point stays as a floor, so SKUs with no sales history still get flagged.
+Plans are cached per data version of the files they read.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from rocket_pos.core import (
+    INVENTORY_FILE,
+    PRODUCTS_FILE,
+    SUPPLIERS_FILE,
+    PURCHASE_ORDERS_FILE,
+    data_version,
+    load_data,
+    load_data_snapshot,
+    snapshot_cache,
+)
+from rocket_pos.costing import cogs_day_files
+
+LOOKBACK_DAYS = 90
+VELOCITY_HALFLIFE = 14
+TREND_HALFLIFES = (7, 28)
+DEFAULT_LEAD_TIME_DAYS = 7
+DEFAULT_MIN_ORDER_QTY = 1
+DEFAULT_REORDER_POINT = 10
+OPEN_PO_STATUSES = ('draft', 'pending')
+
+def _window(today, lookback_days):
+    """The lookback window: complete days only, ending yesterday"""
+    end = today - datetime.timedelta(days=1)
+    return end - datetime.timedelta(days=lookback_days - 1), end
+
+@snapshot_cache(max_entries=2 * LOOKBACK_DAYS)
+def _day_sales(day, path, version):
+    """One COGS day file in long form: (barcodes, day ordinals, net units sold) arrays.
+
+    Cached per file version, so only today's file is re-read after a sale.
+    """
+    day_sales = load_data(path)['products']
+    barcodes = list(day_sales)
+    days = [datetime.date.fromisoformat(day).toordinal()] * len(day_sales)
+    quantities = [t['quantity'] - t['returns_quantity'] for t in day_sales.values()]
+    return np.asarray(barcodes, dtype=object), np.asarray(days, dtype=int), np.asarray(quantities, dtype=float)
+
+def _daily_sales(start, end):
+    """(barcodes, ages in days before end, net units sold) for every SKU-day with sales in the window"""
+    days = [_day_sales(day, path, data_version(path)) for day, path in cogs_day_files(start, end).items()]
+    if not days:
+        return np.array([], dtype=object), np.array([], dtype=int), np.array([], dtype=float)
+    barcodes, ordinals, quantities = (np.concatenate(parts) for parts in zip(*days))
+    return barcodes, end.toordinal() - ordinals, quantities
+
+def _ewma_weights(ages, halflife, lookback_days):
+    """EWMA weights for the given ages, normalised over the whole window so days without sales count as zero"""
+    decay = 0.5 ** (1.0 / halflife)
+    return decay ** ages / (decay ** np.arange(lookback_days)).sum()
+
+def sales_velocity(today=None, lookback_days=LOOKBACK_DAYS):
+    """DataFrame indexed by barcode with 'velocity' (units/day) and 'trend' (fast/slow EWMA - 1)"""
+    start, end = _window(today or datetime.date.today(), lookback_days)
+    barcodes, ages, quantities = _daily_sales(start, end)
+    sales = pd.DataFrame({
+        'barcode': barcodes,
+        'velocity': quantities * _ewma_weights(ages, VELOCITY_HALFLIFE, lookback_days),
+        'fast': quantities * _ewma_weights(ages, TREND_HALFLIFES[0], lookback_days),
+        'slow': quantities * _ewma_weights(ages, TREND_HALFLIFES[1], lookback_days),
+    })
+    rates = sales.groupby('barcode')[['velocity', 'fast', 'slow']].sum().clip(lower=0)
+    rates['trend'] = (rates['fast'] / rates['slow'].where(rates['slow'] > 0) - 1).fillna(0.0)
+    return rates[['velocity', 'trend']]
+
+def _on_order(purchase_orders):
+    """Units per barcode still to arrive on draft and pending purchase orders"""
+    on_order = {}
+    for po in purchase_orders.values():
+        if po.get('status') not in OPEN_PO_STATUSES:
+            continue
+        received = {}
+        for receipt in po.get('receipts', []):
+            for item in receipt.get('items', []):
+                received[item['barcode']] = received.get(item['barcode'], 0) + item.get('received_quantity', 0)
+        for item in po.get('items', []):
+            outstanding = item['quantity'] - received.get(item['barcode'], 0)
+            if outstanding > 0:
+                on_order[item['barcode']] = on_order.get(item['barcode'], 0) + outstanding
+    return on_order
+
+def _build_plan(today, cover_days, lookback_days):
+    inventory = load_data_snapshot(INVENTORY_FILE)
+    products = load_data_snapshot(PRODUCTS_FILE)
+    suppliers = load_data_snapshot(SUPPLIERS_FILE)
+
+    # Products name their supplier; pick up its lead time and MOQ by name
+    supplier_ids = {}
+    for supplier_id, supplier in suppliers.items():
+        supplier_ids.setdefault(supplier.get('name'), supplier_id)
+
+    rows = []
+    for barcode, inv_data in inventory.items():
+        product = products.get(barcode)
+        if product is None:
+            continue
+        supplier_id = supplier_ids.get(product.get('supplier'))
+        supplier = suppliers.get(supplier_id, {})
+        rows.append((
+            barcode,
+            product.get('name', 'Unknown'),
+            product.get('cost', 0),
+            supplier_id,
+            supplier.get('name', ''),
+            supplier.get('lead_time_days', DEFAULT_LEAD_TIME_DAYS),
+            supplier.get('min_order_qty', DEFAULT_MIN_ORDER_QTY),
+            inv_data.get('quantity', 0),
+            inv_data.get('reorder_point', DEFAULT_REORDER_POINT),
+        ))
+    plan = pd.DataFrame(rows, columns=['barcode', 'name', 'cost', 'supplier_id', 'supplier_name',
+                                       'lead_time_days', 'min_order_qty', 'current_stock', 'reorder_point'])
+    plan = plan.set_index('barcode')
+
+    rates = sales_velocity(today, lookback_days).reindex(plan.index, fill_value=0.0)
+    plan['velocity'] = rates['velocity']
+    plan['trend'] = rates['trend']
+    plan['on_order'] = pd.Series(_on_order(load_data(PURCHASE_ORDERS_FILE)), dtype=float).reindex(plan.index, fill_value=0.0)
+
+    # Forecast demand leans on the trend, within -50%/+100% so one busy week can't run away with it
+    daily_demand = plan['velocity'] * (1 + plan['trend'].clip(-0.5, 1.0))
+    position = plan['current_stock'] + plan['on_order']
+    plan['days_of_cover'] = (plan['current_stock'] / daily_demand.where(daily_demand > 0)).round(1)
+
+    reorder_level = np.maximum(daily_demand * plan['lead_time_days'], plan['reorder_point'])
+    order_up_to = reorder_level + daily_demand * cover_days
+    suggested = np.ceil(order_up_to - position).clip(lower=0)
+    plan['reorder'] = position < reorder_level
+    plan['quantity'] = np.where(plan['reorder'], np.maximum(suggested, plan['min_order_qty']), 0).astype(int)
+    plan['velocity'] = plan['velocity'].round(2)
+    plan['trend'] = plan['trend'].round(2)
+    return plan.sort_values('days_of_cover', na_position='last')
+
+@snapshot_cache(max_entries=8)
+def _cached_plan(versions, today, cover_days, lookback_days):
+    return _build_plan(today, cover_days, lookback_days)
+
+def replenishment_plan(cover_days=14, lookback_days=LOOKBACK_DAYS):
+    """One row per stocked product (indexed by barcode), most urgent first.
+
+    Columns include velocity, trend, days_of_cover, on_order, 'reorder' (needs
+    ordering now) and 'quantity' (the suggested order). Cached until any of the
+    files it reads changes; callers must not mutate the result.
+    """
+    today = datetime.date.today()
+    start, end = _window(today, lookback_days)
+    files = [INVENTORY_FILE, PRODUCTS_FILE, SUPPLIERS_FILE, PURCHASE_ORDERS_FILE]
+    files += list(cogs_day_files(start, end).values())
+    versions = tuple(data_version(file) for file in files)
+    return _cached_plan(versions, today, cover_days, lookback_days)
@@ -0,0 +1,100 @@
+"""What has already been returned from each sale.
+
+data/returns_index/ holds, per original transaction_id, the cumulative returned
+quantity and refund per barcode plus the ids of its returns, so the return
+screen and process_return check what is still returnable with a keyed lookup
+instead of scanning the returns log. Transactions are spread over BUCKETS files
+by a hash of their id, so recording a return rewrites one small bucket.
+meta.json records the data_version of the returns log the index matches; if the
+log changed some other way (a restore, an updated record) the index is rebuilt
+from it on next use.
+"""
+
+import os
+import shutil
+import zlib
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    load_data,
+    load_data_snapshot,
+    save_data,
+)
+from rocket_pos.returns_log import load_returns, returns_version
+
+RETURNS_INDEX_DIR = os.path.join(DATA_DIR, "returns_index")
+BUCKETS = 256
+
+def _bucket_path(transaction_id, index_dir=RETURNS_INDEX_DIR):
+    return os.path.join(index_dir, f"{zlib.crc32(transaction_id.encode()) % BUCKETS:03d}.json")
+
+def _meta_path(index_dir=RETURNS_INDEX_DIR):
+    return os.path.join(index_dir, "meta.json")
+
+def _returns_version():
+    return list(returns_version() or [])
+
+def _add_return(bucket, return_record):
+    entry = bucket.setdefault(return_record['transaction_id'], {'return_ids': [], 'items': {}, 'refund': 0.0})
+    if return_record['return_id'] in entry['return_ids']:
+        return
+    subtotal = return_record.get('subtotal_refund', 0)
+    # Each line's share of the tax refund, so line refunds add up to the return's total
+    tax_share = return_record.get('tax_refund', 0) / subtotal if subtotal else 0
+    for barcode, item in return_record.get('items', {}).items():
+        returned = entry['items'].setdefault(barcode, {'quantity': 0, 'refund': 0.0})
+        returned['quantity'] += item.get('quantity', 0)
+        returned['refund'] += item.get('subtotal', 0) * (1 + tax_share)
+    entry['refund'] += return_record.get('total_refund', 0)
+    entry['return_ids'].append(return_record['return_id'])
+
+def rebuild_returns_index():
+    """Rebuild every bucket from the returns log (built aside and swapped in)"""
+    with DATA_LOCK:
+        buckets = {}
+        for return_record in load_returns().values():
+            if 'transaction_id' in return_record:
+                _add_return(buckets.setdefault(_bucket_path(return_record['transaction_id']), {}), return_record)
+
+        build_dir = f"{RETURNS_INDEX_DIR}.rebuild"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+        for path, bucket in buckets.items():
+            save_data(bucket, os.path.join(build_dir, os.path.basename(path)))
+        save_data({'returns_version': _returns_version()}, _meta_path(build_dir))
+        shutil.rmtree(RETURNS_INDEX_DIR, ignore_errors=True)
+        os.replace(build_dir, RETURNS_INDEX_DIR)
+
+def ensure_returns_index():
+    """Rebuild the index if the returns log has changed since it was last written"""
+    if load_data_snapshot(_meta_path()).get('returns_version') != _returns_version():
+        rebuild_returns_index()
+
+def record_return(return_record):
+    """Add a return that has just been appended to the returns log.
+
+    Call inside the write lock that checked the return against returned_items(),
+    so the index was current just before the return was appended.
+    """
+    path = _bucket_path(return_record['transaction_id'])
+    if not os.path.isdir(RETURNS_INDEX_DIR):
+        rebuild_returns_index()  # built from the log, which already holds this return
+        return
+    bucket = load_data(path)
+    _add_return(bucket, return_record)
+    save_data(bucket, path)
+    save_data({'returns_version': _returns_version()}, _meta_path())
+
+def returned_items(transaction_id):
+    """{barcode: {'quantity', 'refund'}} already returned from a transaction (read-only)"""
+    ensure_returns_index()
+    return load_data_snapshot(_bucket_path(transaction_id)).get(transaction_id, {}).get('items', {})
+
+def returnable_quantities(transaction):
+    """{barcode: quantity still returnable} for a transaction record"""
+    returned = returned_items(transaction['transaction_id'])
+    return {
+        barcode: max(item['quantity'] - returned.get(barcode, {}).get('quantity', 0), 0)
+        for barcode, item in transaction['items'].items()
+    }
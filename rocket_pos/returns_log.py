@@ -0,0 +1,69 @@
+"""Return records as an append-only log.
+
+Each return is one JSON line in data/returns.jsonl, so processing a return
+appends a line instead of rewriting every return ever made. A later change to
+a return (completing an exchange) appends the updated record; the last line for
+a return_id is the current one. load_returns() gives the {return_id: record}
+view the reports use, parsed once per version of the log.
+Installs that still keep their records in returns.json have them moved to the
+log on first use; returns.json is then left empty.
+"""
+
+import json
+import os
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    RETURNS_FILE,
+    append_data,
+    data_version,
+    load_data,
+    load_data_lines,
+    load_data_snapshot,
+    save_data,
+    snapshot_cache,
+)
+
+RETURNS_LOG_FILE = os.path.join(DATA_DIR, "returns.jsonl")
+
+def ensure_returns_log():
+    """Move records still in returns.json (an older install, or a restored older backup) to the log.
+
+    The log is rewritten whole from returns.json, which holds every return
+    whenever it has any, so re-running after a crash gives the same log.
+    """
+    if not load_data_snapshot(RETURNS_FILE):
+        return
+    with DATA_LOCK:
+        legacy = load_data(RETURNS_FILE)
+        if not legacy:
+            return
+        tmp_path = f"{RETURNS_LOG_FILE}.tmp"
+        records = sorted(legacy.values(), key=lambda r: r.get('return_date', ''))
+        with open(tmp_path, 'w') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+        os.replace(tmp_path, RETURNS_LOG_FILE)
+        save_data({}, RETURNS_FILE)
+
+@snapshot_cache(max_entries=4)
+def _load_returns(version):
+    returns = {}
+    for record in load_data_lines(RETURNS_LOG_FILE):
+        returns[record['return_id']] = record
+    return returns
+
+def load_returns():
+    """{return_id: record} of every return; shared across reruns, so callers must not mutate it"""
+    ensure_returns_log()
+    return _load_returns(returns_version())
+
+def returns_version():
+    """data_version() of the log, for caches of values derived from the returns"""
+    return data_version(RETURNS_LOG_FILE)
+
+def append_return(return_record):
+    """Add a new or changed return record to the log"""
+    with DATA_LOCK:
+        ensure_returns_log()
+        append_data(return_record, RETURNS_LOG_FILE)
@@ -0,0 +1,36 @@
+"""Idempotency keys of committed sales.
+
+A checkout carries a key chosen by the client (the POS session, or an API
+caller's idempotency_key). commit_sale() records key -> transaction_id here in
+the same data_transaction() as the sale itself, so committing with the same key
+again finds the original sale instead of selling twice. Keys are spread over
+BUCKETS files by a hash of the key, and each bucket drops keys older than
+KEY_RETENTION_DAYS when it is next written.
+"""
+
+import datetime
+import os
+import zlib
+
+from rocket_pos.core import DATA_DIR, load_data, save_data
+
+SALE_KEYS_DIR = os.path.join(DATA_DIR, "sale_keys")
+BUCKETS = 64
+KEY_RETENTION_DAYS = 7
+
+def _bucket_path(key):
+    return os.path.join(SALE_KEYS_DIR, f"{zlib.crc32(key.encode()) % BUCKETS:02d}.json")
+
+def lookup_sale_key(key):
+    """{'transaction_id', 'date'} of the sale committed under key, or None"""
+    return load_data(_bucket_path(key)).get(key)
+
+def record_sale_key(key, transaction_id, date):
+    """Remember key for a sale being committed (call inside its data_transaction())"""
+    path = _bucket_path(key)
+    cutoff = (datetime.datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+              - datetime.timedelta(days=KEY_RETENTION_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+    bucket = {k: entry for k, entry in load_data(path).items() if entry['date'] >= cutoff}
+    bucket[key] = {'transaction_id': transaction_id, 'date': date}
+    os.makedirs(SALE_KEYS_DIR, exist_ok=True)
+    save_data(bucket, path)
@@ -0,0 +1,57 @@
+"""Sales history as column arrays for analytics.
+
+transactions.json is walked once per version into two DataFrames - one row
+per sale and one row per line item - so analytics (customer RFM, basket
+co-occurrence) are groupbys over arrays instead of Python loops over dicts.
+Both are cached until transactions.json changes; callers must not mutate them.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rocket_pos.core import TRANSACTIONS_FILE, data_version, load_data, snapshot_cache
+
+@snapshot_cache(max_entries=2)
+def _sales_frames(version):
+    transaction_ids, customer_ids, dates, totals, discounts, line_counts = [], [], [], [], [], []
+    barcodes, quantities, prices = [], [], []
+    for transaction_id, t in load_data(TRANSACTIONS_FILE).items():
+        items = t.get('items') or {}
+        transaction_ids.append(transaction_id)
+        customer_ids.append(t.get('customer_id') or '')
+        dates.append(t.get('date', ''))
+        totals.append(t.get('total', 0))
+        discounts.append(t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0))
+        line_counts.append(len(items))
+        barcodes.extend(items)
+        quantities.extend(item.get('quantity', 0) for item in items.values())
+        prices.extend(item.get('price', 0) for item in items.values())
+
+    # Line items point back at their sale by row position
+    sale_rows = np.repeat(np.arange(len(transaction_ids)), line_counts)
+    quantities = np.asarray(quantities, dtype=float)
+    lines = pd.DataFrame({
+        'sale': sale_rows,
+        'barcode': np.asarray(barcodes, dtype=object),
+        'quantity': quantities,
+        'price': np.asarray(prices, dtype=float),
+    })
+    sales = pd.DataFrame({
+        'transaction_id': np.asarray(transaction_ids, dtype=object),
+        'customer_id': np.asarray(customer_ids, dtype=object),
+        'date': pd.to_datetime(pd.Series(dates, dtype=object), format="%Y-%m-%d %H:%M:%S", errors='coerce'),
+        'total': np.asarray(totals, dtype=float),
+        'discount': np.asarray(discounts, dtype=float),
+        'units': np.bincount(sale_rows, weights=quantities, minlength=len(transaction_ids)),
+    })
+    return sales, lines
+
+def sales_frames():
+    """(sales, lines) DataFrames for every saved sale.
+
+    sales has one row per transaction: transaction_id, customer_id ('' for
+    walk-ins), date (NaT if unparseable), total, discount (all discount kinds)
+    and units. lines has one row per line item: sale (the row in sales),
+    barcode, quantity and price.
+    """
+    return _sales_frames(data_version(TRANSACTIONS_FILE))
@@ -0,0 +1,226 @@
+"""Receipt barcodes, and barcode decoding from photos, cameras and video files.
+
+Receipts carry the transaction ID as a Code128 strip (read by the keyboard and
+serial scanners the POS already uses) and a QR code (read by cameras). Decoding
+uses pyzbar when the zbar shared library is installed and otherwise OpenCV,
+which reads QR codes and EAN/UPC product barcodes but not Code128.
+
+Video sources (a local camera index or a recorded file) go through a pipeline
+built to keep up with the camera: only every (frame_skip + 1)th frame is
+decoded, it is cropped to a centred region of interest, converted to grayscale
+and downscaled, and decoding runs on a thread pool (OpenCV and zbar release
+the GIL) while the next frames are read.
+"""
+
+import base64
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+from PIL import Image
+from reportlab.graphics.barcode import code128, qrencoder
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    from pyzbar import pyzbar
+except ImportError:  # also raised when the zbar shared library is missing
+    pyzbar = None
+
+RECEIPT_BARCODES = {"both": "Code128 + QR", "code128": "Code128 only", "qr": "QR only", "none": "None"}
+DEFAULT_FRAME_SKIP = 2
+DEFAULT_ROI = 0.6
+DEFAULT_MAX_WIDTH = 640
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+class ScanError(Exception):
+    """A camera or video source that can't be opened, or no decoder available"""
+
+# Encoding: module matrices (True = dark) rendered to images at any scale
+def _code128_modules(value):
+    symbol = code128.Code128(value)
+    symbol.validate()
+    symbol.encode()
+    symbol.decompose()
+    # decomposed is one letter per bar or space: upper case = bar, lower case = space, a=1 module wide
+    modules = []
+    for element in symbol.decomposed:
+        modules += [element.isupper()] * (ord(element.lower()) - ord('a') + 1)
+    return np.array([modules], dtype=bool)
+
+def _qr_modules(value):
+    qr = qrencoder.QRCode(None, qrencoder.QRErrorCorrectLevel.M)
+    qr.addData(value)
+    qr.make()
+    count = qr.getModuleCount()
+    return np.array([[qr.isDark(row, col) for col in range(count)] for row in range(count)], dtype=bool)
+
+def barcode_image(value, symbology="code128", scale=2, height=50):
+    """PIL image of value as a Code128 strip ('code128') or a QR code ('qr'), with quiet zones"""
+    if symbology == "qr":
+        modules = np.pad(_qr_modules(value), 4)
+        pixels = np.kron(modules, np.ones((scale * 2, scale * 2), dtype=bool))
+    else:
+        modules = np.pad(_code128_modules(value), ((0, 0), (10, 10)))
+        pixels = np.repeat(np.repeat(modules, scale, axis=1), height, axis=0)
+    return Image.fromarray(np.where(pixels, 0, 255).astype(np.uint8))
+
+def receipt_barcodes(value, setting="both"):
+    """The barcode images a receipt for value should carry, per the 'receipt_barcode' setting"""
+    symbologies = {"both": ["code128", "qr"], "code128": ["code128"], "qr": ["qr"]}.get(setting, [])
+    return [barcode_image(value, symbology) for symbology in symbologies]
+
+def image_data_uri(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+# Decoding
+def decoder_backend():
+    """'pyzbar', 'opencv', or None when neither is installed"""
+    if pyzbar is not None:
+        return "pyzbar"
+    if cv2 is not None:
+        return "opencv"
+    return None
+
+_detectors = threading.local()
+
+def _opencv_detectors():
+    # OpenCV detectors aren't safe to share between threads; one pair per worker
+    if not hasattr(_detectors, 'qr'):
+        _detectors.qr = cv2.QRCodeDetector()
+        _detectors.barcode = cv2.barcode.BarcodeDetector()
+    return _detectors.qr, _detectors.barcode
+
+def prepare_frame(frame, roi=DEFAULT_ROI, max_width=DEFAULT_MAX_WIDTH):
+    """Grayscale, crop to the centred roi (fraction of width/height; None = whole frame) and downscale"""
+    frame = np.asarray(frame)
+    if frame.ndim == 3:
+        if cv2 is not None:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY if frame.shape[2] == 3 else cv2.COLOR_BGRA2GRAY)
+        else:
+            frame = np.asarray(Image.fromarray(frame).convert("L"))
+    if roi and roi < 1:
+        height, width = frame.shape
+        top, left = int(height * (1 - roi) / 2), int(width * (1 - roi) / 2)
+        frame = frame[top:height - top, left:width - left]
+    if max_width and frame.shape[1] > max_width:
+        new_size = (max_width, int(frame.shape[0] * max_width / frame.shape[1]))
+        if cv2 is not None:
+            frame = cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+        else:
+            frame = np.asarray(Image.fromarray(frame).resize(new_size, Image.BILINEAR))
+    return frame
+
+def decode_frame(gray):
+    """Codes found in a prepared grayscale frame, as a list of strings"""
+    backend = decoder_backend()
+    if backend == "pyzbar":
+        return [symbol.data.decode("utf-8", "replace") for symbol in pyzbar.decode(gray)]
+    if backend == "opencv":
+        qr, barcode = _opencv_detectors()
+        codes = []
+        data, _, _ = qr.detectAndDecode(gray)
+        if data:
+            codes.append(data)
+        found, infos, _, _ = barcode.detectAndDecodeWithType(gray)
+        if found:
+            codes += [info for info in infos if info]
+        return codes
+    raise ScanError("No barcode decoder available: install pyzbar (with the zbar library) or opencv-python-headless")
+
+def decode_image(image, roi=None, max_width=1280):
+    """Codes in a photo: raw bytes, a file-like object (e.g. an upload), a PIL image or an array.
+
+    Photos are decoded whole by default, since the code may be anywhere in them,
+    and retried at full resolution if the downscaled copy finds nothing.
+    """
+    if isinstance(image, bytes):
+        image = io.BytesIO(image)
+    if not isinstance(image, (Image.Image, np.ndarray)):
+        image = Image.open(image)
+    if isinstance(image, Image.Image):
+        image = image.convert("L")
+    codes = decode_frame(prepare_frame(image, roi, max_width))
+    if not codes and max_width and np.asarray(image).shape[1] > max_width:
+        codes = decode_frame(prepare_frame(image, roi, None))
+    return list(dict.fromkeys(codes))
+
+def _open_source(source):
+    if cv2 is None:
+        raise ScanError("Camera and video scanning need opencv-python-headless")
+    # A digit string is a local camera index; anything else a file path or stream URL
+    capture = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+    if not capture.isOpened():
+        raise ScanError(f"Could not open video source {source}")
+    return capture
+
+def scan_video(source, frame_skip=DEFAULT_FRAME_SKIP, roi=DEFAULT_ROI, max_width=DEFAULT_MAX_WIDTH,
+               workers=DEFAULT_WORKERS, stop_on_first=True, timeout=None, max_frames=None):
+    """Decode a camera index or video file; returns the codes found and throughput stats.
+
+    Frames are read on this thread and decoded on the pool, with at most two
+    frames per worker in flight, so reading waits for a slow decoder rather
+    than queueing frames without bound. Stops at the first code (stop_on_first), after timeout
+    seconds, after max_frames frames, or at the end of a file.
+    """
+    capture = _open_source(source)
+    codes = []
+    frames_read = frames_decoded = 0
+    started = time.perf_counter()
+    pending = set()
+
+    def collect(done):
+        nonlocal frames_decoded
+        for future in done:
+            frames_decoded += 1
+            for code in future.result():
+                if code not in codes:
+                    codes.append(code)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while not (stop_on_first and codes):
+                if timeout and time.perf_counter() - started > timeout:
+                    break
+                if max_frames and frames_read >= max_frames:
+                    break
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                frames_read += 1
+                if (frames_read - 1) % (frame_skip + 1):
+                    continue
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(lambda f: decode_frame(prepare_frame(f, roi, max_width)), frame))
+            done, pending = wait(pending)
+            collect(done)
+    finally:
+        capture.release()
+
+    seconds = time.perf_counter() - started
+    return {
+        'codes': codes,
+        'frames_read': frames_read,
+        'frames_decoded': frames_decoded,
+        'seconds': seconds,
+        'fps': frames_read / seconds if seconds else 0.0
+    }
+
+def scan_settings(settings):
+    """scan_video() options from the hardware settings"""
+    return {
+        'frame_skip': settings.get('scan_frame_skip', DEFAULT_FRAME_SKIP),
+        'roi': settings.get('scan_roi', DEFAULT_ROI),
+        'max_width': settings.get('scan_max_width', DEFAULT_MAX_WIDTH),
+        'workers': settings.get('scan_workers', DEFAULT_WORKERS)
+    }
@@ -0,0 +1,646 @@
+"""Headless POS operations shared by the Streamlit pages and the local HTTP API.
+
+Nothing here calls st.* or reads st.session_state: the acting user (and shift)
+is passed in explicitly, results come back as plain dicts, and failures raise
+ServiceError with a message the caller can show however it likes.
+"""
+
+from rocket_pos.cart import Cart
+from rocket_pos.cash_ledger import record_cash
+from rocket_pos.costing import cost_receipt, cost_return, cost_sale_lines
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    TRANSACTIONS_FILE,
+    OFFERS_FILE,
+    LOYALTY_FILE,
+    SETTINGS_FILE,
+    PURCHASE_ORDERS_FILE,
+    data_transaction,
+    generate_short_id,
+    get_current_datetime,
+    load_data,
+    load_data_snapshot,
+    save_data,
+)
+from rocket_pos.discount_rules import applicable_discounts
+from rocket_pos.loyalty import safe_customer_lookup
+from rocket_pos.outdoor_orders import load_live_orders, set_order_status
+from rocket_pos.points_ledger import (
+    PointsError,
+    apply_points,
+    customer_state,
+    record_purchase,
+    record_redemption,
+    set_points,
+)
+from rocket_pos.returns_index import record_return, returnable_quantities
+from rocket_pos.returns_log import append_return
+from rocket_pos.sale_keys import lookup_sale_key, record_sale_key
+from rocket_pos.shifts import record_shift_return, record_shift_transaction
+from rocket_pos.stock_ledger import ensure_stock_ledger, record_stock_events, stock_event
+from rocket_pos.transaction_index import ensure_transaction_index, lookup_transaction, record_transaction
+
+DEFAULT_PAYMENT_CHARGES = {
+    "cash": 0.0,
+    "credit_card": 2.0,
+    "debit_card": 1.0,
+    "mobile_payment": 1.5,
+    "bank_transfer": 0.5,
+    "international_card": 3.0
+}
+
+class ServiceError(Exception):
+    """A business rule rejected the request; the message is safe to show to the user"""
+
+def _now():
+    return get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+
+# Lookups
+def get_product(barcode):
+    """Product record plus its current stock level"""
+    products = load_data_snapshot(PRODUCTS_FILE)
+    if barcode not in products:
+        raise ServiceError(f"Product {barcode} not found")
+    inventory = load_data_snapshot(INVENTORY_FILE)
+    return dict(products[barcode], barcode=barcode, stock=inventory.get(barcode, {}).get('quantity', 0))
+
+def get_stock(barcodes=None):
+    """Stock levels by barcode, for all products or just the given barcodes"""
+    inventory = load_data_snapshot(INVENTORY_FILE)
+    if barcodes is None:
+        barcodes = load_data_snapshot(PRODUCTS_FILE).keys()
+    return {barcode: inventory.get(barcode, {}).get('quantity', 0) for barcode in barcodes}
+
+def find_customer(phone=None, customer_id=None):
+    """Loyalty customer by phone or ID, including their customer_id"""
+    customer = safe_customer_lookup(phone=phone, customer_id=customer_id)
+    if not customer:
+        raise ServiceError("Customer not found")
+    if not customer_id:
+        customers = load_data(LOYALTY_FILE).get('customers', {})
+        customer_id = next(cust_id for cust_id, cust in customers.items() if cust.get('phone') == phone)
+    return dict(customer, customer_id=customer_id)
+
+# Sales
+def price_sale(items, offer_name=None, discount_name=None, customer_id=None, points=0, payment_method="Cash"):
+    """Build a Cart from {barcode: quantity} and return its pricing breakdown.
+
+    Mirrors what the POS totals panel does with the same choices, so a quote from
+    here can be passed straight to commit_sale().
+    """
+    products = load_data_snapshot(PRODUCTS_FILE)
+    inventory = load_data_snapshot(INVENTORY_FILE)
+    settings = load_data_snapshot(SETTINGS_FILE)
+    loyalty_data = load_data_snapshot(LOYALTY_FILE)
+
+    if not items:
+        raise ServiceError("Cart is empty")
+
+    cart = Cart()
+    cart.set_tax_rate(settings.get('tax_rate', 0.0))
+    for barcode, quantity in items.items():
+        if barcode not in products:
+            raise ServiceError(f"Product {barcode} not found")
+        if quantity <= 0:
+            raise ServiceError(f"Invalid quantity for {barcode}")
+        if inventory.get(barcode, {}).get('quantity', 0) < quantity:
+            raise ServiceError(f"{products[barcode]['name']} does not have enough stock")
+        cart.add(barcode, products[barcode], quantity)
+
+    if offer_name:
+        offer = next((o for o in load_data_snapshot(OFFERS_FILE).values()
+                      if o['name'] == offer_name and o.get('active', True)), None)
+        if not offer:
+            raise ServiceError(f"Offer '{offer_name}' is not active")
+        cart.set_offer(offer)
+
+    discount, discount_lines = None, None
+    if discount_name:
+        discount, discount_lines = next(((d, eligible) for d, eligible in applicable_discounts(cart.lines).values()
+                                         if d['name'] == discount_name), (None, None))
+        if not discount:
+            raise ServiceError(f"Discount '{discount_name}' is not active or doesn't apply to these items today")
+
+    loyalty_settings = loyalty_data.get('settings', {})
+    points_value = loyalty_settings.get('points_value', 0.01)
+    loyalty_rate = 0.0
+    if customer_id:
+        customer = loyalty_data.get('customers', {}).get(customer_id)
+        if not customer:
+            raise ServiceError("Customer not found")
+        customer = customer_state(customer_id, customer)
+        loyalty_rate = loyalty_data.get('tiers', {}).get(customer.get('tier', 'Bronze'), {}).get('discount', 0)
+        if points > customer.get('points', 0):
+            raise ServiceError("Customer does not have enough points")
+    elif points:
+        raise ServiceError("Points can only be redeemed for a loyalty customer")
+
+    payment_charges = settings.get('payment_charges', DEFAULT_PAYMENT_CHARGES)
+    return cart.pricing(
+        discount,
+        loyalty_rate,
+        points=points,
+        points_value=points_value,
+        points_per_dollar=loyalty_settings.get('points_per_dollar', 1),
+        customer_id=customer_id,
+        payment_method=payment_method,
+        payment_charge_percent=payment_charges.get(payment_method.lower().replace(" ", "_"), 0.0),
+        discount_lines=discount_lines
+    )
+
+def replayed_sale(idempotency_key, items=None):
+    """The sale already committed under idempotency_key, or None.
+
+    items ({barcode: quantity}), when given, must match that sale's; a key reused
+    for a different sale raises ServiceError.
+    """
+    entry = lookup_sale_key(idempotency_key)
+    if entry is None:
+        return None
+    transaction = lookup_transaction(entry['transaction_id'])
+    if transaction is None:
+        return None  # e.g. a restore rolled the sale back; it can be made again
+    if items is not None and {barcode: item['quantity'] for barcode, item in transaction['items'].items()} != items:
+        raise ServiceError(f"Idempotency key {idempotency_key} was already used for a different sale")
+    return dict(transaction)
+
+def commit_sale(pricing, amount_tendered, username, shift_id=None, idempotency_key=None):
+    """Record a sale from a Cart.pricing() breakdown and return the transaction.
+
+    Updates inventory, the customer's loyalty points and tier, and the cash drawer
+    (cash sales during a shift), all in one data_transaction(): a failure part way
+    leaves every file as it was. Redeemed points are checked against the balance
+    at commit, so points another till has just spent fail the sale. With an
+    idempotency_key, committing again with the same key (a double-click, a rerun,
+    a client retry) returns the original sale. Printing and opening the drawer are
+    left to the caller.
+    """
+    if amount_tendered < pricing['amount_due']:
+        raise ServiceError("Amount tendered is less than total")
+
+    # Backfilling the stock log slims inventory.json; do it before inventory is loaded to save back
+    ensure_stock_ledger()
+    # record_transaction() keeps the receipt index current only if it is current before the sale is saved
+    ensure_transaction_index()
+    with data_transaction():
+        if idempotency_key:
+            replay = replayed_sale(idempotency_key,
+                                   {barcode: item['quantity'] for barcode, item in pricing['items'].items()})
+            if replay:
+                return replay
+
+        inventory = load_data(INVENTORY_FILE)
+        transactions = load_data(TRANSACTIONS_FILE)
+        customers = load_data_snapshot(LOYALTY_FILE).get('customers', {})
+
+        cart_items = {barcode: dict(item) for barcode, item in pricing['items'].items()}
+        customer_id = pricing['customer_id']
+        points_to_redeem = pricing['points_redeemed']
+        net_amount = pricing['net_amount']
+        payment_method = pricing['payment_method']
+        loyalty_points_earned = pricing['loyalty_points_earned']
+
+        for barcode in cart_items:
+            if barcode not in inventory:
+                raise ServiceError(f"Product {barcode} not found in inventory")
+
+        # Generate transaction ID
+        transaction_id = generate_short_id()
+        now = _now()
+
+        # Create transaction record with ALL discount information
+        transaction = {
+            'transaction_id': transaction_id,
+            'date': now,
+            'cashier': username,
+            'items': cart_items,
+            'subtotal': pricing['subtotal'],
+            'tax': pricing['tax'],
+            'offer_discount': pricing['offer_discount'],
+            'manual_discount': pricing['manual_discount'],
+            'loyalty_discount': pricing['loyalty_discount'],
+            'points_discount': pricing['points_discount'],
+            'total_discount': pricing['total_discount'],
+            'total_before_discounts': pricing['total_before_discounts'],
+            'total': net_amount,  # This is the amount before payment charges
+            'payment_method': payment_method,
+            'payment_charge_percent': pricing['payment_charge_percent'],
+            'payment_charge_amount': pricing['payment_charge_amount'],
+            'amount_tendered': amount_tendered,
+            'change': amount_tendered - pricing['amount_due'],
+            'shift_id': shift_id,
+            'customer_id': customer_id,
+            'loyalty_points_earned': loyalty_points_earned,
+            'loyalty_points_redeemed': points_to_redeem,
+            'net_amount': net_amount,  # This is what should match reports
+
+            # Legacy fields kept for older reports
+            'discount': pricing['manual_discount'],
+            'loyalty_points': loyalty_points_earned
+        }
+
+        # Add offer information if applied
+        if pricing['offer']:
+            transaction['applied_offer'] = pricing['offer']
+
+        # Cost the lines from the stock layers (stamps unit_cost) before stock leaves
+        cost_sale_lines(cart_items, inventory, load_data_snapshot(PRODUCTS_FILE), now)
+        record_stock_events([stock_event(barcode, 'sale', -item['quantity'], transaction_id)
+                             for barcode, item in cart_items.items()], username, now)
+
+        # Update inventory
+        for barcode, item in cart_items.items():
+            inventory[barcode]['quantity'] -= item['quantity']
+            inventory[barcode]['last_updated'] = now
+
+        # Update loyalty points, tier and visit counters
+        if customer_id and customer_id in customers:
+            try:
+                record_purchase(customer_id, loyalty_points_earned, points_to_redeem, net_amount,
+                                transaction_id, now, username)
+            except PointsError as e:
+                raise ServiceError(f"Loyalty points: {e}")
+
+        # Update cash drawer if payment is cash
+        if payment_method == "Cash" and shift_id:
+            record_cash('sale', net_amount, username, shift_id, date=now, transaction_id=transaction_id)
+
+        transactions[transaction_id] = transaction
+        save_data(transactions, TRANSACTIONS_FILE)
+        record_transaction(transaction)
+        save_data(inventory, INVENTORY_FILE)
+        if idempotency_key:
+            record_sale_key(idempotency_key, transaction_id, now)
+
+        if shift_id:
+            record_shift_transaction(shift_id, transaction, net_amount if payment_method == "Cash" else 0.0)
+
+    return transaction
+
+# Purchase orders
+def receive_purchase_order(po_id, received_items, notes, username, mark_as_complete=False):
+    """Book received PO lines into inventory and advance the PO status; returns the PO.
+
+    Cost layers, the stock log, inventory and the PO are written in one
+    data_transaction(), so a receipt is booked everywhere or nowhere.
+    """
+    # Backfilling the stock log slims inventory.json; do it before inventory is loaded to save back
+    ensure_stock_ledger()
+    with data_transaction():
+        purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+        inventory = load_data(INVENTORY_FILE)
+        products = load_data(PRODUCTS_FILE)
+
+        if po_id not in purchase_orders:
+            raise ServiceError(f"Purchase order {po_id} not found")
+
+        po = purchase_orders[po_id]
+
+        if po['status'] == 'received':
+            return po  # Already fully processed
+
+        # Initialize receipts if not exists
+        if 'receipts' not in po:
+            po['receipts'] = []
+
+        now = _now()
+
+        cost_receipt(received_items, inventory, products, now, po_id)
+        record_stock_events([stock_event(item['barcode'], 'po_receipt', item['received_quantity'], po_id)
+                             for item in received_items if item['received_quantity'] > 0], username, now)
+
+        # Update inventory only for received items
+        for item in received_items:
+            if item['received_quantity'] > 0:
+                barcode = item['barcode']
+
+                if barcode in inventory:
+                    inventory[barcode]['quantity'] += item['received_quantity']
+                else:
+                    # Initialize inventory with default values if product doesn't exist in inventory
+                    inventory[barcode] = {
+                        'quantity': item['received_quantity'],
+                        'reorder_point': 10  # Default reorder point
+                    }
+
+                inventory[barcode]['last_updated'] = now
+
+        # Update PO status
+        if all(item['received_quantity'] == item['ordered_quantity'] for item in received_items):
+            po['status'] = 'received'
+        elif mark_as_complete:
+            po['status'] = 'partially_received'
+        else:
+            po['status'] = 'pending'  # Still waiting for more items
+
+        # Add receipt details to PO
+        po['receipts'].append({
+            'date': now,
+            'received_by': username,
+            'items': received_items,
+            'notes': notes
+        })
+
+        # Update the PO items if partially received and marked as complete
+        if mark_as_complete and po['status'] == 'partially_received':
+            # Adjust PO items to only include remaining quantities
+            po['items'] = [
+                {
+                    'barcode': item['barcode'],
+                    'name': item['name'],
+                    'quantity': item['ordered_quantity'] - item['received_quantity'],
+                    'cost': item['cost']
+                }
+                for item in received_items
+                if item['received_quantity'] < item['ordered_quantity']
+            ]
+
+        # Update completion info if fully or partially completed
+        if po['status'] in ['received', 'partially_received']:
+            po['date_received'] = now
+            po['received_by'] = username
+
+        save_data(purchase_orders, PURCHASE_ORDERS_FILE)
+        save_data(inventory, INVENTORY_FILE)
+    return po
+
+# Outdoor orders
+def deliver_outdoor_order(order_id, username, shift_id=None):
+    """Mark an outdoor order delivered, take its stock and record the sale; returns the transaction.
+
+    Stock, cost layers, loyalty points, the transaction and the order's status
+    are written in one data_transaction(), like a sale.
+    """
+    # Backfilling the stock log slims inventory.json; do it before inventory is loaded to save back
+    ensure_stock_ledger()
+    # record_transaction() keeps the receipt index current only if it is current before the sale is saved
+    ensure_transaction_index()
+    with data_transaction():
+        # Only approved orders can be delivered; delivered and rejected ones are already archived
+        order = load_live_orders()['orders'].get(order_id)
+        if order is None:
+            raise ServiceError(f"Outdoor order {order_id} not found or already closed")
+        if order['status'] != 'approved':
+            raise ServiceError(f"Outdoor order {order_id} must be approved before delivery")
+        now = _now()
+
+        # Update inventory
+        inventory = load_data(INVENTORY_FILE)
+        items = {barcode: dict(item) for barcode, item in order['items'].items()}
+        cost_sale_lines(items, inventory, load_data_snapshot(PRODUCTS_FILE), now)
+        record_stock_events([stock_event(barcode, 'outdoor_delivery', -item['quantity'], order_id)
+                             for barcode, item in items.items() if barcode in inventory], username, now)
+        for barcode, item in items.items():
+            if barcode in inventory:
+                inventory[barcode]['quantity'] -= item['quantity']
+                inventory[barcode]['last_updated'] = now
+
+        # Create transaction record for outdoor sales
+        transactions = load_data(TRANSACTIONS_FILE)
+        transaction_id = f"OUT_{generate_short_id()}"
+
+        # Calculate totals for transaction record
+        subtotal = order['subtotal']
+        tax_rate = load_data(SETTINGS_FILE).get('tax_rate', 0.0)
+        tax_amount = subtotal * tax_rate
+        total_amount = order['total']
+
+        transaction = {
+            'transaction_id': transaction_id,
+            'date': now,
+            'cashier': username,
+            'items': items,
+            'subtotal': subtotal,
+            'tax': tax_amount,
+            'total': total_amount,
+            'payment_method': order['payment_method'],
+            'payment_charge_percent': order.get('payment_charge_percent', 0),
+            'payment_charge_amount': order.get('payment_charge_amount', 0),
+            'amount_tendered': total_amount + order.get('payment_charge_amount', 0),
+            'change': 0,
+            'shift_id': shift_id,
+            'customer_id': order.get('customer_id'),
+            'order_type': 'outdoor_delivery',
+            'outdoor_order_id': order_id,
+            'delivery_charge': order.get('delivery_charge', 0),
+            'delivery_type': order.get('delivery_type', 'Standard')
+        }
+
+        # Add loyalty points if customer exists
+        if order.get('customer_id'):
+            loyalty_data = load_data_snapshot(LOYALTY_FILE)
+            customer_id = order['customer_id']
+            if customer_id in loyalty_data.get('customers', {}):
+                points_per_dollar = loyalty_data.get('settings', {}).get('points_per_dollar', 1)
+                loyalty_points_earned = int(total_amount * points_per_dollar)
+
+                transaction['loyalty_points_earned'] = loyalty_points_earned
+                transaction['loyalty_points_redeemed'] = 0
+
+                # Update customer points
+                try:
+                    record_purchase(customer_id, loyalty_points_earned, 0, total_amount, transaction_id, now,
+                                    username)
+                except PointsError as e:
+                    raise ServiceError(f"Loyalty points: {e}")
+
+        transactions[transaction_id] = transaction
+        save_data(transactions, TRANSACTIONS_FILE)
+        record_transaction(transaction)
+        save_data(inventory, INVENTORY_FILE)
+        set_order_status(order_id, 'delivered', username, now, from_status='approved')
+
+        if shift_id:
+            record_shift_transaction(shift_id, transaction)
+    return transaction
+
+# Loyalty
+def adjust_customer_points(customer_id, points, reason, mode="add", username=None, expected_version=None):
+    """Add, subtract or set a customer's points; returns the updated customer.
+
+    expected_version is the customer's points_version as the caller last saw it;
+    if given and the points have changed since, nothing is changed.
+    """
+    try:
+        if mode == "add":
+            apply_points(customer_id, points, 'adjust', reason, username, source="manual_addition",
+                         expected_version=expected_version)
+        elif mode == "subtract":
+            apply_points(customer_id, -points, 'adjust', reason, username, expected_version=expected_version)
+        elif mode == "set":
+            set_points(customer_id, points, reason, username, expected_version=expected_version)
+        else:
+            raise ServiceError(f"Unknown points adjustment '{mode}'")
+    except PointsError as e:
+        raise ServiceError(str(e))
+    return find_customer(customer_id=customer_id)
+
+def redeem_reward(customer_id, reward_id, username, expected_version=None):
+    """Spend a customer's points on a reward; returns (updated customer, redemption record)"""
+    reward = load_data_snapshot(LOYALTY_FILE).get('rewards', {}).get(reward_id)
+    if not reward or not reward.get('active', True):
+        raise ServiceError("Reward not found or no longer active")
+    try:
+        _, redemption = record_redemption(customer_id, reward_id, reward, username, expected_version)
+    except PointsError as e:
+        raise ServiceError(str(e))
+    return find_customer(customer_id=customer_id), redemption
+
+# Returns
+def process_return(transaction_id, return_items, username, return_option="Refund", refund_method=None,
+                   exchange_products=None, notes="", shift_id=None):
+    """Record a return/exchange against a transaction and restock the items.
+
+    return_items: {barcode: {'quantity', 'reason', 'condition'}}
+    exchange_products: [{'barcode', 'quantity', 'price' (optional)}] for exchanges
+    The return, its index entry, stock, cost layers, cash and shift totals are
+    written in one data_transaction(), like a sale. Returns the stored return record.
+    """
+    # Backfilling the stock log slims inventory.json; do it before inventory is loaded to save back
+    ensure_stock_ledger()
+    with data_transaction():
+        transaction = lookup_transaction(transaction_id)
+        if transaction is None:
+            raise ServiceError("Transaction not found. Please check the Transaction ID.")
+        returnable = returnable_quantities(transaction)
+
+        # Price the returned items from the original sale
+        items = {}
+        for barcode, item in return_items.items():
+            sold = transaction['items'].get(barcode)
+            if not sold:
+                raise ServiceError(f"Product {barcode} is not part of this transaction")
+            if item['quantity'] <= 0:
+                raise ServiceError(f"Invalid return quantity for {sold['name']}")
+            if item['quantity'] > returnable[barcode]:
+                raise ServiceError(f"Only {returnable[barcode]} of {sold['name']} can still be returned "
+                                   f"({sold['quantity'] - returnable[barcode]} already returned)")
+            items[barcode] = {
+                'name': sold['name'],
+                'quantity': item['quantity'],
+                'price': sold['price'],
+                'subtotal': item['quantity'] * sold['price'],
+                'reason': item.get('reason', ''),
+                'condition': item.get('condition', '')
+            }
+            if 'unit_cost' in sold:
+                items[barcode]['unit_cost'] = sold['unit_cost']
+        if not items:
+            raise ServiceError("No items selected for return")
+
+        total_refund = sum(item['subtotal'] for item in items.values())
+        original_tax_rate = transaction['tax'] / transaction['subtotal'] if transaction['subtotal'] > 0 else 0
+        tax_refund = total_refund * original_tax_rate
+        total_refund_amount = total_refund + tax_refund
+
+        # Exchange products are charged at current prices and tax rate
+        exchange_products = exchange_products or []
+        exchange_subtotal = exchange_tax = exchange_total = exchange_difference = 0
+        if return_option == "Exchange":
+            products = load_data(PRODUCTS_FILE)
+            priced = []
+            for item in exchange_products:
+                barcode = item['barcode']
+                if barcode not in products:
+                    raise ServiceError(f"Product {barcode} not found")
+                price = item.get('price', products[barcode]['price'])
+                priced.append({
+                    'barcode': barcode,
+                    'name': item.get('name', products[barcode]['name']),
+                    'price': price,
+                    'quantity': item['quantity'],
+                    'subtotal': price * item['quantity']
+                })
+            exchange_products = priced
+            exchange_subtotal = sum(item['subtotal'] for item in exchange_products)
+            exchange_tax = exchange_subtotal * load_data(SETTINGS_FILE).get('tax_rate', 0.0)
+            exchange_total = exchange_subtotal + exchange_tax
+            exchange_difference = exchange_total - total_refund_amount
+
+        inventory = load_data(INVENTORY_FILE)
+        return_id = f"RET_{generate_short_id()}"
+        now = _now()
+
+        # Determine refund method for the record
+        if return_option == "Store Credit":
+            record_refund_method = "Store Credit"
+        elif return_option == "Exchange" and exchange_difference == 0:
+            record_refund_method = "Exchange (Even)"
+        else:
+            record_refund_method = refund_method
+
+        return_record = {
+            'return_id': return_id,
+            'transaction_id': transaction_id,
+            'original_date': transaction['date'],
+            'return_date': now,
+            'items': items,
+            'subtotal_refund': total_refund,
+            'tax_refund': tax_refund,
+            'total_refund': total_refund_amount,
+            'refund_method': record_refund_method,
+            'original_payment_method': transaction['payment_method'],
+            'reason': "Multiple items" if len(items) > 1 else list(items.values())[0]['reason'],
+            'condition': "Various" if len(items) > 1 else list(items.values())[0]['condition'],
+            'notes': notes,
+            'processed_by': username,
+            'shift_id': shift_id,
+            'status': 'completed'
+        }
+
+        # Handle exchange
+        if return_option == "Exchange":
+            return_record['exchange_products'] = exchange_products
+            return_record['exchange_subtotal'] = exchange_subtotal
+            return_record['exchange_tax'] = exchange_tax
+            return_record['exchange_total'] = exchange_total
+            return_record['exchange_difference'] = exchange_difference
+            return_record['status'] = 'exchange_processed'
+
+        # Returned units go back into the cost layers at the cost they sold at
+        exchange_lines = {item['barcode']: item for item in exchange_products}
+        cost_return(items, exchange_lines, inventory, load_data_snapshot(PRODUCTS_FILE), now, return_id)
+        record_stock_events(
+            [stock_event(barcode, 'return', item['quantity'], return_id, f"Return: {item['reason']}")
+             for barcode, item in items.items()]
+            + [stock_event(item['barcode'], 'exchange', -item['quantity'], return_id)
+               for item in exchange_products if item['barcode'] in inventory],
+            username, now
+        )
+
+        # Update inventory for returned items
+        for barcode, item in items.items():
+            if barcode in inventory:
+                inventory[barcode]['quantity'] += item['quantity']
+            else:
+                inventory[barcode] = {'quantity': item['quantity']}
+            inventory[barcode]['last_updated'] = now
+
+        # Update inventory for exchange products
+        for item in exchange_products:
+            barcode = item['barcode']
+            if barcode in inventory:
+                inventory[barcode]['quantity'] -= item['quantity']
+                inventory[barcode]['last_updated'] = now
+
+        # Cash refunds and exchange differences go through the drawer during a shift
+        drawer_amount = 0.0
+        if return_option in ["Refund", "Exchange"] and refund_method == "Cash" and shift_id:
+            if return_option == "Refund":
+                entry_type, amount = 'refund', -total_refund_amount
+            elif exchange_difference > 0:
+                entry_type, amount = 'exchange_payment', exchange_difference
+            else:
+                entry_type, amount = 'exchange_refund', -abs(exchange_difference)
+
+            drawer_amount = amount
+            record_cash(entry_type, amount, username, shift_id, date=now, return_id=return_id)
+
+        append_return(return_record)
+        record_return(return_record)
+        save_data(inventory, INVENTORY_FILE)
+
+        if shift_id:
+            record_shift_return(shift_id, return_record, drawer_amount)
+    return return_record
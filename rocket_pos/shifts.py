@@ -0,0 +1,193 @@
+"""Cashier shift lifecycle and the per-shift ledger."""
+
+import streamlit as st
+import datetime
+
+from rocket_pos.cash_ledger import iter_entries
+from rocket_pos.core import (
+    DATA_LOCK,
+    TRANSACTIONS_FILE,
+    SHIFTS_FILE,
+    generate_short_id,
+    get_current_datetime,
+    load_data,
+    load_data_snapshot,
+    save_data,
+)
+from rocket_pos.returns_log import load_returns
+
+# Shift ledger: running totals per shift plus the ids of its transactions and returns,
+# updated as each sale/return commits so closing a shift never scans the history
+def empty_shift_totals():
+    return {
+        'transaction_count': 0,
+        'sales_total': 0.0,
+        'cash_count': 0,
+        'cash_total': 0.0,
+        'non_cash_count': 0,
+        'non_cash_total': 0.0,
+        'payment_methods': {},
+        'discount_total': 0.0,
+        'refund_count': 0,
+        'refund_total': 0.0,
+        'cash_refunds': 0.0,
+        'drawer_net': 0.0
+    }
+
+def _add_transaction(shift, transaction, drawer_amount=0.0):
+    if transaction['transaction_id'] in shift['transactions']:
+        return  # already counted by a backfill
+    totals = shift['totals']
+    amount = transaction.get('total', 0)
+    method = transaction.get('payment_method', 'Unknown')
+    
+    totals['transaction_count'] += 1
+    totals['sales_total'] += amount
+    if method == 'Cash':
+        totals['cash_count'] += 1
+        totals['cash_total'] += amount
+    else:
+        totals['non_cash_count'] += 1
+        totals['non_cash_total'] += amount
+    method_totals = totals['payment_methods'].setdefault(method, {'count': 0, 'total': 0.0})
+    method_totals['count'] += 1
+    method_totals['total'] += amount
+    totals['discount_total'] += transaction.get('total_discount', transaction.get('discount', 0)) or 0
+    totals['drawer_net'] += drawer_amount
+    shift['transactions'].append(transaction['transaction_id'])
+
+def _add_return(shift, return_record, drawer_amount=0.0):
+    if return_record['return_id'] in shift['returns']:
+        return
+    totals = shift['totals']
+    refund = return_record.get('total_refund', 0)
+    totals['refund_count'] += 1
+    totals['refund_total'] += refund
+    if return_record.get('refund_method') == 'Cash':
+        totals['cash_refunds'] += refund
+    totals['drawer_net'] += drawer_amount
+    shift['returns'].append(return_record['return_id'])
+
+def ensure_shift_ledger(shifts):
+    """Backfill totals for shifts recorded before the ledger existed (one pass over the history).
+    
+    Returns True if any shift was changed and needs saving.
+    """
+    missing = {shift_id: shift for shift_id, shift in shifts.items() if 'totals' not in shift}
+    if not missing:
+        return False
+    
+    for shift in missing.values():
+        shift['totals'] = empty_shift_totals()
+        shift['transactions'] = []
+        shift['returns'] = []
+    
+    drawer_amounts = {}
+    for entry in iter_entries():
+        key = entry.get('transaction_id') or entry.get('return_id')
+        drawer_amounts[key] = drawer_amounts.get(key, 0.0) + entry.get('amount', 0)
+    
+    for transaction in sorted(load_data(TRANSACTIONS_FILE).values(), key=lambda t: t.get('date', '')):
+        if transaction.get('shift_id') in missing:
+            _add_transaction(missing[transaction['shift_id']], transaction,
+                             drawer_amounts.get(transaction['transaction_id'], 0.0))
+    for return_record in sorted(load_returns().values(), key=lambda r: r.get('return_date', '')):
+        if return_record.get('shift_id') in missing:
+            _add_return(missing[return_record['shift_id']], return_record,
+                        drawer_amounts.get(return_record['return_id'], 0.0))
+    return True
+
+def load_shifts():
+    """shifts.json with every shift's ledger present"""
+    with DATA_LOCK:
+        shifts = load_data(SHIFTS_FILE)
+        if ensure_shift_ledger(shifts):
+            save_data(shifts, SHIFTS_FILE)
+    return shifts
+
+def _update_shift(shift_id, update):
+    with DATA_LOCK:
+        shifts = load_shifts()
+        if shift_id not in shifts:
+            return None
+        update(shifts[shift_id])
+        save_data(shifts, SHIFTS_FILE)
+        return shifts[shift_id]
+
+def record_shift_transaction(shift_id, transaction, drawer_amount=0.0):
+    """Add a committed sale to its shift's ledger (no-op for unknown shifts)"""
+    return _update_shift(shift_id, lambda shift: _add_transaction(shift, transaction, drawer_amount))
+
+def record_shift_return(shift_id, return_record, drawer_amount=0.0):
+    """Add a committed return/exchange to its shift's ledger (no-op for unknown shifts)"""
+    return _update_shift(shift_id, lambda shift: _add_return(shift, return_record, drawer_amount))
+
+def shift_transactions(shift, transactions=None):
+    """The shift's transaction records, looked up through its index (oldest first)"""
+    if transactions is None:
+        transactions = load_data_snapshot(TRANSACTIONS_FILE)
+    return [transactions[t] for t in shift.get('transactions', []) if t in transactions]
+
+# Shift Management
+def start_shift(starting_cash=0.0):
+    shift_id = generate_short_id()
+    current_time = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+    
+    with DATA_LOCK:
+        shifts = load_shifts()
+        shifts[shift_id] = {
+            'shift_id': shift_id,
+            'user_id': st.session_state.user_info['username'],
+            'start_time': current_time,
+            'end_time': None,
+            'starting_cash': starting_cash,
+            'ending_cash': 0.0,
+            'transactions': [],
+            'returns': [],
+            'totals': empty_shift_totals(),
+            'status': 'active'
+        }
+        save_data(shifts, SHIFTS_FILE)
+    
+    st.session_state.shift_started = True
+    st.session_state.shift_id = shift_id
+    return shift_id
+
+def _close_shift(shift_id):
+    def close(shift):
+        shift['end_time'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+        shift['status'] = 'completed'
+        shift['ending_cash'] = shift['totals']['cash_total']
+    return _update_shift(shift_id, close) is not None
+
+def end_shift():
+    if not st.session_state.shift_started:
+        return False
+    
+    if _close_shift(st.session_state.shift_id):
+        st.session_state.shift_started = False
+        st.session_state.shift_id = None
+        return True
+    return False
+
+# Add these missing function definitions:
+def calculate_shift_duration(shift):
+    """Calculate the duration of a shift"""
+    try:
+        start_time = datetime.datetime.strptime(shift['start_time'], "%Y-%m-%d %H:%M:%S")
+        if shift.get('end_time'):
+            end_time = datetime.datetime.strptime(shift['end_time'], "%Y-%m-%d %H:%M:%S")
+            duration = end_time - start_time
+            return str(duration)
+        else:
+            return "Still active"
+    except:
+        return "Unknown"
+
+def force_end_shift(shift_id):
+    """Force end a shift (admin function)"""
+    try:
+        return _close_shift(shift_id)
+    except Exception as e:
+        st.error(f"Error ending shift: {str(e)}")
+        return False
@@ -0,0 +1,309 @@
+"""Stock event log with daily snapshots, for stock levels and valuation on any date.
+
+Every stock movement (sale, return, exchange, PO receipt, adjustment, transfer,
+outdoor delivery) is one line in data/stock_events/<YYYY-MM-DD>.jsonl with a
+signed 'delta'; <YYYY-MM-DD>.index.json beside it counts the day's events per
+barcode and type (merged into one <YYYY-MM>.index.json once the month is over),
+so history queries page through only the days that matter.
+The first movement of a day also writes that day's opening quantities to
+data/stock_snapshots/<YYYY-MM-DD>.json, so stock on any date is the nearest
+snapshot (or today's inventory) plus or minus the events between.
+
+Installs without a log are backfilled from transactions, returns, PO receipts
+and the per-SKU 'adjustments' lists; inventory.json is then cut down to
+INVENTORY_FIELDS, since the history and who-did-what live in the log.
+"""
+
+import datetime
+import os
+import shutil
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    INVENTORY_FILE,
+    PRODUCTS_FILE,
+    TRANSACTIONS_FILE,
+    PURCHASE_ORDERS_FILE,
+    append_data_lines,
+    get_current_datetime,
+    load_data,
+    load_data_lines,
+    load_data_snapshot,
+    save_data,
+)
+from rocket_pos.returns_log import load_returns
+
+STOCK_EVENTS_DIR = os.path.join(DATA_DIR, "stock_events")
+STOCK_SNAPSHOTS_DIR = os.path.join(DATA_DIR, "stock_snapshots")
+INVENTORY_FIELDS = ('quantity', 'reorder_point', 'last_updated')
+
+def _event_path(day, events_dir=STOCK_EVENTS_DIR):
+    return os.path.join(events_dir, f"{day}.jsonl")
+
+def _index_path(day, events_dir=STOCK_EVENTS_DIR):
+    return os.path.join(events_dir, f"{day}.index.json")
+
+def _snapshot_path(day):
+    return os.path.join(STOCK_SNAPSHOTS_DIR, f"{day}.json")
+
+def _days(directory, suffix):
+    if not os.path.exists(directory):
+        return []
+    return sorted(name[:-len(suffix)] for name in os.listdir(directory) if name.endswith(suffix))
+
+def stock_event(barcode, event_type, delta, ref=None, notes=None):
+    """One movement: delta is the signed change in on-hand quantity"""
+    event = {'barcode': barcode, 'type': event_type, 'delta': delta, 'ref': ref}
+    if notes:
+        event['notes'] = notes
+    return event
+
+def record_stock_events(events, username, date=None):
+    """Append movements to the day's log.
+
+    Call before saving the inventory they change: the day's opening snapshot is
+    taken from inventory.json as it is on disk.
+    """
+    events = [event for event in events if event['delta']]
+    if not events:
+        return
+    date = date or get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+    with DATA_LOCK:
+        ensure_stock_ledger()
+        day = date[:10]
+        if not os.path.exists(_snapshot_path(day)):
+            write_snapshot(day)
+        index = _day_index(day, for_update=True)
+        append_data_lines([dict(event, date=date, user=username) for event in events], _event_path(day))
+        _add_to_index(index, events)
+        save_data(index, _index_path(day))
+        if os.path.exists(_index_path(day[:7])):
+            os.remove(_index_path(day[:7]))  # a late event in a closed month; re-merged on the next query
+
+# Day index: {barcode: {event type: count}}
+def _add_to_index(index, events):
+    for event in events:
+        counts = index.setdefault(event['barcode'], {})
+        counts[event['type']] = counts.get(event['type'], 0) + 1
+
+def _day_index(day, for_update=False):
+    """A day's index, built from its segment if it's missing.
+
+    Read-only callers get the cached parse (past days never change).
+    """
+    index = load_data(_index_path(day)) if for_update else load_data_snapshot(_index_path(day))
+    if not index and os.path.exists(_event_path(day)):
+        index = {}
+        _add_to_index(index, load_data_lines(_event_path(day)))
+        save_data(index, _index_path(day))
+    return index
+
+def _month_index(month):
+    """{day: day index} for a month that's over, merged from its day indexes once"""
+    merged = load_data_snapshot(_index_path(month))
+    if not merged:
+        merged = {day: _day_index(day) for day in _days(STOCK_EVENTS_DIR, ".jsonl") if day.startswith(month)}
+        save_data(merged, _index_path(month))
+    return merged
+
+def _day_count(index, barcode, event_types):
+    rows = [index.get(barcode, {})] if barcode else index.values()
+    return sum(count for counts in rows for event_type, count in counts.items()
+               if not event_types or event_type in event_types)
+
+def query_events(barcode=None, start_day=None, end_day=None, event_types=None, page=1, page_size=50):
+    """One page of movements, newest first, and the total matching.
+
+    Totals come from the day indexes; only the segments overlapping the page are read.
+    """
+    start = str(start_day) if start_day else None
+    end = str(end_day) if end_day else None
+    days = [day for day in _days(STOCK_EVENTS_DIR, ".jsonl") if not (start and day < start) and not (end and day > end)]
+    current_month = get_current_datetime().strftime("%Y-%m")
+    months = {}
+    counts = []
+    for day in reversed(days):
+        month = day[:7]
+        if month < current_month:
+            if month not in months:
+                months[month] = _month_index(month)
+            index = months[month].get(day, {})
+        else:
+            index = _day_index(day)
+        counts.append((day, _day_count(index, barcode, event_types)))
+    total = sum(count for _, count in counts)
+
+    skip = (page - 1) * page_size
+    rows = []
+    for day, count in counts:
+        if len(rows) >= page_size:
+            break
+        if skip >= count:
+            skip -= count
+            continue
+        matching = [event for event in load_data_lines(_event_path(day))
+                    if (barcode is None or event['barcode'] == barcode)
+                    and (not event_types or event['type'] in event_types)]
+        matching.reverse()
+        rows.extend(matching[skip:skip + page_size - len(rows)])
+        skip = 0
+    return rows, total
+
+def iter_events(start_day=None, end_day=None, barcode=None):
+    """Movements oldest first from the day segments in [start_day, end_day] (inclusive)"""
+    start = str(start_day) if start_day else None
+    end = str(end_day) if end_day else None
+    for day in _days(STOCK_EVENTS_DIR, ".jsonl"):
+        if (start and day < start) or (end and day > end):
+            continue
+        for event in load_data_lines(_event_path(day)):
+            if barcode is None or event['barcode'] == barcode:
+                yield event
+
+def _deltas(start_day, end_day, events=None):
+    """Net change per barcode over [start_day, end_day], from the log or the given events"""
+    if events is None:
+        events = iter_events(start_day, end_day)
+    deltas = {}
+    for event in events:
+        deltas[event['barcode']] = deltas.get(event['barcode'], 0) + event['delta']
+    return deltas
+
+def _apply(quantities, deltas, sign=1):
+    """quantities plus (or, with sign=-1, minus) deltas, per barcode"""
+    result = dict(quantities)
+    for barcode, delta in deltas.items():
+        result[barcode] = result.get(barcode, 0.0) + sign * delta
+    return result
+
+def _current_quantities():
+    return {barcode: float(item.get('quantity', 0)) for barcode, item in load_data(INVENTORY_FILE).items()}
+
+def _load_snapshot(day):
+    return {barcode: float(quantity) for barcode, quantity in load_data(_snapshot_path(day)).items()}
+
+def _save_snapshot(day, quantities):
+    os.makedirs(STOCK_SNAPSHOTS_DIR, exist_ok=True)
+    save_data({barcode: float(quantity) for barcode, quantity in quantities.items()}, _snapshot_path(day))
+
+def write_snapshot(day):
+    """Save the opening quantities of a day: today's inventory less the movements since"""
+    opening = _apply(_current_quantities(), _deltas(day, None), -1)
+    _save_snapshot(day, opening)
+    return opening
+
+def stock_on(day):
+    """Quantity per barcode at the end of day (a date), as a Series.
+
+    Starts from whichever is nearest to the next day's opening - a snapshot or
+    today's inventory - and applies the movements in between.
+    """
+    # Imported here so the sale and bootstrap paths that log movements don't load pandas
+    import pandas as pd
+
+    ensure_stock_ledger()
+    target = day + datetime.timedelta(days=1)  # stock at end of day == opening of the next
+    target_day = str(target)
+    today = get_current_datetime().date()
+
+    anchors = [(abs((today + datetime.timedelta(days=1) - target).days), None)]
+    for snapshot_day in _days(STOCK_SNAPSHOTS_DIR, ".json"):
+        anchors.append((abs((datetime.date.fromisoformat(snapshot_day) - target).days), snapshot_day))
+    _, anchor = min(anchors, key=lambda a: a[0])
+
+    if anchor is None:
+        quantities = _apply(_current_quantities(), _deltas(target_day, None), -1)
+    elif anchor <= target_day:
+        quantities = _apply(_load_snapshot(anchor), _deltas(anchor, str(day)))
+    else:
+        previous_day = str(datetime.date.fromisoformat(anchor) - datetime.timedelta(days=1))
+        quantities = _apply(_load_snapshot(anchor), _deltas(target_day, previous_day), -1)
+    return pd.Series(dict(sorted(quantities.items())), dtype=float)
+
+def valuation_on(day):
+    """Stock and value per product at the end of day, at catalogue cost, as a DataFrame"""
+    import pandas as pd
+
+    products = load_data(PRODUCTS_FILE)
+    quantities = stock_on(day)
+    catalogue = pd.DataFrame.from_dict(products, orient='index')
+    frame = pd.DataFrame({'quantity': quantities})
+    frame['product'] = catalogue.get('name', pd.Series(dtype=object)).reindex(frame.index).fillna('Unknown')
+    frame['unit_cost'] = catalogue.get('cost', pd.Series(dtype=float)).reindex(frame.index).fillna(0).astype(float)
+    frame['value'] = frame['quantity'] * frame['unit_cost']
+    frame.index.name = 'barcode'
+    return frame.reset_index()[['product', 'barcode', 'quantity', 'unit_cost', 'value']]
+
+# Backfill
+def _history_events():
+    """Movements reconstructed from records that predate the log"""
+    events = []
+    for transaction in load_data(TRANSACTIONS_FILE).values():
+        event_type = 'outdoor_delivery' if transaction.get('order_type') == 'outdoor_delivery' else 'sale'
+        for barcode, item in transaction.get('items', {}).items():
+            events.append(dict(stock_event(barcode, event_type, -item.get('quantity', 0), transaction.get('transaction_id')),
+                               date=transaction.get('date', ''), user=transaction.get('cashier')))
+    for return_record in load_returns().values():
+        for barcode, item in return_record.get('items', {}).items():
+            events.append(dict(stock_event(barcode, 'return', item.get('quantity', 0), return_record.get('return_id')),
+                               date=return_record.get('return_date', ''), user=return_record.get('processed_by')))
+        for item in return_record.get('exchange_products', []):
+            events.append(dict(stock_event(item['barcode'], 'exchange', -item.get('quantity', 0), return_record.get('return_id')),
+                               date=return_record.get('return_date', ''), user=return_record.get('processed_by')))
+    for po_id, po in load_data(PURCHASE_ORDERS_FILE).items():
+        for receipt in po.get('receipts', []):
+            for item in receipt.get('items', []):
+                events.append(dict(stock_event(item['barcode'], 'po_receipt', item.get('received_quantity', 0), po_id),
+                                   date=receipt.get('date', ''), user=receipt.get('received_by')))
+    for barcode, item in load_data(INVENTORY_FILE).items():
+        for adjustment in item.get('adjustments', []):
+            event_type = 'transfer' if adjustment.get('type') == "Transfer Stock" else 'adjustment'
+            delta = adjustment.get('new_qty', 0) - adjustment.get('previous_qty', 0)
+            events.append(dict(stock_event(barcode, event_type, delta, adjustment.get('type'), adjustment.get('notes')),
+                               date=adjustment.get('date', ''), user=adjustment.get('user')))
+    return [event for event in events if event['delta'] and len(event['date']) >= 10]
+
+def ensure_stock_ledger():
+    """Backfill the log from history the first time it's needed.
+
+    Built aside and renamed into place; inventory.json is only slimmed once
+    the log holds its adjustment lists.
+    """
+    if os.path.isdir(STOCK_EVENTS_DIR):
+        return
+    with DATA_LOCK:
+        if os.path.isdir(STOCK_EVENTS_DIR):
+            return
+        history = sorted(_history_events(), key=lambda e: e['date'])
+        segments = {}
+        for event in history:
+            segments.setdefault(event['date'][:10], []).append(event)
+
+        build_dir = f"{STOCK_EVENTS_DIR}.rebuild"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+        for day, day_events in segments.items():
+            append_data_lines(day_events, _event_path(day, build_dir))
+            index = {}
+            _add_to_index(index, day_events)
+            save_data(index, _index_path(day, build_dir))
+        os.replace(build_dir, STOCK_EVENTS_DIR)
+
+        inventory = load_data(INVENTORY_FILE)
+        slim = {barcode: {field: item[field] for field in INVENTORY_FIELDS if field in item}
+                for barcode, item in inventory.items()}
+        if slim != inventory:
+            save_data(slim, INVENTORY_FILE)
+
+        # Today's opening, then the first of each month with history, walking backwards
+        anchor = get_current_datetime().strftime("%Y-%m-%d")
+        opening = write_snapshot(anchor)
+        for month in sorted({day[:7] for day in segments}, reverse=True):
+            first = f"{month}-01"
+            if first >= anchor:
+                continue
+            between = (event for event in history if first <= event['date'][:10] < anchor)
+            opening = _apply(opening, _deltas(first, anchor, between), -1)
+            _save_snapshot(first, opening)
+            anchor = first
@@ -0,0 +1,79 @@
+"""Loyalty tier resolution from min_points thresholds.
+
+A TierTable sorts the configured tiers by min_points once, so the tier for a
+balance is a bisect over the thresholds and the order tiers were created in
+doesn't matter. Tiers with the same min_points rank in creation order. A
+customer whose tier no longer exists (renamed or deleted) is treated as below
+every tier, so the next settle moves them to whichever tier they qualify for.
+
+The 'tier_downgrade' loyalty setting decides when customers move down:
+'never', 'review' (only when all tiers are re-evaluated, e.g. after the tiers
+are edited) or 'immediate' (whenever their points drop below their tier).
+Moving up is always immediate.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+from rocket_pos.core import LOYALTY_FILE, data_version, load_data_snapshot, snapshot_cache
+
+TIER_DOWNGRADE_RULES = {
+    "never": "Never - tiers only go up",
+    "review": "When tiers are re-evaluated",
+    "immediate": "As soon as points drop below the tier"
+}
+DEFAULT_TIER_DOWNGRADE = "never"
+
+class TierTable:
+    """Tiers sorted by min_points, for bisect lookups"""
+
+    def __init__(self, tiers):
+        ordered = sorted(enumerate(tiers.items()), key=lambda entry: (entry[1][1].get('min_points', 0), entry[0]))
+        self.names = [name for _, (name, _) in ordered]
+        self.thresholds = [tier.get('min_points', 0) for _, (_, tier) in ordered]
+        self.ranks = {name: rank for rank, name in enumerate(self.names)}
+
+    def resolve(self, points):
+        """The highest tier points reach (the lowest tier below every threshold), or None without tiers"""
+        if not self.names:
+            return None
+        return self.names[max(bisect_right(self.thresholds, points) - 1, 0)]
+
+    def next_tier(self, tier_name):
+        """(name, min_points) of the tier above tier_name, or None at the top"""
+        rank = self.ranks.get(tier_name, -1) + 1
+        if rank >= len(self.names):
+            return None
+        return self.names[rank], self.thresholds[rank]
+
+    def settle(self, tier_name, points, downgrade=False):
+        """tier_name after a balance change: moved up if points reach higher, down only if downgrade"""
+        target = self.resolve(points)
+        if target is None:
+            return tier_name
+        if downgrade or self.ranks[target] > self.ranks.get(tier_name, -1):
+            return target
+        return tier_name
+
+    def settle_many(self, tier_names, points, downgrade=False):
+        """settle() for parallel sequences of tiers and balances; returns the new tier names"""
+        if not self.names:
+            return list(tier_names)
+        current = np.fromiter((self.ranks.get(name, -1) for name in tier_names), dtype=np.int64, count=len(tier_names))
+        target = np.maximum(np.searchsorted(self.thresholds, np.asarray(points, dtype=float), side='right') - 1, 0)
+        ranks = target if downgrade else np.maximum(current, target)
+        return list(np.asarray(self.names, dtype=object)[ranks])
+
+@snapshot_cache(max_entries=4)
+def _tier_table(version):
+    return TierTable(load_data_snapshot(LOYALTY_FILE).get('tiers', {}))
+
+def tier_table():
+    """TierTable for the saved tiers, rebuilt only when loyalty.json changes"""
+    return _tier_table(data_version(LOYALTY_FILE))
+
+def tier_downgrade_rule(settings):
+    """The 'tier_downgrade' rule from the loyalty settings"""
+    rule = settings.get('tier_downgrade', DEFAULT_TIER_DOWNGRADE)
+    return rule if rule in TIER_DOWNGRADE_RULES else DEFAULT_TIER_DOWNGRADE
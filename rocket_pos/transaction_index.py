@@ -0,0 +1,78 @@
+"""Transaction records by id, for receipt lookups.
+
+data/transaction_index/ holds a copy of each transaction record, spread over
+BUCKETS files by a hash of its id, so the return screen and process_return
+resolve a receipt by reading one small bucket instead of parsing the whole of
+transactions.json (which every sale rewrites, so a cached parse never lasts).
+Sales add their record in the same data_transaction() that saves
+transactions.json. meta.json records the data_version of transactions.json the
+index matches; if that file changed some other way (a restore, an edited
+record) the index is rebuilt from it on next use.
+"""
+
+import os
+import shutil
+import zlib
+
+from rocket_pos.core import (
+    DATA_DIR,
+    DATA_LOCK,
+    TRANSACTIONS_FILE,
+    data_version,
+    load_data,
+    load_data_snapshot,
+    save_data,
+)
+
+TRANSACTION_INDEX_DIR = os.path.join(DATA_DIR, "transaction_index")
+BUCKETS = 256
+
+def _bucket_path(transaction_id, index_dir=TRANSACTION_INDEX_DIR):
+    return os.path.join(index_dir, f"{zlib.crc32(transaction_id.encode()) % BUCKETS:03d}.json")
+
+def _meta_path(index_dir=TRANSACTION_INDEX_DIR):
+    return os.path.join(index_dir, "meta.json")
+
+def _transactions_version():
+    return list(data_version(TRANSACTIONS_FILE) or [])
+
+def rebuild_transaction_index():
+    """Rebuild every bucket from transactions.json (built aside and swapped in)"""
+    with DATA_LOCK:
+        buckets = {}
+        for transaction_id, transaction in load_data(TRANSACTIONS_FILE).items():
+            buckets.setdefault(_bucket_path(transaction_id), {})[transaction_id] = transaction
+
+        build_dir = f"{TRANSACTION_INDEX_DIR}.rebuild"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+        for path, bucket in buckets.items():
+            save_data(bucket, os.path.join(build_dir, os.path.basename(path)))
+        save_data({'transactions_version': _transactions_version()}, _meta_path(build_dir))
+        shutil.rmtree(TRANSACTION_INDEX_DIR, ignore_errors=True)
+        os.replace(build_dir, TRANSACTION_INDEX_DIR)
+
+def ensure_transaction_index():
+    """Rebuild the index if transactions.json has changed since it was last written"""
+    if load_data_snapshot(_meta_path()).get('transactions_version') != _transactions_version():
+        rebuild_transaction_index()
+
+def record_transaction(transaction):
+    """Add a sale that has just been saved to transactions.json.
+
+    Call inside the data_transaction() that saved it, so the index was current
+    just before transactions.json was written.
+    """
+    if not os.path.isdir(TRANSACTION_INDEX_DIR):
+        rebuild_transaction_index()  # built from transactions.json, which already holds this sale
+        return
+    path = _bucket_path(transaction['transaction_id'])
+    bucket = load_data(path)
+    bucket[transaction['transaction_id']] = transaction
+    save_data(bucket, path)
+    save_data({'transactions_version': _transactions_version()}, _meta_path())
+
+def lookup_transaction(transaction_id):
+    """The transaction record with this id, or None (read-only)"""
+    ensure_transaction_index()
+    return load_data_snapshot(_bucket_path(transaction_id)).get(transaction_id)
@@ -0,0 +1 @@
+"""Page modules, imported lazily by rocket_pos.navigation."""
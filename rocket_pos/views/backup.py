@@ -0,0 +1,954 @@
+"""Backup & restore."""
+
+import streamlit as st
+import time
+import datetime
+import json
+import os
+import shutil
+import zipfile
+
+from rocket_pos import backups
+from rocket_pos.api import DEFAULT_HOST as API_HOST, DEFAULT_PORT as API_PORT
+from rocket_pos.core import (DATA_DIR, BACKUP_DIR, DATA_FILE_SUFFIXES, DATA_LOCK, SETTINGS_FILE, backup_scheduler,
+                             bootstrap_data_store, clear_data_snapshots, is_admin, load_data, recover_data_dir,
+                             save_data, stage_data_dir, swap_in_staged_data)
+
+# Backup and Restore functions
+def create_backup():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_filename = f"pos_backup_{timestamp}.zip"
+    backup_path = os.path.join(BACKUP_DIR, backup_filename)
+    
+    with zipfile.ZipFile(backup_path, 'w') as zipf:
+        for root, _, files in os.walk(DATA_DIR):
+            for file in files:
+                file_path = os.path.join(root, file)
+                zipf.write(file_path, os.path.relpath(file_path, DATA_DIR))
+    
+    return backup_path
+
+# Backup & Restore
+# Backup & Restore Management Module
+def backup_restore():
+    if not is_admin():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("📦 Backup & Restore")
+    
+    tab1, tab2, tab3 = st.tabs(["Create Backup", "Restore Backup", "Backup History"])
+    
+    with tab1:
+        create_backup_tab()
+    
+    with tab2:
+        restore_backup_tab()
+    
+    with tab3:
+        backup_history_tab()
+
+def create_backup_tab():
+    st.header("Create System Backup")
+    
+    st.info("This will create a complete backup of all system data including:")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("✓ Products and inventory")
+        st.write("✓ Transaction history")
+        st.write("✓ User accounts")
+        st.write("✓ Customer data")
+    with col2:
+        st.write("✓ Settings and configuration")
+        st.write("✓ Suppliers and purchase orders")
+        st.write("✓ Discounts and promotions")
+        st.write("✓ All other system data")
+    
+    backup_name = st.text_input("Backup Name (optional)", 
+                               value=f"pos_backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    
+    # Backup options
+    st.subheader("Backup Options")
+    backup_format = st.radio(
+        "Backup Format",
+        ["Incremental Snapshot (Recommended)", "Compressed Archive (.posbak)", "Compressed ZIP", "Uncompressed Copy"],
+        help="Snapshots only store the parts of each file that changed since earlier snapshots"
+    )
+    
+    if st.button("🔄 Create Backup Now", type="primary", use_container_width=True):
+        if backup_format.startswith("Incremental"):
+            with st.spinner("Creating snapshot..."):
+                manifest = create_snapshot_backup(backup_name)
+            if manifest:
+                stats = manifest['stats']
+                st.success("✅ Snapshot created successfully!")
+                st.info(f"**Throughput:** {manifest['throughput_mb_s']:.1f} MB/s")
+                st.info(f"**Data Size:** {format_file_size(stats['logical_size'])}")
+                st.info(f"**Written:** {format_file_size(stats['delta_size'])} "
+                        f"({stats['new_chunks']} new of {stats['chunk_count']} chunks, "
+                        f"{stats['reused_files']} unchanged file(s))")
+                st.info(f"**Created:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            return
+        
+        archive_format = {"Compressed Archive (.posbak)": "archive", "Compressed ZIP": "zip"}.get(backup_format, "folder")
+        with st.spinner("Creating backup... This may take a moment"):
+            try:
+                result = create_complete_backup(backup_name, archive_format)
+                
+                if result and os.path.exists(result[0]):
+                    backup_path, stats = result
+                    st.success("✅ Backup created successfully!")
+                    
+                    # Show backup details
+                    if os.path.isfile(backup_path):
+                        st.info(f"**Backup Size:** {format_file_size(os.path.getsize(backup_path))}")
+                    st.info(f"**Backup Location:** `{backup_path}`")
+                    st.info(f"**Throughput:** {stats['throughput_mb_s']:.1f} MB/s "
+                            f"({format_file_size(stats['bytes'])} in {stats['seconds']:.2f}s)")
+                    st.info(f"**Created:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                    
+                    # Not offered inline: st.download_button would read the whole archive into memory
+                    if os.path.isfile(backup_path):
+                        st.info("📥 Download it from the Backup History tab")
+                        api_download_link(backup_path)
+                else:
+                    st.error("❌ Failed to create backup")
+                    
+            except Exception as e:
+                st.error(f"❌ Backup creation failed: {str(e)}")
+                st.error("Please check system permissions and try again")
+    
+    scheduled_backups_section()
+
+def scheduled_backups_section():
+    """Background snapshot schedule, GFS retention and the scheduler's status"""
+    st.subheader("Scheduled Backups")
+    
+    scheduler = backup_scheduler()
+    settings = load_data(SETTINGS_FILE)
+    schedule = {**backups.SCHEDULE_DEFAULTS, **settings.get('backup_schedule', {})}
+    
+    with st.form("backup_schedule_form"):
+        enabled = st.checkbox("Take snapshots automatically", value=schedule['enabled'])
+        interval = st.number_input("Every (minutes)", min_value=5, value=int(schedule['interval_minutes']), step=5)
+        
+        st.write("**Retention** (scheduled snapshots only; manual snapshots are always kept)")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            keep_hourly = st.number_input("Hourly", min_value=0, value=int(schedule['keep_hourly']),
+                                          help="Keep the newest snapshot of each of the last N hours")
+        with col2:
+            keep_daily = st.number_input("Daily", min_value=0, value=int(schedule['keep_daily']),
+                                          help="Keep the newest snapshot of each of the last N days")
+        with col3:
+            keep_weekly = st.number_input("Weekly", min_value=0, value=int(schedule['keep_weekly']),
+                                          help="Keep the newest snapshot of each of the last N weeks")
+        with col4:
+            keep_monthly = st.number_input("Monthly", min_value=0, value=int(schedule['keep_monthly']),
+                                          help="Keep the newest snapshot of each of the last N months")
+        
+        if st.form_submit_button("💾 Save Schedule"):
+            settings['backup_schedule'] = {
+                'enabled': enabled,
+                'interval_minutes': int(interval),
+                'keep_hourly': int(keep_hourly),
+                'keep_daily': int(keep_daily),
+                'keep_weekly': int(keep_weekly),
+                'keep_monthly': int(keep_monthly)
+            }
+            save_data(settings, SETTINGS_FILE)
+            scheduler.wake.set()
+            st.success("Backup schedule saved")
+    
+    status = scheduler.status
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Scheduler", status['state'].title())
+    with col2:
+        st.metric("Last Run", status['last_run'] or "Never")
+    with col3:
+        next_run = status['next_run']
+        st.metric("Next Run", next_run.strftime('%Y-%m-%d %H:%M') if next_run else "Off")
+    if status['last_error']:
+        st.error(f"Last scheduled backup failed: {status['last_error']}")
+    
+    if st.button("▶️ Run Scheduled Backup Now", disabled=status['state'] == 'running'):
+        # Runs in the scheduler thread; this session isn't blocked
+        scheduler.run_now()
+        st.info("Backup started in the background - see the Backup History tab for the result")
+
+def restore_backup_tab():
+    st.header("Restore System Backup")
+    
+    st.warning("""
+    ⚠️ **Warning:** Restoring a backup will overwrite all current system data. 
+    This action cannot be undone. Make sure you have a current backup before proceeding.
+    """)
+    
+    # Restore from a stored snapshot
+    snapshots = backups.list_snapshots()
+    if snapshots:
+        st.subheader("Restore from Snapshot")
+        snapshot_options = {f"{s['name']} - {s['timestamp'][:19].replace('T', ' ')}": s['name'] for s in snapshots}
+        selected_snapshot = st.selectbox("Snapshot", list(snapshot_options.keys()))
+        snapshot_confirmation = st.text_input("Type 'RESTORE' to confirm", key="snapshot_restore_confirm",
+                                              help="This is required to prevent accidental restores")
+        
+        if st.button("🔄 Restore Snapshot", type="primary", use_container_width=True,
+                     disabled=snapshot_confirmation != "RESTORE"):
+            with st.spinner("Restoring snapshot..."):
+                if restore_snapshot(snapshot_options[selected_snapshot]):
+                    st.success("✅ Snapshot restored successfully!")
+                    st.info("The system will need to be reloaded. Please refresh the page.")
+                else:
+                    st.error("❌ Snapshot restoration failed")
+        
+        point_in_time_section()
+        
+        st.subheader("Restore from File")
+    
+    # Upload backup file
+    uploaded_file = st.file_uploader("Choose a backup file", type=['zip', 'bak', 'posbak'], 
+                                   help="Select a backup file created by this system")
+    
+    if uploaded_file:
+        try:
+            # Check file signature to determine type
+            file_signature = uploaded_file.getvalue()[:4]
+            is_zip = file_signature == b'PK\x03\x04'  # ZIP file signature
+            is_archive = file_signature[:2] == backups.GZIP_MAGIC  # .posbak (gzip) archive
+            
+            # Save uploaded file temporarily
+            temp_dir = os.path.join(BACKUP_DIR, "temp_restore")
+            os.makedirs(temp_dir, exist_ok=True)
+            
+            temp_path = os.path.join(temp_dir, uploaded_file.name)
+            with open(temp_path, "wb") as f:
+                f.write(uploaded_file.getvalue())
+            
+            # Validate backup file (including per-file SHA-256 checks where the manifest has them)
+            if is_zip:
+                # Validate ZIP backup
+                if not validate_zip_backup(temp_path):
+                    st.error("❌ Invalid backup file. This isn't a POS backup or a file failed its checksum.")
+                    return
+            elif is_archive:
+                try:
+                    backups.read_archive(temp_path)
+                except Exception as e:
+                    st.error(f"❌ Invalid backup archive: {str(e)}")
+                    return
+            else:
+                # Validate uncompressed backup
+                if not validate_uncompressed_backup(temp_path):
+                    st.error("❌ Invalid backup file format. This doesn't appear to be a valid POS backup.")
+                    return
+            
+            st.success("✅ Valid backup file detected")
+            
+            # Show backup information
+            backup_info = get_backup_info(temp_path, is_zip)
+            if backup_info:
+                st.subheader("Backup Information")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"**Backup Name:** {backup_info.get('name', 'Unknown')}")
+                    st.write(f"**Created:** {backup_info.get('timestamp', 'Unknown')}")
+                with col2:
+                    st.write(f"**Data Files:** {backup_info.get('file_count', 0)}")
+                    st.write(f"**Size:** {format_file_size(len(uploaded_file.getvalue()))}")
+            
+            # Confirmation
+            st.subheader("Confirmation")
+            confirmation = st.text_input("Type 'RESTORE' to confirm", 
+                                       help="This is required to prevent accidental restores")
+            
+            if st.button("🔄 Restore Backup", type="primary", use_container_width=True, 
+                       disabled=confirmation != "RESTORE"):
+                with st.spinner("Restoring backup... This may take a moment"):
+                    try:
+                        # Perform restore
+                        success = restore_backup(temp_path, is_zip)
+                        
+                        # Clean up
+                        try:
+                            os.remove(temp_path)
+                            os.rmdir(temp_dir)
+                        except:
+                            pass
+                        
+                        if success:
+                            st.success("✅ Backup restored successfully!")
+                            st.info("The system will need to be reloaded. Please refresh the page.")
+                            
+                            # Auto-refresh after a delay
+                            st.write("Refreshing page in 5 seconds...")
+                            time.sleep(5)
+                            st.rerun()
+                        else:
+                            st.error("❌ Backup restoration failed")
+                            
+                    except Exception as e:
+                        st.error(f"❌ Restore failed: {str(e)}")
+            
+        except Exception as e:
+            st.error(f"❌ Error processing backup file: {str(e)}")
+            # Clean up on error
+            try:
+                if 'temp_path' in locals() and os.path.exists(temp_path):
+                    os.remove(temp_path)
+                if 'temp_dir' in locals() and os.path.exists(temp_dir):
+                    os.rmdir(temp_dir)
+            except:
+                pass
+
+def backup_history_tab():
+    st.header("Backup History")
+    
+    snapshot_history()
+    
+    backup_activity_log()
+    
+    st.subheader("Backup Files")
+    
+    # List existing backups
+    backup_files = get_backup_list()
+    
+    if not backup_files:
+        st.info("No backups found")
+        return
+    
+    st.write(f"Found {len(backup_files)} backup(s)")
+    
+    # Sort backups by date (newest first)
+    backup_files.sort(key=lambda x: x['timestamp'], reverse=True)
+    
+    for backup in backup_files:
+        with st.expander(f"{backup['name']} - {backup['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}"):
+            col1, col2, col3 = st.columns([2, 1, 1])
+            
+            with col1:
+                st.write(f"**Size:** {format_file_size(backup['size'])}")
+                st.write(f"**Path:** `{backup['path']}`")
+                st.write(f"**Type:** {backup_type_label(backup['path'])}")
+            
+            with col2:
+                # st.download_button reads the whole file into memory, so only once it is asked for
+                if st.button("📥 Download", key=f"dl_{backup['name']}", use_container_width=True):
+                    with open(backup['path'], "rb") as f:
+                        st.download_button(
+                            label="Download Now",
+                            data=f,
+                            file_name=os.path.basename(backup['path']),
+                            mime=backup_mime_type(backup['path']),
+                            key=f"dl_btn_{backup['name']}"
+                        )
+                api_download_link(backup['path'])
+            
+            with col3:
+                # Delete button
+                if st.button("🗑️ Delete", key=f"del_{backup['name']}", use_container_width=True):
+                    try:
+                        os.remove(backup['path'])
+                        st.success("Backup deleted successfully")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error deleting backup: {str(e)}")
+
+def backup_activity_log():
+    """Newest entries of the durable backup log"""
+    st.subheader("Activity Log")
+    entries = backups.read_log_tail(50)
+    if not entries:
+        st.info("No backup activity yet")
+        return
+    
+    rows = []
+    for entry in entries:
+        rows.append({
+            'Time': entry.get('timestamp'),
+            'Action': entry.get('action'),
+            'Backup': entry.get('backup_name'),
+            'Status': entry.get('state') if entry.get('state') == 'started' else
+                      ('✅' if entry.get('success') else f"❌ {entry.get('error', '')}"),
+            'Size': format_file_size(entry['bytes']) if entry.get('bytes') else '',
+            'MB/s': entry.get('throughput_mb_s'),
+            'User': entry.get('user')
+        })
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+def snapshot_history():
+    """Incremental snapshots: store totals, retention and per-snapshot delta sizes"""
+    snapshots = backups.list_snapshots()
+    st.subheader("Incremental Snapshots")
+    
+    if not snapshots:
+        st.info("No snapshots yet")
+        return
+    
+    store = backups.store_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Snapshots", len(snapshots))
+    with col2:
+        st.metric("Data Backed Up", format_file_size(store['logical_size']))
+    with col3:
+        st.metric("Stored on Disk", format_file_size(store['stored_size']))
+    with col4:
+        st.metric("Dedup Ratio", f"{store['dedup_ratio']:.1f}x")
+    
+    # Retention
+    with st.form("snapshot_retention_form"):
+        keep_last = st.number_input("Keep newest snapshots", min_value=1, value=min(len(snapshots), 24), step=1)
+        if st.form_submit_button("🧹 Prune & Free Space"):
+            try:
+                deleted = backups.prune_snapshots(int(keep_last))
+                removed, freed = backups.collect_garbage()
+                log_backup_activity('prune', f"{len(deleted)} snapshot(s)", backups.SNAPSHOT_DIR, True)
+                st.success(f"Deleted {len(deleted)} snapshot(s), freed {format_file_size(freed)} ({removed} chunks)")
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error pruning snapshots: {str(e)}")
+    
+    for snapshot in snapshots:
+        stats = snapshot.get('stats', {})
+        logical = stats.get('logical_size', 0)
+        delta = stats.get('delta_size', 0)
+        with st.expander(f"{snapshot['name']} - {snapshot['timestamp'][:19].replace('T', ' ')}"):
+            col1, col2, col3 = st.columns([2, 1, 1])
+            
+            with col1:
+                st.write(f"**Data Size:** {format_file_size(logical)} in {len(snapshot['files'])} file(s)")
+                st.write(f"**Delta Written:** {format_file_size(delta)} "
+                         f"({stats.get('new_chunks', 0)} new of {stats.get('chunk_count', 0)} chunks)")
+                st.write(f"**Dedup Ratio:** {logical / delta:.1f}x" if delta else "**Dedup Ratio:** fully deduplicated")
+                st.write(f"**Created By:** {snapshot.get('created_by', 'system')}")
+            
+            with col2:
+                if st.button("📥 Download", key=f"dl_snap_{snapshot['name']}", use_container_width=True):
+                    # Exported to a file, which then also lists under Backup Files
+                    export_path = export_snapshot(snapshot['name'])
+                    with open(export_path, "rb") as f:
+                        st.download_button(
+                            label="Download Now",
+                            data=f,
+                            file_name=os.path.basename(export_path),
+                            mime="application/zip",
+                            key=f"dl_snap_btn_{snapshot['name']}"
+                        )
+                    api_download_link(export_path)
+            
+            with col3:
+                if st.button("🗑️ Delete", key=f"del_snap_{snapshot['name']}", use_container_width=True):
+                    try:
+                        backups.delete_snapshot(snapshot['name'])
+                        backups.collect_garbage()
+                        st.success("Snapshot deleted successfully")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error deleting snapshot: {str(e)}")
+
+# Utility functions for backup/restore
+def api_download_link(path):
+    """Link to the file on the local API, which streams it without loading it into memory"""
+    if path.endswith(('.zip', backups.ARCHIVE_SUFFIX)):
+        name = os.path.basename(path)
+        st.caption(f"[Stream {name} from the local API](http://{API_HOST}:{API_PORT}/backups/{name}) "
+                   f"(needs `python -m rocket_pos.api` running; sign in as an admin)")
+
+def export_snapshot(name):
+    """Write a snapshot out as a ZIP backup in BACKUP_DIR; returns its path"""
+    export_path = os.path.join(BACKUP_DIR, f"{name}.snapshot.zip")
+    tmp_path = f"{export_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        backups.export_snapshot_zip(name, f)
+    os.replace(tmp_path, export_path)
+    return export_path
+
+def create_snapshot_backup(backup_name):
+    """Create an incremental, deduplicated snapshot of all system data"""
+    try:
+        created_by = st.session_state.user_info['username'] if 'user_info' in st.session_state else 'system'
+        started = time.perf_counter()
+        manifest = backups.create_snapshot(backup_name, created_by, lock=DATA_LOCK)
+        stats = throughput_stats(manifest['stats']['logical_size'], time.perf_counter() - started)
+        log_backup_activity('snapshot', backup_name, backups.SNAPSHOT_DIR, True, stats=stats)
+        manifest['throughput_mb_s'] = stats['throughput_mb_s']
+        return manifest
+    except Exception as e:
+        log_backup_activity('snapshot', backup_name, '', False, str(e))
+        st.error(f"Snapshot creation failed: {str(e)}")
+        return None
+
+def point_in_time_section():
+    """Restore to any moment covered by the write journal"""
+    st.subheader("Restore to a Point in Time")
+    
+    settings = load_data(SETTINGS_FILE)
+    journal_enabled = st.toggle("Journal every data write", value=settings.get('write_journal', False),
+                                help="Needed for point-in-time restores; every save also stores the changed chunks")
+    if journal_enabled != settings.get('write_journal', False):
+        settings['write_journal'] = journal_enabled
+        save_data(settings, SETTINGS_FILE)
+    
+    journal = backups.journal_stats()
+    if not journal['entries']:
+        st.info("The write journal is empty. Turn on journaling to be able to restore to a point in time.")
+        return
+    
+    st.caption(f"Journal: {journal['entries']} writes from {journal['first'][:19].replace('T', ' ')} "
+               f"to {journal['last'][:19].replace('T', ' ')}")
+    
+    with st.form("point_in_time_form"):
+        last = datetime.datetime.fromisoformat(journal['last'])
+        col1, col2 = st.columns(2)
+        with col1:
+            restore_date = st.date_input("Date", value=last.date())
+        with col2:
+            restore_time = st.time_input("Time", value=last.time().replace(second=0, microsecond=0), step=60)
+        confirmation = st.text_input("Type 'RESTORE' to confirm", key="point_in_time_confirm")
+        
+        if st.form_submit_button("⏪ Restore to This Time"):
+            if confirmation != "RESTORE":
+                st.error("Type 'RESTORE' to confirm")
+                return
+            # Everything written up to the end of the chosen minute
+            until = datetime.datetime.combine(restore_date, restore_time).replace(second=59, microsecond=999999)
+            with st.spinner("Replaying journal..."):
+                if restore_point_in_time(until):
+                    st.success(f"✅ Data restored to {until.strftime('%Y-%m-%d %H:%M')}")
+                    st.info("The system will need to be reloaded. Please refresh the page.")
+                else:
+                    st.error("❌ Point-in-time restore failed")
+
+def restore_point_in_time(until):
+    """Rebuild the data as of `until` from the newest earlier snapshot plus the journal, then restore it"""
+    restore_dir = os.path.join(BACKUP_DIR, "point_in_time_restore")
+    try:
+        if os.path.exists(restore_dir):
+            shutil.rmtree(restore_dir)
+        base, replayed = backups.restore_point_in_time_files(until, restore_dir)
+        st.caption(f"Snapshot {base} + {replayed} journal entries")
+        return restore_backup(restore_dir, False)
+    except Exception as e:
+        log_backup_activity('restore', until.isoformat(), restore_dir, False, str(e))
+        st.error(f"Restore failed: {str(e)}")
+        return False
+    finally:
+        shutil.rmtree(restore_dir, ignore_errors=True)
+
+def restore_snapshot(name):
+    """Reassemble a snapshot from the chunk store and restore it like a directory backup"""
+    snapshot_dir = os.path.join(BACKUP_DIR, "snapshot_restore")
+    try:
+        if os.path.exists(snapshot_dir):
+            shutil.rmtree(snapshot_dir)
+        backups.restore_snapshot_files(name, snapshot_dir)
+        return restore_backup(snapshot_dir, False)
+    except Exception as e:
+        log_backup_activity('restore', name, snapshot_dir, False, str(e))
+        st.error(f"Restore failed: {str(e)}")
+        return False
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+def create_complete_backup(backup_name, backup_format="archive"):
+    """Create a complete backup of all system data as a .posbak archive, a .zip or an uncompressed folder.
+    
+    Every data file's SHA-256 goes into the manifest. Returns (backup_path, throughput stats).
+    """
+    try:
+        # Create backup directory if it doesn't exist
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        
+        # Create backup filename
+        extension = {'archive': backups.ARCHIVE_SUFFIX, 'zip': '.zip'}.get(backup_format, '.bak')
+        backup_path = os.path.join(BACKUP_DIR, f"{backup_name}{extension}")
+        
+        # Copy the data files aside under DATA_LOCK, so a sale is either wholly in the backup or not at
+        # all, then compress the copies without holding up writers (as backups.create_snapshot does)
+        frozen_dir = os.path.join(BACKUP_DIR, f".frozen_{os.path.basename(backup_path)}")
+        shutil.rmtree(frozen_dir, ignore_errors=True)
+        data_files = []
+        with DATA_LOCK:
+            for root, _, files in os.walk(DATA_DIR):
+                for file in files:
+                    if file.endswith(DATA_FILE_SUFFIXES):
+                        file_path = os.path.join(root, file)
+                        arcname = os.path.relpath(file_path, DATA_DIR)
+                        frozen_path = os.path.join(frozen_dir, arcname)
+                        os.makedirs(os.path.dirname(frozen_path), exist_ok=True)
+                        shutil.copy2(file_path, frozen_path)
+                        data_files.append((frozen_path, arcname))
+        
+        # Create backup manifest
+        manifest = {
+            'name': backup_name,
+            'timestamp': datetime.datetime.now().isoformat(),
+            'version': '1.1',
+            'created_by': st.session_state.user_info['username'] if 'user_info' in st.session_state else 'system',
+            'files': [arcname for _, arcname in data_files]
+        }
+        
+        started = time.perf_counter()
+        bytes_read = 0
+        
+        if backup_format == 'archive':
+            # Parallel-compressed tar stream, manifest (with checksums) as the last member
+            bytes_read, _ = backups.write_archive(backup_path, data_files, manifest)
+            
+        elif backup_format == 'zip':
+            # Stream each file into the ZIP, hashing it on the way
+            checksums = {}
+            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for file_path, arcname in data_files:
+                    info = zipfile.ZipInfo.from_file(file_path, arcname)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with open(file_path, 'rb') as src, zipf.open(info, 'w') as dst:
+                        checksums[arcname], copied = backups.copy_with_sha256(src, dst)
+                    bytes_read += copied
+                
+                # Add manifest
+                manifest['checksums'] = checksums
+                zipf.writestr('manifest.json', json.dumps(manifest, indent=2))
+                
+        else:
+            # Create uncompressed backup (directory copy)
+            backup_dir = backup_path
+            os.makedirs(backup_dir, exist_ok=True)
+            
+            checksums = {}
+            for src_path, rel_path in data_files:
+                dst_path = os.path.join(backup_dir, rel_path)
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+                    checksums[rel_path], copied = backups.copy_with_sha256(src, dst)
+                shutil.copystat(src_path, dst_path)
+                bytes_read += copied
+            
+            # Save manifest
+            manifest['checksums'] = checksums
+            with open(os.path.join(backup_dir, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f, indent=2)
+        
+        stats = throughput_stats(bytes_read, time.perf_counter() - started)
+        
+        # Log backup creation
+        log_backup_activity('create', backup_name, backup_path, True, stats=stats)
+        
+        return backup_path, stats
+        
+    except Exception as e:
+        # Log error
+        log_backup_activity('create', backup_name, '', False, str(e))
+        st.error(f"Backup creation failed: {str(e)}")
+        return None
+    
+    finally:
+        if 'frozen_dir' in locals():
+            shutil.rmtree(frozen_dir, ignore_errors=True)
+
+def validate_zip_backup(zip_path):
+    """Validate if the ZIP file is a valid backup"""
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zipf:
+            # Check for manifest file
+            if 'manifest.json' not in zipf.namelist():
+                return False
+            
+            # Check for at least some data files
+            data_files = [f for f in zipf.namelist() if f.endswith(DATA_FILE_SUFFIXES) and f != 'manifest.json']
+            if len(data_files) == 0:
+                return False
+            
+            # Verify per-file checksums by streaming each member
+            with zipf.open('manifest.json') as f:
+                manifest = json.load(f)
+            if manifest.get('checksums'):
+                digests = {}
+                for name in data_files:
+                    with zipf.open(name) as f:
+                        digests[name] = backups.file_sha256(f)
+                backups.check_checksums(manifest, digests)
+                
+            return True
+    except:
+        return False
+
+def validate_uncompressed_backup(backup_path):
+    """Validate if the directory is a valid backup"""
+    try:
+        # Check if it's a directory
+        if not os.path.isdir(backup_path):
+            return False
+        
+        # Check for manifest file
+        manifest_path = os.path.join(backup_path, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return False
+        
+        # Check for data files
+        data_files = []
+        for root, _, files in os.walk(backup_path):
+            for file in files:
+                if file.endswith(DATA_FILE_SUFFIXES) and file != 'manifest.json':
+                    data_files.append(file)
+        
+        if len(data_files) == 0:
+            return False
+        
+        # Verify per-file checksums
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('checksums'):
+            digests = {}
+            for name in manifest['checksums']:
+                file_path = os.path.join(backup_path, name)
+                if os.path.exists(file_path):
+                    with open(file_path, 'rb') as f:
+                        digests[name] = backups.file_sha256(f)
+            backups.check_checksums(manifest, digests)
+            
+        return True
+    except:
+        return False
+
+def get_backup_info(backup_path, is_zip):
+    """Get information about a backup file"""
+    try:
+        if backups.is_archive(backup_path):
+            manifest = backups.read_archive(backup_path)
+            return {
+                'name': manifest.get('name', 'Unknown'),
+                'timestamp': manifest.get('timestamp', 'Unknown'),
+                'file_count': len(manifest.get('files', []))
+            }
+        elif is_zip:
+            with zipfile.ZipFile(backup_path, 'r') as zipf:
+                if 'manifest.json' in zipf.namelist():
+                    with zipf.open('manifest.json') as f:
+                        manifest = json.load(f)
+                    
+                    return {
+                        'name': manifest.get('name', 'Unknown'),
+                        'timestamp': manifest.get('timestamp', 'Unknown'),
+                        'file_count': len([f for f in zipf.namelist() if f.endswith(DATA_FILE_SUFFIXES) and f != 'manifest.json'])
+                    }
+        else:
+            manifest_path = os.path.join(backup_path, 'manifest.json')
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+                
+                # Count data files
+                data_files = []
+                for root, _, files in os.walk(backup_path):
+                    for file in files:
+                        if file.endswith(DATA_FILE_SUFFIXES) and file != 'manifest.json':
+                            data_files.append(file)
+                
+                return {
+                    'name': manifest.get('name', 'Unknown'),
+                    'timestamp': manifest.get('timestamp', 'Unknown'),
+                    'file_count': len(data_files)
+                }
+        
+        return None
+    except:
+        return None
+
+def restore_backup(backup_path, is_zip):
+    """Restore system from backup.
+    
+    The restored files are laid over a staged copy of the data directory, which
+    then replaces the live one in a single swap - a crash never leaves a mix of
+    old and restored files.
+    """
+    try:
+        # Create restore directory
+        restore_dir = os.path.join(BACKUP_DIR, "restore_temp")
+        if os.path.exists(restore_dir):
+            shutil.rmtree(restore_dir)
+        os.makedirs(restore_dir)
+        
+        # Extract backup
+        if backups.is_archive(backup_path):
+            # Streams the archive, verifying checksums as files are extracted
+            backups.read_archive(backup_path, restore_dir)
+        elif is_zip:
+            with zipfile.ZipFile(backup_path, 'r') as zipf:
+                zipf.extractall(restore_dir)
+        else:
+            # For directory backups, copy files to restore directory
+            for item in os.listdir(backup_path):
+                src_path = os.path.join(backup_path, item)
+                dst_path = os.path.join(restore_dir, item)
+                
+                if os.path.isdir(src_path):
+                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
+                else:
+                    shutil.copy2(src_path, dst_path)
+        
+        # Read manifest
+        manifest_path = os.path.join(restore_dir, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            raise Exception("Invalid backup: manifest file missing")
+        
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        
+        # Check per-file SHA-256 before touching the live data
+        if manifest.get('checksums'):
+            digests = {}
+            for name in manifest['checksums']:
+                file_path = os.path.join(restore_dir, name)
+                if os.path.exists(file_path):
+                    with open(file_path, 'rb') as f:
+                        digests[name] = backups.file_sha256(f)
+            backups.check_checksums(manifest, digests)
+        
+        # No save_data() may land between staging (a copy of the live data) and the swap - it would
+        # be lost with the replaced directory - so writers wait for the whole restore
+        with DATA_LOCK:
+            # Build the complete new data directory next to the live one
+            staging_dir = stage_data_dir()
+        
+            # Subdirectories hold segmented logs (e.g. the cash ledger); they come from the backup as a
+            # whole, so no segment newer than the backup survives next to its restored totals
+            for item in os.listdir(staging_dir):
+                if os.path.isdir(os.path.join(staging_dir, item)):
+                    shutil.rmtree(os.path.join(staging_dir, item))
+        
+            # Restore all JSON files
+            json_files = []
+            for root, _, files in os.walk(restore_dir):
+                for file in files:
+                    if file.endswith(DATA_FILE_SUFFIXES):
+                        json_files.append(os.path.join(root, file))
+        
+            for json_file in json_files:
+                # Get relative path
+                rel_path = os.path.relpath(json_file, restore_dir)
+            
+                # Skip manifest for now (we'll handle it separately)
+                if os.path.basename(json_file) == 'manifest.json':
+                    continue
+            
+                # Destination path
+                dst_path = os.path.join(staging_dir, rel_path)
+            
+                # Ensure directory exists
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            
+                # Copy contents only - a fresh mtime invalidates cached reads of the old file
+                shutil.copyfile(json_file, dst_path)
+        
+            # Swap it in; the replaced data is kept under backups/pre_restore_backup (safety measure)
+            swap_in_staged_data()
+            
+            # Cached reads of the old files must not outlive them
+            clear_data_snapshots()
+        
+        # Clean up
+        shutil.rmtree(restore_dir)
+        
+        # Restored files may predate the current schema - migrate them on the next rerun
+        bootstrap_data_store.clear()
+        
+        # Log successful restore
+        log_backup_activity('restore', manifest.get('name', 'unknown'), backup_path, True)
+        
+        return True
+        
+    except Exception as e:
+        # Log error
+        log_backup_activity('restore', 'unknown', backup_path, False, str(e))
+        st.error(f"Restore failed: {str(e)}")
+        
+        # Discard a half-built staging dir, or finish a swap that had already been committed
+        with DATA_LOCK:
+            recover_data_dir()
+            clear_data_snapshots()
+        
+        # Clean up on error
+        try:
+            if os.path.exists(restore_dir):
+                shutil.rmtree(restore_dir)
+        except:
+            pass
+        
+        return False
+
+def get_backup_list():
+    """Get list of all backups"""
+    backup_list = []
+    
+    if not os.path.exists(BACKUP_DIR):
+        return backup_list
+    
+    for filename in os.listdir(BACKUP_DIR):
+        if filename.endswith(('.zip', '.bak', backups.ARCHIVE_SUFFIX)) and os.path.isfile(os.path.join(BACKUP_DIR, filename)):
+            file_path = os.path.join(BACKUP_DIR, filename)
+            file_size = os.path.getsize(file_path)
+            file_time = datetime.datetime.fromtimestamp(os.path.getctime(file_path))
+            
+            backup_list.append({
+                'name': filename,
+                'path': file_path,
+                'size': file_size,
+                'timestamp': file_time
+            })
+    
+    return backup_list
+
+def backup_type_label(path):
+    if path.endswith(backups.ARCHIVE_SUFFIX):
+        return 'Compressed Archive'
+    return 'Compressed ZIP' if path.endswith('.zip') else 'Uncompressed'
+
+def backup_mime_type(path):
+    if path.endswith(backups.ARCHIVE_SUFFIX):
+        return "application/gzip"
+    return "application/zip" if path.endswith('.zip') else "application/octet-stream"
+
+def throughput_stats(size_bytes, seconds):
+    """Bytes processed, elapsed time and MB/s for the backup log"""
+    return {
+        'bytes': size_bytes,
+        'seconds': round(seconds, 3),
+        'throughput_mb_s': round(size_bytes / seconds / 1e6, 2) if seconds > 0 else 0.0
+    }
+
+def format_file_size(size_bytes):
+    """Format file size in human-readable format"""
+    if size_bytes == 0:
+        return "0B"
+    
+    size_names = ["B", "KB", "MB", "GB"]
+    i = 0
+    while size_bytes >= 1024 and i < len(size_names) - 1:
+        size_bytes /= 1024.0
+        i += 1
+    
+    return f"{size_bytes:.2f} {size_names[i]}"
+
+def log_backup_activity(action, backup_name, backup_path, success, error_msg=None, stats=None):
+    """Log backup/restore activities"""
+    log_entry = {
+        'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'action': action,
+        'backup_name': backup_name,
+        'backup_path': backup_path,
+        'success': success,
+        'user': st.session_state.user_info['username'] if 'user_info' in st.session_state else 'system'
+    }
+    
+    if error_msg:
+        log_entry['error'] = error_msg
+    
+    if stats:
+        log_entry.update(stats)
+    
+    # Append-only log outside the data dir, so restores don't rewrite backup history
+    backups.append_log(log_entry)
@@ -0,0 +1,290 @@
+"""Brands management."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    TRANSACTIONS_FILE,
+    BRANDS_FILE,
+    format_currency,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.product_search import product_picker
+
+def brands_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Brand Management")
+    
+    tab1, tab2, tab3 = st.tabs(["Manage Brands", "Assign Brands to Products", "Brand Reports"])
+    
+    with tab1:
+        st.header("Manage Brands")
+        
+        brands_data = load_data(BRANDS_FILE)
+        brands_list = brands_data.get('brands', [])
+        brand_products = brands_data.get('brand_products', {})
+        
+        st.subheader("Current Brands")
+        if not brands_list:
+            st.info("No brands defined yet")
+        else:
+            st.dataframe(pd.DataFrame(brands_list, columns=["Brands"]))
+        
+        st.subheader("Add New Brand")
+        with st.form("add_brand_form"):
+            new_brand = st.text_input("Brand Name")
+            
+            if st.form_submit_button("Add Brand"):
+                if new_brand and new_brand not in brands_list:
+                    brands_list.append(new_brand)
+                    brands_data['brands'] = brands_list
+                    if new_brand not in brand_products:
+                        brand_products[new_brand] = []
+                    brands_data['brand_products'] = brand_products
+                    save_data(brands_data, BRANDS_FILE)
+                    st.success(f"Brand '{new_brand}' added successfully")
+                    st.rerun()
+                elif new_brand in brands_list:
+                    st.error("Brand already exists")
+        
+        st.subheader("Remove Brand")
+        if brands_list:
+            brand_to_remove = st.selectbox("Select Brand to Remove", [""] + brands_list)
+            
+            if brand_to_remove and st.button("Remove Brand"):
+                # Check if brand has products assigned
+                if brand_products.get(brand_to_remove):
+                    st.error(f"Cannot remove brand '{brand_to_remove}' because it has products assigned to it")
+                else:
+                    brands_list.remove(brand_to_remove)
+                    brands_data['brands'] = brands_list
+                    if brand_to_remove in brand_products:
+                        del brand_products[brand_to_remove]
+                    brands_data['brand_products'] = brand_products
+                    save_data(brands_data, BRANDS_FILE)
+                    st.success(f"Brand '{brand_to_remove}' removed successfully")
+                    st.rerun()
+    
+    with tab2:
+        st.header("Assign Brands to Products")
+        
+        brands_data = load_data(BRANDS_FILE)
+        products = load_data(PRODUCTS_FILE)
+        brands_list = brands_data.get('brands', [])
+        
+        if not brands_list:
+            st.info("No brands available. Please add brands first.")
+        else:
+            # Filter products without brands
+            products_without_brands = {k: v for k, v in products.items() if not v.get('brand')}
+            
+            if not products_without_brands:
+                st.info("All products already have brands assigned")
+            else:
+                st.subheader("Products Without Brands")
+                barcode = product_picker("Select Product", key="brand_assign_product", within=products_without_brands)
+                
+                if barcode:
+                    product = products[barcode]
+                    
+                    st.write(f"**Selected Product:** {product['name']}")
+                    
+                    selected_brand = st.selectbox("Assign Brand", [""] + brands_list)
+                    
+                    if selected_brand and st.button("Assign Brand"):
+                        products[barcode]['brand'] = selected_brand
+                        
+                        # Update brand_products mapping
+                        brand_products = brands_data.get('brand_products', {})
+                        if selected_brand not in brand_products:
+                            brand_products[selected_brand] = []
+                        if barcode not in brand_products[selected_brand]:
+                            brand_products[selected_brand].append(barcode)
+                        
+                        brands_data['brand_products'] = brand_products
+                        
+                        save_data(products, PRODUCTS_FILE)
+                        save_data(brands_data, BRANDS_FILE)
+                        st.success(f"Brand '{selected_brand}' assigned to {product['name']}")
+                        st.session_state.pop('brand_assign_product', None)
+                        st.rerun()
+            
+            st.subheader("Bulk Brand Assignment")
+            st.info("Assign the same brand to multiple products")
+            
+            # Multi-select products
+            selected_products = product_picker("Select Products", key="brand_bulk_products", multiple=True)
+            
+            if selected_products:
+                bulk_brand = st.selectbox("Assign Brand to Selected Products", [""] + brands_list)
+                
+                if bulk_brand and st.button("Assign to Selected"):
+                    updated_count = 0
+                    brand_products = brands_data.get('brand_products', {})
+                    
+                    for barcode in selected_products:
+                        products[barcode]['brand'] = bulk_brand
+                        
+                        if bulk_brand not in brand_products:
+                            brand_products[bulk_brand] = []
+                        if barcode not in brand_products[bulk_brand]:
+                            brand_products[bulk_brand].append(barcode)
+                            updated_count += 1
+                    
+                    brands_data['brand_products'] = brand_products
+                    
+                    save_data(products, PRODUCTS_FILE)
+                    save_data(brands_data, BRANDS_FILE)
+                    st.success(f"Brand '{bulk_brand}' assigned to {updated_count} products")
+                    st.session_state.pop('brand_bulk_products', None)
+                    st.rerun()
+    
+    with tab3:
+        st.header("Brand Reports")
+        
+        brands_data = load_data(BRANDS_FILE)
+        products = load_data(PRODUCTS_FILE)
+        inventory = load_data(INVENTORY_FILE)
+        transactions = load_data(TRANSACTIONS_FILE)
+        brands_list = brands_data.get('brands', [])
+        brand_products = brands_data.get('brand_products', {})
+        
+        if not brands_list:
+            st.info("No brands available for reporting")
+        else:
+            report_type = st.selectbox("Report Type", [
+                "Brand Overview",
+                "Sales by Brand",
+                "Inventory by Brand",
+                "Product Count by Brand"
+            ])
+            
+            selected_brand = st.selectbox("Select Brand", [""] + brands_list)
+            
+            if report_type == "Brand Overview":
+                if selected_brand:
+                    st.subheader(f"Overview for {selected_brand}")
+                    
+                    # Product count
+                    product_count = len(brand_products.get(selected_brand, []))
+                    st.write(f"**Number of Products:** {product_count}")
+                    
+                    # Inventory value
+                    total_value = 0
+                    total_quantity = 0
+                    for barcode in brand_products.get(selected_brand, []):
+                        inv_data = inventory.get(barcode, {})
+                        product = products.get(barcode, {})
+                        quantity = inv_data.get('quantity', 0)
+                        cost = product.get('cost', 0)
+                        total_value += quantity * cost
+                        total_quantity += quantity
+                    
+                    st.write(f"**Total Inventory Quantity:** {total_quantity}")
+                    st.write(f"**Total Inventory Value:** {format_currency(total_value)}")
+                    
+                    # Sales data (last 30 days)
+                    thirty_days_ago = (datetime.datetime.now() - datetime.timedelta(days=30)).date()
+                    sales_total = 0
+                    units_sold = 0
+                    
+                    for transaction in transactions.values():
+                        try:
+                            trans_date = datetime.datetime.strptime(transaction.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+                            if trans_date >= thirty_days_ago:
+                                for barcode, item in transaction.get('items', {}).items():
+                                    if barcode in brand_products.get(selected_brand, []):
+                                        sales_total += item['price'] * item['quantity']
+                                        units_sold += item['quantity']
+                        except (ValueError, KeyError):
+                            continue
+                    
+                    st.write(f"**Sales (Last 30 Days):** {format_currency(sales_total)}")
+                    st.write(f"**Units Sold (Last 30 Days):** {units_sold}")
+                    
+                else:
+                    st.info("Please select a brand to view details")
+            
+            elif report_type == "Sales by Brand":
+                st.subheader("Sales by Brand")
+                
+                # Date range
+                col1, col2 = st.columns(2)
+                with col1:
+                    start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30))
+                with col2:
+                    end_date = st.date_input("End Date", value=datetime.date.today())
+                
+                brand_sales = {}
+                for brand in brands_list:
+                    brand_sales[brand] = {'revenue': 0, 'units': 0}
+                
+                for transaction in transactions.values():
+                    try:
+                        trans_date = datetime.datetime.strptime(transaction.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+                        if start_date <= trans_date <= end_date:
+                            for barcode, item in transaction.get('items', {}).items():
+                                product = products.get(barcode, {})
+                                brand = product.get('brand')
+                                if brand and brand in brand_sales:
+                                    brand_sales[brand]['revenue'] += item['price'] * item['quantity']
+                                    brand_sales[brand]['units'] += item['quantity']
+                    except (ValueError, KeyError):
+                        continue
+                
+                sales_df = pd.DataFrame.from_dict(brand_sales, orient='index')
+                sales_df = sales_df.sort_values('revenue', ascending=False)
+                
+                st.dataframe(sales_df)
+                
+                # Chart
+                st.bar_chart(sales_df['revenue'])
+            
+            elif report_type == "Inventory by Brand":
+                st.subheader("Inventory by Brand")
+                
+                brand_inventory = {}
+                for brand in brands_list:
+                    brand_inventory[brand] = {'value': 0, 'quantity': 0, 'products': 0}
+                
+                for barcode, product in products.items():
+                    brand = product.get('brand')
+                    if brand and brand in brand_inventory:
+                        inv_data = inventory.get(barcode, {})
+                        quantity = inv_data.get('quantity', 0)
+                        cost = product.get('cost', 0)
+                        
+                        brand_inventory[brand]['value'] += quantity * cost
+                        brand_inventory[brand]['quantity'] += quantity
+                        brand_inventory[brand]['products'] += 1
+                
+                inv_df = pd.DataFrame.from_dict(brand_inventory, orient='index')
+                inv_df = inv_df.sort_values('value', ascending=False)
+                
+                st.dataframe(inv_df)
+                
+                # Chart
+                st.bar_chart(inv_df['value'])
+            
+            elif report_type == "Product Count by Brand":
+                st.subheader("Product Count by Brand")
+                
+                product_counts = {}
+                for brand in brands_list:
+                    product_counts[brand] = len(brand_products.get(brand, []))
+                
+                count_df = pd.DataFrame.from_dict(product_counts, orient='index', columns=['Product Count'])
+                count_df = count_df.sort_values('Product Count', ascending=False)
+                
+                st.dataframe(count_df)
+                
+                # Chart
+                st.bar_chart(count_df['Product Count'])
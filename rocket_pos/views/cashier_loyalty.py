@@ -0,0 +1,384 @@
+"""Cashier-facing loyalty customer lookup and reward redemption."""
+
+import streamlit as st
+
+from rocket_pos.core import (
+    TRANSACTIONS_FILE,
+    LOYALTY_FILE,
+    SETTINGS_FILE,
+    format_currency,
+    generate_short_id,
+    get_current_datetime,
+    is_cashier,
+    load_data,
+    save_data,
+)
+from rocket_pos.hardware import print_receipt
+from rocket_pos.points_ledger import customer_state, customer_states
+from rocket_pos.services import ServiceError, redeem_reward as redeem_customer_reward
+from rocket_pos.tiers import tier_table
+
+# cashier loyality 
+def cashier_loyalty_management():
+    if not is_cashier():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("👥 Loyalty Customer Management")
+    
+    # Load loyalty data
+    loyalty_data = load_data(LOYALTY_FILE)
+    customers = loyalty_data.get('customers', {})
+    rewards = loyalty_data.get('rewards', {})
+    
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "🔍 Find Customer", 
+        "📊 Customer Details", 
+        "🎁 Available Rewards", 
+        "➕ New Customer"
+    ])
+    
+    with tab1:
+        st.header("Find Loyalty Customer")
+        
+        # Search options
+        col1, col2 = st.columns(2)
+        with col1:
+            search_option = st.radio("Search by:", ["Phone Number", "Customer ID", "Name"])
+        
+        with col2:
+            if search_option == "Phone Number":
+                search_term = st.text_input("Enter Phone Number", placeholder="e.g., 555-0123")
+            elif search_option == "Customer ID":
+                search_term = st.text_input("Enter Customer ID", placeholder="e.g., CUST123")
+            else:
+                search_term = st.text_input("Enter Customer Name", placeholder="e.g., John Smith")
+        
+        # Search button
+        if st.button("🔍 Search Customer", use_container_width=True, key="search_customer_btn"):
+            found_customers = []
+            
+            if search_term:
+                for customer_id, customer in customers.items():
+                    if search_option == "Phone Number" and customer.get('phone', '').lower() == search_term.lower():
+                        found_customers.append((customer_id, customer))
+                    elif search_option == "Customer ID" and customer_id.lower() == search_term.lower():
+                        found_customers.append((customer_id, customer))
+                    elif search_option == "Name" and search_term.lower() in customer.get('name', '').lower():
+                        found_customers.append((customer_id, customer))
+            
+            if found_customers:
+                states = customer_states(dict(found_customers))
+                found_customers = [(customer_id, states[customer_id]) for customer_id, _ in found_customers]
+                st.session_state.found_customers = found_customers
+                st.session_state.selected_customer_id = found_customers[0][0]
+                st.success(f"Found {len(found_customers)} customer(s)")
+            else:
+                st.warning("No customers found matching your search")
+                st.session_state.found_customers = []
+                st.session_state.selected_customer_id = None
+        
+        # Display search results
+        if 'found_customers' in st.session_state and st.session_state.found_customers:
+            st.subheader("Search Results")
+            
+            for i, (customer_id, customer) in enumerate(st.session_state.found_customers):
+                col1, col2, col3 = st.columns([3, 2, 1])
+                with col1:
+                    st.write(f"**{customer.get('name', 'Unknown')}**")
+                    st.write(f"Phone: {customer.get('phone', 'N/A')}")
+                with col2:
+                    st.write(f"Points: {customer.get('points', 0)}")
+                    st.write(f"Tier: {customer.get('tier', 'Bronze')}")
+                with col3:
+                    if st.button("Select", key=f"select_{customer_id}_{i}", use_container_width=True):
+                        st.session_state.selected_customer_id = customer_id
+                        st.rerun()
+    
+    with tab2:
+        st.header("Customer Details")
+        
+        if 'selected_customer_id' not in st.session_state or not st.session_state.selected_customer_id:
+            st.info("Please search for and select a customer first")
+        else:
+            customer_id = st.session_state.selected_customer_id
+            customer = customers.get(customer_id, {})
+            
+            if not customer:
+                st.error("Customer not found")
+            else:
+                customer = customer_state(customer_id, customer)
+                
+                # Customer information
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.subheader("Customer Information")
+                    st.write(f"**Name:** {customer.get('name', 'Unknown')}")
+                    st.write(f"**Phone:** {customer.get('phone', 'N/A')}")
+                    st.write(f"**Email:** {customer.get('email', 'N/A')}")
+                    st.write(f"**Customer ID:** {customer_id}")
+                
+                with col2:
+                    st.subheader("Loyalty Status")
+                    
+                    # Points display
+                    current_points = customer.get('points', 0)
+                    st.metric("Loyalty Points", f"{current_points:,}")
+                    
+                    # Tier information
+                    current_tier = customer.get('tier', 'Bronze')
+                    st.write(f"**Current Tier:** {current_tier}")
+                    
+                    # Next tier progress, by threshold
+                    upcoming = tier_table().next_tier(current_tier)
+                    
+                    if upcoming:
+                        next_tier, next_tier_min = upcoming
+                        points_needed = max(0, next_tier_min - current_points)
+                        
+                        st.write(f"**Next Tier:** {next_tier} ({points_needed} points needed)")
+                        
+                        # Progress bar
+                        if next_tier_min > 0:
+                            progress = min(100, (current_points / next_tier_min) * 100)
+                            st.progress(progress / 100)
+                            st.write(f"Progress to {next_tier}: {progress:.1f}%")
+                
+                # Transaction history (simplified)
+                st.subheader("Recent Activity")
+                
+                # Get recent transactions for this customer
+                transactions = load_data(TRANSACTIONS_FILE)
+                customer_transactions = []
+                
+                for t in transactions.values():
+                    if t.get('customer_id') == customer_id:
+                        customer_transactions.append(t)
+                
+                # Sort by date, newest first
+                customer_transactions.sort(key=lambda x: x.get('date', ''), reverse=True)
+                
+                if customer_transactions:
+                    for trans in customer_transactions[:5]:  # Show last 5 transactions
+                        with st.expander(f"Transaction {trans.get('date', 'Unknown date')} - {format_currency(trans.get('total', 0))}"):
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                st.write(f"**Date:** {trans.get('date', 'N/A')}")
+                                st.write(f"**Total:** {format_currency(trans.get('total', 0))}")
+                            with col2:
+                                points_earned = trans.get('loyalty_points_earned', 0)
+                                points_redeemed = trans.get('loyalty_points_redeemed', 0)
+                                if points_earned > 0:
+                                    st.write(f"**Points Earned:** +{points_earned}")
+                                if points_redeemed > 0:
+                                    st.write(f"**Points Redeemed:** -{points_redeemed}")
+                else:
+                    st.info("No transaction history found")
+                
+                # Quick actions
+                st.subheader("Quick Actions")
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    if st.button("🖨️ Print Loyalty Card", key="print_loyalty_card", use_container_width=True):
+                        print_loyalty_card(customer_id, customer)
+                
+                with col2:
+                    if st.button("🔄 Refresh Data", key="refresh_customer_data", use_container_width=True):
+                        st.rerun()
+    
+    with tab3:
+        st.header("Available Rewards")
+        
+        if 'selected_customer_id' not in st.session_state or not st.session_state.selected_customer_id:
+            st.info("Please select a customer first to view available rewards")
+        else:
+            customer_id = st.session_state.selected_customer_id
+            customer = customer_state(customer_id, customers.get(customer_id, {}))
+            current_points = customer.get('points', 0)
+            
+            # A click is handled on the run after the one that showed the balance, so redeem
+            # against the version shown then; points changed in between fail the redemption
+            shown_version = st.session_state.get(f"points_shown_{customer_id}", customer['points_version'])
+            st.session_state[f"points_shown_{customer_id}"] = customer['points_version']
+            
+            st.subheader(f"Available Points: {current_points}")
+            
+            # Filter active rewards
+            active_rewards = {k: v for k, v in rewards.items() if v.get('active', True)}
+            
+            if not active_rewards:
+                st.info("No rewards currently available")
+            else:
+                # Display rewards
+                for i, (reward_id, reward) in enumerate(active_rewards.items()):
+                    points_required = reward.get('points', 0)
+                    can_redeem = current_points >= points_required
+                    
+                    with st.container():
+                        col1, col2, col3 = st.columns([3, 1, 1])
+                        
+                        with col1:
+                            st.write(f"**{reward.get('name', 'Unknown Reward')}**")
+                            st.write(f"{reward.get('description', 'No description')}")
+                            st.write(f"**Cost:** {points_required} points")
+                        
+                        with col2:
+                            status_color = "green" if can_redeem else "red"
+                            status_text = "✅ Available" if can_redeem else "❌ Not enough points"
+                            st.markdown(f"<span style='color:{status_color}'>{status_text}</span>", unsafe_allow_html=True)
+                        
+                        with col3:
+                            if can_redeem:
+                                if st.button("Redeem", key=f"redeem_{reward_id}_{i}", use_container_width=True):
+                                    redeem_reward(customer_id, reward_id, reward, shown_version)
+                            else:
+                                st.button("Redeem", key=f"redeem_disabled_{reward_id}_{i}", disabled=True, use_container_width=True)
+                        
+                        st.markdown("---")
+    
+    with tab4:
+        st.header("Add New Loyalty Customer")
+        
+        with st.form("new_customer_form"):
+            st.subheader("Customer Information")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                name = st.text_input("Full Name*", help="Customer's full name", key="new_cust_name")
+                phone = st.text_input("Phone Number*", help="Primary contact number", key="new_cust_phone")
+            with col2:
+                email = st.text_input("Email Address", help="Optional email address", key="new_cust_email")
+                initial_points = st.number_input("Initial Points", min_value=0, value=0, help="Starting loyalty points", key="new_cust_points")
+            
+            # Address information
+            st.subheader("Address Information (Optional)")
+            address = st.text_area("Street Address", key="new_cust_address")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                city = st.text_input("City", key="new_cust_city")
+            with col2:
+                postal_code = st.text_input("Postal Code", key="new_cust_postal")
+            
+            # Marketing preferences
+            st.subheader("Communication Preferences")
+            col1, col2 = st.columns(2)
+            with col1:
+                accept_emails = st.checkbox("Email offers and updates", value=True, key="new_cust_emails")
+            with col2:
+                accept_sms = st.checkbox("SMS/text messages", value=True, key="new_cust_sms")
+            
+            if st.form_submit_button("➕ Add Customer", use_container_width=True):
+                if not name or not phone:
+                    st.error("Name and phone number are required")
+                else:
+                    # Check if phone already exists
+                    phone_exists = any(c.get('phone') == phone for c in customers.values())
+                    if phone_exists:
+                        st.error("A customer with this phone number already exists")
+                    else:
+                        # Create new customer
+                        new_customer_id = f"CUST{generate_short_id()}"
+                        
+                        # Determine initial tier based on points
+                        initial_tier = tier_table().resolve(initial_points) or "Bronze"
+                        
+                        new_customer = {
+                            'id': new_customer_id,
+                            'name': name,
+                            'phone': phone,
+                            'email': email,
+                            'address': address,
+                            'city': city,
+                            'postal_code': postal_code,
+                            'points': initial_points,
+                            'tier': initial_tier,
+                            'accept_emails': accept_emails,
+                            'accept_sms': accept_sms,
+                            'date_joined': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                            'joined_by': st.session_state.user_info['username']
+                        }
+                        
+                        customers[new_customer_id] = new_customer
+                        loyalty_data['customers'] = customers
+                        save_data(loyalty_data, LOYALTY_FILE)
+                        
+                        st.success(f"Customer added successfully! Customer ID: {new_customer_id}")
+                        
+                        # Auto-select the new customer
+                        st.session_state.selected_customer_id = new_customer_id
+                        st.session_state.found_customers = [(new_customer_id, new_customer)]
+                        st.rerun()
+
+# Helper functions for loyalty management
+def print_loyalty_card(customer_id, customer):
+    """Generate and print a loyalty card"""
+    try:
+        settings = load_data(SETTINGS_FILE)
+        
+        card_content = f"""
+        {settings.get('store_name', 'SUPERMARKET POS')}
+        LOYALTY CARD
+        ====================
+        Customer: {customer.get('name', 'N/A')}
+        ID: {customer_id}
+        Phone: {customer.get('phone', 'N/A')}
+        Tier: {customer.get('tier', 'Bronze')}
+        Points: {customer.get('points', 0)}
+        ====================
+        Issued: {get_current_datetime().strftime('%Y-%m-%d')}
+        """
+        
+        if print_receipt(card_content):
+            st.success("Loyalty card printed successfully")
+        else:
+            st.warning("Could not print automatically. Please try manual print.")
+            
+            # Show the card content for manual printing
+            st.text_area("Loyalty Card Content", card_content, height=200)
+            
+    except Exception as e:
+        st.error(f"Error printing loyalty card: {str(e)}")
+
+def redeem_reward(customer_id, reward_id, reward, points_version=None):
+    """Redeem a reward for a customer.
+
+    points_version is the customer's points_version the reward list was shown
+    with, so a balance another till has changed since is re-shown, not spent.
+    """
+    try:
+        try:
+            customer, redemption = redeem_customer_reward(customer_id, reward_id,
+                                                          st.session_state.user_info['username'], points_version)
+        except ServiceError as e:
+            st.error(str(e))
+            return
+        points_required = redemption['points_used']
+        
+        # Generate redemption receipt
+        redemption_receipt = f"""
+        REWARD REDEMPTION RECEIPT
+        ====================
+        Customer: {customer.get('name', 'N/A')}
+        Reward: {reward.get('name', 'Unknown')}
+        Points Used: {points_required}
+        Remaining Points: {customer['points']}
+        Date: {get_current_datetime().strftime('%Y-%m-%d %H:%M:%S')}
+        ====================
+        {reward.get('description', '')}
+        ====================
+        Thank you for your loyalty!
+        """
+        
+        if print_receipt(redemption_receipt):
+            st.success("Reward redeemed successfully! Receipt printed.")
+        else:
+            st.success("Reward redeemed successfully! (Print failed)")
+        
+        st.rerun()
+        
+    except Exception as e:
+        st.error(f"Error redeeming reward: {str(e)}")
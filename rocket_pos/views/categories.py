@@ -0,0 +1,104 @@
+"""Categories management."""
+
+import streamlit as st
+import pandas as pd
+
+from rocket_pos.core import CATEGORIES_FILE, is_manager, load_data, save_data
+
+# Categories Management
+def categories_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Categories Management")
+    
+    tab1, tab2 = st.tabs(["Manage Categories", "Manage Subcategories"])
+    
+    with tab1:
+        st.header("Manage Categories")
+        
+        categories_data = load_data(CATEGORIES_FILE)
+        categories = categories_data.get('categories', [])
+        subcategories = categories_data.get('subcategories', {})
+        
+        st.subheader("Current Categories")
+        if not categories:
+            st.info("No categories defined")
+        else:
+            st.dataframe(pd.DataFrame(categories, columns=["Categories"]))
+        
+        st.subheader("Add/Edit Category")
+        with st.form("category_form"):
+            new_category = st.text_input("Category Name")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.form_submit_button("Add Category"):
+                    if new_category and new_category not in categories:
+                        categories.append(new_category)
+                        categories_data['categories'] = categories
+                        if new_category not in subcategories:
+                            subcategories[new_category] = []
+                        categories_data['subcategories'] = subcategories
+                        save_data(categories_data, CATEGORIES_FILE)
+                        st.success("Category added successfully")
+                        st.rerun()
+            with col2:
+                if categories and st.form_submit_button("Remove Selected"):
+                    category_to_remove = st.selectbox("Select Category to Remove", [""] + categories)
+                    if category_to_remove:
+                        categories.remove(category_to_remove)
+                        categories_data['categories'] = categories
+                        if category_to_remove in subcategories:
+                            del subcategories[category_to_remove]
+                        categories_data['subcategories'] = subcategories
+                        save_data(categories_data, CATEGORIES_FILE)
+                        st.success("Category removed successfully")
+                        st.rerun()
+    
+    with tab2:
+        st.header("Manage Subcategories")
+        
+        categories_data = load_data(CATEGORIES_FILE)
+        categories = categories_data.get('categories', [])
+        subcategories = categories_data.get('subcategories', {})
+        
+        if not categories:
+            st.info("No categories available to add subcategories")
+        else:
+            selected_category = st.selectbox("Select Category", categories)
+            
+            if selected_category:
+                if selected_category not in subcategories:
+                    subcategories[selected_category] = []
+                
+                st.subheader(f"Subcategories for {selected_category}")
+                if not subcategories[selected_category]:
+                    st.info("No subcategories defined for this category")
+                else:
+                    st.dataframe(pd.DataFrame(subcategories[selected_category], columns=["Subcategories"]))
+                
+                st.subheader("Add/Edit Subcategory")
+                with st.form("subcategory_form"):
+                    new_subcategory = st.text_input("Subcategory Name")
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.form_submit_button("Add Subcategory"):
+                            if new_subcategory and new_subcategory not in subcategories[selected_category]:
+                                subcategories[selected_category].append(new_subcategory)
+                                categories_data['subcategories'] = subcategories
+                                save_data(categories_data, CATEGORIES_FILE)
+                                st.success("Subcategory added successfully")
+                                st.rerun()
+                    with col2:
+                        if subcategories[selected_category] and st.form_submit_button("Remove Selected"):
+                            subcategory_to_remove = st.selectbox("Select Subcategory to Remove", 
+                                                               [""] + subcategories[selected_category])
+                            if subcategory_to_remove:
+                                subcategories[selected_category].remove(subcategory_to_remove)
+                                categories_data['subcategories'] = subcategories
+                                save_data(categories_data, CATEGORIES_FILE)
+                                st.success("Subcategory removed successfully")
+                                st.rerun()
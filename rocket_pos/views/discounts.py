@@ -0,0 +1,275 @@
+"""Discounts & promotions."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+import uuid
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    DISCOUNTS_FILE,
+    CATEGORIES_FILE,
+    get_current_datetime,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.product_search import product_picker
+
+# Discounts & Promotions
+def discounts_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Discounts & Promotions")
+    
+    tab1, tab2, tab3 = st.tabs(["Add Discount", "View/Edit Discounts", "Bulk Import"])
+    
+    with tab1:
+        st.header("Add New Discount")
+        
+        # Scope first, outside the form, so the product search updates as you type
+        apply_to = st.selectbox("Apply To*", ["All Products", "Specific Categories", "Specific Products"],
+                                key="add_discount_apply_to")
+        
+        if apply_to == "Specific Categories":
+            categories = load_data(CATEGORIES_FILE).get('categories', [])
+            selected_categories = st.multiselect("Select Categories*", categories, key="add_discount_categories")
+        elif apply_to == "Specific Products":
+            selected_products = product_picker("Select Products*", key="add_discount_products", multiple=True)
+        
+        with st.form("add_discount_form"):
+            name = st.text_input("Discount Name*")
+            description = st.text_area("Description")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                discount_type = st.selectbox("Discount Type*", ["Percentage", "Fixed Amount"])
+            with col2:
+                if discount_type == "Percentage":
+                    value = st.number_input("Value*", min_value=1, max_value=100, value=10, step=1)
+                else:
+                    value = st.number_input("Value*", min_value=0.01, value=1.0, step=1.0)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("Start Date*", value=datetime.date.today())
+            with col2:
+                end_date = st.date_input("End Date*", value=datetime.date.today() + datetime.timedelta(days=7))
+            
+            active = st.checkbox("Active", value=True)
+            
+            submit_button = st.form_submit_button("Add Discount")
+            
+            if submit_button:
+                if not name:
+                    st.error("Discount name is required")
+                elif apply_to == "Specific Categories" and not selected_categories:
+                    st.error("Please select at least one category")
+                elif apply_to == "Specific Products" and not selected_products:
+                    st.error("Please select at least one product")
+                else:
+                    discounts = load_data(DISCOUNTS_FILE)
+                    discount_id = str(uuid.uuid4())
+                    
+                    discount_data = {
+                        'id': discount_id,
+                        'name': name,
+                        'description': description,
+                        'type': 'percentage' if discount_type == "Percentage" else 'fixed',
+                        'value': value,
+                        'start_date': start_date.strftime("%Y-%m-%d"),
+                        'end_date': end_date.strftime("%Y-%m-%d"),
+                        'apply_to': apply_to,
+                        'active': active,
+                        'created_by': st.session_state.user_info['username'],
+                        'created_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                    }
+                    
+                    if apply_to == "Specific Categories":
+                        discount_data['categories'] = selected_categories
+                    elif apply_to == "Specific Products":
+                        discount_data['products'] = list(selected_products)
+                    
+                    discounts[discount_id] = discount_data
+                    save_data(discounts, DISCOUNTS_FILE)
+                    st.session_state.pop('add_discount_products', None)
+                    st.success("Discount added successfully")
+    
+    with tab2:
+        st.header("View/Edit Discounts")
+        
+        discounts = load_data(DISCOUNTS_FILE)
+        if not discounts:
+            st.info("No discounts available")
+        else:
+            for discount_id, discount in discounts.items():
+                with st.expander(f"{discount['name']} - {'Active' if discount['active'] else 'Inactive'}"):
+                    scopes = ["All Products", "Specific Categories", "Specific Products"]
+                    apply_to = st.selectbox("Apply To", scopes, index=scopes.index(discount.get('apply_to')),
+                                            key=f"edit_apply_to_{discount_id}")
+                    
+                    if apply_to == "Specific Categories":
+                        categories = load_data(CATEGORIES_FILE).get('categories', [])
+                        selected_categories = st.multiselect("Categories", categories,
+                                                             default=discount.get('categories', []),
+                                                             key=f"edit_categories_{discount_id}")
+                    elif apply_to == "Specific Products":
+                        selected_products = product_picker("Products", key=f"edit_products_{discount_id}",
+                                                           multiple=True, default=discount.get('products', []))
+                    
+                    with st.form(key=f"edit_{discount_id}"):
+                        name = st.text_input("Name", value=discount.get('name', ''))
+                        description = st.text_area("Description", value=discount.get('description', ''))
+                        
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            discount_type = st.selectbox("Type", 
+                                                       ["Percentage", "Fixed Amount"], 
+                                                       index=0 if discount.get('type') == 'percentage' else 1)
+                        with col2:
+                            if discount_type == "Percentage":
+                                value = st.number_input("Value", 
+                                                      min_value=1, 
+                                                      max_value=100, 
+                                                      value=int(discount.get('value', 10)),
+                                                      step=1)
+                            else:
+                                value = st.number_input("Value", 
+                                                      min_value=0.01, 
+                                                      value=float(discount.get('value', 1.0)), 
+                                                      step=1.0)
+                        
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            start_date = st.date_input("Start Date", 
+                                                     value=datetime.datetime.strptime(discount.get('start_date'), "%Y-%m-%d").date())
+                        with col2:
+                            end_date = st.date_input("End Date", 
+                                                   value=datetime.datetime.strptime(discount.get('end_date'), "%Y-%m-%d").date())
+                        
+                        active = st.checkbox("Active", value=discount.get('active', True))
+                        
+                        if st.form_submit_button("Update Discount"):
+                            discounts[discount_id]['name'] = name
+                            discounts[discount_id]['description'] = description
+                            discounts[discount_id]['type'] = 'percentage' if discount_type == "Percentage" else 'fixed'
+                            discounts[discount_id]['value'] = value
+                            discounts[discount_id]['start_date'] = start_date.strftime("%Y-%m-%d")
+                            discounts[discount_id]['end_date'] = end_date.strftime("%Y-%m-%d")
+                            discounts[discount_id]['apply_to'] = apply_to
+                            discounts[discount_id]['active'] = active
+                            discounts[discount_id]['updated_by'] = st.session_state.user_info['username']
+                            discounts[discount_id]['updated_at'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            
+                            if apply_to == "Specific Categories":
+                                discounts[discount_id]['categories'] = selected_categories
+                                discounts[discount_id].pop('products', None)
+                            elif apply_to == "Specific Products":
+                                discounts[discount_id]['products'] = list(selected_products)
+                                discounts[discount_id].pop('categories', None)
+                            else:
+                                discounts[discount_id].pop('categories', None)
+                                discounts[discount_id].pop('products', None)
+                            
+                            save_data(discounts, DISCOUNTS_FILE)
+                            st.success("Discount updated successfully")
+    
+    with tab3:
+        st.header("Bulk Import Discounts")
+        
+        st.info("Download the template file to prepare your discount data")
+        
+        # Generate template file
+        template_data = {
+            "name": ["Summer Sale", ""],
+            "description": ["Summer discount on all items", ""],
+            "type": ["percentage", ""],
+            "value": [10, ""],
+            "start_date": ["2023-06-01", ""],
+            "end_date": ["2023-08-31", ""],
+            "apply_to": ["All Products", ""],
+            "categories": ["Groceries,Dairy", ""],
+            "products": ["123456789012,987654321098", ""],
+            "active": [True, ""]
+        }
+        template_df = pd.DataFrame(template_data)
+        
+        st.download_button(
+            label="Download Template",
+            data=template_df.to_csv(index=False).encode('utf-8'),
+            file_name="discount_import_template.csv",
+            mime="text/csv"
+        )
+        
+        uploaded_file = st.file_uploader("Upload CSV file", type=['csv'])
+        
+        if uploaded_file:
+            try:
+                df = pd.read_csv(uploaded_file)
+                st.dataframe(df)
+                
+                if st.button("Import Discounts"):
+                    discounts = load_data(DISCOUNTS_FILE)
+                    products = load_data(PRODUCTS_FILE)
+                    categories = load_data(CATEGORIES_FILE).get('categories', [])
+                    imported = 0
+                    updated = 0
+                    errors = 0
+                    
+                    for _, row in df.iterrows():
+                        try:
+                            if pd.isna(row['name']) or str(row['name']).strip() == "":
+                                errors += 1
+                                continue
+                            
+                            discount_id = str(uuid.uuid4())
+                            
+                            discount_data = {
+                                'id': discount_id,
+                                'name': str(row['name']).strip(),
+                                'description': str(row['description']).strip() if not pd.isna(row['description']) else "",
+                                'type': str(row['type']).strip().lower() if not pd.isna(row['type']) else "percentage",
+                                'value': float(row['value']) if not pd.isna(row['value']) else 0.0,
+                                'start_date': str(row['start_date']).strip() if not pd.isna(row['start_date']) else datetime.date.today().strftime("%Y-%m-%d"),
+                                'end_date': str(row['end_date']).strip() if not pd.isna(row['end_date']) else (datetime.date.today() + datetime.timedelta(days=7)).strftime("%Y-%m-%d"),
+                                'apply_to': str(row['apply_to']).strip() if not pd.isna(row['apply_to']) else "All Products",
+                                'active': bool(row['active']) if not pd.isna(row['active']) else True,
+                                'created_by': st.session_state.user_info['username'],
+                                'created_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            }
+                            
+                            if discount_data['apply_to'] == "Specific Categories":
+                                if pd.isna(row['categories']):
+                                    errors += 1
+                                    continue
+                                cat_list = [c.strip() for c in str(row['categories']).split(',')]
+                                valid_cats = [c for c in cat_list if c in categories]
+                                if not valid_cats:
+                                    errors += 1
+                                    continue
+                                discount_data['categories'] = valid_cats
+                            
+                            elif discount_data['apply_to'] == "Specific Products":
+                                if pd.isna(row['products']):
+                                    errors += 1
+                                    continue
+                                prod_list = [p.strip() for p in str(row['products']).split(',')]
+                                valid_prods = [p for p in prod_list if p in products]
+                                if not valid_prods:
+                                    errors += 1
+                                    continue
+                                discount_data['products'] = valid_prods
+                            
+                            discounts[discount_id] = discount_data
+                            imported += 1
+                        
+                        except Exception as e:
+                            errors += 1
+                            continue
+                    
+                    save_data(discounts, DISCOUNTS_FILE)
+                    st.success(f"Import completed: {imported} new discounts, {errors} errors")
+            except Exception as e:
+                st.error(f"Error reading CSV file: {str(e)}")
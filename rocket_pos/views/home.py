@@ -0,0 +1,260 @@
+"""Dashboard landing pages."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    TRANSACTIONS_FILE,
+    format_currency,
+    load_data,
+)
+from rocket_pos.receipts import generate_receipt
+from rocket_pos.returns_log import load_returns
+from rocket_pos.shifts import empty_shift_totals, load_shifts
+
+def dashboard_content():
+    st.header("Overview")
+    
+    col1, col2, col3, col4 = st.columns(4)  # Added an extra column
+    
+    products = load_data(PRODUCTS_FILE)
+    inventory = load_data(INVENTORY_FILE)
+    transactions = load_data(TRANSACTIONS_FILE)
+    returns = load_returns()
+    
+    total_products = len(products)
+    low_stock_items = sum(1 for item in inventory.values() if item.get('quantity', 0) < item.get('reorder_point', 10))
+    
+    # Calculate today's sales and returns
+    today = datetime.date.today()
+    today_sales = 0
+    today_returns = 0
+    
+    # Calculate sales
+    for t in transactions.values():
+        try:
+            trans_date = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if trans_date == today:
+                today_sales += t.get('total', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    # Calculate returns/refunds
+    for r in returns.values():
+        try:
+            return_date = datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if return_date == today:
+                today_returns += r.get('total_refund', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    # Calculate net sales (sales minus returns)
+    today_net_sales = today_sales - today_returns
+    
+    col1.metric("Total Products", total_products)
+    col2.metric("Low Stock Items", low_stock_items)
+    col3.metric("Today's Gross Sales", format_currency(today_sales))
+    col4.metric("Today's Net Sales", format_currency(today_net_sales), 
+               delta=f"Refunds: -{format_currency(today_returns)}")
+    
+    # Additional metrics row for refunds
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Today's Refunds", format_currency(today_returns))
+    
+    # Calculate weekly metrics
+    week_start = today - datetime.timedelta(days=today.weekday())
+    week_sales = 0
+    week_returns = 0
+    
+    for t in transactions.values():
+        try:
+            trans_date = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if trans_date >= week_start:
+                week_sales += t.get('total', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    for r in returns.values():
+        try:
+            return_date = datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if return_date >= week_start:
+                week_returns += r.get('total_refund', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    week_net_sales = week_sales - week_returns
+    
+    col2.metric("Weekly Gross Sales", format_currency(week_sales))
+    col3.metric("Weekly Net Sales", format_currency(week_net_sales))
+    col4.metric("Weekly Refunds", format_currency(week_returns))
+    
+    st.subheader("Recent Transactions")
+    
+    def get_transaction_date(t):
+        try:
+            return datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S")
+        except (ValueError, KeyError):
+            return datetime.datetime.min
+    
+    recent_transactions = sorted(transactions.values(), 
+                               key=get_transaction_date, 
+                               reverse=True)[:5]
+    
+    if recent_transactions:
+        display_data = []
+        for t in recent_transactions:
+            display_data.append({
+                'transaction_id': t.get('transaction_id', 'N/A'),
+                'date': t.get('date', 'N/A'),
+                'total': format_currency(t.get('total', 0)),
+                'cashier': t.get('cashier', 'N/A')
+            })
+        
+        trans_df = pd.DataFrame(display_data)
+        st.dataframe(trans_df)
+    else:
+        st.info("No recent transactions")
+    
+    # Show recent returns
+    st.subheader("Recent Returns/Refunds")
+    
+    def get_return_date(r):
+        try:
+            return datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S")
+        except (ValueError, KeyError):
+            return datetime.datetime.min
+    
+    recent_returns = sorted(returns.values(), 
+                          key=get_return_date, 
+                          reverse=True)[:5]
+    
+    if recent_returns:
+        return_data = []
+        for r in recent_returns:
+            return_data.append({
+                'return_id': r.get('return_id', 'N/A'),
+                'date': r.get('return_date', 'N/A'),
+                'amount': format_currency(r.get('total_refund', 0)),
+                'reason': r.get('reason', 'N/A'),
+                'processed_by': r.get('processed_by', 'N/A')
+            })
+        
+        returns_df = pd.DataFrame(return_data)
+        st.dataframe(returns_df)
+    else:
+        st.info("No recent returns")
+
+def get_sales_metrics(start_date, end_date):
+    """Calculate sales and returns for a given date range"""
+    transactions = load_data(TRANSACTIONS_FILE)
+    returns = load_returns()
+    
+    total_sales = 0
+    total_returns = 0
+    
+    # Calculate sales
+    for t in transactions.values():
+        try:
+            trans_date = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= trans_date <= end_date:
+                total_sales += t.get('total', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    # Calculate returns
+    for r in returns.values():
+        try:
+            return_date = datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= return_date <= end_date:
+                total_returns += r.get('total_refund', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    return {
+        'gross_sales': total_sales,
+        'returns': total_returns,
+        'net_sales': total_sales - total_returns
+    }
+
+# Cahier dash and trans historia 
+def cashier_dashboard():
+    st.header("Cashier Dashboard")
+    
+    # Load data
+    transactions = load_data(TRANSACTIONS_FILE)
+    returns = load_returns()
+    
+    # Calculate today's metrics
+    today = datetime.date.today()
+    today_sales = 0
+    today_returns = 0
+    
+    # Calculate sales
+    for t in transactions.values():
+        try:
+            trans_date = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if trans_date == today:
+                today_sales += t.get('total', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    # Calculate returns/refunds
+    for r in returns.values():
+        try:
+            return_date = datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if return_date == today:
+                today_returns += r.get('total_refund', 0)
+        except (ValueError, KeyError):
+            continue
+    
+    # Calculate net sales
+    today_net_sales = today_sales - today_returns
+    
+    # Display metrics
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Today's Sales", format_currency(today_sales))
+    col2.metric("Today's Returns", format_currency(today_returns))
+    col3.metric("Net Sales", format_currency(today_net_sales))
+    
+    # Current shift info if active
+    if st.session_state.shift_started:
+        shifts = load_shifts()
+        current_shift = shifts.get(st.session_state.shift_id, {})
+        starting_cash = current_shift.get('starting_cash', 0)
+        
+        # Cash taken this shift, from the shift's running totals
+        current_cash = current_shift.get('totals', empty_shift_totals())['cash_total']
+        
+        col4.metric("Cash in Drawer", format_currency(starting_cash + current_cash))
+    
+    # Recent transactions (last 5)
+    st.subheader("Recent Transactions")
+    user_transactions = [t for t in transactions.values() 
+                        if t.get('cashier') == st.session_state.user_info['username']]
+    
+    # Sort by date (newest first)
+    def get_transaction_date(t):
+        try:
+            return datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S")
+        except (ValueError, KeyError):
+            return datetime.datetime.min
+    
+    recent_transactions = sorted(user_transactions, key=get_transaction_date, reverse=True)[:5]
+    
+    if recent_transactions:
+        for t in recent_transactions:
+            with st.expander(f"Sale {t.get('date', 'N/A')} - {format_currency(t.get('total', 0))}"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"**Date:** {t.get('date', 'N/A')}")
+                    st.write(f"**Total:** {format_currency(t.get('total', 0))}")
+                    st.write(f"**Payment:** {t.get('payment_method', 'N/A')}")
+                with col2:
+                    if st.button("View Receipt", key=f"view_{t.get('transaction_id', '')}"):
+                        receipt_text = generate_receipt(t)
+                        st.text_area("Receipt", receipt_text, height=200)
+    else:
+        st.info("No recent transactions")
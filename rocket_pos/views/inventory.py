@@ -0,0 +1,379 @@
+"""Inventory management."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    format_currency,
+    get_current_datetime,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.product_search import product_picker
+from rocket_pos.stock_ledger import ensure_stock_ledger, query_events, record_stock_events, stock_event, valuation_on
+
+# Inventory Management
+def inventory_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Inventory Management")
+    
+    # Moves any legacy per-SKU adjustment lists into the stock event log before they're loaded below
+    ensure_stock_ledger()
+    
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "Current Inventory", 
+        "Stock Adjustment", 
+        "Inventory Reports", 
+        "Bulk Update"
+    ])
+    
+    with tab1:
+        st.header("Current Inventory")
+        
+        inventory = load_data(INVENTORY_FILE)
+        products = load_data(PRODUCTS_FILE)
+        
+        if not inventory:
+            st.info("No inventory items available")
+        else:
+            # Merge product info with inventory
+            inventory_list = []
+            for barcode, inv_data in inventory.items():
+                product = products.get(barcode, {'name': 'Unknown Product', 'price': 0})
+                inventory_list.append({
+                    'product': product['name'],
+                    'barcode': barcode,
+                    'quantity': inv_data.get('quantity', 0),
+                    'reorder_point': inv_data.get('reorder_point', 10),
+                    'status': 'Low Stock' if inv_data.get('quantity', 0) < inv_data.get('reorder_point', 10) else 'OK',
+                    'last_updated': inv_data.get('last_updated', 'N/A')
+                })
+            
+            inventory_df = pd.DataFrame(inventory_list)
+            
+            # Filter options
+            col1, col2 = st.columns(2)
+            with col1:
+                show_low_stock = st.checkbox("Show Only Low Stock Items", key="inv_low_stock_filter")
+            with col2:
+                sort_by = st.selectbox(
+                    "Sort By", 
+                    ["Product Name", "Quantity", "Status"],
+                    key="inv_sort_by"
+                )
+            
+            if show_low_stock:
+                inventory_df = inventory_df[inventory_df['status'] == 'Low Stock']
+            
+            if sort_by == "Product Name":
+                inventory_df = inventory_df.sort_values('product')
+            elif sort_by == "Quantity":
+                inventory_df = inventory_df.sort_values('quantity')
+            else:
+                inventory_df = inventory_df.sort_values('status')
+            
+            st.dataframe(inventory_df)
+            
+            # Export option
+            if st.button("Export Inventory to CSV", key="export_inv_csv"):
+                csv = inventory_df.to_csv(index=False)
+                st.download_button(
+                    label="Download CSV",
+                    data=csv,
+                    file_name=f"inventory_report_{datetime.date.today()}.csv",
+                    mime="text/csv",
+                    key="inv_download_csv"
+                )
+    
+    with tab2:
+        st.header("Stock Adjustment")
+        
+        products = load_data(PRODUCTS_FILE)
+        if not products:
+            st.info("No products available")
+        else:
+            barcode = product_picker("Select Product", key="stock_adj_product")
+            
+            if barcode:
+                inventory = load_data(INVENTORY_FILE)
+                current_qty = inventory.get(barcode, {}).get('quantity', 0)
+                current_reorder = inventory.get(barcode, {}).get('reorder_point', 10)
+                
+                st.write(f"Current Stock: {current_qty}")
+                st.write(f"Current Reorder Point: {current_reorder}")
+                
+                with st.form(key=f"adjust_{barcode}"):
+                    adjustment_type = st.radio(
+                        "Adjustment Type", 
+                        ["Add Stock", "Remove Stock", "Set Stock", "Transfer Stock"],
+                        key=f"adj_type_{barcode}"
+                    )
+                    
+                    if adjustment_type in ["Add Stock", "Remove Stock", "Set Stock"]:
+                        quantity = st.number_input(
+                            "Quantity", 
+                            min_value=1, 
+                            value=1, 
+                            step=1,
+                            key=f"adj_qty_{barcode}"
+                        )
+                    else:
+                        quantity = st.number_input(
+                            "Quantity to Transfer", 
+                            min_value=1, 
+                            value=1, 
+                            step=1,
+                            key=f"transfer_qty_{barcode}"
+                        )
+                        transfer_to = st.text_input(
+                            "Transfer To (Location/Branch)",
+                            key=f"transfer_to_{barcode}"
+                        )
+                    
+                    new_reorder = st.number_input(
+                        "Reorder Point", 
+                        min_value=0, 
+                        value=current_reorder, 
+                        step=1,
+                        key=f"reorder_{barcode}"
+                    )
+                    notes = st.text_area(
+                        "Notes",
+                        key=f"notes_{barcode}"
+                    )
+                    
+                    if st.form_submit_button("Submit Adjustment"):
+                        if barcode not in inventory:
+                            inventory[barcode] = {'quantity': 0, 'reorder_point': new_reorder}
+                        
+                        if adjustment_type == "Add Stock":
+                            inventory[barcode]['quantity'] += quantity
+                        elif adjustment_type == "Remove Stock":
+                            inventory[barcode]['quantity'] -= quantity
+                        elif adjustment_type == "Set Stock":
+                            inventory[barcode]['quantity'] = quantity
+                        elif adjustment_type == "Transfer Stock":
+                            inventory[barcode]['quantity'] -= quantity
+                        
+                        inventory[barcode]['reorder_point'] = new_reorder
+                        inventory[barcode]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                        
+                        if adjustment_type == "Transfer Stock":
+                            event = stock_event(barcode, 'transfer', -quantity, transfer_to, notes)
+                        else:
+                            event = stock_event(barcode, 'adjustment', inventory[barcode]['quantity'] - current_qty,
+                                                adjustment_type, notes)
+                        record_stock_events([event], st.session_state.user_info['username'])
+                        
+                        save_data(inventory, INVENTORY_FILE)
+                        st.success("Inventory updated successfully")
+    
+    with tab3:
+        st.header("Inventory Reports")
+        
+        inventory = load_data(INVENTORY_FILE)
+        products = load_data(PRODUCTS_FILE)
+        
+        if not inventory:
+            st.info("No inventory data available")
+        else:
+            report_type = st.selectbox(
+                "Inventory Report Type", 
+                [
+                    "Stock Levels",
+                    "Stock Value",
+                    "Stock Movement",
+                    "Stock Valuation (Any Date)",
+                    "Inventory Audit"
+                ],
+                key="inv_report_type"
+            )
+            
+            if report_type == "Stock Levels":
+                inventory_list = []
+                for barcode, inv_data in inventory.items():
+                    product = products.get(barcode, {'name': 'Unknown'})
+                    inventory_list.append({
+                        'product': product['name'],
+                        'barcode': barcode,
+                        'quantity': inv_data.get('quantity', 0),
+                        'reorder_point': inv_data.get('reorder_point', 10)
+                    })
+                
+                inv_df = pd.DataFrame(inventory_list)
+                st.dataframe(inv_df)
+            
+            elif report_type == "Stock Value":
+                value_list = []
+                for barcode, inv_data in inventory.items():
+                    product = products.get(barcode, {'name': 'Unknown', 'cost': 0})
+                    value_list.append({
+                        'product': product['name'],
+                        'barcode': barcode,
+                        'quantity': inv_data.get('quantity', 0),
+                        'unit_cost': product.get('cost', 0),
+                        'total_value': inv_data.get('quantity', 0) * product.get('cost', 0)
+                    })
+                
+                value_df = pd.DataFrame(value_list)
+                total_value = value_df['total_value'].sum()
+                
+                st.write(f"Total Inventory Value: {format_currency(total_value)}")
+                st.dataframe(value_df.sort_values('total_value', ascending=False))
+            
+            elif report_type == "Stock Movement":
+                st.info("Pick a product, or leave it blank to see every product's movements")
+                
+                selected_barcode = product_picker("Select Product", key="movement_product")
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    movement_start = st.date_input("From", datetime.date.today() - datetime.timedelta(days=30),
+                                                   key="movement_start")
+                with col2:
+                    movement_end = st.date_input("To", datetime.date.today(), key="movement_end")
+                with col3:
+                    movement_scope = st.selectbox("Show", ["All Movements", "Adjustments & Transfers"],
+                                                  key="movement_scope")
+                event_types = ['adjustment', 'transfer'] if movement_scope == "Adjustments & Transfers" else None
+                barcode = selected_barcode or None
+                
+                page_size = 50
+                page = st.session_state.get("movement_page", 1)
+                movements, total = query_events(barcode, movement_start, movement_end, event_types, page, page_size)
+                pages = max(1, -(-total // page_size))
+                if page > pages:
+                    # The filters changed under a later page
+                    st.session_state.movement_page = page = pages
+                    movements, total = query_events(barcode, movement_start, movement_end, event_types, page, page_size)
+                
+                if movements:
+                    movement_df = pd.DataFrame(movements)
+                    columns = ['date', 'barcode', 'type', 'delta', 'ref', 'user', 'notes']
+                    st.dataframe(movement_df.reindex(columns=columns), use_container_width=True)
+                    st.caption(f"{total} movement(s) - newest first")
+                    st.number_input("Page", min_value=1, max_value=pages, step=1, key="movement_page")
+                else:
+                    st.info("No stock movements match the selected filters")
+            
+            elif report_type == "Stock Valuation (Any Date)":
+                valuation_date = st.date_input("Stock as of end of", datetime.date.today(), key="valuation_date")
+                
+                try:
+                    valuation_df = valuation_on(valuation_date)
+                    valuation_df = valuation_df[valuation_df['quantity'] != 0]
+                    st.write(f"Total Inventory Value: {format_currency(valuation_df['value'].sum())}")
+                    st.caption("Quantities are rebuilt from the stock event log; values use current catalogue cost.")
+                    st.dataframe(valuation_df.sort_values('value', ascending=False), use_container_width=True)
+                except Exception as e:
+                    st.error(f"Error computing valuation: {str(e)}")
+            
+            elif report_type == "Inventory Audit":
+                st.info("Inventory audit would compare physical counts with system records")
+                if st.button("Generate Audit Sheet", key="gen_audit_sheet"):
+                    audit_data = []
+                    for barcode, inv_data in inventory.items():
+                        product = products.get(barcode, {'name': 'Unknown'})
+                        audit_data.append({
+                            'Product': product['name'],
+                            'Barcode': barcode,
+                            'System Quantity': inv_data.get('quantity', 0),
+                            'Physical Count': "",
+                            'Variance': "",
+                            'Notes': ""
+                        })
+                    
+                    audit_df = pd.DataFrame(audit_data)
+                    st.dataframe(audit_df)
+                    
+                    csv = audit_df.to_csv(index=False)
+                    st.download_button(
+                        label="Download Audit Sheet",
+                        data=csv,
+                        file_name=f"inventory_audit_{datetime.date.today()}.csv",
+                        mime="text/csv",
+                        key="download_audit"
+                    )
+    
+    with tab4:
+        st.header("Bulk Inventory Update")
+        
+        st.info("Download the template file to prepare your inventory data")
+        
+        # Generate template file
+        template_data = {
+            "barcode": ["123456789012", ""],
+            "quantity": [10, ""],
+            "reorder_point": [5, ""]
+        }
+        template_df = pd.DataFrame(template_data)
+        
+        st.download_button(
+            label="Download Template",
+            data=template_df.to_csv(index=False).encode('utf-8'),
+            file_name="inventory_update_template.csv",
+            mime="text/csv",
+            key="dl_inv_template"
+        )
+        
+        uploaded_file = st.file_uploader(
+            "Upload CSV file", 
+            type=['csv'],
+            key="inv_upload_csv"
+        )
+        
+        if uploaded_file:
+            try:
+                df = pd.read_csv(uploaded_file)
+                st.dataframe(df)
+                
+                if st.button("Update Inventory", key="inv_update_btn"):
+                    inventory = load_data(INVENTORY_FILE)
+                    products = load_data(PRODUCTS_FILE)
+                    updated = 0
+                    errors = 0
+                    events = []
+                    
+                    for _, row in df.iterrows():
+                        try:
+                            barcode = str(row['barcode']).strip()
+                            
+                            if barcode not in products:
+                                errors += 1
+                                continue
+                            
+                            if barcode not in inventory:
+                                inventory[barcode] = {
+                                    'quantity': 0,
+                                    'reorder_point': 10
+                                }
+                            
+                            if not pd.isna(row['quantity']):
+                                events.append(stock_event(barcode, 'adjustment',
+                                                          int(row['quantity']) - inventory[barcode]['quantity'],
+                                                          "Bulk Update"))
+                                inventory[barcode]['quantity'] = int(row['quantity'])
+                            
+                            if not pd.isna(row['reorder_point']):
+                                inventory[barcode]['reorder_point'] = int(row['reorder_point'])
+                            
+                            inventory[barcode]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            
+                            updated += 1
+                        
+                        except Exception as e:
+                            errors += 1
+                            continue
+                    
+                    record_stock_events(events, st.session_state.user_info['username'])
+                    save_data(inventory, INVENTORY_FILE)
+                    st.success(f"Update completed: {updated} items updated, {errors} errors")
+            except Exception as e:
+                st.error(f"Error reading CSV file: {str(e)}")
@@ -0,0 +1,28 @@
+"""Login page."""
+
+import streamlit as st
+import time
+
+from rocket_pos.core import verify_user
+
+# Login Page
+def login_page():
+    st.title("ROCKET VAPE POS - Login")
+    
+    with st.form("login_form"):
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        submit_button = st.form_submit_button("Login")
+        
+        if submit_button:
+            user = verify_user(username, password)
+            if user:
+                if not user.get('active', True):
+                    st.error("This account is inactive. Please contact administrator.")
+                else:
+                    st.session_state.user_info = user
+                    st.session_state.current_page = "Dashboard"
+                    st.session_state.last_activity = time.time()
+                    st.rerun()
+            else:
+                st.error("Invalid username or password")
@@ -0,0 +1,595 @@
+"""Loyalty program administration."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    LOYALTY_FILE,
+    format_currency,
+    generate_short_id,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.loyalty import (
+    get_next_expiry_date,
+    process_expired_points,
+    safe_customer_lookup,
+    validate_customer_deletion,
+)
+from rocket_pos.points_ledger import customer_states, points_history, redemption_history, retier_customers
+from rocket_pos.tiers import TIER_DOWNGRADE_RULES, TierTable, tier_downgrade_rule
+from rocket_pos.services import ServiceError, adjust_customer_points
+
+# Loyalty Program Management
+# LOYALTY PROGRAM MANAGEMENT - COMPLETE IMPLEMENTATION
+def loyalty_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("🎯 Loyalty Program Management")
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["Tier Management", "Customer Management", "Rewards Management", "Program Settings"])
+    
+    with tab1:
+        loyalty_tier_management()
+    
+    with tab2:
+        loyalty_customer_management()
+    
+    with tab3:
+        loyalty_rewards_management()
+    
+    with tab3:
+        loyalty_settings_management()
+
+def loyalty_tier_management():
+    st.header("Loyalty Tiers Configuration")
+    
+    loyalty_data = load_data(LOYALTY_FILE)
+    
+    # Initialize tiers if they don't exist
+    if 'tiers' not in loyalty_data:
+        loyalty_data['tiers'] = {
+            'Bronze': {'min_points': 0, 'discount': 0.0, 'benefits': ['Basic rewards']},
+            'Silver': {'min_points': 1000, 'discount': 0.05, 'benefits': ['5% discount', 'Early access to sales']},
+            'Gold': {'min_points': 5000, 'discount': 0.10, 'benefits': ['10% discount', 'Free delivery', 'Birthday rewards']},
+            'Platinum': {'min_points': 10000, 'discount': 0.15, 'benefits': ['15% discount', 'Personal shopper', 'VIP events']}
+        }
+        save_data(loyalty_data, LOYALTY_FILE)
+    
+    tiers = loyalty_data['tiers']
+    
+    # Result of the last re-evaluation (shown once, after the rerun that saved it)
+    retier_report = st.session_state.pop('retier_report', None)
+    if retier_report is not None:
+        moved = sum(move['customers'] for move in retier_report)
+        if moved:
+            st.success(f"Tiers re-evaluated: {moved} customer(s) changed tier")
+            st.dataframe(pd.DataFrame(retier_report).rename(
+                columns={'from': 'From', 'to': 'To', 'customers': 'Customers'}))
+        else:
+            st.success("Tiers re-evaluated: no customer changed tier")
+    
+    # Display current tiers
+    st.subheader("Current Loyalty Tiers")
+    if not tiers:
+        st.info("No loyalty tiers configured")
+    else:
+        tier_data = []
+        # Listed in threshold order, which is the order customers move through them
+        for tier_name in TierTable(tiers).names:
+            tier_info = tiers[tier_name]
+            benefits = tier_info.get('benefits', ['No benefits specified'])
+            tier_data.append({
+                'Tier': tier_name,
+                'Minimum Points': tier_info.get('min_points', 0),
+                'Discount': f"{tier_info.get('discount', 0) * 100}%",
+                'Benefits': ', '.join(benefits)
+            })
+        
+        st.dataframe(pd.DataFrame(tier_data))
+    
+    # Add/Edit tier form
+    st.subheader("Add/Edit Tier")
+    with st.form("tier_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            tier_names = list(tiers.keys()) if tiers else []
+            edit_tier = st.selectbox("Select Tier to Edit", [""] + tier_names, key="edit_tier_select")
+            
+            if edit_tier:
+                tier_info = tiers[edit_tier]
+                new_tier_name = st.text_input("Tier Name", value=edit_tier, key="tier_name")
+                min_points = st.number_input("Minimum Points", min_value=0, value=tier_info.get('min_points', 0), key="min_points")
+                discount = st.number_input("Discount (%)", min_value=0.0, max_value=50.0, value=tier_info.get('discount', 0) * 100, step=0.5, key="discount")
+            else:
+                new_tier_name = st.text_input("Tier Name", key="new_tier_name")
+                min_points = st.number_input("Minimum Points", min_value=0, value=0, key="new_min_points")
+                discount = st.number_input("Discount (%)", min_value=0.0, max_value=50.0, value=0.0, step=0.5, key="new_discount")
+        
+        with col2:
+            if edit_tier:
+                current_benefits = tier_info.get('benefits', [])
+                benefits = st.text_area("Benefits (one per line)", value="\n".join(current_benefits), key="benefits")
+            else:
+                benefits = st.text_area("Benefits (one per line)", value="", key="new_benefits")
+            
+            benefit_list = [b.strip() for b in benefits.split('\n') if b.strip()]
+        
+        if st.form_submit_button("💾 Save Tier Configuration"):
+            if not new_tier_name:
+                st.error("Tier name is required")
+            else:
+                # Remove old tier if name changed
+                if edit_tier and edit_tier != new_tier_name:
+                    if edit_tier in tiers:
+                        del tiers[edit_tier]
+                
+                # Add/update tier
+                tiers[new_tier_name] = {
+                    'min_points': min_points,
+                    'discount': discount / 100,
+                    'benefits': benefit_list
+                }
+                
+                loyalty_data['tiers'] = tiers
+                # Saves the tiers and moves customers to the tiers their points now reach
+                st.session_state.retier_report = retier_customers(loyalty_data)
+                st.success("Tier configuration saved successfully!")
+                st.rerun()
+    
+    # Delete tier option
+    if tiers:
+        st.subheader("Delete Tier")
+        delete_tier = st.selectbox("Select Tier to Delete", [""] + list(tiers.keys()), key="delete_tier_select")
+        
+        if delete_tier and st.button("🗑️ Delete Tier", type="secondary"):
+            # Check if any customers are using this tier
+            customers = loyalty_data.get('customers', {})
+            customers_in_tier = [c for c in customer_states(customers).values() if c.get('tier') == delete_tier]
+            
+            if customers_in_tier:
+                st.error(f"Cannot delete {delete_tier} tier - {len(customers_in_tier)} customers are assigned to this tier")
+            else:
+                del tiers[delete_tier]
+                loyalty_data['tiers'] = tiers
+                st.session_state.retier_report = retier_customers(loyalty_data)
+                st.success(f"Tier {delete_tier} deleted successfully!")
+                st.rerun()
+    
+    # Downgrade rule and manual re-evaluation
+    st.subheader("Tier Changes")
+    settings = loyalty_data.setdefault('settings', {})
+    rule_options = {label: rule for rule, label in TIER_DOWNGRADE_RULES.items()}
+    rule_labels = list(rule_options.keys())
+    selected_rule = st.selectbox("Move customers down a tier", rule_labels,
+                                 index=rule_labels.index(TIER_DOWNGRADE_RULES[tier_downgrade_rule(settings)]))
+    st.caption("Customers move up as soon as their points reach a higher tier.")
+    if st.button("🔄 Save Rule and Re-evaluate All Customers", key="retier_customers"):
+        settings['tier_downgrade'] = rule_options[selected_rule]
+        st.session_state.retier_report = retier_customers(loyalty_data)
+        st.rerun()
+
+def loyalty_customer_management():
+    st.header("Loyalty Customer Management")
+    
+    loyalty_data = load_data(LOYALTY_FILE)
+    customers = loyalty_data.get('customers', {})
+    tiers = loyalty_data.get('tiers', {})
+    
+    # Process expired points (once a day)
+    process_expired_points()
+    
+    # Search and filter
+    st.subheader("Search Customers")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        search_term = st.text_input("Search by name, phone, or ID", key="cust_search")
+    
+    with col2:
+        tier_filter = st.selectbox("Filter by Tier", ["All"] + list(tiers.keys()), key="tier_filter")
+    
+    # Apply filters
+    filtered_customers = {}
+    for cust_id, customer in customers.items():
+        matches_search = not search_term or (
+            search_term.lower() in customer.get('name', '').lower() or
+            search_term.lower() in customer.get('phone', '').lower() or
+            search_term.lower() in cust_id.lower()
+        )
+        
+        if matches_search:
+            filtered_customers[cust_id] = customer
+    
+    # Points, tier and counters come from the points accounts
+    filtered_customers = {cust_id: customer for cust_id, customer in customer_states(filtered_customers).items()
+                          if tier_filter == "All" or customer.get('tier') == tier_filter}
+    
+    # Display customers
+    st.subheader(f"Customers ({len(filtered_customers)} found)")
+    if not filtered_customers:
+        st.info("No customers found matching your criteria")
+    else:
+        for cust_id, customer in filtered_customers.items():
+            with st.expander(f"{customer.get('name', 'Unknown')} - {cust_id}"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.write(f"**Phone:** {customer.get('phone', 'N/A')}")
+                    st.write(f"**Email:** {customer.get('email', 'N/A')}")
+                    st.write(f"**Tier:** {customer.get('tier', 'N/A')}")
+                    st.write(f"**Total Points:** {customer.get('points', 0)}")
+                
+                with col2:
+                    st.write(f"**Join Date:** {customer.get('date_joined', 'N/A')}")
+                    st.write(f"**Last Activity:** {customer.get('last_activity', 'N/A')}")
+                    st.write(f"**Total Spent:** {format_currency(customer.get('total_spent', 0))}")
+                    st.write(f"**Visit Count:** {customer.get('visit_count', 0)}")
+                
+                with col3:
+                    # Display point breakdown
+                    point_breakdown = customer.get('point_breakdown', {})
+                    available_points = point_breakdown.get('available', 0)
+                    pending_expiry = point_breakdown.get('pending_expiry', 0)
+                    
+                    st.write(f"**Available Points:** {available_points}")
+                    if pending_expiry > 0:
+                        st.write(f"**Expiring Soon:** {pending_expiry}")
+                    
+                    # Next expiry date
+                    next_expiry = get_next_expiry_date(customer)
+                    if next_expiry:
+                        st.write(f"**Next Expiry:** {next_expiry}")
+                
+                # Points adjustment, against the version shown on the previous run (when the form was filled in)
+                shown_version = st.session_state.get(f"points_shown_{cust_id}", customer['points_version'])
+                st.session_state[f"points_shown_{cust_id}"] = customer['points_version']
+                with st.form(key=f"points_form_{cust_id}"):
+                    st.subheader("Points Management")
+                    points_action = st.radio("Points Action", ["Add Points", "Subtract Points", "Set Points"], 
+                                           key=f"points_action_{cust_id}")
+                    points_value = st.number_input("Points", min_value=0, value=0, key=f"points_value_{cust_id}")
+                    points_reason = st.text_input("Reason", key=f"points_reason_{cust_id}")
+                    
+                    if st.form_submit_button("Update Points"):
+                        mode = {"Add Points": "add", "Subtract Points": "subtract"}.get(points_action, "set")
+                        try:
+                            # A change made meanwhile is reported, not overwritten
+                            adjust_customer_points(cust_id, points_value, points_reason, mode,
+                                                   st.session_state.user_info['username'], shown_version)
+                            st.success("Points updated successfully!")
+                            st.rerun()
+                        except ServiceError as e:
+                            st.error(str(e))
+                
+                # Points history, newest first (read from the ledger only when asked for)
+                if st.checkbox("Show points history", key=f"points_history_{cust_id}"):
+                    page_size = 20
+                    page = st.session_state.get(f"points_page_{cust_id}", 1)
+                    history, total = points_history(cust_id, page, page_size)
+                    if history:
+                        history_df = pd.DataFrame(history)
+                        columns = ['date', 'type', 'delta', 'balance', 'reason', 'ref', 'user']
+                        st.dataframe(history_df.reindex(columns=columns), use_container_width=True)
+                        st.caption(f"{total} entr{'y' if total == 1 else 'ies'} - newest first")
+                        st.number_input("Page", min_value=1, max_value=max(1, -(-total // page_size)), step=1,
+                                        key=f"points_page_{cust_id}")
+                    else:
+                        st.info("No points history yet")
+                
+                # ✅ FIX: Safe customer deletion with validation
+                st.subheader("Customer Management")
+                can_delete, reason = validate_customer_deletion(cust_id)
+                
+                if not can_delete:
+                    st.warning(f"⚠️ Cannot delete customer: {reason}")
+                else:
+                    if st.button("🗑️ Delete Customer", key=f"delete_cust_{cust_id}", type="secondary"):
+                        confirmation = st.text_input("Type 'DELETE' to confirm", key=f"delete_confirm_{cust_id}")
+                        if st.button("Confirm Delete", key=f"confirm_delete_{cust_id}") and confirmation == "DELETE":
+                            del customers[cust_id]
+                            loyalty_data['customers'] = customers
+                            save_data(loyalty_data, LOYALTY_FILE)
+                            st.success("Customer deleted successfully!")
+                            st.rerun()
+    
+    # Add new customer (existing code remains the same)
+    st.subheader("Add New Customer")
+    with st.form("new_customer_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            name = st.text_input("Full Name*")
+            phone = st.text_input("Phone Number*")
+            email = st.text_input("Email Address")
+        
+        with col2:
+            initial_points = st.number_input("Initial Points", min_value=0, value=0)
+            initial_tier = st.selectbox("Initial Tier", [""] + list(tiers.keys()))
+            address = st.text_area("Address")
+        
+        if st.form_submit_button("➕ Add Customer"):
+            if not name or not phone:
+                st.error("Name and phone number are required")
+            else:
+                # Check for duplicate phone using safe lookup
+                existing_customer = safe_customer_lookup(phone=phone)
+                if existing_customer:
+                    st.error("A customer with this phone number already exists")
+                else:
+                    # Create new customer
+                    cust_id = f"CUST{generate_short_id()}"
+                    
+                    # Determine tier based on points if not specified
+                    if not initial_tier:
+                        initial_tier = TierTable(tiers).resolve(initial_points)
+                    
+                    # Initialize point breakdown
+                    point_breakdown = {}
+                    if initial_points > 0:
+                        expiry_days = loyalty_data.get('settings', {}).get('points_expiry_days', 365)
+                        expiry_date = (datetime.datetime.now() + datetime.timedelta(days=expiry_days)).strftime("%Y-%m-%d")
+                        point_breakdown = {
+                            'available': initial_points,
+                            'pending_expiry': 0,
+                            'expiry_batches': [
+                                {
+                                    'points': initial_points,
+                                    'expiry_date': expiry_date,
+                                    'earned_date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                                }
+                            ]
+                        }
+                    
+                    customers[cust_id] = {
+                        'id': cust_id,
+                        'name': name,
+                        'phone': phone,
+                        'email': email,
+                        'address': address,
+                        'points': initial_points,
+                        'point_breakdown': point_breakdown,
+                        'tier': initial_tier or 'Bronze',
+                        'total_spent': 0,
+                        'visit_count': 0,
+                        'date_joined': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        'last_activity': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        'joined_by': st.session_state.user_info['username'],
+                        'active': True  # ✅ FIX: Add active status to prevent accidental deletion
+                    }
+                    
+                    loyalty_data['customers'] = customers
+                    save_data(loyalty_data, LOYALTY_FILE)
+                    st.success(f"Customer added successfully! Customer ID: {cust_id}")
+                    st.rerun()
+
+def loyalty_rewards_management():
+    st.header("Rewards Management")
+    
+    loyalty_data = load_data(LOYALTY_FILE)
+    rewards = loyalty_data.get('rewards', {})
+    
+    # Initialize rewards if empty
+    if not rewards:
+        rewards = {
+            'REW001': {
+                'name': '10% Off Next Purchase',
+                'points': 500,
+                'description': 'Get 10% off your entire next purchase',
+                'active': True,
+                'max_redemptions': 1,
+                'valid_days': 30
+            },
+            'REW002': {
+                'name': 'Free Product',
+                'points': 1000,
+                'description': 'Choose any product under $20 for free',
+                'active': True,
+                'max_redemptions': None,
+                'valid_days': 60
+            }
+        }
+        loyalty_data['rewards'] = rewards
+        save_data(loyalty_data, LOYALTY_FILE)
+    
+    # Display current rewards
+    st.subheader("Current Rewards")
+    if not rewards:
+        st.info("No rewards configured")
+    else:
+        reward_data = []
+        for reward_id, reward in rewards.items():
+            if reward['active']:
+                status = "🟢 Active"
+            else:
+                status = "🔴 Inactive"
+            
+            reward_data.append({
+                'ID': reward_id,
+                'Name': reward['name'],
+                'Points': reward['points'],
+                'Description': reward['description'],
+                'Status': status
+            })
+        
+        st.dataframe(pd.DataFrame(reward_data))
+    
+    # Add/Edit reward form
+    st.subheader("Add/Edit Reward")
+    with st.form("reward_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            reward_options = [""] + list(rewards.keys())
+            edit_reward = st.selectbox("Select Reward to Edit", reward_options, key="edit_reward_select")
+            
+            if edit_reward:
+                reward = rewards[edit_reward]
+                name = st.text_input("Reward Name", value=reward['name'], key="reward_name")
+                points = st.number_input("Points Required", min_value=1, value=reward['points'], key="reward_points")
+                description = st.text_area("Description", value=reward['description'], key="reward_desc")
+            else:
+                name = st.text_input("Reward Name", key="new_reward_name")
+                points = st.number_input("Points Required", min_value=1, value=100, key="new_reward_points")
+                description = st.text_area("Description", key="new_reward_desc")
+        
+        with col2:
+            if edit_reward:
+                active = st.checkbox("Active", value=reward['active'], key="reward_active")
+                max_redemptions = st.number_input("Max Redemptions per Customer", min_value=1, 
+                                                value=reward.get('max_redemptions', 1), key="reward_max_redemptions")
+                valid_days = st.number_input("Valid for (days)", min_value=1, 
+                                           value=reward.get('valid_days', 30), key="reward_valid_days")
+            else:
+                active = st.checkbox("Active", value=True, key="new_reward_active")
+                max_redemptions = st.number_input("Max Redemptions per Customer", min_value=1, value=1, 
+                                                key="new_reward_max_redemptions")
+                valid_days = st.number_input("Valid for (days)", min_value=1, value=30, 
+                                           key="new_reward_valid_days")
+        
+        if st.form_submit_button("💾 Save Reward"):
+            if not name:
+                st.error("Reward name is required")
+            else:
+                reward_id = edit_reward if edit_reward else f"REW{generate_short_id()}"
+                
+                rewards[reward_id] = {
+                    'name': name,
+                    'points': points,
+                    'description': description,
+                    'active': active,
+                    'max_redemptions': max_redemptions if max_redemptions > 0 else None,
+                    'valid_days': valid_days,
+                    'created_at': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'created_by': st.session_state.user_info['username']
+                }
+                
+                loyalty_data['rewards'] = rewards
+                save_data(loyalty_data, LOYALTY_FILE)
+                st.success("Reward saved successfully!")
+                st.rerun()
+    
+    # Reward redemption history
+    st.subheader("Reward Redemption History")
+    customers = loyalty_data.get('customers', {})
+    
+    page_size = 50
+    page = st.session_state.get("redemptions_page", 1)
+    redemptions, total = redemption_history(page, page_size)
+    
+    redemption_data = []
+    for redemption in redemptions:
+        redemption_data.append({
+            'Customer': customers.get(redemption.get('customer_id'), {}).get('name', 'Unknown'),
+            'Reward': redemption.get('reward_name', 'Unknown'),
+            'Points Used': redemption.get('points_used', 0),
+            'Date': redemption.get('date_redeemed', 'N/A')
+        })
+    
+    if redemption_data:
+        st.dataframe(pd.DataFrame(redemption_data))
+        st.caption(f"{total} redemption(s) - newest first")
+        st.number_input("Page", min_value=1, max_value=max(1, -(-total // page_size)), step=1, key="redemptions_page")
+    else:
+        st.info("No reward redemptions yet")
+
+def loyalty_settings_management():
+    st.header("Loyalty Program Settings")
+    
+    loyalty_data = load_data(LOYALTY_FILE)
+    
+    # Initialize settings if they don't exist
+    if 'settings' not in loyalty_data:
+        loyalty_data['settings'] = {
+            'points_per_dollar': 1.0,
+            'points_value': 0.01,
+            'signup_bonus': 100,
+            'min_redemption': 100,
+            'points_expiry_days': 365,
+            'auto_enroll': True,
+            'birthday_bonus': 500,
+            'anniversary_bonus': 250
+        }
+        save_data(loyalty_data, LOYALTY_FILE)
+    
+    settings = loyalty_data['settings']
+    
+    with st.form("loyalty_settings_form"):
+        st.subheader("Points Configuration")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            points_per_dollar = st.number_input(
+                "Points per Dollar Spent", 
+                min_value=0.1, 
+                max_value=10.0, 
+                value=float(settings.get('points_per_dollar', 1.0)),
+                step=0.1
+            )
+            points_value = st.number_input(
+                "Point Value (in dollars)", 
+                min_value=0.001, 
+                max_value=1.0, 
+                value=float(settings.get('points_value', 0.01)),
+                step=0.001,
+                help="How much each point is worth when redeemed"
+            )
+            signup_bonus = st.number_input(
+                "Sign-up Bonus Points", 
+                min_value=0, 
+                value=int(settings.get('signup_bonus', 100))
+            )
+        
+        with col2:
+            min_redemption = st.number_input(
+                "Minimum Redemption Points", 
+                min_value=1, 
+                value=int(settings.get('min_redemption', 100))
+            )
+            points_expiry = st.number_input(
+                "Points Expiry (days)", 
+                min_value=0, 
+                value=int(settings.get('points_expiry_days', 365)),
+                help="0 means points never expire"
+            )
+            auto_enroll = st.checkbox(
+                "Auto-enroll New Customers", 
+                value=settings.get('auto_enroll', True)
+            )
+        
+        st.subheader("Special Bonuses")
+        col1, col2 = st.columns(2)
+        with col1:
+            birthday_bonus = st.number_input(
+                "Birthday Bonus Points", 
+                min_value=0, 
+                value=int(settings.get('birthday_bonus', 500))
+            )
+        with col2:
+            anniversary_bonus = st.number_input(
+                "Anniversary Bonus Points", 
+                min_value=0, 
+                value=int(settings.get('anniversary_bonus', 250))
+            )
+        
+        if st.form_submit_button("💾 Save Settings"):
+            # Updated in place, keeping settings edited elsewhere (e.g. the tier downgrade rule)
+            settings.update({
+                'points_per_dollar': float(points_per_dollar),
+                'points_value': float(points_value),
+                'signup_bonus': int(signup_bonus),
+                'min_redemption': int(min_redemption),
+                'points_expiry_days': int(points_expiry),
+                'auto_enroll': auto_enroll,
+                'birthday_bonus': int(birthday_bonus),
+                'anniversary_bonus': int(anniversary_bonus)
+            })
+            
+            save_data(loyalty_data, LOYALTY_FILE)
+            st.success("Loyalty program settings saved successfully!")
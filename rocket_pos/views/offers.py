@@ -0,0 +1,820 @@
+"""Offers management."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    OFFERS_FILE,
+    format_currency,
+    generate_short_id,
+    get_current_datetime,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.product_search import product_picker
+
+# Offers Management
+# Offers Management - Improved with proper BOGO functionality and error handling
+def offers_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("🎁 Offers Management")
+    
+    tab1, tab2, tab3 = st.tabs(["➕ Add Offer", "👀 View/Edit Offers", "📤 Bulk Import"])
+    
+    with tab1:
+        st.header("Add New Offer")
+        
+        # A bundle suggested by the product affinity report
+        prefill = st.session_state.get('bundle_prefill')
+        if prefill:
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.info(f"Suggested by the product affinity report. {prefill['description']}. Review it below and add it.")
+            with col2:
+                if st.button("Discard Suggestion", key="discard_bundle_prefill"):
+                    st.session_state.pop('bundle_prefill', None)
+                    st.session_state.pop('add_offer_products', None)
+                    st.rerun()
+        
+        # Type and products sit outside the form so the product search updates as you type
+        offer_type = st.selectbox("Offer Type*", 
+                                ["BOGO", "Bundle", "Special Price", "Percentage Discount", "Fixed Discount"],
+                                index=1 if prefill else 0, key="add_offer_type",
+                                help="Select the type of offer to create")
+        
+        products = load_data(PRODUCTS_FILE)
+        selected_products, selected_product = [], ""
+        if not products:
+            st.warning("No products available. Please add products first.")
+        elif offer_type == "BOGO":
+            selected_products = product_picker("Select Products*", key="add_offer_products", multiple=True,
+                                               help="Products this BOGO offer applies to")
+        elif offer_type == "Bundle":
+            selected_products = product_picker("Select Bundle Products*", key="add_offer_products", multiple=True,
+                                               max_selections=5, help="Products included in this bundle")
+        elif offer_type == "Special Price":
+            selected_product = product_picker("Select Product*", key="add_offer_product")
+        else:
+            selected_products = product_picker("Select Products*", key="add_offer_products", multiple=True,
+                                               help="Products this discount applies to")
+        
+        with st.form("add_offer_form", clear_on_submit=True):
+            name = st.text_input("Offer Name*", value=prefill['name'] if prefill else "",
+                                 help="Give your offer a descriptive name")
+            description = st.text_area("Description", value=prefill['description'] if prefill else "",
+                                       help="Describe the offer for customers and staff")
+            
+            # BOGO Offer Configuration
+            if offer_type == "BOGO":
+                col1, col2 = st.columns(2)
+                with col1:
+                    buy_quantity = st.number_input("Buy Quantity*", min_value=1, value=1, step=1,
+                                                 help="Number of items customer needs to buy")
+                with col2:
+                    get_quantity = st.number_input("Get Quantity Free*", min_value=1, value=1, step=1,
+                                                  help="Number of items customer gets free")
+            
+            # Bundle Offer Configuration
+            elif offer_type == "Bundle":
+                if selected_products:
+                    # Calculate original total price
+                    original_total = sum(products[barcode].get('price', 0) for barcode in selected_products)
+                    st.info(f"Original total price: {format_currency(original_total)}")
+                    
+                    bundle_price = st.number_input("Bundle Price*", min_value=0.01, value=original_total * 0.8, 
+                                                 step=0.01, help="Special price for the bundle")
+                    
+                    discount_amount = original_total - bundle_price
+                    discount_percent = (discount_amount / original_total) * 100 if original_total > 0 else 0
+                    st.success(f"Discount: {format_currency(discount_amount)} ({discount_percent:.1f}% off)")
+            
+            # Special Price Offer Configuration
+            elif offer_type == "Special Price":
+                if selected_product:
+                    product = products[selected_product]
+                    original_price = product.get('price', 0)
+                    
+                    special_price = st.number_input("Special Price*", min_value=0.01, value=original_price * 0.9, 
+                                                   step=0.01, help="Temporary special price for this product")
+                    
+                    discount_amount = original_price - special_price
+                    discount_percent = (discount_amount / original_price) * 100 if original_price > 0 else 0
+                    st.success(f"Discount: {format_currency(discount_amount)} ({discount_percent:.1f}% off)")
+            
+            # Percentage Discount Offer Configuration
+            elif offer_type == "Percentage Discount":
+                discount_percent = st.number_input("Discount Percentage*", min_value=1, max_value=100, value=10, 
+                                                  step=1, help="Percentage discount to apply")
+            
+            # Fixed Discount Offer Configuration
+            elif offer_type == "Fixed Discount":
+                discount_amount = st.number_input("Discount Amount*", min_value=0.01, value=1.0, 
+                                                 step=0.01, help="Fixed amount to discount")
+            
+            # Date Range for Offer
+            st.subheader("Offer Validity")
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("Start Date*", value=datetime.date.today())
+            with col2:
+                end_date = st.date_input("End Date*", value=datetime.date.today() + datetime.timedelta(days=7))
+            
+            # Additional Options
+            st.subheader("Additional Options")
+            active = st.checkbox("Active", value=True, help="Enable/disable this offer")
+            apply_to_all = st.checkbox("Apply to All Products", value=False, 
+                                     help="Apply this offer to all products (overrides product selection)")
+            
+            submit_button = st.form_submit_button("➕ Add Offer")
+            
+            if submit_button:
+                # Validation
+                errors = []
+                
+                if not name:
+                    errors.append("Offer name is required")
+                
+                if offer_type in ["BOGO", "Bundle", "Percentage Discount", "Fixed Discount"] and not apply_to_all:
+                    if offer_type == "BOGO" and not selected_products:
+                        errors.append("Please select at least one product for BOGO offer")
+                    elif offer_type == "Bundle" and not selected_products:
+                        errors.append("Please select bundle products")
+                    elif offer_type in ["Percentage Discount", "Fixed Discount"] and not selected_products:
+                        errors.append("Please select products for discount")
+                
+                if offer_type == "Special Price" and not selected_product:
+                    errors.append("Please select a product for special pricing")
+                
+                if end_date < start_date:
+                    errors.append("End date cannot be before start date")
+                
+                if errors:
+                    for error in errors:
+                        st.error(error)
+                else:
+                    offers = load_data(OFFERS_FILE)
+                    offer_id = f"offer_{generate_short_id()}"
+                    
+                    offer_data = {
+                        'id': offer_id,
+                        'name': name,
+                        'description': description,
+                        'type': offer_type.lower().replace(' ', '_'),
+                        'start_date': start_date.strftime("%Y-%m-%d"),
+                        'end_date': end_date.strftime("%Y-%m-%d"),
+                        'active': active,
+                        'apply_to_all': apply_to_all,
+                        'created_by': st.session_state.user_info['username'],
+                        'created_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                        'updated_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                    }
+                    
+                    # Add type-specific data
+                    if offer_type == "BOGO":
+                        offer_data['buy_quantity'] = buy_quantity
+                        offer_data['get_quantity'] = get_quantity
+                        if not apply_to_all:
+                            offer_data['products'] = list(selected_products)
+                    
+                    elif offer_type == "Bundle":
+                        offer_data['bundle_price'] = bundle_price
+                        if not apply_to_all:
+                            offer_data['products'] = list(selected_products)
+                    
+                    elif offer_type == "Special Price":
+                        offer_data['product'] = selected_product
+                        offer_data['special_price'] = special_price
+                    
+                    elif offer_type == "Percentage Discount":
+                        offer_data['discount_percent'] = discount_percent
+                        if not apply_to_all:
+                            offer_data['products'] = list(selected_products)
+                    
+                    elif offer_type == "Fixed Discount":
+                        offer_data['discount_amount'] = discount_amount
+                        if not apply_to_all:
+                            offer_data['products'] = list(selected_products)
+                    
+                    # Save offer
+                    offers[offer_id] = offer_data
+                    save_data(offers, OFFERS_FILE)
+                    
+                    for key in ('bundle_prefill', 'add_offer_products', 'add_offer_product'):
+                        st.session_state.pop(key, None)
+                    st.success(f"✅ Offer '{name}' added successfully!")
+                    st.balloons()
+    
+    with tab2:
+        st.header("View/Edit Offers")
+        
+        offers = load_data(OFFERS_FILE)
+        products = load_data(PRODUCTS_FILE)
+        
+        if not offers:
+            st.info("No offers available. Create your first offer above!")
+        else:
+            # Filter options
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                status_filter = st.selectbox("Filter by Status", ["All", "Active", "Inactive"])
+            with col2:
+                type_filter = st.selectbox("Filter by Type", ["All"] + list(set(o['type'].replace('_', ' ').title() for o in offers.values())))
+            with col3:
+                search_term = st.text_input("Search Offers", placeholder="Search by name...")
+            
+            # Apply filters
+            filtered_offers = offers.copy()
+            
+            if status_filter != "All":
+                active_status = status_filter == "Active"
+                filtered_offers = {k: v for k, v in filtered_offers.items() if v['active'] == active_status}
+            
+            if type_filter != "All":
+                type_key = type_filter.lower().replace(' ', '_')
+                filtered_offers = {k: v for k, v in filtered_offers.items() if v['type'] == type_key}
+            
+            if search_term:
+                filtered_offers = {k: v for k, v in filtered_offers.items() if search_term.lower() in v['name'].lower()}
+            
+            if not filtered_offers:
+                st.info("No offers match the selected filters")
+            else:
+                st.write(f"**Found {len(filtered_offers)} offer(s)**")
+                
+                for offer_id, offer in filtered_offers.items():
+                    # Determine offer status badge
+                    current_date = datetime.date.today()
+                    start_date = datetime.datetime.strptime(offer['start_date'], "%Y-%m-%d").date()
+                    end_date = datetime.datetime.strptime(offer['end_date'], "%Y-%m-%d").date()
+                    
+                    status_badge = ""
+                    if not offer['active']:
+                        status_badge = "🔴 Inactive"
+                    elif current_date < start_date:
+                        status_badge = "⏳ Upcoming"
+                    elif current_date > end_date:
+                        status_badge = "⌛ Expired"
+                    else:
+                        status_badge = "✅ Active"
+                    
+                    with st.expander(f"{offer['name']} - {offer['type'].replace('_', ' ').title()} - {status_badge}"):
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
+                            st.write(f"**Description:** {offer.get('description', 'No description')}")
+                            st.write(f"**Type:** {offer['type'].replace('_', ' ').title()}")
+                            st.write(f"**Valid:** {offer['start_date']} to {offer['end_date']}")
+                            st.write(f"**Status:** {'Active' if offer['active'] else 'Inactive'}")
+                            st.write(f"**Apply to All:** {'Yes' if offer.get('apply_to_all', False) else 'No'}")
+                            
+                            # Show type-specific details
+                            if offer['type'] == 'bogo':
+                                st.write(f"**Buy:** {offer.get('buy_quantity', 1)} Get: {offer.get('get_quantity', 1)} Free")
+                            elif offer['type'] == 'bundle':
+                                st.write(f"**Bundle Price:** {format_currency(offer.get('bundle_price', 0))}")
+                            elif offer['type'] == 'special_price':
+                                st.write(f"**Special Price:** {format_currency(offer.get('special_price', 0))}")
+                            elif offer['type'] == 'percentage_discount':
+                                st.write(f"**Discount:** {offer.get('discount_percent', 0)}%")
+                            elif offer['type'] == 'fixed_discount':
+                                st.write(f"**Discount:** {format_currency(offer.get('discount_amount', 0))}")
+                        
+                        with col2:
+                            # Show products if not applying to all
+                            if not offer.get('apply_to_all', False):
+                                st.write("**Applied to:**")
+                                if offer['type'] == 'special_price':
+                                    product_id = offer.get('product')
+                                    if product_id and product_id in products:
+                                        st.write(f"- {products[product_id].get('name', 'Unknown')} ({product_id})")
+                                    else:
+                                        st.warning("Product not found")
+                                else:
+                                    product_ids = offer.get('products', [])
+                                    for pid in product_ids:
+                                        if pid in products:
+                                            st.write(f"- {products[pid].get('name', 'Unknown')} ({pid})")
+                                        else:
+                                            st.warning(f"Product {pid} not found")
+                            
+                            st.write(f"**Created by:** {offer.get('created_by', 'Unknown')}")
+                            st.write(f"**Created at:** {offer.get('created_at', 'Unknown')}")
+                            st.write(f"**Last updated:** {offer.get('updated_at', 'Unknown')}")
+                        
+                        # Edit form
+                        with st.form(key=f"edit_{offer_id}"):
+                            st.subheader("Edit Offer")
+                            
+                            edit_name = st.text_input("Name", value=offer.get('name', ''))
+                            edit_description = st.text_area("Description", value=offer.get('description', ''))
+                            
+                            col1, col2 = st.columns(2)
+                            with col1:
+                                edit_start_date = st.date_input("Start Date", 
+                                                              value=datetime.datetime.strptime(offer.get('start_date'), "%Y-%m-%d").date())
+                            with col2:
+                                edit_end_date = st.date_input("End Date", 
+                                                            value=datetime.datetime.strptime(offer.get('end_date'), "%Y-%m-%d").date())
+                            
+                            edit_active = st.checkbox("Active", value=offer.get('active', True))
+                            
+                            # Type-specific editing
+                            if offer['type'] == 'bogo':
+                                col1, col2 = st.columns(2)
+                                with col1:
+                                    edit_buy_qty = st.number_input("Buy Quantity", min_value=1, 
+                                                                 value=offer.get('buy_quantity', 1), step=1)
+                                with col2:
+                                    edit_get_qty = st.number_input("Get Quantity Free", min_value=1, 
+                                                                  value=offer.get('get_quantity', 1), step=1)
+                            
+                            elif offer['type'] == 'bundle':
+                                edit_bundle_price = st.number_input("Bundle Price", min_value=0.01, 
+                                                                  value=offer.get('bundle_price', 0.0), step=0.01)
+                            
+                            elif offer['type'] == 'special_price':
+                                edit_special_price = st.number_input("Special Price", min_value=0.01, 
+                                                                   value=offer.get('special_price', 0.0), step=0.01)
+                            
+                            elif offer['type'] == 'percentage_discount':
+                                edit_discount_percent = st.number_input("Discount Percentage", min_value=1, max_value=100, 
+                                                                      value=offer.get('discount_percent', 10), step=1)
+                            
+                            elif offer['type'] == 'fixed_discount':
+                                edit_discount_amount = st.number_input("Discount Amount", min_value=0.01, 
+                                                                     value=offer.get('discount_amount', 1.0), step=0.01)
+                            
+                            if st.form_submit_button("💾 Update Offer"):
+                                # Update offer data
+                                offers[offer_id]['name'] = edit_name
+                                offers[offer_id]['description'] = edit_description
+                                offers[offer_id]['start_date'] = edit_start_date.strftime("%Y-%m-%d")
+                                offers[offer_id]['end_date'] = edit_end_date.strftime("%Y-%m-%d")
+                                offers[offer_id]['active'] = edit_active
+                                offers[offer_id]['updated_at'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                                
+                                # Update type-specific data
+                                if offer['type'] == 'bogo':
+                                    offers[offer_id]['buy_quantity'] = edit_buy_qty
+                                    offers[offer_id]['get_quantity'] = edit_get_qty
+                                elif offer['type'] == 'bundle':
+                                    offers[offer_id]['bundle_price'] = edit_bundle_price
+                                elif offer['type'] == 'special_price':
+                                    offers[offer_id]['special_price'] = edit_special_price
+                                elif offer['type'] == 'percentage_discount':
+                                    offers[offer_id]['discount_percent'] = edit_discount_percent
+                                elif offer['type'] == 'fixed_discount':
+                                    offers[offer_id]['discount_amount'] = edit_discount_amount
+                                
+                                save_data(offers, OFFERS_FILE)
+                                st.success("✅ Offer updated successfully!")
+                                st.rerun()
+                        
+                        # Delete button
+                        if st.button("🗑️ Delete Offer", key=f"delete_{offer_id}"):
+                            del offers[offer_id]
+                            save_data(offers, OFFERS_FILE)
+                            st.success("✅ Offer deleted successfully!")
+                            st.rerun()
+    
+    with tab3:
+        st.header("Bulk Import Offers")
+        
+        st.info("Download the template file to prepare your offer data")
+        
+        # Generate template file with examples for each offer type
+        template_data = {
+            "name": ["Summer BOGO", "Winter Bundle", "Spring Special", "Fall Discount"],
+            "description": ["Buy 2 Get 1 Free Summer Special", "Winter essentials bundle", "Spring clearance special pricing", "Fall season discount"],
+            "type": ["bogo", "bundle", "special_price", "percentage_discount"],
+            "buy_quantity": [2, "", "", ""],
+            "get_quantity": [1, "", "", ""],
+            "bundle_price": ["", 29.99, "", ""],
+            "special_price": ["", "", 15.99, ""],
+            "discount_percent": ["", "", "", 15],
+            "discount_amount": ["", "", "", ""],
+            "product": ["", "", "123456789012", ""],
+            "products": ["123456789012,987654321098", "123456789012,987654321098,555555555555", "", "123456789012,987654321098"],
+            "start_date": ["2023-06-01", "2023-12-01", "2023-03-01", "2023-09-01"],
+            "end_date": ["2023-08-31", "2023-02-28", "2023-05-31", "2023-11-30"],
+            "active": [True, True, True, True],
+            "apply_to_all": [False, False, False, False]
+        }
+        template_df = pd.DataFrame(template_data)
+        
+        st.download_button(
+            label="📥 Download Import Template",
+            data=template_df.to_csv(index=False).encode('utf-8'),
+            file_name="offers_import_template.csv",
+            mime="text/csv",
+            help="Download the CSV template with example data for different offer types"
+        )
+        
+        uploaded_file = st.file_uploader("Choose a CSV file", type=['csv'], 
+                                       help="Upload your offers data CSV file")
+        
+        if uploaded_file:
+            try:
+                df = pd.read_csv(uploaded_file)
+                st.success("✅ CSV file loaded successfully!")
+                
+                # Show preview
+                st.subheader("Data Preview")
+                st.dataframe(df.head())
+                
+                # Validation options
+                st.subheader("Import Options")
+                import_mode = st.radio("Import Mode", 
+                                     ["Add new offers only", "Update existing offers", "Add or update offers"],
+                                     help="Choose how to handle existing offers with the same name")
+                
+                on_error = st.radio("On Error", 
+                                  ["Skip row and continue", "Stop import"],
+                                  help="Choose what to do when encountering errors")
+                
+                if st.button("🚀 Import Offers", type="primary"):
+                    offers = load_data(OFFERS_FILE)
+                    products = load_data(PRODUCTS_FILE)
+                    imported = 0
+                    updated = 0
+                    errors = []
+                    
+                    for index, row in df.iterrows():
+                        try:
+                            # Skip empty rows
+                            if pd.isna(row.get('name')) or not str(row.get('name')).strip():
+                                errors.append(f"Row {index+2}: Missing offer name")
+                                continue
+                            
+                            # Basic validation
+                            if pd.isna(row.get('type')) or str(row.get('type')).strip() not in ['bogo', 'bundle', 'special_price', 'percentage_discount', 'fixed_discount']:
+                                errors.append(f"Row {index+2}: Invalid offer type")
+                                continue
+                            
+                            offer_type = str(row.get('type')).strip()
+                            
+                            # Check if offer already exists
+                            existing_offer_id = None
+                            for oid, o in offers.items():
+                                if o['name'] == str(row.get('name')).strip():
+                                    existing_offer_id = oid
+                                    break
+                            
+                            # Handle based on import mode
+                            if import_mode == "Add new offers only" and existing_offer_id:
+                                continue
+                            if import_mode == "Update existing offers" and not existing_offer_id:
+                                continue
+                            
+                            # Prepare offer data
+                            offer_id = existing_offer_id if existing_offer_id else f"offer_{generate_short_id()}"
+                            
+                            offer_data = {
+                                'id': offer_id,
+                                'name': str(row.get('name')).strip(),
+                                'description': str(row.get('description')).strip() if not pd.isna(row.get('description')) else "",
+                                'type': offer_type,
+                                'start_date': str(row.get('start_date')).strip() if not pd.isna(row.get('start_date')) else datetime.date.today().strftime("%Y-%m-%d"),
+                                'end_date': str(row.get('end_date')).strip() if not pd.isna(row.get('end_date')) else (datetime.date.today() + datetime.timedelta(days=7)).strftime("%Y-%m-%d"),
+                                'active': bool(row.get('active')) if not pd.isna(row.get('active')) else True,
+                                'apply_to_all': bool(row.get('apply_to_all')) if not pd.isna(row.get('apply_to_all')) else False,
+                                'updated_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            }
+                            
+                            if not existing_offer_id:
+                                offer_data['created_by'] = st.session_state.user_info['username']
+                                offer_data['created_at'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            
+                            # Add type-specific data
+                            if offer_type == 'bogo':
+                                offer_data['buy_quantity'] = int(row.get('buy_quantity', 1)) if not pd.isna(row.get('buy_quantity')) else 1
+                                offer_data['get_quantity'] = int(row.get('get_quantity', 1)) if not pd.isna(row.get('get_quantity')) else 1
+                                
+                                if not offer_data['apply_to_all']:
+                                    if pd.isna(row.get('products')):
+                                        errors.append(f"Row {index+2}: Products required for BOGO offer")
+                                        continue
+                                    product_list = [p.strip() for p in str(row.get('products')).split(',')]
+                                    valid_products = [p for p in product_list if p in products]
+                                    if not valid_products:
+                                        errors.append(f"Row {index+2}: No valid products found")
+                                        continue
+                                    offer_data['products'] = valid_products
+                            
+                            elif offer_type == 'bundle':
+                                if pd.isna(row.get('bundle_price')):
+                                    errors.append(f"Row {index+2}: Bundle price required")
+                                    continue
+                                offer_data['bundle_price'] = float(row.get('bundle_price'))
+                                
+                                if not offer_data['apply_to_all']:
+                                    if pd.isna(row.get('products')):
+                                        errors.append(f"Row {index+2}: Products required for bundle offer")
+                                        continue
+                                    product_list = [p.strip() for p in str(row.get('products')).split(',')]
+                                    valid_products = [p for p in product_list if p in products]
+                                    if len(valid_products) < 2:
+                                        errors.append(f"Row {index+2}: Bundle requires at least 2 products")
+                                        continue
+                                    offer_data['products'] = valid_products
+                            
+                            elif offer_type == 'special_price':
+                                if pd.isna(row.get('special_price')):
+                                    errors.append(f"Row {index+2}: Special price required")
+                                    continue
+                                offer_data['special_price'] = float(row.get('special_price'))
+                                
+                                if not offer_data['apply_to_all']:
+                                    if pd.isna(row.get('product')):
+                                        errors.append(f"Row {index+2}: Product required for special price offer")
+                                        continue
+                                    product_id = str(row.get('product')).strip()
+                                    if product_id not in products:
+                                        errors.append(f"Row {index+2}: Product {product_id} not found")
+                                        continue
+                                    offer_data['product'] = product_id
+                            
+                            elif offer_type == 'percentage_discount':
+                                if pd.isna(row.get('discount_percent')):
+                                    errors.append(f"Row {index+2}: Discount percentage required")
+                                    continue
+                                offer_data['discount_percent'] = float(row.get('discount_percent'))
+                                
+                                if not offer_data['apply_to_all']:
+                                    if pd.isna(row.get('products')):
+                                        errors.append(f"Row {index+2}: Products required for discount offer")
+                                        continue
+                                    product_list = [p.strip() for p in str(row.get('products')).split(',')]
+                                    valid_products = [p for p in product_list if p in products]
+                                    if not valid_products:
+                                        errors.append(f"Row {index+2}: No valid products found")
+                                        continue
+                                    offer_data['products'] = valid_products
+                            
+                            elif offer_type == 'fixed_discount':
+                                if pd.isna(row.get('discount_amount')):
+                                    errors.append(f"Row {index+2}: Discount amount required")
+                                    continue
+                                offer_data['discount_amount'] = float(row.get('discount_amount'))
+                                
+                                if not offer_data['apply_to_all']:
+                                    if pd.isna(row.get('products')):
+                                        errors.append(f"Row {index+2}: Products required for discount offer")
+                                        continue
+                                    product_list = [p.strip() for p in str(row.get('products')).split(',')]
+                                    valid_products = [p for p in product_list if p in products]
+                                    if not valid_products:
+                                        errors.append(f"Row {index+2}: No valid products found")
+                                        continue
+                                    offer_data['products'] = valid_products
+                            
+                            # Save offer
+                            offers[offer_id] = offer_data
+                            
+                            if existing_offer_id:
+                                updated += 1
+                            else:
+                                imported += 1
+                            
+                        except Exception as e:
+                            error_msg = f"Row {index+2}: {str(e)}"
+                            errors.append(error_msg)
+                            if on_error == "Stop import":
+                                break
+                    
+                    # Save all offers
+                    save_data(offers, OFFERS_FILE)
+                    
+                    # Show results
+                    st.success(f"✅ Import completed: {imported} new offers, {updated} updated")
+                    
+                    if errors:
+                        st.warning(f"Encountered {len(errors)} errors:")
+                        with st.expander("View Errors"):
+                            for error in errors:
+                                st.write(f"- {error}")
+                    
+            except Exception as e:
+                st.error(f"❌ Error reading CSV file: {str(e)}")
+
+# Enhanced apply_offers_to_cart function with better BOGO handling
+def apply_offers_to_cart(cart_items, current_total):
+    """
+    Apply active offers to the cart and return the updated total
+    """
+    offers = load_data(OFFERS_FILE)
+    products = load_data(PRODUCTS_FILE)
+    
+    # Get active offers (within date range)
+    current_date = datetime.date.today()
+    active_offers = []
+    
+    for offer in offers.values():
+        if not offer.get('active', True):
+            continue
+        
+        try:
+            start_date = datetime.datetime.strptime(offer.get('start_date'), "%Y-%m-%d").date()
+            end_date = datetime.datetime.strptime(offer.get('end_date'), "%Y-%m-%d").date()
+            
+            if start_date <= current_date <= end_date:
+                active_offers.append(offer)
+        except (ValueError, TypeError):
+            # Skip offers with invalid date formats
+            continue
+    
+    total_after_offers = current_total
+    applied_offers = []
+    
+    # Create a copy of cart items for processing
+    cart_copy = cart_items.copy()
+    
+    for offer in active_offers:
+        try:
+            if offer['type'] == 'bogo':
+                # Buy One Get One Free offer
+                applicable_products = []
+                
+                if offer.get('apply_to_all', False):
+                    # Apply to all products in cart
+                    applicable_products = list(cart_copy.keys())
+                else:
+                    # Apply only to specified products
+                    applicable_products = offer.get('products', [])
+                
+                buy_qty = offer.get('buy_quantity', 1)
+                get_qty = offer.get('get_quantity', 1)
+                
+                for barcode in applicable_products:
+                    if barcode in cart_copy:
+                        item = cart_copy[barcode]
+                        eligible_sets = item['quantity'] // (buy_qty + get_qty)
+                        
+                        if eligible_sets > 0:
+                            discount_amount = eligible_sets * get_qty * item['price']
+                            total_after_offers -= discount_amount
+                            
+                            applied_offers.append({
+                                'type': 'bogo',
+                                'name': offer['name'],
+                                'product': item['name'],
+                                'discount': discount_amount,
+                                'details': f"Buy {buy_qty} Get {get_qty} Free"
+                            })
+            
+            elif offer['type'] == 'bundle':
+                # Bundle offer - check if all bundle products are in cart
+                bundle_products = offer.get('products', [])
+                
+                if all(barcode in cart_copy for barcode in bundle_products):
+                    # Calculate total quantity of each product in the bundle
+                    bundle_quantities = [cart_copy[barcode]['quantity'] for barcode in bundle_products]
+                    max_bundles = min(bundle_quantities)
+                    
+                    if max_bundles > 0:
+                        # Calculate original and bundle prices
+                        original_price = 0
+                        for barcode in bundle_products:
+                            original_price += cart_copy[barcode]['price'] * max_bundles
+                        
+                        bundle_price = offer.get('bundle_price', 0) * max_bundles
+                        discount_amount = original_price - bundle_price
+                        total_after_offers -= discount_amount
+                        
+                        applied_offers.append({
+                            'type': 'bundle',
+                            'name': offer['name'],
+                            'discount': discount_amount,
+                            'details': f"Bundle of {len(bundle_products)} products"
+                        })
+            
+            elif offer['type'] == 'special_price':
+                # Special price offer
+                if offer.get('apply_to_all', False):
+                    # Apply to all products
+                    for barcode, item in cart_copy.items():
+                        special_price = offer.get('special_price', 0)
+                        discount_amount = (item['price'] - special_price) * item['quantity']
+                        total_after_offers -= discount_amount
+                        
+                        applied_offers.append({
+                            'type': 'special_price',
+                            'name': offer['name'],
+                            'product': item['name'],
+                            'discount': discount_amount,
+                            'details': f"Special price: {format_currency(special_price)}"
+                        })
+                else:
+                    # Apply to specific product
+                    product_barcode = offer.get('product')
+                    if product_barcode in cart_copy:
+                        special_price = offer.get('special_price', 0)
+                        item = cart_copy[product_barcode]
+                        discount_amount = (item['price'] - special_price) * item['quantity']
+                        total_after_offers -= discount_amount
+                        
+                        applied_offers.append({
+                            'type': 'special_price',
+                            'name': offer['name'],
+                            'product': item['name'],
+                            'discount': discount_amount,
+                            'details': f"Special price: {format_currency(special_price)}"
+                        })
+            
+            elif offer['type'] == 'percentage_discount':
+                # Percentage discount offer
+                applicable_products = []
+                
+                if offer.get('apply_to_all', False):
+                    # Apply to all products
+                    applicable_products = list(cart_copy.keys())
+                else:
+                    # Apply to specific products
+                    applicable_products = offer.get('products', [])
+                
+                discount_percent = offer.get('discount_percent', 0) / 100
+                
+                for barcode in applicable_products:
+                    if barcode in cart_copy:
+                        item = cart_copy[barcode]
+                        discount_amount = item['price'] * item['quantity'] * discount_percent
+                        total_after_offers -= discount_amount
+                        
+                        applied_offers.append({
+                            'type': 'percentage_discount',
+                            'name': offer['name'],
+                            'product': item['name'],
+                            'discount': discount_amount,
+                            'details': f"{offer.get('discount_percent', 0)}% off"
+                        })
+            
+            elif offer['type'] == 'fixed_discount':
+                # Fixed amount discount offer
+                applicable_products = []
+                
+                if offer.get('apply_to_all', False):
+                    # Apply to all products
+                    applicable_products = list(cart_copy.keys())
+                else:
+                    # Apply to specific products
+                    applicable_products = offer.get('products', [])
+                
+                discount_amount_per_item = offer.get('discount_amount', 0)
+                
+                for barcode in applicable_products:
+                    if barcode in cart_copy:
+                        item = cart_copy[barcode]
+                        total_discount = discount_amount_per_item * item['quantity']
+                        total_after_offers -= total_discount
+                        
+                        applied_offers.append({
+                            'type': 'fixed_discount',
+                            'name': offer['name'],
+                            'product': item['name'],
+                            'discount': total_discount,
+                            'details': f"{format_currency(discount_amount_per_item)} off per item"
+                        })
+        
+        except Exception as e:
+            # Skip offers that cause errors but continue processing others
+            print(f"Error applying offer {offer.get('name', 'Unknown')}: {str(e)}")
+            continue
+    
+    # Display applied offers
+    if applied_offers:
+        st.subheader("🎁 Applied Offers & Discounts")
+        
+        for offer in applied_offers:
+            col1, col2, col3 = st.columns([3, 2, 1])
+            
+            with col1:
+                st.write(f"**{offer['name']}**")
+                if 'product' in offer:
+                    st.write(f"*{offer['product']}*")
+                if 'details' in offer:
+                    st.caption(offer['details'])
+            
+            with col2:
+                st.write(f"Discount: -{format_currency(offer['discount'])}")
+            
+            with col3:
+                if offer['type'] == 'bogo':
+                    st.success("BOGO")
+                elif offer['type'] == 'bundle':
+                    st.info("BUNDLE")
+                elif offer['type'] == 'special_price':
+                    st.warning("SPECIAL")
+                elif offer['type'] == 'percentage_discount':
+                    st.info("PERCENT")
+                elif offer['type'] == 'fixed_discount':
+                    st.info("FIXED")
+        
+        st.markdown("---")
+    
+    return max(total_after_offers, 0)  # Ensure total doesn't go negative
@@ -0,0 +1,624 @@
+"""POS terminal: scanning, cart, checkout and sale processing."""
+
+import streamlit as st
+import time
+import os
+import hashlib
+import json
+import uuid
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    OFFERS_FILE,
+    LOYALTY_FILE,
+    CATEGORIES_FILE,
+    SETTINGS_FILE,
+    BRANDS_FILE,
+    format_currency,
+    is_cashier,
+    load_data,
+    load_data_snapshot,
+)
+from rocket_pos.cart import Cart
+from rocket_pos.discount_rules import applicable_discounts
+from rocket_pos.hardware import barcode_scanner, camera_scan_panel, open_cash_drawer, print_receipt
+from rocket_pos.points_ledger import customer_state
+from rocket_pos.receipts import generate_receipt
+from rocket_pos.services import commit_sale
+
+def add_item_to_cart(barcode, quantity=1):
+    """Add a scanned/selected product to the cart; returns False if unknown or out of stock"""
+    products = load_data_snapshot(PRODUCTS_FILE)
+    inventory = load_data_snapshot(INVENTORY_FILE)
+    
+    if barcode not in products:
+        st.error("Product not found with this barcode")
+        return False
+    
+    product = products[barcode]
+    stock = inventory.get(barcode, {}).get('quantity', 0)
+    if stock <= 0:
+        st.error(f"{product['name']} is out of stock")
+        return False
+    
+    st.session_state.cart.add(barcode, product, quantity)
+    st.session_state.last_scan_time = time.perf_counter()
+    st.success(f"Added {product['name']} to cart")
+    return True
+
+def init_loyalty_session_state():
+    if 'loyalty_customer_id' not in st.session_state:
+        st.session_state.loyalty_customer_id = None
+    if 'loyalty_points_to_redeem' not in st.session_state:
+        st.session_state.loyalty_points_to_redeem = 0
+    if 'loyalty_customer_data' not in st.session_state:
+        st.session_state.loyalty_customer_data = None
+
+def loyalty_panel():
+    """Customer lookup by phone or loyalty ID"""
+    init_loyalty_session_state()
+    
+    st.subheader("🎯 Loyalty Program")
+    
+    loyalty_data = load_data_snapshot(LOYALTY_FILE)
+    customers = loyalty_data.get('customers', {})
+    
+    # Customer lookup form
+    with st.form("loyalty_lookup_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            customer_phone = st.text_input("Customer Phone", key="loyalty_phone_input")
+        with col2:
+            customer_id_input = st.text_input("Customer ID", key="customer_id_input")
+        
+        if st.form_submit_button("🔍 Find Customer", use_container_width=True):
+            customer_found = None
+            customer_id = None
+            
+            # Search by phone
+            if customer_phone:
+                for cust_id, cust_data in customers.items():
+                    if cust_data.get('phone') == customer_phone:
+                        customer_found = cust_data
+                        customer_id = cust_id
+                        break
+            
+            # Search by ID
+            if not customer_found and customer_id_input and customer_id_input in customers:
+                customer_found = customers[customer_id_input]
+                customer_id = customer_id_input
+            
+            if customer_found:
+                st.session_state.loyalty_customer_id = customer_id
+                st.session_state.loyalty_customer_data = customer_found
+                st.session_state.loyalty_points_to_redeem = 0
+                # Totals depend on the customer's tier, so refresh the whole terminal
+                st.rerun()
+            else:
+                st.session_state.loyalty_customer_id = None
+                st.session_state.loyalty_customer_data = None
+                st.warning("❌ Customer not found")
+    
+    # Display customer info if found
+    if st.session_state.loyalty_customer_data:
+        # Points and tier are re-read each run; another till may have just changed them
+        customer = customer_state(st.session_state.loyalty_customer_id, st.session_state.loyalty_customer_data)
+        
+        # Clear customer button
+        if st.button("🗑️ Clear Customer", key="clear_loyalty_customer", use_container_width=True):
+            st.session_state.loyalty_customer_id = None
+            st.session_state.loyalty_points_to_redeem = 0
+            st.session_state.loyalty_customer_data = None
+            st.rerun()
+        
+        st.info(f"✅ **{customer.get('name', 'Unknown')}** - {customer.get('tier', 'Bronze')} Tier")
+        st.info(f"Points: {customer.get('points', 0)}")
+
+def cart_lines_panel():
+    """Cart line widgets; quantity edits and removals update the cart's cached totals"""
+    cart = st.session_state.cart
+    # Create a copy of the cart items to avoid modification during iteration
+    cart_items = list(cart.items())
+    items_to_remove = []
+    
+    for barcode, item in cart_items:
+        with st.container():
+            col1, col2, col3, col4 = st.columns([4, 2, 2, 1])
+            with col1:
+                st.write(f"**{item['name']}**")
+                if item.get('description'):
+                    with st.expander("Description"):
+                        st.write(item['description'])
+            with col2:
+                new_qty = st.number_input(
+                    "Qty", 
+                    min_value=1, 
+                    max_value=100, 
+                    value=item['quantity'], 
+                    key=f"edit_{barcode}"
+                )
+                cart.set_quantity(barcode, new_qty)
+            with col3:
+                st.write(f"{format_currency(cart.line_totals[barcode])}")
+            with col4:
+                if st.button("❌", key=f"remove_{barcode}"):
+                    items_to_remove.append(barcode)
+    
+    # Remove items after iteration is complete
+    for barcode in items_to_remove:
+        cart.remove(barcode)
+    if items_to_remove:
+        st.rerun()
+
+def totals_panel():
+    """Discounts, loyalty redemption, summary and payment for the current cart"""
+    settings = load_data_snapshot(SETTINGS_FILE)
+    payment_charges = settings.get('payment_charges', {
+        "cash": 0.0,
+        "credit_card": 2.0,
+        "debit_card": 1.0,
+        "mobile_payment": 1.5,
+        "bank_transfer": 0.5,
+        "international_card": 3.0
+    })
+    
+    cart = st.session_state.cart
+    cart.set_tax_rate(settings.get('tax_rate', 0.0))
+    
+    # Selected offer - the cart only re-prices when it changes
+    selected_offer = None
+    selected_offer_name = st.session_state.get('selected_offer', None)
+    if selected_offer_name:
+        offers = load_data_snapshot(OFFERS_FILE)
+        for offer in offers.values():
+            if offer['name'] == selected_offer_name and offer.get('active', True):
+                selected_offer = offer
+                break
+    cart.set_offer(selected_offer)
+    
+    # Apply discounts - only those live today that cover something in the cart
+    applicable = applicable_discounts(cart.lines)
+    
+    selected_discount, discount_lines = None, None
+    if applicable:
+        discount_options = {d['name']: (d, eligible) for d, eligible in applicable.values()}
+        discount_name = st.selectbox("Apply Discount", [""] + list(discount_options.keys()))
+        if discount_name:
+            selected_discount, discount_lines = discount_options[discount_name]
+            if discount_lines is not None:
+                st.caption("Applies to: " + ", ".join(cart.lines[barcode]['name'] for barcode in discount_lines))
+    
+    loyalty_data = load_data_snapshot(LOYALTY_FILE)
+    loyalty_settings = loyalty_data.get('settings', {})
+    points_value = loyalty_settings.get('points_value', 0.01)
+    
+    # Tier discount and points redemption for the customer picked in the loyalty panel
+    customer_id = st.session_state.loyalty_customer_id
+    loyalty_rate = 0.0
+    if st.session_state.loyalty_customer_data:
+        customer = customer_state(customer_id, st.session_state.loyalty_customer_data)
+        
+        # Apply tier discount
+        current_tier = customer.get('tier', 'Bronze')
+        tier_settings = loyalty_data.get('tiers', {}).get(current_tier, {})
+        loyalty_rate = tier_settings.get('discount', 0)
+        
+        before_points = cart.pricing(selected_discount, loyalty_rate, customer_id=customer_id,
+                                     discount_lines=discount_lines)
+        if before_points['loyalty_discount'] > 0:
+            st.success(f"🏆 Tier discount ({current_tier}): -{format_currency(before_points['loyalty_discount'])}")
+        
+        # Points redemption
+        max_points_to_redeem = customer.get('points', 0)
+        
+        if max_points_to_redeem > 0:
+            max_redeemable = max(min(max_points_to_redeem, int(before_points['total_after_discounts'] / points_value)), 0)
+            st.session_state.loyalty_points_to_redeem = st.number_input(
+                "Points to redeem", 
+                min_value=0, 
+                max_value=max_redeemable,
+                value=min(st.session_state.loyalty_points_to_redeem, max_redeemable),
+                step=10,
+                key="points_redeem_input"
+            )
+    
+    st.markdown("---")
+    
+    # PAYMENT SECTION
+    col1, col2 = st.columns(2)
+    with col2:
+        st.subheader("💳 Payment")
+        payment_method = st.selectbox("Payment Method", 
+                                    ["Cash", "Credit Card", "Debit Card", "Mobile Payment", "Bank Transfer", "International Card"])
+        
+        # Calculate payment charge
+        payment_method_key = payment_method.lower().replace(" ", "_")
+        payment_charge_percent = payment_charges.get(payment_method_key, 0.0)
+    
+    pricing = cart.pricing(
+        selected_discount,
+        loyalty_rate,
+        points=st.session_state.loyalty_points_to_redeem,
+        points_value=points_value,
+        points_per_dollar=loyalty_settings.get('points_per_dollar', 1),
+        customer_id=customer_id,
+        payment_method=payment_method,
+        payment_charge_percent=payment_charge_percent,
+        discount_lines=discount_lines
+    )
+    
+    with col1:
+        if pricing['points_discount'] > 0:
+            st.success(f"🎉 Redeeming {pricing['points_redeemed']} points: -{format_currency(pricing['points_discount'])}")
+        
+        # Loyalty points to earn (for display only)
+        if customer_id:
+            st.info(f"📈 Points to earn: {pricing['loyalty_points_earned']}")
+        
+        st.subheader("💰 Summary")
+        st.write(f"Subtotal: {format_currency(pricing['subtotal'])}")
+        st.write(f"Tax ({pricing['tax_rate']*100}%): {format_currency(pricing['tax'])}")
+        st.write(f"Total Before Discounts: {format_currency(pricing['total_before_discounts'])}")
+        
+        if pricing['offer_discount'] > 0:
+            st.write(f"Offer Discount: -{format_currency(pricing['offer_discount'])}")
+        
+        if pricing['manual_discount'] > 0:
+            st.write(f"Manual Discount: -{format_currency(pricing['manual_discount'])}")
+        
+        if pricing['loyalty_discount'] > 0:
+            st.write(f"Loyalty Discount: -{format_currency(pricing['loyalty_discount'])}")
+        
+        if pricing['points_discount'] > 0:
+            st.write(f"Points Discount: -{format_currency(pricing['points_discount'])}")
+        
+        st.write(f"**Net Amount: {format_currency(pricing['net_amount'])}**")
+    
+    with col2:
+        if payment_charge_percent > 0:
+            st.info(f"💸 Payment Fee ({payment_charge_percent}%): +{format_currency(pricing['payment_charge_amount'])}")
+            st.write(f"**Amount Due: {format_currency(pricing['amount_due'])}**")
+        
+        amount_tendered = st.number_input("Amount Tendered", min_value=0.0, value=pricing['amount_due'], step=1.0)
+        
+        change = amount_tendered - pricing['amount_due']
+        if change >= 0:
+            st.success(f"Change: {format_currency(change)}")
+        else:
+            st.error(f"Short by: {format_currency(abs(change))}")
+        
+        if st.button("✅ Complete Sale", type="primary", use_container_width=True):
+            if amount_tendered < pricing['amount_due']:
+                st.error("❌ Amount tendered is less than total")
+            else:
+                # Commit the breakdown shown above as is
+                success = process_sale(pricing, amount_tendered)
+                
+                if success:
+                    st.success("🎉 Sale completed successfully!")
+                    st.rerun()
+                else:
+                    st.error("❌ Failed to process sale")
+
+def display_cart_and_checkout():
+    st.header("Current Sale")
+    
+    init_loyalty_session_state()
+    
+    if st.session_state.cart:
+        cart_lines_panel()
+        totals_panel()
+    else:
+        st.info("🛒 Cart is empty")
+    
+    # Server-side scan-to-render latency: from the cart update to the end of the cart/totals render
+    if 'last_scan_time' in st.session_state:
+        st.session_state.scan_render_ms = (time.perf_counter() - st.session_state.pop('last_scan_time')) * 1000
+    if st.session_state.get('scan_render_ms') is not None:
+        st.caption(f"⏱️ Last scan rendered in {st.session_state.scan_render_ms:.0f} ms")
+
+def scan_and_checkout():
+    """Scanner input, then the cart and totals"""
+    # Check for barcode scanner input
+    if st.session_state.scanner_status == "Connected":
+        barcode = barcode_scanner.get_barcode()
+        if barcode:
+            add_item_to_cart(barcode)
+    
+    # Manual barcode entry as fallback
+    st.subheader("Manual Barcode Entry")
+    
+    # Use a callback function to handle automatic addition
+    def handle_barcode_input():
+        manual_barcode = st.session_state.manual_barcode_input
+        if manual_barcode and add_item_to_cart(manual_barcode):
+            # Clear the input field by resetting the session state
+            st.session_state.manual_barcode_input = ""
+    
+    # Text input with on_change callback
+    st.text_input(
+        "Enter Barcode Manually", 
+        key="manual_barcode_input",
+        on_change=handle_barcode_input,
+        placeholder="Scan or type barcode and press Enter"
+    )
+    
+    with st.expander("📷 Camera Scan"):
+        products = load_data_snapshot(PRODUCTS_FILE)
+        codes = camera_scan_panel("pos_scan")
+        # Only known barcodes: a camera can misread a stray pattern as some valid code
+        for code in codes:
+            if code in products:
+                add_item_to_cart(code)
+        if codes and not any(code in products for code in codes):
+            st.error("Product not found with this barcode")
+    
+    # Display cart and checkout
+    display_cart_and_checkout()
+
+def checkout_key(pricing):
+    """Idempotency key for committing this breakdown.
+
+    Stays the same across reruns and double-clicks while the cart is unchanged,
+    so the sale can only be made once; finish_sale() drops it with the cart.
+    """
+    fingerprint = hashlib.sha1(json.dumps(pricing, sort_keys=True, default=str).encode()).hexdigest()
+    if st.session_state.get('checkout_fingerprint') != fingerprint:
+        st.session_state.checkout_fingerprint = fingerprint
+        st.session_state.checkout_key = uuid.uuid4().hex
+    return st.session_state.checkout_key
+
+def finish_sale():
+    """Empty the cart and loyalty selection and drop the checkout key, together"""
+    st.session_state.cart = Cart()
+    st.session_state.selected_offer = None
+    st.session_state.loyalty_customer_id = None
+    st.session_state.loyalty_points_to_redeem = 0
+    st.session_state.loyalty_customer_data = None
+    # The next cart gets a fresh key, even if it is the same items again
+    st.session_state.pop('checkout_fingerprint', None)
+
+# Commit a sale from the pricing breakdown produced by Cart.pricing()
+def process_sale(pricing, amount_tendered):
+    try:
+        transaction = commit_sale(
+            pricing,
+            amount_tendered,
+            st.session_state.user_info['username'],
+            st.session_state.shift_id if st.session_state.shift_started else None,
+            checkout_key(pricing)
+        )
+    except Exception as e:
+        st.error(f"Error processing sale: {str(e)}")
+        return False
+    
+    # No st.* call before this: a rerun (a second click) can only interrupt the script at one,
+    # and until the cart is gone the same key must keep replaying this sale
+    finish_sale()
+    
+    try:
+        # Generate and print receipt
+        receipt_text = generate_receipt(transaction)
+        if print_receipt(receipt_text, transaction['transaction_id']):
+            st.success("Receipt printed successfully")
+        else:
+            st.error("Failed to print receipt")
+        
+        # Open cash drawer if enabled
+        if pricing['payment_method'] == "Cash":
+            open_cash_drawer()
+    except Exception as e:
+        st.error(f"Sale saved, but the receipt or cash drawer failed: {str(e)}")
+    
+    return True
+
+# POS Terminal - Main Page
+# POS Terminal - Enhanced with Payment Charges and Offers
+def pos_terminal():
+    if is_cashier() and not st.session_state.shift_started:
+        st.warning("Please start your shift before using the POS terminal")
+        return
+    
+    st.title("POS Terminal")
+    
+    # Scanner status indicator
+    if 'scanner_status' in st.session_state:
+        status_color = "green" if st.session_state.scanner_status == "Connected" else "red"
+        st.markdown(f"**Scanner Status:** <span style='color:{status_color}'>{st.session_state.scanner_status}</span>", 
+                   unsafe_allow_html=True)
+    
+    # POS Mode Selection
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Barcode Scan Mode", use_container_width=True):
+            st.session_state.pos_mode = 'scan'
+    with col2:
+        if st.button("Manual Entry Mode", use_container_width=True):
+            st.session_state.pos_mode = 'manual'
+    
+    if st.session_state.pos_mode == 'scan':
+        pos_scan_mode()
+    else:
+        pos_manual_mode()
+
+def pos_scan_mode():
+    st.header("Barcode Scan Mode")
+    
+    # Offer selection
+    offers = load_data_snapshot(OFFERS_FILE)
+    active_offers = [o for o in offers.values() if o['active']]
+    
+    if active_offers:
+        st.subheader("🎁 Active Offers")
+        offer_options = {o['name']: o for o in active_offers}
+        
+        # Initialize selected_offer in session state if not exists
+        if 'selected_offer' not in st.session_state:
+            st.session_state.selected_offer = None
+            
+        selected_offer = st.selectbox(
+            "Select Offer to Apply", 
+            [""] + list(offer_options.keys()),
+            key="offer_select"
+        )
+        
+        # Store the selected offer in session state
+        st.session_state.selected_offer = selected_offer
+        
+        if selected_offer:
+            st.info(f"Selected: {offer_options[selected_offer]['description']}")
+    
+    loyalty_panel()
+    st.markdown("---")
+    scan_and_checkout()
+
+def pos_manual_mode():
+    products = load_data(PRODUCTS_FILE)
+    inventory = load_data(INVENTORY_FILE)
+    categories = load_data(CATEGORIES_FILE)
+    brands = load_data(BRANDS_FILE).get('brands', [])
+    
+    st.header("Manual Entry Mode")
+    
+    # Offer selection
+    offers = load_data(OFFERS_FILE)
+    active_offers = [o for o in offers.values() if o['active']]
+    
+    if active_offers:
+        st.subheader("🎁 Active Offers")
+        offer_options = {o['name']: o for o in active_offers}
+        selected_offer = st.selectbox("Select Offer to Apply", [""] + list(offer_options.keys()))
+        
+        if selected_offer:
+            st.info(f"Selected: {offer_options[selected_offer]['description']}")
+    
+    # Search and filter options
+    st.subheader("Search & Filter Products")
+    
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    
+    with col1:
+        # Search by name or barcode
+        search_term = st.text_input("🔍 Search by Name or Barcode", 
+                                  placeholder="Enter product name or barcode...",
+                                  key="manual_search")
+    
+    with col2:
+        # Category filter
+        selected_category = st.selectbox(
+            "Category", 
+            [""] + categories.get('categories', []),
+            key="manual_category"
+        )
+    
+    with col3:
+        # Subcategory filter (only show if category is selected)
+        if selected_category:
+            subcategories = categories.get('subcategories', {}).get(selected_category, [])
+            selected_subcategory = st.selectbox(
+                "Subcategory", 
+                [""] + subcategories,
+                key="manual_subcategory"
+            )
+        else:
+            selected_subcategory = None
+    
+    with col4:
+        # Brand filter
+        selected_brand = st.selectbox("Brand", [""] + brands, key="manual_brand")
+    
+    # Display products based on search and filters
+    st.subheader("Products")
+    
+    filtered_products = {}
+    for barcode, product in products.items():
+        # Check search term
+        matches_search = not search_term or (
+            search_term.lower() in product['name'].lower() or 
+            search_term.lower() in barcode.lower()
+        )
+        
+        # Check category
+        matches_category = not selected_category or product.get('category') == selected_category
+        
+        # Check subcategory
+        matches_subcategory = not selected_subcategory or product.get('subcategory') == selected_subcategory
+        
+        # Check brand
+        matches_brand = not selected_brand or product.get('brand') == selected_brand
+        
+        # Check stock
+        stock = inventory.get(barcode, {}).get('quantity', 0)
+        has_stock = stock > 0
+        
+        if matches_search and matches_category and matches_subcategory and matches_brand and has_stock:
+            filtered_products[barcode] = product
+    
+    if not filtered_products:
+        st.info("No products found with the selected filters")
+    else:
+        # Show search results count
+        st.write(f"**Found {len(filtered_products)} product(s)**")
+        
+        # Sort products by name for better organization
+        sorted_products = sorted(filtered_products.items(), key=lambda x: x[1]['name'])
+        
+        cols_per_row = 3  # Fewer columns to accommodate quantity inputs
+        
+        for i in range(0, len(sorted_products), cols_per_row):
+            cols = st.columns(cols_per_row)
+            for col_idx in range(cols_per_row):
+                if i + col_idx < len(sorted_products):
+                    barcode, product = sorted_products[i + col_idx]
+                    with cols[col_idx]:
+                        with st.container():
+                            # Product image
+                            if 'image' in product and os.path.exists(product['image']):
+                                try:
+                                    from PIL import Image
+                                    img = Image.open(product['image'])
+                                    img.thumbnail((150, 150))
+                                    st.image(img, use_column_width=True)
+                                except:
+                                    pass
+                            
+                            # Product name and details
+                            st.subheader(product['name'])
+                            st.text(f"Price: {format_currency(product['price'])}")
+                            st.text(f"Barcode: {barcode}")
+                            
+                            # Stock status
+                            stock = inventory.get(barcode, {}).get('quantity', 0)
+                            status = "In Stock" if stock > 0 else "Out of Stock"
+                            color = "green" if stock > 0 else "red"
+                            st.markdown(f"Status: <span style='color:{color}'>{status}</span>", unsafe_allow_html=True)
+                            
+                            # Brand and category
+                            if product.get('brand'):
+                                st.text(f"Brand: {product['brand']}")
+                            if product.get('category'):
+                                st.text(f"Category: {product.get('category')}")
+                            
+                            # Product description
+                            if product.get('description'):
+                                with st.expander("Description"):
+                                    st.write(product['description'])
+                            
+                            # Quantity selection
+                            quantity = st.number_input(
+                                "Quantity", 
+                                min_value=1, 
+                                max_value=min(100, stock), 
+                                value=1, 
+                                key=f"qty_{barcode}"
+                            )
+                            
+                            # Add to cart button
+                            if st.button(f"Add to Cart", key=f"add_manual_{barcode}", use_container_width=True):
+                                st.session_state.cart.add(barcode, product, quantity)
+                                st.success(f"Added {quantity} {product['name']} to cart")
+    
+    loyalty_panel()
+    st.markdown("---")
+    display_cart_and_checkout()
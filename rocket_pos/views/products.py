@@ -0,0 +1,1095 @@
+"""Product management."""
+
+import streamlit as st
+import pandas as pd
+import os
+
+from rocket_pos.core import (
+    DATA_DIR,
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    TRANSACTIONS_FILE,
+    CATEGORIES_FILE,
+    SUPPLIERS_FILE,
+    BRANDS_FILE,
+    format_currency,
+    generate_barcode,
+    get_current_datetime,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.stock_ledger import ensure_stock_ledger, record_stock_events, stock_event
+
+# product Management 
+def product_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Product Management")
+    
+    # Moves any legacy per-SKU adjustment lists into the stock event log before they're loaded below
+    ensure_stock_ledger()
+    
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+        "Add Product", 
+        "View/Edit Products", 
+        "Delete Product", 
+        "Bulk Import", 
+        "Template Management",
+        "Category Management"
+    ])
+    
+    # Helper function to load categories with proper structure
+    def load_categories_data():
+        categories_data = load_data(CATEGORIES_FILE)
+        # Ensure the data structure is correct
+        if 'categories' not in categories_data:
+            categories_data['categories'] = []
+        if 'subcategories' not in categories_data:
+            categories_data['subcategories'] = {}
+        return categories_data
+    
+    # Helper function to get subcategories for a category
+    def get_subcategories(category):
+        categories_data = load_categories_data()
+        return categories_data['subcategories'].get(category, [])
+    
+    # Helper function to add new subcategory
+    def add_subcategory(category, subcategory):
+        categories_data = load_categories_data()
+        if category not in categories_data['subcategories']:
+            categories_data['subcategories'][category] = []
+        if subcategory and subcategory not in categories_data['subcategories'][category]:
+            categories_data['subcategories'][category].append(subcategory)
+        save_data(categories_data, CATEGORIES_FILE)
+    
+    with tab1:
+        st.header("Add New Product")
+        
+        categories_data = load_categories_data()
+        categories = categories_data.get('categories', [])
+        brands_data = load_data(BRANDS_FILE)
+        brands = brands_data.get('brands', [])
+        suppliers = load_data(SUPPLIERS_FILE)
+        
+        # Separate form for adding new category (outside the main form)
+        with st.expander("Quick Add Category/Subcategory"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                new_category_name = st.text_input("New Category Name", key="quick_add_category")
+                if st.button("Add Category", key="add_category_btn"):
+                    if new_category_name and new_category_name not in categories:
+                        categories_data['categories'].append(new_category_name)
+                        categories_data['subcategories'][new_category_name] = []
+                        save_data(categories_data, CATEGORIES_FILE)
+                        st.success(f"Category '{new_category_name}' added")
+                        st.rerun()
+                    elif new_category_name in categories:
+                        st.error("Category already exists")
+            
+            with col2:
+                selected_category_for_sub = st.selectbox("Select Category for Subcategory", 
+                                                       [""] + categories, key="cat_for_sub")
+                new_subcategory_name = st.text_input("New Subcategory Name", key="quick_add_subcategory",
+                                                   disabled=not selected_category_for_sub)
+                if st.button("Add Subcategory", key="add_subcategory_btn") and selected_category_for_sub:
+                    if new_subcategory_name:
+                        add_subcategory(selected_category_for_sub, new_subcategory_name)
+                        st.success(f"Subcategory '{new_subcategory_name}' added to '{selected_category_for_sub}'")
+                        st.rerun()
+        
+        # Main product form
+        with st.form("add_product_form", clear_on_submit=True):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                name = st.text_input("Product Name*", help="Enter the product name")
+                description = st.text_area("Description", help="Product description for customers")
+                
+                # Category selection
+                category = st.selectbox("Category", [""] + categories, help="Select product category", 
+                                      key="add_product_category")
+                
+                # Get subcategories based on selected category
+                subcategories_list = []
+                if category:
+                    subcategories_list = get_subcategories(category)
+                
+                # Subcategory selection (dynamic based on category)
+                subcategory = st.selectbox("Subcategory", [""] + subcategories_list, 
+                                         help="Select product subcategory",
+                                         key="add_product_subcategory")
+                
+                # Brand selection
+                brand = st.selectbox("Brand", [""] + brands, help="Select product brand",
+                                   key="add_product_brand")
+            
+            with col2:
+                price = st.number_input("Selling Price*", min_value=0.01, step=0.01, value=1.0, 
+                                      help="Customer selling price", key="add_product_price")
+                cost = st.number_input("Cost Price*", min_value=0.01, step=0.01, value=1.0, 
+                                     help="Wholesale or manufacturing cost", key="add_product_cost")
+                
+                # Barcode options - FIXED: Better state management
+                barcode_option = st.radio("Barcode Options", 
+                                         ["Generate Automatically", "Enter Manually"], 
+                                         help="Choose how to handle barcode",
+                                         key="add_product_barcode_option")
+                
+                if barcode_option == "Enter Manually":
+                    barcode = st.text_input("Barcode*", help="Enter 12-13 digit barcode",
+                                          key="add_product_barcode_manual")
+                else:
+                    barcode = st.text_input("Barcode (leave blank to auto-generate)", 
+                                          value="", help="Leave empty to auto-generate barcode",
+                                          key="add_product_barcode_auto")
+                
+                # Initial stock
+                initial_stock = st.number_input("Initial Stock", min_value=0, value=0, step=1,
+                                              help="Initial inventory quantity",
+                                              key="add_product_stock")
+                
+                # Reorder point
+                reorder_point = st.number_input("Reorder Point", min_value=0, value=10, step=1,
+                                              help="Stock level to trigger reordering",
+                                              key="add_product_reorder")
+                
+                # Product image
+                image = st.file_uploader("Product Image", type=['jpg', 'png', 'jpeg', 'gif'],
+                                       help="Upload product image (optional)",
+                                       key="add_product_image")
+            
+            # Supplier information
+            supplier_options = [""]
+            if suppliers:
+                supplier_options.extend([v['name'] for v in suppliers.values()])
+            
+            # FIXED: Safe supplier selection
+            selected_supplier = st.selectbox("Primary Supplier", supplier_options,
+                                           help="Select main supplier for this product",
+                                           key="add_product_supplier")
+            
+            # Product status
+            active = st.checkbox("Active Product", value=True, help="Enable/disable product for sales",
+                               key="add_product_active")
+            
+            submit_button = st.form_submit_button("Add Product")
+            
+            if submit_button:
+                # Validation - FIXED: Better barcode validation
+                errors = []
+                if not name:
+                    errors.append("Product name is required")
+                if price <= 0:
+                    errors.append("Price must be greater than 0")
+                if cost <= 0:
+                    errors.append("Cost must be greater than 0")
+                
+                # Handle barcode validation based on selection
+                final_barcode = ""
+                if barcode_option == "Enter Manually":
+                    if not barcode:
+                        errors.append("Barcode is required when selecting manual entry")
+                    elif not barcode.isdigit():
+                        errors.append("Barcode must contain only digits")
+                    elif len(barcode) not in [12, 13]:
+                        errors.append("Barcode must be 12 or 13 digits")
+                    else:
+                        final_barcode = barcode
+                        # Check for duplicate barcode
+                        products = load_data(PRODUCTS_FILE)
+                        if final_barcode in products:
+                            errors.append(f"Product with barcode {final_barcode} already exists")
+                
+                if errors:
+                    for error in errors:
+                        st.error(error)
+                else:
+                    products = load_data(PRODUCTS_FILE)
+                    inventory = load_data(INVENTORY_FILE)
+                    
+                    # Generate barcode if needed - FIXED: Proper barcode generation
+                    if barcode_option == "Generate Automatically" or not final_barcode:
+                        # Generate unique barcode
+                        while True:
+                            final_barcode = generate_barcode()
+                            if final_barcode not in products:
+                                break
+                    
+                    # Save product
+                    products[final_barcode] = {
+                        'barcode': final_barcode,
+                        'name': name,
+                        'description': description,
+                        'price': price,
+                        'cost': cost,
+                        'category': category,
+                        'subcategory': subcategory,
+                        'brand': brand,
+                        'supplier': selected_supplier if selected_supplier else None,
+                        'active': active,
+                        'date_added': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                        'added_by': st.session_state.user_info['username']
+                    }
+                    
+                    # Save image if provided
+                    if image:
+                        # Create images directory if it doesn't exist
+                        images_dir = os.path.join(DATA_DIR, "product_images")
+                        os.makedirs(images_dir, exist_ok=True)
+                        
+                        # Save image with barcode as filename
+                        image_ext = image.name.split('.')[-1]
+                        image_path = os.path.join(images_dir, f"{final_barcode}.{image_ext}")
+                        with open(image_path, 'wb') as f:
+                            f.write(image.getbuffer())
+                        products[final_barcode]['image'] = image_path
+                    
+                    # Initialize inventory
+                    inventory[final_barcode] = {
+                        'quantity': initial_stock,
+                        'reorder_point': reorder_point,
+                        'last_updated': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                    }
+                    
+                    # Update brand mapping if brand is selected
+                    if brand:
+                        brands_data = load_data(BRANDS_FILE)
+                        brand_products = brands_data.get('brand_products', {})
+                        if brand not in brand_products:
+                            brand_products[brand] = []
+                        if final_barcode not in brand_products[brand]:
+                            brand_products[brand].append(final_barcode)
+                        brands_data['brand_products'] = brand_products
+                        save_data(brands_data, BRANDS_FILE)
+                    
+                    record_stock_events([stock_event(final_barcode, 'adjustment', initial_stock, "Initial Stock")],
+                                        st.session_state.user_info['username'])
+                    save_data(products, PRODUCTS_FILE)
+                    save_data(inventory, INVENTORY_FILE)
+                    st.success(f"Product '{name}' added successfully with barcode: {final_barcode}")
+                    
+                    # Clear form by rerunning
+                    st.rerun()
+
+    with tab2:
+        st.header("View/Edit Products")
+        
+        products = load_data(PRODUCTS_FILE)
+        inventory = load_data(INVENTORY_FILE)
+        categories_data = load_categories_data()
+        brands_data = load_data(BRANDS_FILE)
+        suppliers = load_data(SUPPLIERS_FILE)
+        
+        if not products:
+            st.info("No products available")
+        else:
+            # Advanced filtering
+            st.subheader("Filter Products")
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                search_term = st.text_input("Search by name or barcode", key="filter_search")
+                category_filter = st.selectbox("Filter by Category", 
+                                             [""] + categories_data.get('categories', []),
+                                             key="filter_category")
+            
+            with col2:
+                brand_filter = st.selectbox("Filter by Brand", 
+                                          [""] + brands_data.get('brands', []),
+                                          key="filter_brand")
+                status_filter = st.selectbox("Filter by Status", 
+                                           ["All", "Active", "Inactive"],
+                                           key="filter_status")
+            
+            with col3:
+                stock_filter = st.selectbox("Filter by Stock", 
+                                          ["All", "In Stock", "Low Stock", "Out of Stock"],
+                                          key="filter_stock")
+                sort_by = st.selectbox("Sort By", 
+                                     ["Name (A-Z)", "Name (Z-A)", "Price (High-Low)", 
+                                      "Price (Low-High)", "Stock (High-Low)", "Stock (Low-High)"],
+                                     key="filter_sort")
+            
+            # Apply filters
+            filtered_products = products.copy()
+            
+            if search_term:
+                filtered_products = {k: v for k, v in filtered_products.items() 
+                                   if search_term.lower() in v['name'].lower() or 
+                                   search_term.lower() in k.lower()}
+            
+            if category_filter:
+                filtered_products = {k: v for k, v in filtered_products.items() 
+                                   if v.get('category') == category_filter}
+            
+            if brand_filter:
+                filtered_products = {k: v for k, v in filtered_products.items() 
+                                   if v.get('brand') == brand_filter}
+            
+            if status_filter != "All":
+                active_status = status_filter == "Active"
+                filtered_products = {k: v for k, v in filtered_products.items() 
+                                   if v.get('active', True) == active_status}
+            
+            if stock_filter != "All":
+                for barcode in list(filtered_products.keys()):
+                    stock = inventory.get(barcode, {}).get('quantity', 0)
+                    reorder = inventory.get(barcode, {}).get('reorder_point', 10)
+                    
+                    if stock_filter == "In Stock" and stock <= 0:
+                        del filtered_products[barcode]
+                    elif stock_filter == "Low Stock" and (stock > reorder or stock == 0):
+                        del filtered_products[barcode]
+                    elif stock_filter == "Out of Stock" and stock > 0:
+                        del filtered_products[barcode]
+            
+            # Apply sorting
+            if sort_by == "Name (A-Z)":
+                filtered_products = dict(sorted(filtered_products.items(), 
+                                              key=lambda x: x[1]['name'].lower()))
+            elif sort_by == "Name (Z-A)":
+                filtered_products = dict(sorted(filtered_products.items(), 
+                                              key=lambda x: x[1]['name'].lower(), reverse=True))
+            elif sort_by == "Price (High-Low)":
+                filtered_products = dict(sorted(filtered_products.items(), 
+                                              key=lambda x: x[1]['price'], reverse=True))
+            elif sort_by == "Price (Low-High)":
+                filtered_products = dict(sorted(filtered_products.items(), 
+                                              key=lambda x: x[1]['price']))
+            elif sort_by == "Stock (High-Low)":
+                filtered_products = dict(sorted(filtered_products.items(), 
+                                              key=lambda x: inventory.get(x[0], {}).get('quantity', 0), 
+                                              reverse=True))
+            elif sort_by == "Stock (Low-High)":
+                filtered_products = dict(sorted(filtered_products.items(), 
+                                              key=lambda x: inventory.get(x[0], {}).get('quantity', 0)))
+            
+            st.write(f"**Found {len(filtered_products)} products**")
+            
+            # Pagination
+            items_per_page = 10
+            total_pages = max(1, (len(filtered_products) + items_per_page - 1) // items_per_page)
+            page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1,
+                                 key="pagination_page")
+            
+            start_idx = (page - 1) * items_per_page
+            end_idx = min(start_idx + items_per_page, len(filtered_products))
+            
+            # Display products for current page
+            product_items = list(filtered_products.items())[start_idx:end_idx]
+            
+            for barcode, product in product_items:
+                with st.expander(f"{product['name']} - {barcode}"):
+                    col1, col2 = st.columns([1, 2])
+                    
+                    with col1:
+                        # Display product image if available
+                        if 'image' in product and os.path.exists(product['image']):
+                            try:
+                                from PIL import Image
+                                img = Image.open(product['image'])
+                                img.thumbnail((200, 200))
+                                st.image(img, use_column_width=True)
+                            except Exception as e:
+                                st.error(f"Error loading image: {str(e)}")
+                        else:
+                            st.info("No image available")
+                    
+                    with col2:
+                        # Create a unique form for each product
+                        with st.form(key=f"edit_{barcode}"):
+                            name = st.text_input("Name", value=product.get('name', ''), 
+                                               key=f"edit_name_{barcode}")
+                            description = st.text_area("Description", value=product.get('description', ''),
+                                                     key=f"edit_desc_{barcode}")
+                            
+                            col21, col22 = st.columns(2)
+                            with col21:
+                                price = st.number_input("Price", value=product.get('price', 1.0), 
+                                                      min_value=0.01, step=0.01,
+                                                      key=f"edit_price_{barcode}")
+                                cost = st.number_input("Cost", value=product.get('cost', 1.0), 
+                                                     min_value=0.01, step=0.01,
+                                                     key=f"edit_cost_{barcode}")
+                                
+                                # Category selection - FIXED: Safe index handling
+                                current_category = product.get('category', '')
+                                category_options = [""] + categories_data.get('categories', [])
+                                category_index = 0
+                                if current_category and current_category in category_options:
+                                    category_index = category_options.index(current_category)
+                                category = st.selectbox("Category", category_options, 
+                                                      index=category_index,
+                                                      key=f"edit_cat_{barcode}")
+                                
+                                # Get subcategories based on selected category
+                                subcategories_list = []
+                                if category:
+                                    subcategories_list = get_subcategories(category)
+                                
+                                # Subcategory based on selected category - FIXED: Safe index handling
+                                current_subcategory = product.get('subcategory', '')
+                                subcategory_index = 0
+                                if current_subcategory and current_subcategory in subcategories_list:
+                                    subcategory_index = subcategories_list.index(current_subcategory) + 1
+                                subcategory = st.selectbox("Subcategory", 
+                                                         [""] + subcategories_list, 
+                                                         index=subcategory_index,
+                                                         key=f"edit_sub_{barcode}")
+                            
+                            with col22:
+                                # Brand selection - FIXED: Safe index handling
+                                current_brand = product.get('brand', '')
+                                brand_options = [""] + brands_data.get('brands', [])
+                                brand_index = 0
+                                if current_brand and current_brand in brand_options:
+                                    brand_index = brand_options.index(current_brand)
+                                brand = st.selectbox("Brand", brand_options, 
+                                                   index=brand_index,
+                                                   key=f"edit_brand_{barcode}")
+                                
+                                # Supplier selection - FIXED: Safe index handling
+                                supplier_options = [""] + [v['name'] for v in suppliers.values()]
+                                current_supplier = product.get('supplier', '')
+                                supplier_index = 0
+                                if current_supplier and current_supplier in supplier_options:
+                                    supplier_index = supplier_options.index(current_supplier)
+                                supplier = st.selectbox("Supplier", supplier_options,
+                                                      index=supplier_index,
+                                                      key=f"edit_sup_{barcode}")
+                                
+                                # Inventory management
+                                current_stock = inventory.get(barcode, {}).get('quantity', 0)
+                                new_stock = st.number_input("Current Stock", min_value=0, value=current_stock, step=1,
+                                                          key=f"edit_stock_{barcode}")
+                                
+                                current_reorder = inventory.get(barcode, {}).get('reorder_point', 10)
+                                reorder_point = st.number_input("Reorder Point", min_value=0, value=current_reorder, step=1,
+                                                              key=f"edit_reorder_{barcode}")
+                                
+                                active = st.checkbox("Active", value=product.get('active', True),
+                                                   key=f"edit_active_{barcode}")
+                            
+                            # Image update
+                            new_image = st.file_uploader("Update Image", type=['jpg', 'png', 'jpeg', 'gif'], 
+                                                       key=f"edit_img_{barcode}")
+                            
+                            # Submit button
+                            if st.form_submit_button("Update Product"):
+                                # Update product data
+                                products[barcode]['name'] = name
+                                products[barcode]['description'] = description
+                                products[barcode]['price'] = price
+                                products[barcode]['cost'] = cost
+                                products[barcode]['category'] = category
+                                products[barcode]['subcategory'] = subcategory
+                                products[barcode]['brand'] = brand
+                                products[barcode]['supplier'] = supplier if supplier else None
+                                products[barcode]['active'] = active
+                                products[barcode]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                                products[barcode]['updated_by'] = st.session_state.user_info['username']
+                                
+                                # Update image if provided
+                                if new_image:
+                                    # Remove old image if exists
+                                    if 'image' in products[barcode] and os.path.exists(products[barcode]['image']):
+                                        try:
+                                            os.remove(products[barcode]['image'])
+                                        except:
+                                            pass
+                                    
+                                    # Create images directory if it doesn't exist
+                                    images_dir = os.path.join(DATA_DIR, "product_images")
+                                    os.makedirs(images_dir, exist_ok=True)
+                                    
+                                    # Save new image
+                                    image_ext = new_image.name.split('.')[-1]
+                                    image_path = os.path.join(images_dir, f"{barcode}.{image_ext}")
+                                    with open(image_path, 'wb') as f:
+                                        f.write(new_image.getbuffer())
+                                    products[barcode]['image'] = image_path
+                                
+                                # Update inventory
+                                record_stock_events([stock_event(barcode, 'adjustment', new_stock - current_stock, "Product Edit")],
+                                                    st.session_state.user_info['username'])
+                                inventory[barcode]['quantity'] = new_stock
+                                inventory[barcode]['reorder_point'] = reorder_point
+                                inventory[barcode]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                                
+                                # Update brand mapping if brand changed
+                                old_brand = product.get('brand')
+                                if old_brand != brand:
+                                    brands_data = load_data(BRANDS_FILE)
+                                    brand_products = brands_data.get('brand_products', {})
+                                    
+                                    # Remove from old brand
+                                    if old_brand and old_brand in brand_products and barcode in brand_products[old_brand]:
+                                        brand_products[old_brand].remove(barcode)
+                                    
+                                    # Add to new brand
+                                    if brand:
+                                        if brand not in brand_products:
+                                            brand_products[brand] = []
+                                        if barcode not in brand_products[brand]:
+                                            brand_products[brand].append(barcode)
+                                    
+                                    brands_data['brand_products'] = brand_products
+                                    save_data(brands_data, BRANDS_FILE)
+                                
+                                save_data(products, PRODUCTS_FILE)
+                                save_data(inventory, INVENTORY_FILE)
+                                st.success("Product updated successfully")
+                                
+                                
+    with tab3:
+        st.header("Delete Product")
+        
+        products = load_data(PRODUCTS_FILE)
+        inventory = load_data(INVENTORY_FILE)
+        
+        if not products:
+            st.info("No products available to delete")
+        else:
+            # Filter options
+            col1, col2 = st.columns(2)
+            with col1:
+                search_term = st.text_input("Search products to delete", key="delete_search")
+            with col2:
+                category_filter = st.selectbox("Filter by category", 
+                                             [""] + load_categories_data().get('categories', []),
+                                             key="delete_category")
+            
+            # Apply filters
+            filtered_products = products.copy()
+            if search_term:
+                filtered_products = {k: v for k, v in filtered_products.items() 
+                                   if search_term.lower() in v['name'].lower() or 
+                                   search_term.lower() in k.lower()}
+            
+            if category_filter:
+                filtered_products = {k: v for k, v in filtered_products.items() 
+                                   if v.get('category') == category_filter}
+            
+            if not filtered_products:
+                st.info("No products match the filters")
+            else:
+                product_options = {f"{v['name']} ({k})": k for k, v in filtered_products.items()}
+                selected_product = st.selectbox("Select Product to Delete", [""] + list(product_options.keys()),
+                                              key="delete_select")
+                
+                if selected_product:
+                    barcode = product_options[selected_product]
+                    product = products[barcode]
+                    
+                    st.warning(f"⚠️ You are about to delete: {product['name']} ({barcode})")
+                    
+                    # Show product details
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**Price:** {format_currency(product['price'])}")
+                        st.write(f"**Category:** {product.get('category', 'N/A')}")
+                        st.write(f"**Brand:** {product.get('brand', 'N/A')}")
+                    
+                    with col2:
+                        stock = inventory.get(barcode, {}).get('quantity', 0)
+                        st.write(f"**Current Stock:** {stock}")
+                        st.write(f"**Status:** {'Active' if product.get('active', True) else 'Inactive'}")
+                    
+                    # Check if product has sales history
+                    transactions = load_data(TRANSACTIONS_FILE)
+                    has_sales = any(barcode in t.get('items', {}) for t in transactions.values())
+                    
+                    if has_sales:
+                        st.error("⚠️ This product has sales history. Deleting it may affect reports.")
+                        deletion_option = st.radio("Deletion Option", 
+                                                  ["Deactivate only (recommended)", "Permanent deletion"],
+                                                  key="delete_option")
+                    else:
+                        deletion_option = "Permanent deletion"
+                    
+                    confirmation = st.text_input("Type 'DELETE' to confirm", key="delete_confirm")
+                    
+                    if st.button("Confirm Delete", disabled=confirmation != "DELETE", key="confirm_delete_btn"):
+                        if deletion_option == "Deactivate only (recommended)":
+                            # Deactivate instead of deleting
+                            products[barcode]['active'] = False
+                            products[barcode]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            products[barcode]['updated_by'] = st.session_state.user_info['username']
+                            save_data(products, PRODUCTS_FILE)
+                            st.success("Product deactivated successfully")
+                        else:
+                            # Permanent deletion
+                            # Remove product image if exists
+                            if 'image' in product and os.path.exists(product['image']):
+                                try:
+                                    os.remove(product['image'])
+                                except:
+                                    pass
+                            
+                            # Remove from products and inventory
+                            del products[barcode]
+                            if barcode in inventory:
+                                record_stock_events([stock_event(barcode, 'adjustment', -inventory[barcode].get('quantity', 0),
+                                                                 "Product Deleted")],
+                                                    st.session_state.user_info['username'])
+                                del inventory[barcode]
+                            
+                            # Remove from brand mapping
+                            brand = product.get('brand')
+                            if brand:
+                                brands_data = load_data(BRANDS_FILE)
+                                brand_products = brands_data.get('brand_products', {})
+                                if brand in brand_products and barcode in brand_products[brand]:
+                                    brand_products[brand].remove(barcode)
+                                brands_data['brand_products'] = brand_products
+                                save_data(brands_data, BRANDS_FILE)
+                            
+                            save_data(products, PRODUCTS_FILE)
+                            save_data(inventory, INVENTORY_FILE)
+                            st.success("Product permanently deleted")
+
+    with tab4:
+        st.header("Bulk Import Products")
+        
+        st.info("Import multiple products at once using a CSV file")
+        
+        # Template management section
+        st.subheader("Download Template")
+        
+        # Create proper template with example data
+        template_data = {
+            "barcode": ["AUTO_GENERATE", "1234567890123", "AUTO_GENERATE"],
+            "name": ["Apple iPhone 14", "Samsung Galaxy S23", "Google Pixel 7"],
+            "description": ["Latest iPhone model", "Flagship Samsung phone", "Google's premium smartphone"],
+            "price": [999.99, 899.99, 699.99],
+            "cost": [750.00, 650.00, 500.00],
+            "category": ["Electronics", "Electronics", "Electronics"],
+            "subcategory": ["Smartphones", "Smartphones", "Smartphones"],
+            "brand": ["Apple", "Samsung", "Google"],
+            "supplier": ["Tech Supplier Inc", "Mobile Distributors", "Gadget World"],
+            "initial_stock": [50, 75, 60],
+            "reorder_point": [10, 15, 12],
+            "active": [True, True, True]
+        }
+        template_df = pd.DataFrame(template_data)
+        
+        st.download_button(
+            label="Download Import Template",
+            data=template_df.to_csv(index=False).encode('utf-8'),
+            file_name="product_import_template.csv",
+            mime="text/csv",
+            help="Download the template with proper format and example data"
+        )
+        
+        # Upload section
+        st.subheader("Upload CSV File")
+        
+        uploaded_file = st.file_uploader("Choose a CSV file", type=['csv'], 
+                                       help="Upload your product data CSV file")
+        
+        if uploaded_file:
+            try:
+                # Read and preview the CSV
+                df = pd.read_csv(uploaded_file)
+                st.success("CSV file loaded successfully")
+                
+                # Show preview
+                st.write("**Data Preview:**")
+                st.dataframe(df.head())
+                
+                # Validation options
+                st.subheader("Import Options")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    import_mode = st.radio("Import Mode", 
+                                          ["Add new products only", "Update existing products", "Add or update"],
+                                          key="import_mode")
+                    on_error = st.radio("On Error", 
+                                       ["Skip row and continue", "Stop import"],
+                                       key="on_error")
+                
+                with col2:
+                    generate_barcodes = st.checkbox("Generate missing barcodes", value=True,
+                                                  help="Automatically generate barcodes for rows with empty or AUTO_GENERATE values",
+                                                  key="generate_barcodes")
+                    validate_data = st.checkbox("Validate data before import", value=True,
+                                              help="Check for data issues before importing",
+                                              key="validate_data")
+                
+                if st.button("Validate Data" if validate_data else "Import Products", key="import_btn"):
+                    products = load_data(PRODUCTS_FILE)
+                    inventory = load_data(INVENTORY_FILE)
+                    categories_data = load_categories_data()
+                    brands_data = load_data(BRANDS_FILE)
+                    suppliers = load_data(SUPPLIERS_FILE)
+                    stock_events = []
+                    
+                    results = {
+                        'processed': 0,
+                        'added': 0,
+                        'updated': 0,
+                        'skipped': 0,
+                        'errors': []
+                    }
+                    
+                    # Get all existing barcodes for quick lookup
+                    existing_barcodes = set(products.keys())
+                    
+                    for index, row in df.iterrows():
+                        try:
+                            # Skip empty rows
+                            if pd.isna(row.get('name')) or not str(row.get('name')).strip():
+                                results['skipped'] += 1
+                                results['errors'].append(f"Row {index+2}: Missing product name")
+                                continue
+                            
+                            # Handle barcode
+                            barcode = str(row.get('barcode', '')).strip()
+                            if not barcode or barcode == 'AUTO_GENERATE':
+                                if generate_barcodes:
+                                    barcode = generate_barcode()
+                                else:
+                                    results['skipped'] += 1
+                                    results['errors'].append(f"Row {index+2}: Missing barcode and generation disabled")
+                                    continue
+                            
+                            # Validate barcode format
+                            if barcode and not barcode.isdigit():
+                                results['skipped'] += 1
+                                results['errors'].append(f"Row {index+2}: Invalid barcode format '{barcode}' - must be digits only")
+                                continue
+                            
+                            if barcode and len(barcode) not in [12, 13]:
+                                results['skipped'] += 1
+                                results['errors'].append(f"Row {index+2}: Invalid barcode length '{barcode}' - must be 12 or 13 digits")
+                                continue
+                            
+                            # Check if product exists
+                            product_exists = barcode in existing_barcodes
+                            
+                            # Determine if we should process based on import mode
+                            if import_mode == "Add new products only" and product_exists:
+                                results['skipped'] += 1
+                                continue
+                            if import_mode == "Update existing products" and not product_exists:
+                                results['skipped'] += 1
+                                continue
+                            
+                            # Prepare product data with proper validation
+                            product_data = {
+                                'barcode': barcode,
+                                'name': str(row.get('name', '')).strip(),
+                                'description': str(row.get('description', '')).strip() if pd.notna(row.get('description')) else '',
+                                'price': float(row.get('price', 0)) if pd.notna(row.get('price')) else 0.0,
+                                'cost': float(row.get('cost', 0)) if pd.notna(row.get('cost')) else 0.0,
+                                'category': str(row.get('category', '')).strip() if pd.notna(row.get('category')) else '',
+                                'subcategory': str(row.get('subcategory', '')).strip() if pd.notna(row.get('subcategory')) else '',
+                                'brand': str(row.get('brand', '')).strip() if pd.notna(row.get('brand')) else '',
+                                'supplier': str(row.get('supplier', '')).strip() if pd.notna(row.get('supplier')) else None,
+                                'active': bool(row.get('active', True)) if pd.notna(row.get('active')) else True,
+                                'last_updated': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            }
+                            
+                            # Validate required fields
+                            if not product_data['name']:
+                                results['skipped'] += 1
+                                results['errors'].append(f"Row {index+2}: Product name is required")
+                                continue
+                            
+                            if product_data['price'] <= 0:
+                                results['skipped'] += 1
+                                results['errors'].append(f"Row {index+2}: Price must be greater than 0")
+                                continue
+                            
+                            if product_data['cost'] <= 0:
+                                results['skipped'] += 1
+                                results['errors'].append(f"Row {index+2}: Cost must be greater than 0")
+                                continue
+                            
+                            # Set added_by/updated_by based on whether it's new or existing
+                            if product_exists:
+                                product_data['updated_by'] = st.session_state.user_info['username']
+                                # Preserve original date added
+                                product_data['date_added'] = products[barcode].get('date_added')
+                            else:
+                                product_data['date_added'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                                product_data['added_by'] = st.session_state.user_info['username']
+                            
+                            # Validate category and subcategory
+                            category = product_data['category']
+                            if category and category not in categories_data.get('categories', []):
+                                # Add new category if it doesn't exist
+                                if category not in categories_data.get('categories', []):
+                                    categories_data['categories'].append(category)
+                                    categories_data['subcategories'][category] = []
+                            
+                            # Validate brand
+                            brand = product_data['brand']
+                            if brand and brand not in brands_data.get('brands', []):
+                                # Add new brand if it doesn't exist
+                                brands_data['brands'].append(brand)
+                            
+                            # Save product
+                            products[barcode] = product_data
+                            
+                            # Handle inventory
+                            initial_stock = int(row.get('initial_stock', 0)) if pd.notna(row.get('initial_stock')) else 0
+                            reorder_point = int(row.get('reorder_point', 10)) if pd.notna(row.get('reorder_point')) else 10
+                            
+                            if barcode in inventory:
+                                inventory[barcode]['reorder_point'] = reorder_point
+                                inventory[barcode]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            else:
+                                inventory[barcode] = {
+                                    'quantity': initial_stock,
+                                    'reorder_point': reorder_point,
+                                    'last_updated': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                                }
+                                stock_events.append(stock_event(barcode, 'adjustment', initial_stock, "Initial Stock"))
+                            
+                            # Update brand mapping
+                            if brand:
+                                brand_products = brands_data.get('brand_products', {})
+                                if brand not in brand_products:
+                                    brand_products[brand] = []
+                                if barcode not in brand_products[brand]:
+                                    brand_products[brand].append(barcode)
+                                brands_data['brand_products'] = brand_products
+                            
+                            results['processed'] += 1
+                            if product_exists:
+                                results['updated'] += 1
+                            else:
+                                results['added'] += 1
+                            
+                        except Exception as e:
+                            results['skipped'] += 1
+                            results['errors'].append(f"Row {index+2}: Error - {str(e)}")
+                            if on_error == "Stop import":
+                                break
+                    
+                    # Save all data
+                    record_stock_events(stock_events, st.session_state.user_info['username'])
+                    save_data(products, PRODUCTS_FILE)
+                    save_data(inventory, INVENTORY_FILE)
+                    save_data(categories_data, CATEGORIES_FILE)
+                    save_data(brands_data, BRANDS_FILE)
+                    
+                    # Show results
+                    st.success(f"Import completed: {results['processed']} processed, "
+                             f"{results['added']} added, {results['updated']} updated, "
+                             f"{results['skipped']} skipped")
+                    
+                    if results['errors']:
+                        st.warning(f"Encountered {len(results['errors'])} errors:")
+                        for error in results['errors']:
+                            st.write(f"- {error}")
+                
+            except Exception as e:
+                st.error(f"Error reading CSV file: {str(e)}")
+
+    with tab5:
+        st.header("Template Management")
+        
+        st.info("Manage and create custom import templates")
+        
+        # Template gallery
+        st.subheader("Available Templates")
+        
+        # Predefined templates
+        templates = {
+            "Basic Products": ["barcode", "name", "price", "cost", "category"],
+            "Full Products": ["barcode", "name", "description", "price", "cost", "category", "subcategory", "brand", "initial_stock", "reorder_point", "active"],
+            "Products with Suppliers": ["barcode", "name", "price", "cost", "category", "supplier", "initial_stock"],
+            "Inventory Update": ["barcode", "initial_stock", "reorder_point"]
+        }
+        
+        selected_template = st.selectbox("Select Template Type", list(templates.keys()), key="template_select")
+        
+        if selected_template:
+            st.write("**Template Fields:**")
+            for field in templates[selected_template]:
+                st.write(f"- {field}")
+            
+            # Customize template
+            st.subheader("Customize Template")
+            
+            # Add/remove fields
+            all_fields = ["barcode", "name", "description", "price", "cost", "category", 
+                         "subcategory", "brand", "supplier", "initial_stock", 
+                         "reorder_point", "active"]
+            
+            selected_fields = st.multiselect("Select Fields for Custom Template", 
+                                           all_fields, 
+                                           default=templates[selected_template],
+                                           key="custom_fields")
+            
+            # Generate sample data
+            if selected_fields:
+                sample_data = {}
+                for field in selected_fields:
+                    if field == "barcode":
+                        sample_data[field] = ["AUTO_GENERATE", "1234567890123"]
+                    elif field == "name":
+                        sample_data[field] = ["Product 1", "Product 2"]
+                    elif field in ["price", "cost"]:
+                        sample_data[field] = [10.99, 5.50]
+                    elif field == "category":
+                        sample_data[field] = ["Groceries", "Electronics"]
+                    elif field == "subcategory":
+                        sample_data[field] = ["Snacks", "Accessories"]
+                    elif field == "brand":
+                        sample_data[field] = ["Brand A", "Brand B"]
+                    elif field == "supplier":
+                        sample_data[field] = ["Supplier X", "Supplier Y"]
+                    elif field in ["initial_stock", "reorder_point"]:
+                        sample_data[field] = [100, 50]
+                    elif field == "active":
+                        sample_data[field] = [True, True]
+                    elif field == "description":
+                        sample_data[field] = ["Product description", "Another description"]
+                
+                template_df = pd.DataFrame(sample_data)
+                
+                # Download custom template
+                template_name = st.text_input("Template Name", value=f"Custom_{selected_template}", key="template_name")
+                
+                st.download_button(
+                    label="Download Custom Template",
+                    data=template_df.to_csv(index=False).encode('utf-8'),
+                    file_name=f"{template_name}_template.csv",
+                    mime="text/csv",
+                    key="download_custom"
+                )
+        
+        # Template history
+        st.subheader("Template History")
+        st.info("Template history feature would be implemented here to track previously used templates")
+
+    with tab6:
+        st.header("Category Management")
+        
+        categories_data = load_categories_data()
+        categories = categories_data.get('categories', [])
+        subcategories = categories_data.get('subcategories', {})
+        
+        st.subheader("Current Categories")
+        if not categories:
+            st.info("No categories defined yet")
+        else:
+            # Display categories with their subcategories
+            for category in categories:
+                with st.expander(f"Category: {category}"):
+                    cat_subcategories = subcategories.get(category, [])
+                    if cat_subcategories:
+                        st.write("**Subcategories:**")
+                        for subcat in cat_subcategories:
+                            col1, col2 = st.columns([4, 1])
+                            with col1:
+                                st.write(f"- {subcat}")
+                            with col2:
+                                if st.button("Remove", key=f"remove_sub_{category}_{subcat}"):
+                                    categories_data['subcategories'][category].remove(subcat)
+                                    save_data(categories_data, CATEGORIES_FILE)
+                                    st.success(f"Removed subcategory '{subcat}' from '{category}'")
+                                    st.rerun()
+                    else:
+                        st.info("No subcategories for this category")
+                    
+                    # Add new subcategory to this category
+                    new_subcat = st.text_input("Add new subcategory", key=f"new_sub_{category}")
+                    if st.button("Add Subcategory", key=f"add_sub_{category}"):
+                        if new_subcat:
+                            add_subcategory(category, new_subcat)
+                            st.success(f"Added subcategory '{new_subcat}' to '{category}'")
+                            st.rerun()
+            
+            # Category management
+            st.subheader("Manage Categories")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Add new category
+                new_category = st.text_input("New Category Name", key="new_cat_name")
+                if st.button("Add Category", key="add_cat_btn"):
+                    if new_category and new_category not in categories:
+                        categories_data['categories'].append(new_category)
+                        categories_data['subcategories'][new_category] = []
+                        save_data(categories_data, CATEGORIES_FILE)
+                        st.success(f"Category '{new_category}' added")
+                        st.rerun()
+                    elif new_category in categories:
+                        st.error("Category already exists")
+            
+            with col2:
+                # Remove category
+                if categories:
+                    category_to_remove = st.selectbox("Select Category to Remove", [""] + categories, key="remove_cat_select")
+                    if category_to_remove and st.button("Remove Category", key="remove_cat_btn"):
+                        # Check if category has products
+                        products = load_data(PRODUCTS_FILE)
+                        has_products = any(p.get('category') == category_to_remove for p in products.values())
+                        
+                        if has_products:
+                            st.error(f"Cannot remove category '{category_to_remove}' because it has products assigned")
+                        else:
+                            categories_data['categories'].remove(category_to_remove)
+                            if category_to_remove in categories_data['subcategories']:
+                                del categories_data['subcategories'][category_to_remove]
+                            save_data(categories_data, CATEGORIES_FILE)
+                            st.success(f"Category '{category_to_remove}' removed")
+                            st.rerun()
+        
+        # Bulk category import
+        st.subheader("Bulk Category Import")
+        
+        # Template for category import
+        category_template_data = {
+            "category": ["Groceries", "Electronics", "Clothing"],
+            "subcategories": ["Dairy|Fruits|Vegetables", "Phones|Laptops|Accessories", "Men|Women|Kids"]
+        }
+        category_template_df = pd.DataFrame(category_template_data)
+        
+        st.download_button(
+            label="Download Category Template",
+            data=category_template_df.to_csv(index=False).encode('utf-8'),
+            file_name="category_import_template.csv",
+            mime="text/csv",
+            key="download_cat_template"
+        )
+        
+        uploaded_category_file = st.file_uploader("Upload Category CSV", type=['csv'], key="cat_upload")
+        
+        if uploaded_category_file:
+            try:
+                cat_df = pd.read_csv(uploaded_category_file)
+                st.dataframe(cat_df)
+                
+                if st.button("Import Categories", key="import_cat_btn"):
+                    for _, row in cat_df.iterrows():
+                        category = str(row['category']).strip()
+                        subcats = str(row['subcategories']).split('|') if pd.notna(row['subcategories']) else []
+                        
+                        if category and category not in categories_data['categories']:
+                            categories_data['categories'].append(category)
+                        
+                        if category and subcats:
+                            if category not in categories_data['subcategories']:
+                                categories_data['subcategories'][category] = []
+                            
+                            for subcat in subcats:
+                                subcat = subcat.strip()
+                                if subcat and subcat not in categories_data['subcategories'][category]:
+                                    categories_data['subcategories'][category].append(subcat)
+                    
+                    save_data(categories_data, CATEGORIES_FILE)
+                    st.success("Categories imported successfully")
+                    st.rerun()
+                    
+            except Exception as e:
+                st.error(f"Error reading category file: {str(e)}")
@@ -0,0 +1,338 @@
+"""Profit and loss statement."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+import zipfile
+import io
+
+from rocket_pos.core import (
+    SETTINGS_FILE,
+    format_currency,
+    is_admin,
+    is_manager,
+    load_data,
+    save_data,
+)
+from rocket_pos.costing import COST_METHODS, cost_method, cogs_summary, rebuild_cogs_aggregates
+
+# Profit And Loss 
+# Add a new function for P&L reports
+def profit_loss_statement():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("💰 Profit & Loss Statement")
+    
+    # Date range selection
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime.date.today().replace(day=1))
+    with col2:
+        end_date = st.date_input("End Date", value=datetime.date.today())
+    with col3:
+        st.write("")  # Spacer
+        if st.button("🔄 Generate Report"):
+            st.rerun()
+    
+    # Revenue and COGS (at the cost each line was sold at) from the daily aggregates
+    summary = cogs_summary(start_date, end_date)
+    total_revenue = summary['revenue']
+    total_cogs = summary['cogs']  # Cost of Goods Sold
+    returns_impact = summary['returns_revenue']
+    returns_cogs = summary['returns_cogs']
+    product_profitability = summary['products']
+    category_profitability = summary['categories']
+    
+    # Calculate gross profit
+    gross_profit = total_revenue - total_cogs - returns_impact + returns_cogs
+    
+    # Display summary metrics
+    st.subheader("📊 Financial Summary")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Revenue", format_currency(total_revenue))
+    with col2:
+        st.metric("Cost of Goods Sold", format_currency(total_cogs))
+    with col3:
+        st.metric("Returns Impact", format_currency(-returns_impact))
+    with col4:
+        st.metric("Gross Profit", format_currency(gross_profit), 
+                 delta=f"{((gross_profit / total_revenue) * 100):.1f}%" if total_revenue > 0 else "0%")
+    
+    # Gross profit margin
+    gross_margin = (gross_profit / total_revenue * 100) if total_revenue > 0 else 0
+    st.info(f"**Gross Profit Margin:** {gross_margin:.2f}%")
+    
+    if is_admin():
+        with st.expander("⚙️ Costing Method"):
+            methods = list(COST_METHODS.keys())
+            labels = list(COST_METHODS.values())
+            method_label = st.selectbox("Inventory Costing", labels, index=methods.index(cost_method()))
+            method = methods[labels.index(method_label)]
+            st.caption("Applies to stock received and sold from now on; past sales keep the cost they were sold at.")
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Save Costing Method"):
+                    settings = load_data(SETTINGS_FILE)
+                    settings['cost_method'] = method
+                    save_data(settings, SETTINGS_FILE)
+                    st.success("Costing method saved")
+            with col2:
+                if st.button("Rebuild P&L Aggregates"):
+                    try:
+                        rebuild_cogs_aggregates()
+                        st.success("Aggregates rebuilt from transaction history")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error rebuilding aggregates: {str(e)}")
+    
+    # Tabs for detailed views
+    tab1, tab2, tab3, tab4 = st.tabs(["By Category", "By Product", "Trend Analysis", "Export Report"])
+    
+    with tab1:
+        st.subheader("Profitability by Category")
+        
+        if category_profitability:
+            # Prepare category data
+            category_data = []
+            for category, data in category_profitability.items():
+                profit = data['revenue'] - data['cogs']
+                margin = (profit / data['revenue'] * 100) if data['revenue'] > 0 else 0
+                category_data.append({
+                    'Category': category,
+                    'Revenue': data['revenue'],
+                    'COGS': data['cogs'],
+                    'Profit': profit,
+                    'Margin %': margin,
+                    'Quantity': data['quantity']
+                })
+            
+            category_df = pd.DataFrame(category_data)
+            
+            # Sort by profit
+            category_df = category_df.sort_values('Profit', ascending=False)
+            
+            # Display table
+            st.dataframe(
+                category_df.style.format({
+                    'Revenue': lambda x: format_currency(x),
+                    'COGS': lambda x: format_currency(x),
+                    'Profit': lambda x: format_currency(x),
+                    'Margin %': lambda x: f"{x:.1f}%"
+                }),
+                use_container_width=True
+            )
+            
+        else:
+            st.info("No category data available for the selected period")
+    
+    with tab2:
+        st.subheader("Profitability by Product")
+        
+        if product_profitability:
+            # Prepare product data
+            product_data = []
+            for barcode, data in product_profitability.items():
+                profit = data['revenue'] - data['cogs']
+                margin = (profit / data['revenue'] * 100) if data['revenue'] > 0 else 0
+                product_data.append({
+                    'Product': data['name'],
+                    'Barcode': barcode,
+                    'Revenue': data['revenue'],
+                    'COGS': data['cogs'],
+                    'Profit': profit,
+                    'Margin %': margin,
+                    'Quantity': data['quantity'],
+                    'Avg Price': data['revenue'] / data['quantity'] if data['quantity'] > 0 else 0
+                })
+            
+            product_df = pd.DataFrame(product_data)
+            
+            # Sort options
+            sort_by = st.selectbox("Sort By", 
+                                 ['Profit', 'Revenue', 'Margin %', 'Quantity'], 
+                                 key='product_sort')
+            
+            ascending = st.checkbox("Ascending Order", key='product_ascending')
+            
+            product_df = product_df.sort_values(sort_by, ascending=ascending)
+            
+            # Search filter
+            search_term = st.text_input("Search Products", key='product_search')
+            if search_term:
+                product_df = product_df[product_df['Product'].str.contains(search_term, case=False)]
+            
+            # Display table
+            st.dataframe(
+                product_df.style.format({
+                    'Revenue': lambda x: format_currency(x),
+                    'COGS': lambda x: format_currency(x),
+                    'Profit': lambda x: format_currency(x),
+                    'Margin %': lambda x: f"{x:.1f}%",
+                    'Avg Price': lambda x: format_currency(x)
+                }),
+                use_container_width=True,
+                height=400
+            )
+            
+            # Show top and bottom performers
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("🏆 Top 5 Performers")
+                top_5 = product_df.nlargest(5, 'Profit')
+                for _, row in top_5.iterrows():
+                    st.write(f"**{row['Product']}** - {format_currency(row['Profit'])} "
+                           f"({row['Margin %']:.1f}% margin)")
+            
+            with col2:
+                st.subheader("⚠️ Bottom 5 Performers")
+                bottom_5 = product_df.nsmallest(5, 'Profit')
+                for _, row in bottom_5.iterrows():
+                    st.write(f"**{row['Product']}** - {format_currency(row['Profit'])} "
+                           f"({row['Margin %']:.1f}% margin)")
+        else:
+            st.info("No product data available for the selected period")
+    
+    with tab3:
+        st.subheader("Profit Trend Analysis")
+        
+        daily_data = summary['daily']
+        
+        # Prepare trend data
+        dates = sorted(daily_data.keys())
+        revenue_trend = [daily_data[date]['revenue'] for date in dates]
+        profit_trend = [daily_data[date]['profit'] for date in dates]
+        
+        
+        # Show statistics
+        st.subheader("Trend Statistics")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            avg_daily_profit = sum(profit_trend) / len(profit_trend) if profit_trend else 0
+            st.metric("Average Daily Profit", format_currency(avg_daily_profit))
+        
+        with col2:
+            best_day = max(profit_trend) if profit_trend else 0
+            st.metric("Best Day Profit", format_currency(best_day))
+        
+        with col3:
+            worst_day = min(profit_trend) if profit_trend else 0
+            st.metric("Worst Day Profit", format_currency(worst_day))
+    
+    with tab4:
+        st.subheader("Export Profit & Loss Report")
+        
+        # Prepare comprehensive report data
+        report_data = {
+            'Period': f"{start_date} to {end_date}",
+            'Total Revenue': total_revenue,
+            'Cost of Goods Sold': total_cogs,
+            'Returns Impact': -returns_impact,
+            'Gross Profit': gross_profit,
+            'Gross Margin %': gross_margin,
+            'Report Generated': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'Generated By': st.session_state.user_info['username']
+        }
+        
+        # Create detailed DataFrames for export
+        category_export_df = pd.DataFrame([
+            {
+                'Category': cat,
+                'Revenue': data['revenue'],
+                'COGS': data['cogs'],
+                'Profit': data['revenue'] - data['cogs'],
+                'Margin %': ((data['revenue'] - data['cogs']) / data['revenue'] * 100) if data['revenue'] > 0 else 0,
+                'Quantity': data['quantity']
+            }
+            for cat, data in category_profitability.items()
+        ])
+        
+        product_export_df = pd.DataFrame([
+            {
+                'Product': data['name'],
+                'Barcode': barcode,
+                'Revenue': data['revenue'],
+                'COGS': data['cogs'],
+                'Profit': data['revenue'] - data['cogs'],
+                'Margin %': ((data['revenue'] - data['cogs']) / data['revenue'] * 100) if data['revenue'] > 0 else 0,
+                'Quantity': data['quantity']
+            }
+            for barcode, data in product_profitability.items()
+        ])
+        
+        # Export options
+        export_format = st.radio("Export Format", ["Excel", "CSV"], horizontal=True)
+        
+        if st.button("📊 Generate Export", type="primary"):
+            try:
+                if export_format == "Excel":
+                    # Create Excel file with multiple sheets
+                    excel_buffer = io.BytesIO()
+                    with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
+                        # Summary sheet
+                        summary_df = pd.DataFrame(list(report_data.items()), columns=['Metric', 'Value'])
+                        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                        
+                        # Category sheet
+                        category_export_df.to_excel(writer, sheet_name='By Category', index=False)
+                        
+                        # Product sheet
+                        product_export_df.to_excel(writer, sheet_name='By Product', index=False)
+                        
+                        # Formatting
+                        workbook = writer.book
+                        
+                        # Currency format
+                        currency_format = workbook.add_format({'num_format': '$#,##0.00'})
+                        percent_format = workbook.add_format({'num_format': '0.00%'})
+                        
+                        # Apply formats
+                        for sheet_name in writer.sheets:
+                            worksheet = writer.sheets[sheet_name]
+                            
+                            if sheet_name == 'Summary':
+                                worksheet.set_column('A:A', 20)
+                                worksheet.set_column('B:B', 15, currency_format)
+                            else:
+                                worksheet.set_column('A:A', 30)
+                                worksheet.set_column('B:B', 15)
+                                worksheet.set_column('C:E', 15, currency_format)
+                                worksheet.set_column('F:F', 10, percent_format)
+                                worksheet.set_column('G:G', 10)
+                    
+                    st.download_button(
+                        label="📥 Download Excel Report",
+                        data=excel_buffer.getvalue(),
+                        file_name=f"profit_loss_report_{start_date}_{end_date}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                
+                else:  # CSV format
+                    # Create ZIP with multiple CSV files
+                    zip_buffer = io.BytesIO()
+                    with zipfile.ZipFile(zip_buffer, 'w') as zip_file:
+                        # Summary CSV
+                        summary_df = pd.DataFrame(list(report_data.items()), columns=['Metric', 'Value'])
+                        zip_file.writestr('summary.csv', summary_df.to_csv(index=False))
+                        
+                        # Category CSV
+                        zip_file.writestr('by_category.csv', category_export_df.to_csv(index=False))
+                        
+                        # Product CSV
+                        zip_file.writestr('by_product.csv', product_export_df.to_csv(index=False))
+                    
+                    st.download_button(
+                        label="📥 Download CSV Report (ZIP)",
+                        data=zip_buffer.getvalue(),
+                        file_name=f"profit_loss_report_{start_date}_{end_date}.zip",
+                        mime="application/zip"
+                    )
+                
+                st.success("Report generated successfully!")
+                
+            except Exception as e:
+                st.error(f"Error generating report: {str(e)}")
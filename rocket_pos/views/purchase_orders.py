@@ -0,0 +1,355 @@
+"""Purchase orders page."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    SUPPLIERS_FILE,
+    PURCHASE_ORDERS_FILE,
+    format_currency,
+    is_manager,
+    load_data,
+)
+from rocket_pos.hardware import print_receipt
+from rocket_pos.product_search import product_picker
+from rocket_pos.purchasing import (
+    approve_draft_po,
+    discard_draft_po,
+    generate_draft_purchase_orders,
+    generate_po_report,
+    generate_purchase_order,
+    process_received_po,
+)
+from rocket_pos.replenishment import replenishment_plan
+
+def purchase_orders_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Purchase Orders Management")
+    
+    tab1, tab2, tab3 = st.tabs(["Create PO", "View POs", "Receive PO"])
+    
+    with tab1:
+        st.header("Create Purchase Order")
+        
+        suppliers = load_data(SUPPLIERS_FILE)
+        products = load_data(PRODUCTS_FILE)
+        
+        if not suppliers:
+            st.warning("No suppliers available. Please add suppliers first.")
+            return
+        
+        if not products:
+            st.warning("No products available. Please add products first.")
+            return
+        
+        if 'po_items' not in st.session_state:
+            st.session_state.po_items = []
+        
+        # Reorder suggestions from sales velocity, lead time and MOQ (cached per data version)
+        st.subheader("Reorder Suggestions")
+        cover_days = st.number_input("Days of stock to order beyond supplier lead time",
+                                     min_value=1, max_value=180, value=14, step=1)
+        plan = replenishment_plan(cover_days)
+        suggestions = plan[plan['reorder']]
+        
+        if not suggestions.empty:
+            st.info(f"{len(suggestions)} items need reordering:")
+            st.dataframe(suggestions[['name', 'supplier_name', 'current_stock', 'on_order', 'reorder_point',
+                                      'velocity', 'trend', 'days_of_cover', 'lead_time_days', 'quantity', 'cost']]
+                         .rename(columns={'supplier_name': 'supplier', 'velocity': 'units/day',
+                                          'lead_time_days': 'lead_time', 'quantity': 'suggested_qty'}))
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Add All Suggested Items to PO"):
+                    for barcode, item in suggestions.iterrows():
+                        if not any(i['barcode'] == barcode for i in st.session_state.po_items):
+                            st.session_state.po_items.append({
+                                'barcode': barcode,
+                                'name': item['name'],
+                                'quantity': int(item['quantity']),
+                                'cost': item['cost']
+                            })
+                    st.rerun()
+            with col2:
+                if st.button("Generate Draft POs by Supplier"):
+                    po_ids, unassigned = generate_draft_purchase_orders(plan)
+                    if po_ids:
+                        st.success(f"Created {len(po_ids)} draft purchase order(s): {', '.join(po_ids)}. "
+                                   "Review and approve them under View POs.")
+                    else:
+                        st.warning("No draft purchase orders created")
+                    if unassigned:
+                        st.warning(f"{unassigned} suggested item(s) have no matching supplier and were left out")
+        else:
+            st.success("No items need reordering")
+        
+        # Items are picked outside the form so the product search updates as you type
+        barcode = product_picker("Select Product", key="po_product")
+        quantity = st.number_input("Quantity", min_value=1, value=1, step=1, key="po_item_quantity")
+        
+        if st.button("Add Item to PO", key="po_add_item") and barcode:
+            if not any(i['barcode'] == barcode for i in st.session_state.po_items):
+                st.session_state.po_items.append({
+                    'barcode': barcode,
+                    'name': products[barcode]['name'],
+                    'quantity': quantity,
+                    'cost': products[barcode].get('cost', 0)
+                })
+                st.session_state.pop('po_product', None)
+                st.rerun()
+            else:
+                st.warning("Item already in PO. Adjust quantity in PO items below.")
+        
+        with st.form("po_form"):
+            supplier_options = {f"{v['name']} ({k})": k for k, v in suppliers.items()}
+            selected_supplier = st.selectbox("Select Supplier", [""] + list(supplier_options.keys()))
+            
+            po_notes = st.text_area("Notes")
+            
+            create_po = st.form_submit_button("Create Purchase Order")
+            
+            if create_po:
+                if not selected_supplier:
+                    st.error("Please select a supplier")
+                elif not st.session_state.po_items:
+                    st.error("Please add items to the purchase order")
+                else:
+                    supplier_id = supplier_options[selected_supplier]
+                    po_id = generate_purchase_order(supplier_id, st.session_state.po_items)
+                    
+                    if po_id:
+                        st.session_state.last_po_id = po_id
+                        po_report = generate_po_report(po_id)
+                        st.success("Purchase order created successfully!")
+                        st.subheader("Purchase Order")
+                        st.text(po_report)
+                        
+                        st.session_state.po_items = []
+                        
+                    else:
+                        st.error("Failed to create purchase order")
+        
+        st.subheader("Current PO Items")
+        if not st.session_state.po_items:
+            st.info("No items in PO")
+        else:
+            items_copy = st.session_state.po_items.copy()
+            items_to_remove = []
+            
+            for idx, item in enumerate(st.session_state.po_items):
+                with st.container():
+                    col1, col2, col3, col4 = st.columns([4, 2, 2, 1])
+                    with col1:
+                        st.write(f"**{item['name']}**")
+                    with col2:
+                        new_qty = st.number_input(
+                            "Qty", 
+                            min_value=1, 
+                            value=item['quantity'], 
+                            key=f"po_qty_{idx}"
+                        )
+                        if new_qty != item['quantity']:
+                            items_copy[idx]['quantity'] = new_qty
+                    with col3:
+                        st.write(f"Cost: {format_currency(item['cost'])}")
+                        st.write(f"Total: {format_currency(item['cost'] * item['quantity'])}")
+                    with col4:
+                        if st.button("❌", key=f"remove_po_{idx}"):
+                            items_to_remove.append(idx)
+            
+            if items_copy != st.session_state.po_items:
+                st.session_state.po_items = items_copy
+                st.rerun()
+            
+            if items_to_remove:
+                for idx in sorted(items_to_remove, reverse=True):
+                    st.session_state.po_items.pop(idx)
+                st.rerun()
+        
+        if st.button("Print Last Purchase Order"):
+            if 'last_po_id' in st.session_state:
+                po_report = generate_po_report(st.session_state.last_po_id)
+                if print_receipt(po_report):
+                    st.success("Purchase order printed successfully")
+                else:
+                    st.error("Failed to print purchase order")
+            else:
+                st.warning("No purchase order created yet")
+
+    with tab2:
+        st.header("View Purchase Orders")
+        
+        purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+        suppliers = load_data(SUPPLIERS_FILE)
+        
+        if not purchase_orders:
+            st.info("No purchase orders available")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                status_filter = st.selectbox("Filter by Status", ["All", "draft", "pending", "partially_received", "received"])
+            with col2:
+                supplier_filter = st.selectbox("Filter by Supplier", ["All"] + list(set(po['supplier_name'] for po in purchase_orders.values())))
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30))
+            with col2:
+                end_date = st.date_input("End Date", value=datetime.date.today())
+            
+            filtered_pos = []
+            for po_id, po in purchase_orders.items():
+                try:
+                    po_date = datetime.datetime.strptime(po['date_created'], "%Y-%m-%d %H:%M:%S").date()
+                    if (status_filter == "All" or po['status'] == status_filter) and \
+                       (supplier_filter == "All" or po['supplier_name'] == supplier_filter) and \
+                       (start_date <= po_date <= end_date):
+                        filtered_pos.append(po)
+                except (ValueError, KeyError):
+                    continue
+            
+            if not filtered_pos:
+                st.info("No purchase orders match the filters")
+            else:
+                st.subheader("Purchase Orders Summary")
+                po_summary = []
+                for po in filtered_pos:
+                    po_summary.append({
+                        'PO ID': po['po_id'],
+                        'Supplier': po['supplier_name'],
+                        'Date': po['date_created'],
+                        'Items': len(po['items']),
+                        'Total Cost': format_currency(po['total_cost']),
+                        'Status': po['status'].capitalize().replace('_', ' '),
+                        'Created By': po['created_by']
+                    })
+                
+                st.dataframe(pd.DataFrame(po_summary))
+                
+                selected_po = st.selectbox("View PO Details", [""] + [f"{po['po_id']} - {po['supplier_name']}" for po in filtered_pos])
+                
+                if selected_po:
+                    po_id = selected_po.split(" - ")[0]
+                    po = purchase_orders[po_id]
+                    
+                    # Initialize receipts if not exists
+                    if 'receipts' not in po:
+                        po['receipts'] = []
+                    
+                    st.subheader(f"Purchase Order #{po_id}")
+                    st.write(f"Supplier: {po['supplier_name']}")
+                    st.write(f"Date Created: {po['date_created']}")
+                    st.write(f"Created By: {po['created_by']}")
+                    st.write(f"Status: {po['status'].capitalize().replace('_', ' ')}")
+                    st.write(f"Total Cost: {format_currency(po['total_cost'])}")
+                    
+                    st.subheader("Items")
+                    items_df = pd.DataFrame(po['items'])
+                    st.dataframe(items_df)
+                    
+                    if po['receipts']:
+                        st.subheader("Receipt History")
+                        for receipt in po['receipts']:
+                            st.write(f"**{receipt['date']}** by {receipt['received_by']}")
+                            if receipt.get('notes'):
+                                st.write(f"Notes: {receipt['notes']}")
+                            receipt_df = pd.DataFrame(receipt['items'])
+                            st.dataframe(receipt_df)
+                    
+                    if po['status'] == 'draft':
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            if st.button("Approve Draft"):
+                                if approve_draft_po(po_id):
+                                    st.success("Purchase order approved")
+                                    st.rerun()
+                                else:
+                                    st.error("Failed to approve purchase order")
+                        with col2:
+                            if st.button("Discard Draft"):
+                                if discard_draft_po(po_id):
+                                    st.success("Draft purchase order discarded")
+                                    st.rerun()
+                                else:
+                                    st.error("Failed to discard purchase order")
+                    
+                    if st.button("Print PO"):
+                        po_report = generate_po_report(po_id)
+                        if print_receipt(po_report):
+                            st.success("Purchase order printed successfully")
+                        else:
+                            st.error("Failed to print purchase order")
+
+    with tab3:
+        st.header("Receive Purchase Order")
+        
+        purchase_orders = load_data(PURCHASE_ORDERS_FILE)
+        pending_pos = [po for po in purchase_orders.values() if po.get('status') in ['pending', 'partially_received']]
+        
+        if not pending_pos:
+            st.info("No pending purchase orders to receive")
+        else:
+            selected_po = st.selectbox("Select PO to Receive", [""] + [f"{po['po_id']} - {po['supplier_name']}" for po in pending_pos])
+            
+            if selected_po:
+                po_id = selected_po.split(" - ")[0]
+                po = purchase_orders[po_id]
+                
+                # Initialize receipts if not exists
+                if 'receipts' not in po:
+                    po['receipts'] = []
+                
+                st.subheader(f"Purchase Order #{po_id}")
+                st.write(f"Supplier: {po['supplier_name']}")
+                st.write(f"Date Created: {po['date_created']}")
+                st.write(f"Total Cost: {format_currency(po['total_cost'])}")
+                st.write(f"Current Status: {po['status'].capitalize().replace('_', ' ')}")
+                
+                if po['receipts']:
+                    st.subheader("Previous Receipts")
+                    for receipt in po['receipts']:
+                        st.write(f"**{receipt['date']}** by {receipt['received_by']}")
+                        if receipt.get('notes'):
+                            st.write(f"Notes: {receipt['notes']}")
+                        receipt_df = pd.DataFrame(receipt['items'])
+                        st.dataframe(receipt_df)
+                
+                st.subheader("Receive Items")
+                with st.form("receive_po_form"):
+                    received_items = []
+                    for item in po['items']:
+                        max_qty = item['quantity']
+                        received_qty = st.number_input(
+                            f"Quantity received for {item['name']} (ordered: {max_qty})",
+                            min_value=0,
+                            max_value=max_qty,
+                            value=max_qty,
+                            key=f"receive_{item['barcode']}"
+                        )
+                        received_items.append({
+                            'barcode': item['barcode'],
+                            'name': item['name'],
+                            'ordered_quantity': item['quantity'],
+                            'received_quantity': received_qty,
+                            'cost': item.get('cost', 0)
+                        })
+                    
+                    notes = st.text_area("Receiving Notes")
+                    mark_as_complete = st.checkbox("Mark as complete (even if not all items received)", 
+                                                 value=po['status'] == 'partially_received')
+                    
+                    if st.form_submit_button("Process Receipt"):
+                        if all(item['received_quantity'] == 0 for item in received_items):
+                            st.error("Cannot process receipt with all quantities as zero")
+                        else:
+                            if process_received_po(po_id, received_items, notes, mark_as_complete):
+                                st.success("Receipt processed successfully")
+                                st.rerun()
+                            else:
+                                st.error("Failed to process receipt")
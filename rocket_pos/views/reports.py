@@ -0,0 +1,956 @@
+"""Reports & analytics."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+import io
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    TRANSACTIONS_FILE,
+    DISCOUNTS_FILE,
+    OFFERS_FILE,
+    CATEGORIES_FILE,
+    BRANDS_FILE,
+    format_currency,
+    is_manager,
+    load_data,
+)
+from rocket_pos.basket_analysis import DEFAULT_MIN_COUNT, LEVELS as AFFINITY_LEVELS, product_affinity
+from rocket_pos.customer_analytics import (
+    SEGMENTS,
+    customer_analytics,
+    customer_spend,
+    rebuild_lifetime_counters,
+    segment_export,
+)
+from rocket_pos.navigation import open_page
+from rocket_pos.returns_log import load_returns
+
+# Reports & Analytics
+def reports_analytics():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("📊 Sales Analytics Dashboard")
+    
+    # Load all data
+    transactions = load_data(TRANSACTIONS_FILE)
+    products = load_data(PRODUCTS_FILE)
+    inventory = load_data(INVENTORY_FILE)
+    returns_data = load_returns()
+    categories_data = load_data(CATEGORIES_FILE)
+    brands_data = load_data(BRANDS_FILE)
+    discounts_data = load_data(DISCOUNTS_FILE)
+    offers_data = load_data(OFFERS_FILE)
+    
+    # Date range selector
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30))
+    with col2:
+        end_date = st.date_input("End Date", value=datetime.date.today())
+    with col3:
+        st.write("")  # Spacer
+        if st.button("🔄 Refresh Data"):
+            st.rerun()
+    
+    # Filter transactions and returns by date
+    filtered_transactions = []
+    for t in transactions.values():
+        try:
+            trans_date = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= trans_date <= end_date:
+                filtered_transactions.append(t)
+        except (ValueError, KeyError):
+            continue
+    
+    filtered_returns = []
+    for r in returns_data.values():
+        try:
+            return_date = datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= return_date <= end_date:
+                filtered_returns.append(r)
+        except (ValueError, KeyError):
+            continue
+    
+    # Calculate key metrics with discount tracking
+    total_sales = 0
+    total_discounts = 0
+    total_returns = 0
+    transaction_count = len(filtered_transactions)
+    
+    for t in filtered_transactions:
+        total_sales += t.get('total', 0)
+        # Sum all types of discounts
+        total_discounts += t.get('discount', 0)  # Regular discounts
+        total_discounts += t.get('loyalty_discount', 0)  # Loyalty discounts
+        total_discounts += t.get('points_discount', 0)  # Points discounts
+    
+    for r in filtered_returns:
+        total_returns += r.get('total_refund', 0)
+    
+    # Safe calculations with zero division checks
+    net_sales = total_sales - total_returns
+    avg_transaction_value = total_sales / transaction_count if transaction_count > 0 else 0
+    return_rate = (total_returns / total_sales * 100) if total_sales > 0 else 0
+    discount_rate = (total_discounts / total_sales * 100) if total_sales > 0 else 0
+    
+    # KPI Cards with discount metrics
+    st.subheader("📈 Key Performance Indicators")
+    kpi1, kpi2, kpi3, kpi4, kpi5, kpi6 = st.columns(6)
+    
+    with kpi1:
+        st.metric("Total Sales", format_currency(total_sales))
+    with kpi2:
+        st.metric("Net Sales", format_currency(net_sales), 
+                 delta=format_currency(-total_returns), delta_color="inverse")
+    with kpi3:
+        st.metric("Transactions", f"{transaction_count:,}")
+    with kpi4:
+        st.metric("Avg. Transaction", format_currency(avg_transaction_value))
+    with kpi5:
+        st.metric("Return Rate", f"{return_rate:.1f}%")
+    with kpi6:
+        st.metric("Discounts", format_currency(total_discounts), f"{discount_rate:.1f}%")
+    
+    # Main dashboard layout
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+        "📅 Sales Overview", 
+        "📦 Product Performance", 
+        "👥 Customer Insights", 
+        "💳 Payment Analysis",
+        "🎯 Discount Analysis",
+        "🧺 Product Affinity",
+        "📋 Export Reports"
+    ])
+    
+    with tab1:
+        st.header("Sales Overview")
+        
+        # Daily sales trend with discount tracking
+        daily_sales = {}
+        daily_discounts = {}
+        daily_returns = {}
+        daily_transactions = {}
+        
+        current_date = start_date
+        while current_date <= end_date:
+            daily_sales[current_date] = 0
+            daily_discounts[current_date] = 0
+            daily_returns[current_date] = 0
+            daily_transactions[current_date] = 0
+            current_date += datetime.timedelta(days=1)
+        
+        for t in filtered_transactions:
+            try:
+                trans_date = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+                daily_sales[trans_date] += t.get('total', 0)
+                # Sum all discount types
+                daily_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+                daily_discounts[trans_date] += daily_discount
+                daily_transactions[trans_date] += 1
+            except:
+                continue
+        
+        for r in filtered_returns:
+            try:
+                return_date = datetime.datetime.strptime(r.get('return_date', ''), "%Y-%m-%d %H:%M:%S").date()
+                daily_returns[return_date] += r.get('total_refund', 0)
+            except:
+                continue
+        
+        # Prepare chart data
+        chart_data = pd.DataFrame({
+            'Date': [d.strftime('%Y-%m-%d') for d in daily_sales.keys()],
+            'Sales': list(daily_sales.values()),
+            'Discounts': list(daily_discounts.values()),
+            'Returns': list(daily_returns.values()),
+            'Transactions': list(daily_transactions.values()),
+            'Net Sales': [sales - returns for sales, returns in zip(daily_sales.values(), daily_returns.values())]
+        })
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Daily Sales Trend")
+            if not chart_data.empty:
+                st.line_chart(chart_data.set_index('Date')[['Sales', 'Returns', 'Net Sales']])
+            else:
+                st.info("No sales data available for the selected period")
+        
+        with col2:
+            st.subheader("Discounts & Transactions")
+            if not chart_data.empty:
+                st.bar_chart(chart_data.set_index('Date')[['Discounts', 'Transactions']])
+            else:
+                st.info("No transaction data available")
+            
+            # Quick stats
+            if daily_sales:
+                total_days = len(daily_sales)
+                best_day_value = max(daily_sales.values())
+                best_day_date = [date for date, value in daily_sales.items() if value == best_day_value][0]
+                avg_daily = sum(daily_sales.values()) / total_days if total_days > 0 else 0
+                total_period_discounts = sum(daily_discounts.values())
+                
+                st.info(f"""
+                **Period Summary:**
+                - Total Days: {total_days}
+                - Best Day: {best_day_date.strftime('%b %d')} ({format_currency(best_day_value)})
+                - Average Daily: {format_currency(avg_daily)}
+                - Total Discounts: {format_currency(total_period_discounts)}
+                """)
+            else:
+                st.info("No data available for period summary")
+    
+    with tab2:
+        st.header("Product Performance")
+        
+        # Product sales analysis with discount tracking
+        product_sales = {}
+        product_discounts = {}
+        category_sales = {}
+        category_discounts = {}
+        
+        for t in filtered_transactions:
+            transaction_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+            
+            for barcode, item in t.get('items', {}).items():
+                product = products.get(barcode, {'name': 'Unknown', 'category': 'Uncategorized', 'brand': 'No Brand'})
+                category = product.get('category', 'Uncategorized')
+                brand = product.get('brand', 'No Brand')
+                
+                # Calculate discount allocation per item (proportional to item value)
+                item_value = item.get('price', 0) * item.get('quantity', 0)
+                transaction_total = t.get('subtotal', 0)
+                item_discount_share = (item_value / transaction_total) * transaction_discount if transaction_total > 0 else 0
+                
+                # Product level
+                if barcode not in product_sales:
+                    product_sales[barcode] = {
+                        'name': product['name'],
+                        'category': category,
+                        'brand': brand,
+                        'quantity': 0,
+                        'revenue': 0,
+                        'discounts': 0
+                    }
+                product_sales[barcode]['quantity'] += item.get('quantity', 0)
+                product_sales[barcode]['revenue'] += item_value
+                product_sales[barcode]['discounts'] += item_discount_share
+                
+                # Category level
+                if category not in category_sales:
+                    category_sales[category] = {'quantity': 0, 'revenue': 0, 'discounts': 0}
+                category_sales[category]['quantity'] += item.get('quantity', 0)
+                category_sales[category]['revenue'] += item_value
+                category_sales[category]['discounts'] += item_discount_share
+        
+        if product_sales:
+            # Convert to DataFrames
+            product_df = pd.DataFrame.from_dict(product_sales, orient='index')
+            category_df = pd.DataFrame.from_dict(category_sales, orient='index')
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Top 10 Products by Revenue")
+                top_products = product_df.nlargest(10, 'revenue')[['name', 'quantity', 'revenue', 'discounts']]
+                top_products['net_revenue'] = top_products['revenue'] - top_products['discounts']
+                top_products['discount_rate'] = (top_products['discounts'] / top_products['revenue'] * 100).round(1)
+                
+                # Replace infinite values and NaN with 0
+                top_products = top_products.replace([float('inf'), -float('inf')], 0).fillna(0)
+                
+                st.dataframe(
+                    top_products.style.format({
+                        'revenue': lambda x: format_currency(x),
+                        'discounts': lambda x: format_currency(x),
+                        'net_revenue': lambda x: format_currency(x),
+                        'discount_rate': lambda x: f"{x}%" if pd.notnull(x) else "0%",
+                        'quantity': lambda x: f"{x:,.0f}"
+                    }),
+                    height=400
+                )
+            
+            with col2:
+                st.subheader("Sales by Category")
+                # Create bar chart for categories
+                if not category_df.empty:
+                    category_chart_data = category_df.sort_values('revenue', ascending=False).head(10)
+                    st.bar_chart(category_chart_data['revenue'])
+                else:
+                    st.info("No category data available")
+                
+                st.subheader("Top Categories with Discounts")
+                if not category_df.empty:
+                    top_categories = category_df.nlargest(5, 'revenue').copy()
+                    top_categories['net_revenue'] = top_categories['revenue'] - top_categories['discounts']
+                    top_categories['discount_rate'] = (top_categories['discounts'] / top_categories['revenue'] * 100).round(1)
+                    
+                    # Replace infinite values and NaN with 0
+                    top_categories = top_categories.replace([float('inf'), -float('inf')], 0).fillna(0)
+                    
+                    st.dataframe(
+                        top_categories.style.format({
+                            'revenue': lambda x: format_currency(x),
+                            'discounts': lambda x: format_currency(x),
+                            'net_revenue': lambda x: format_currency(x),
+                            'discount_rate': lambda x: f"{x}%" if pd.notnull(x) else "0%",
+                            'quantity': lambda x: f"{x:,.0f}"
+                        })
+                    )
+                else:
+                    st.info("No category discount data available")
+        else:
+            st.info("No product sales data for the selected period")
+    
+    with tab3:
+        st.header("Customer Insights")
+        
+        customer_spending = customer_spend(start_date, end_date)
+        
+        if not customer_spending.empty:
+            customer_df = customer_spending
+            customer_df['avg_spend'] = customer_df['total_spent'] / customer_df['transactions']
+            customer_df['discount_rate'] = (customer_df['discounts_received'] / customer_df['total_spent'] * 100).round(1)
+            
+            # Replace infinite values and NaN with 0
+            customer_df = customer_df.replace([float('inf'), -float('inf')], 0).fillna(0)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Top 5 Customers by Spending")
+                top_customers = customer_df.nlargest(5, 'total_spent')
+                st.dataframe(
+                    top_customers.style.format({
+                        'total_spent': lambda x: format_currency(x),
+                        'discounts_received': lambda x: format_currency(x),
+                        'avg_spend': lambda x: format_currency(x),
+                        'discount_rate': lambda x: f"{x}%" if pd.notnull(x) else "0%",
+                        'transactions': lambda x: f"{x:,.0f}"
+                    })
+                )
+            
+            with col2:
+                st.subheader("Customer Discount Analysis")
+                # Group customers by discount rate
+                discount_groups = {
+                    'High (>10%)': len(customer_df[customer_df['discount_rate'] > 10]),
+                    'Medium (5-10%)': len(customer_df[(customer_df['discount_rate'] >= 5) & (customer_df['discount_rate'] <= 10)]),
+                    'Low (<5%)': len(customer_df[customer_df['discount_rate'] < 5])
+                }
+                st.bar_chart(discount_groups)
+                
+                st.metric("Total Customers", len(customer_df))
+                avg_discount_rate = customer_df['discount_rate'].mean() if len(customer_df) > 0 else 0
+                st.metric("Avg. Discount Rate", f"{avg_discount_rate:.1f}%")
+        else:
+            st.info("No customer data available for the selected period")
+        
+        # Lifetime view of every loyalty customer, whatever the date range
+        st.subheader("Customer Lifetime Analytics")
+        analytics = customer_analytics()
+        buyers = analytics[analytics['frequency'] > 0]
+        if buyers.empty:
+            st.info("No purchases by loyalty customers yet")
+        else:
+            m1, m2, m3, m4 = st.columns(4)
+            with m1:
+                st.metric("Customers Who Bought", f"{len(buyers):,}", f"of {len(analytics):,} enrolled", delta_color="off")
+            with m2:
+                st.metric("Avg. Lifetime Spend", format_currency(buyers['monetary'].mean()))
+            with m3:
+                st.metric("Avg. Expected Value (12 mo)", format_currency(buyers['clv'].mean()))
+            with m4:
+                st.metric("Likely Churned", f"{(buyers['churn_risk'] >= 0.9).mean() * 100:.1f}%")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Customers by Segment**")
+                segment_summary = analytics.groupby('segment').agg(
+                    customers=('frequency', 'size'),
+                    avg_spend=('monetary', 'mean'),
+                    avg_clv=('clv', 'mean'),
+                    avg_recency=('recency_days', 'mean')
+                ).reindex([name for name, _ in SEGMENTS]).dropna(subset=['customers'])
+                st.bar_chart(segment_summary['customers'])
+                st.dataframe(segment_summary.style.format({
+                    'customers': lambda x: f"{x:,.0f}",
+                    'avg_spend': lambda x: format_currency(x),
+                    'avg_clv': lambda x: format_currency(x),
+                    'avg_recency': lambda x: f"{x:,.0f} days" if pd.notnull(x) else "-"
+                }))
+            with col2:
+                st.write("**Top 10 by Expected Value**")
+                st.dataframe(buyers.nlargest(10, 'clv')[
+                    ['name', 'segment', 'rfm', 'frequency', 'monetary', 'clv', 'churn_risk']
+                ].style.format({
+                    'monetary': lambda x: format_currency(x),
+                    'clv': lambda x: format_currency(x),
+                    'churn_risk': lambda x: f"{x:.0%}"
+                }))
+                st.write("**Valuable Customers Slipping Away**")
+                at_risk = buyers[buyers['segment'] == "At Risk"].nlargest(10, 'monetary')
+                if at_risk.empty:
+                    st.info("No valuable customers at risk")
+                else:
+                    st.dataframe(at_risk[['name', 'phone', 'last_purchase', 'recency_days', 'monetary', 'churn_risk']].style.format({
+                        'monetary': lambda x: format_currency(x),
+                        'recency_days': lambda x: f"{x:,.0f}",
+                        'churn_risk': lambda x: f"{x:.0%}"
+                    }))
+            
+            # Customer lists for campaigns
+            st.write("**Segment Export**")
+            with st.expander("What the segments mean"):
+                for name, description in SEGMENTS:
+                    st.write(f"**{name}:** {description}")
+            export_segments = st.multiselect("Segments to export", [name for name, _ in SEGMENTS],
+                                             default=["At Risk"], key="export_segments")
+            if export_segments:
+                export_count = int(analytics['segment'].isin(export_segments).sum())
+                st.download_button(
+                    label=f"📥 Download {export_count:,} Customers (CSV)",
+                    data=segment_export(analytics, export_segments),
+                    file_name=f"customer_segments_{datetime.date.today()}.csv",
+                    mime="text/csv"
+                )
+        
+        with st.expander("🔧 Lifetime Counters"):
+            st.caption("Total spent and visit count on each customer are kept as running counters. "
+                       "Rebuilding recounts them from the saved sales.")
+            if st.button("Rebuild Lifetime Counters", key="rebuild_lifetime_counters"):
+                try:
+                    corrected = rebuild_lifetime_counters()
+                    st.success(f"Lifetime counters rebuilt: {corrected} customer(s) corrected")
+                except Exception as e:
+                    st.error(f"Error rebuilding lifetime counters: {str(e)}")
+    
+    with tab4:
+        st.header("Payment Analysis")
+        
+        payment_methods = {}
+        payment_discounts = {}
+        
+        for t in filtered_transactions:
+            method = t.get('payment_method', 'Unknown')
+            total_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+            
+            if method not in payment_methods:
+                payment_methods[method] = {'count': 0, 'amount': 0, 'discounts': 0}
+            payment_methods[method]['count'] += 1
+            payment_methods[method]['amount'] += t.get('total', 0)
+            payment_methods[method]['discounts'] += total_discount
+        
+        if payment_methods:
+            payment_df = pd.DataFrame.from_dict(payment_methods, orient='index')
+            payment_df['avg_amount'] = payment_df['amount'] / payment_df['count']
+            payment_df['discount_rate'] = (payment_df['discounts'] / payment_df['amount'] * 100).round(1)
+            
+            # Replace infinite values and NaN with 0
+            payment_df = payment_df.replace([float('inf'), -float('inf')], 0).fillna(0)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Payment Methods Summary")
+                st.dataframe(
+                    payment_df.style.format({
+                        'amount': lambda x: format_currency(x),
+                        'discounts': lambda x: format_currency(x),
+                        'avg_amount': lambda x: format_currency(x),
+                        'discount_rate': lambda x: f"{x}%" if pd.notnull(x) else "0%",
+                        'count': lambda x: f"{x:,.0f}"
+                    })
+                )
+            
+            with col2:
+                st.subheader("Payment Method Popularity")
+                st.bar_chart(payment_df['count'])
+                
+                st.subheader("Discounts by Payment Method")
+                st.bar_chart(payment_df['discounts'])
+        else:
+            st.info("No payment data available")
+    
+    with tab5:
+        st.header("Discount Analysis")
+        
+        # Analyze discounts by type
+        discount_types = {
+            'regular': 0,
+            'loyalty': 0,
+            'points': 0
+        }
+        
+        discount_by_hour = {}
+        discount_by_cashier = {}
+        
+        for t in filtered_transactions:
+            # Categorize discounts
+            discount_types['regular'] += t.get('discount', 0)
+            discount_types['loyalty'] += t.get('loyalty_discount', 0)
+            discount_types['points'] += t.get('points_discount', 0)
+            
+            # Discounts by hour
+            try:
+                hour = datetime.datetime.strptime(t.get('date', ''), "%Y-%m-%d %H:%M:%S").hour
+                total_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+                
+                if hour not in discount_by_hour:
+                    discount_by_hour[hour] = 0
+                discount_by_hour[hour] += total_discount
+            except:
+                pass
+            
+            # Discounts by cashier
+            cashier = t.get('cashier', 'Unknown')
+            total_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+            
+            if cashier not in discount_by_cashier:
+                discount_by_cashier[cashier] = 0
+            discount_by_cashier[cashier] += total_discount
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Discounts by Type")
+            if sum(discount_types.values()) > 0:
+                discount_type_df = pd.DataFrame({
+                    'Type': ['Regular Discounts', 'Loyalty Discounts', 'Points Discounts'],
+                    'Amount': [discount_types['regular'], discount_types['loyalty'], discount_types['points']]
+                })
+                st.bar_chart(discount_type_df.set_index('Type'))
+            else:
+                st.info("No discounts applied in this period")
+        
+        with col2:
+            st.subheader("Discounts by Hour")
+            if discount_by_hour:
+                hours_df = pd.DataFrame({
+                    'Hour': list(discount_by_hour.keys()),
+                    'Discounts': list(discount_by_hour.values())
+                }).sort_values('Hour')
+                st.bar_chart(hours_df.set_index('Hour'))
+            else:
+                st.info("No discount timing data available")
+        
+        # Discounts by cashier
+        st.subheader("Discounts by Cashier")
+        if discount_by_cashier:
+            cashier_df = pd.DataFrame.from_dict(discount_by_cashier, orient='index', columns=['Total Discounts'])
+            cashier_df = cashier_df.sort_values('Total Discounts', ascending=False)
+            
+            st.dataframe(
+                cashier_df.style.format({
+                    'Total Discounts': lambda x: format_currency(x)
+                })
+            )
+        else:
+            st.info("No cashier discount data available")
+        
+        # Active discounts and offers
+        st.subheader("Active Discounts & Offers")
+        
+        # Get active discounts
+        active_discounts = [d for d in discounts_data.values() if d.get('active', False)]
+        active_offers = [o for o in offers_data.values() if o.get('active', False)]
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Active Discounts**")
+            if active_discounts:
+                for discount in active_discounts:
+                    st.write(f"• {discount.get('name', 'Unknown')}: {discount.get('value', 0)}%")
+            else:
+                st.info("No active discounts")
+        
+        with col2:
+            st.write("**Active Offers**")
+            if active_offers:
+                for offer in active_offers:
+                    st.write(f"• {offer.get('name', 'Unknown')}: {offer.get('type', '').replace('_', ' ').title()}")
+            else:
+                st.info("No active offers")
+    
+    with tab6:
+        st.header("Product Affinity")
+        st.caption("Items bought in the same sale during the selected period. Lift above 1 means they sell "
+                   "together more often than chance; confidence is how often buying one means buying the other.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            level_options = {label: level for level, label in AFFINITY_LEVELS.items()}
+            affinity_level = level_options[st.selectbox("Analyse", list(level_options.keys()), key="affinity_level")]
+        with col2:
+            min_together = st.number_input("Minimum Sales Together", min_value=1, value=DEFAULT_MIN_COUNT,
+                                           step=1, key="affinity_min_count")
+        with col3:
+            st.write("")  # Spacer
+            include_trios = st.checkbox("Include 3-item sets", value=False, key="affinity_trios")
+        
+        affinity = product_affinity(start_date, end_date, affinity_level, min_together, 3 if include_trios else 2)
+        pairs = affinity['pairs']
+        if pairs.empty:
+            st.info(f"No items were bought together in at least {min_together} of the "
+                    f"{affinity['baskets']:,} sales in this period")
+        else:
+            if affinity_level == "product":
+                product_names = {barcode: product.get('name', barcode) for barcode, product in products.items()}
+            else:
+                product_names = {}
+            item_name = lambda item: product_names.get(item, item)
+            
+            st.write(f"**Top Associations** ({len(pairs):,} pairs from {affinity['baskets']:,} sales)")
+            top_pairs = pairs.head(25)
+            st.dataframe(pd.DataFrame({
+                'Item A': top_pairs['item_a'].map(item_name),
+                'Item B': top_pairs['item_b'].map(item_name),
+                'Sales Together': top_pairs['count'],
+                'Support': top_pairs['support'].map(lambda x: f"{x:.1%}"),
+                'A → B': top_pairs['confidence_ab'].map(lambda x: f"{x:.0%}"),
+                'B → A': top_pairs['confidence_ba'].map(lambda x: f"{x:.0%}"),
+                'Lift': top_pairs['lift'].round(2)
+            }), hide_index=True)
+            
+            itemsets = affinity['itemsets']
+            if include_trios:
+                if itemsets.empty:
+                    st.info("No 3-item sets reached the minimum")
+                else:
+                    st.write("**Frequent 3-Item Sets**")
+                    top_sets = itemsets.head(15)
+                    st.dataframe(pd.DataFrame({
+                        'Items': top_sets['items'].map(lambda items: " + ".join(item_name(item) for item in items)),
+                        'Sales Together': top_sets['count'],
+                        'Support': top_sets['support'].map(lambda x: f"{x:.1%}"),
+                        'Lift': top_sets['lift'].round(2)
+                    }), hide_index=True)
+            
+            # Prefill a bundle offer from one of the strongest associations
+            if affinity_level == "product":
+                suggestions = list(zip(zip(top_pairs['item_a'], top_pairs['item_b']), top_pairs['count']))
+                if include_trios and not itemsets.empty:
+                    suggestions += list(zip(itemsets.head(15)['items'].map(tuple), itemsets.head(15)['count']))
+                bundle_options = {" + ".join(item_name(item) for item in items): (items, together)
+                                  for items, together in suggestions}
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    selected_bundle = st.selectbox("Bundle Suggestion", list(bundle_options.keys()),
+                                                   key="affinity_bundle")
+                with col2:
+                    st.write("")  # Spacer
+                    if st.button("🎁 Create Bundle Offer", key="create_bundle_offer"):
+                        bundle_items, together = bundle_options[selected_bundle]
+                        st.session_state.bundle_prefill = {
+                            'name': f"Bundle: {selected_bundle}",
+                            'description': f"Bought together in {together} sales "
+                                           f"between {start_date} and {end_date}",
+                            'products': list(bundle_items)
+                        }
+                        # Preselect the items in the offer form's product picker
+                        st.session_state.add_offer_products = list(bundle_items)
+                        open_page("Offers Management")
+    
+    with tab7:
+        st.header("Export Reports")
+        
+        st.subheader("Generate Custom Reports")
+        
+        report_type = st.selectbox("Select Report Type", [
+            "Sales Detailed Report",
+            "Product Performance Report",
+            "Customer Analysis Report",
+            "Payment Method Report",
+            "Discount Analysis Report",
+            "Daily Sales Summary"
+        ])
+        
+        # Report customization
+        selected_columns = []
+        if report_type == "Sales Detailed Report":
+            selected_columns = st.multiselect(
+                "Select Columns",
+                options=['Date', 'Transaction ID', 'Cashier', 'Payment Method', 'Subtotal', 'Tax', 
+                        'Discount', 'Loyalty Discount', 'Points Discount', 'Total Discount', 'Total', 'Items Count'],
+                default=['Date', 'Transaction ID', 'Cashier', 'Total', 'Total Discount']
+            )
+        elif report_type == "Discount Analysis Report":
+            selected_columns = st.multiselect(
+                "Select Columns",
+                options=['Date', 'Transaction ID', 'Cashier', 'Payment Method', 'Regular Discount', 
+                        'Loyalty Discount', 'Points Discount', 'Total Discount', 'Subtotal', 'Discount Rate'],
+                default=['Date', 'Transaction ID', 'Cashier', 'Total Discount', 'Discount Rate']
+            )
+        elif report_type == "Product Performance Report":
+            selected_columns = st.multiselect(
+                "Select Columns",
+                options=['Product Name', 'Category', 'Brand', 'Quantity Sold', 'Revenue', 'Discounts', 'Net Revenue', 'Avg Price', 'Discount Rate'],
+                default=['Product Name', 'Quantity Sold', 'Revenue', 'Discounts', 'Net Revenue']
+            )
+        elif report_type == "Customer Analysis Report":
+            selected_columns = st.multiselect(
+                "Select Columns",
+                options=['Customer ID', 'Total Transactions', 'Total Spent', 'Discounts Received', 'Average Spend', 'Discount Rate', 'Last Purchase'],
+                default=['Customer ID', 'Total Spent', 'Discounts Received', 'Average Spend']
+            )
+        elif report_type == "Payment Method Report":
+            selected_columns = st.multiselect(
+                "Select Columns",
+                options=['Payment Method', 'Transaction Count', 'Total Amount', 'Total Discounts', 'Average Amount', 'Discount Rate'],
+                default=['Payment Method', 'Transaction Count', 'Total Amount', 'Total Discounts']
+            )
+        elif report_type == "Daily Sales Summary":
+            selected_columns = st.multiselect(
+                "Select Columns",
+                options=['Date', 'Total Sales', 'Total Discounts', 'Total Returns', 'Net Sales', 'Transaction Count', 'Average Transaction'],
+                default=['Date', 'Total Sales', 'Net Sales', 'Transaction Count']
+            )
+        
+        # Format options
+        export_format = st.radio("Export Format", ["CSV", "Excel"], horizontal=True)
+        
+        if st.button("🚀 Generate & Export Report", type="primary"):
+            with st.spinner("Generating report..."):
+                try:
+                    df = pd.DataFrame()
+                    
+                    if report_type == "Sales Detailed Report":
+                        report_data = []
+                        for t in filtered_transactions:
+                            total_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+                            discount_rate = (total_discount / t.get('subtotal', 1) * 100) if t.get('subtotal', 0) > 0 else 0
+                            
+                            report_data.append({
+                                'Date': t.get('date', ''),
+                                'Transaction ID': t.get('transaction_id', ''),
+                                'Cashier': t.get('cashier', ''),
+                                'Payment Method': t.get('payment_method', ''),
+                                'Subtotal': t.get('subtotal', 0),
+                                'Tax': t.get('tax', 0),
+                                'Discount': t.get('discount', 0),
+                                'Loyalty Discount': t.get('loyalty_discount', 0),
+                                'Points Discount': t.get('points_discount', 0),
+                                'Total Discount': total_discount,
+                                'Discount Rate': f"{discount_rate:.1f}%",
+                                'Total': t.get('total', 0),
+                                'Items Count': len(t.get('items', {}))
+                            })
+                        df = pd.DataFrame(report_data)
+                    
+                    elif report_type == "Discount Analysis Report":
+                        report_data = []
+                        for t in filtered_transactions:
+                            total_discount = t.get('discount', 0) + t.get('loyalty_discount', 0) + t.get('points_discount', 0)
+                            discount_rate = (total_discount / t.get('subtotal', 1) * 100) if t.get('subtotal', 0) > 0 else 0
+                            
+                            report_data.append({
+                                'Date': t.get('date', ''),
+                                'Transaction ID': t.get('transaction_id', ''),
+                                'Cashier': t.get('cashier', ''),
+                                'Payment Method': t.get('payment_method', ''),
+                                'Regular Discount': t.get('discount', 0),
+                                'Loyalty Discount': t.get('loyalty_discount', 0),
+                                'Points Discount': t.get('points_discount', 0),
+                                'Total Discount': total_discount,
+                                'Subtotal': t.get('subtotal', 0),
+                                'Discount Rate': f"{discount_rate:.1f}%"
+                            })
+                        df = pd.DataFrame(report_data)
+                    
+                    elif report_type == "Product Performance Report":
+                        report_data = []
+                        for barcode, data in product_sales.items():
+                            discount_rate = (data['discounts'] / data['revenue'] * 100) if data['revenue'] > 0 else 0
+                            avg_price = data['revenue'] / data['quantity'] if data['quantity'] > 0 else 0
+                            report_data.append({
+                                'Product Name': data['name'],
+                                'Category': data['category'],
+                                'Brand': data['brand'],
+                                'Quantity Sold': data['quantity'],
+                                'Revenue': data['revenue'],
+                                'Discounts': data['discounts'],
+                                'Net Revenue': data['revenue'] - data['discounts'],
+                                'Avg Price': avg_price,
+                                'Discount Rate': f"{discount_rate:.1f}%"
+                            })
+                        df = pd.DataFrame(report_data)
+                    
+                    elif report_type == "Customer Analysis Report":
+                        report_data = []
+                        for customer_id, data in customer_spending.iterrows():
+                            discount_rate = (data['discounts_received'] / data['total_spent'] * 100) if data['total_spent'] > 0 else 0
+                            avg_spend = data['total_spent'] / data['transactions'] if data['transactions'] > 0 else 0
+                            report_data.append({
+                                'Customer ID': customer_id,
+                                'Total Transactions': data['transactions'],
+                                'Total Spent': data['total_spent'],
+                                'Discounts Received': data['discounts_received'],
+                                'Average Spend': avg_spend,
+                                'Discount Rate': f"{discount_rate:.1f}%",
+                                'Last Purchase': data['last_purchase']
+                            })
+                        df = pd.DataFrame(report_data)
+                    
+                    elif report_type == "Payment Method Report":
+                        report_data = []
+                        for method, data in payment_methods.items():
+                            discount_rate = (data['discounts'] / data['amount'] * 100) if data['amount'] > 0 else 0
+                            avg_amount = data['amount'] / data['count'] if data['count'] > 0 else 0
+                            report_data.append({
+                                'Payment Method': method,
+                                'Transaction Count': data['count'],
+                                'Total Amount': data['amount'],
+                                'Total Discounts': data['discounts'],
+                                'Average Amount': avg_amount,
+                                'Discount Rate': f"{discount_rate:.1f}%"
+                            })
+                        df = pd.DataFrame(report_data)
+                    
+                    elif report_type == "Daily Sales Summary":
+                        report_data = []
+                        for date in daily_sales.keys():
+                            sales = daily_sales[date]
+                            discounts = daily_discounts[date]
+                            returns = daily_returns[date]
+                            transactions_count = daily_transactions[date]
+                            net_sales = sales - returns
+                            avg_transaction = sales / transactions_count if transactions_count > 0 else 0
+                            
+                            report_data.append({
+                                'Date': date.strftime('%Y-%m-%d'),
+                                'Total Sales': sales,
+                                'Total Discounts': discounts,
+                                'Total Returns': returns,
+                                'Net Sales': net_sales,
+                                'Transaction Count': transactions_count,
+                                'Average Transaction': avg_transaction
+                            })
+                        df = pd.DataFrame(report_data)
+                    
+                    # Filter selected columns if any are selected and dataframe is not empty
+                    if not df.empty and selected_columns:
+                        # Only include columns that exist in the dataframe
+                        available_columns = [col for col in selected_columns if col in df.columns]
+                        if available_columns:
+                            df = df[available_columns]
+                    
+                    # Display preview
+                    st.subheader("Report Preview")
+                    if not df.empty:
+                        st.dataframe(df.head(10))
+                        
+                        # Export functionality
+                        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                        filename = f"{report_type.replace(' ', '_')}_{start_date}_to_{end_date}_{timestamp}"
+                        
+                        if export_format == "CSV":
+                            csv = df.to_csv(index=False)
+                            st.download_button(
+                                label="📄 Download CSV",
+                                data=csv,
+                                file_name=f"{filename}.csv",
+                                mime="text/csv",
+                                use_container_width=True
+                            )
+                        
+                        else:  # Excel
+                            excel_buffer = io.BytesIO()
+                            with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
+                                df.to_excel(writer, index=False, sheet_name='Report')
+                                
+                                # Add formatting
+                                workbook = writer.book
+                                worksheet = writer.sheets['Report']
+                                
+                                # Add header format
+                                header_format = workbook.add_format({
+                                    'bold': True,
+                                    'text_wrap': True,
+                                    'valign': 'top',
+                                    'fg_color': '#D7E4BC',
+                                    'border': 1
+                                })
+                                
+                                # Write column headers with format
+                                for col_num, value in enumerate(df.columns.values):
+                                    worksheet.write(0, col_num, value, header_format)
+                                
+                                # Auto-adjust columns width
+                                for i, col in enumerate(df.columns):
+                                    max_len = max(
+                                        df[col].astype(str).map(len).max(),
+                                        len(col)
+                                    ) + 2
+                                    worksheet.set_column(i, i, max_len)
+                            
+                            st.download_button(
+                                label="📊 Download Excel",
+                                data=excel_buffer.getvalue(),
+                                file_name=f"{filename}.xlsx",
+                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                use_container_width=True
+                            )
+                        
+                        # Show export summary
+                        st.success(f"✅ Report generated with {len(df)} records")
+                        st.info(f"**Time Period:** {start_date} to {end_date}")
+                    else:
+                        st.warning("No data available for the selected report type and period")
+                    
+                except Exception as e:
+                    st.error(f"Error generating report: {str(e)}")
+    
+    # Quick insights at the bottom with discount focus
+    st.markdown("---")
+    st.subheader("📋 Quick Insights Summary")
+    
+    insight1, insight2, insight3 = st.columns(3)
+    
+    with insight1:
+        if product_sales and len(product_df) > 0:
+            # Product with highest discount rate
+            high_discount_products = product_df[product_df['revenue'] > 0].copy()
+            if len(high_discount_products) > 0:
+                high_discount_products['discount_rate'] = (high_discount_products['discounts'] / high_discount_products['revenue'] * 100)
+                highest_discount_product = high_discount_products.nlargest(1, 'discount_rate').iloc[0]
+                
+                st.info(f"**🎯 Highest Discount Product:** {highest_discount_product['name']}\n\n"
+                       f"Discount rate: {highest_discount_product['discount_rate']:.1f}%\n"
+                       f"Total discounts: {format_currency(highest_discount_product['discounts'])}")
+            else:
+                st.info("**🎯 Highest Discount Product:** No discount data")
+        else:
+            st.info("**🎯 Highest Discount Product:** No product data")
+    
+    with insight2:
+        if discount_by_hour:
+            peak_discount_hour = max(discount_by_hour.items(), key=lambda x: x[1])
+            st.info(f"**🕒 Peak Discount Hour:** {peak_discount_hour[0]}:00\n\n"
+                   f"{format_currency(peak_discount_hour[1])} in discounts\n"
+                   f"Best time for promotions")
+        else:
+            st.info("**🕒 Peak Discount Hour:** No discount timing data")
+    
+    with insight3:
+        if discount_types and total_discounts > 0:
+            most_used_type = max(discount_types.items(), key=lambda x: x[1])
+            type_name = {
+                'regular': 'Regular Discounts',
+                'loyalty': 'Loyalty Discounts',
+                'points': 'Points Discounts'
+            }.get(most_used_type[0], most_used_type[0])
+            
+            discount_percentage = (most_used_type[1] / total_discounts * 100) if total_discounts > 0 else 0
+            
+            st.info(f"**💰 Most Used Discount:** {type_name}\n\n"
+                   f"{format_currency(most_used_type[1])} total\n"
+                   f"{discount_percentage:.1f}% of all discounts")
+        else:
+            st.info("**💰 Most Used Discount:** No discounts applied\n\n"
+                   f"No discount data available for the period")
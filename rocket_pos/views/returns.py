@@ -0,0 +1,1046 @@
+"""Returns & refunds."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos.core import (
+    PRODUCTS_FILE,
+    INVENTORY_FILE,
+    CATEGORIES_FILE,
+    SETTINGS_FILE,
+    data_transaction,
+    format_currency,
+    get_current_datetime,
+    is_manager,
+    load_data,
+    load_data_snapshot,
+    save_data,
+)
+from rocket_pos.hardware import camera_scan_panel
+from rocket_pos.returns_index import record_return, returned_items
+from rocket_pos.returns_log import append_return, load_returns
+from rocket_pos.services import ServiceError, process_return
+from rocket_pos.transaction_index import lookup_transaction
+
+# Returns & Refunds Management
+# Returns & Refunds Management with proper receipt printing
+# Returns & Refunds Management Module
+# Returns & Refunds Management Module - with reliable print functionality
+def returns_management():
+    st.title("🔄 Returns & Refunds")
+    
+    # Initialize session state
+    if 'print_receipt' not in st.session_state:
+        st.session_state.print_receipt = None
+    if 'print_return_id' not in st.session_state:
+        st.session_state.print_return_id = None
+    if 'exchange_cart' not in st.session_state:
+        st.session_state.exchange_cart = {}
+    if 'exchange_mode' not in st.session_state:
+        st.session_state.exchange_mode = False
+    
+    # Handle print requests
+    if st.session_state.print_receipt and st.session_state.print_return_id:
+        print_return_receipt(st.session_state.print_return_id)
+        return
+    
+    tab1, tab2, tab3, tab4 = st.tabs([
+        "🔄 Process Return", 
+        "📋 View Returns", 
+        "📊 Return Analytics", 
+        "⚙️ Return Settings"
+    ])
+    
+    with tab1:
+        process_return_tab()
+    
+    with tab2:
+        view_returns_tab()
+    
+    with tab3:
+        return_analytics_tab()
+    
+    with tab4:
+        return_settings_tab()
+
+def initialize_session_state():
+    # Add these to your session state initialization section
+ if 'tab_counter' not in st.session_state:
+    st.session_state.tab_counter = 0
+ if 'outdoor_cart' not in st.session_state:
+    st.session_state.outdoor_cart = {}
+ if 'loyalty_customer_id' not in st.session_state:
+    st.session_state.loyalty_customer_id = None
+ if 'loyalty_points_to_redeem' not in st.session_state:
+    st.session_state.loyalty_points_to_redeem = 0
+ if 'loyalty_customer_data' not in st.session_state:
+    st.session_state.loyalty_customer_data = None
+ if 'current_order_id' not in st.session_state:
+    st.session_state.current_order_id = None
+ if 'print_requested' not in st.session_state:
+    st.session_state.print_requested = False
+ if 'order_to_print' not in st.session_state:
+    st.session_state.order_to_print = None
+ if 'print_type' not in st.session_state:
+    st.session_state.print_type = 'browser_printer'
+ if 'show_cart' not in st.session_state:
+    st.session_state.show_cart = True
+
+def return_settings_tab():
+    if not is_manager():
+        st.warning("You need manager privileges to access return settings")
+        return
+    
+    st.header("Return Settings")
+    
+    settings = load_data(SETTINGS_FILE)
+    return_settings = settings.get('return_settings', {})
+    
+    with st.form("return_settings_form"):
+        st.subheader("Return Policy Configuration")
+        
+        # Return policy settings
+        return_period = st.number_input(
+            "Return Period (days)", 
+            min_value=0, 
+            max_value=365, 
+            value=return_settings.get('return_period', 30),
+            help="Number of days customers have to return items"
+        )
+        
+        require_receipt = st.checkbox(
+            "Require Receipt for Returns",
+            value=return_settings.get('require_receipt', True),
+            help="Whether customers must provide a receipt to process returns"
+        )
+        
+        restocking_fee = st.number_input(
+            "Restocking Fee (%)",
+            min_value=0.0,
+            max_value=25.0,
+            value=return_settings.get('restocking_fee', 0.0),
+            step=0.5,
+            help="Percentage fee charged for restocking returned items"
+        )
+        
+        non_returnable_items = st.text_area(
+            "Non-Returnable Items",
+            value="\n".join(return_settings.get('non_returnable_items', [])),
+            help="List of item categories or types that cannot be returned (one per line)"
+        )
+        
+        # Refund method preferences
+        st.subheader("Refund Method Preferences")
+        default_refund_method = st.selectbox(
+            "Default Refund Method",
+            ["Original Payment Method", "Store Credit", "Cash"],
+            index=["Original Payment Method", "Store Credit", "Cash"].index(
+                return_settings.get('default_refund_method', "Original Payment Method")
+            )
+        )
+        
+        # Exchange settings
+        st.subheader("Exchange Settings")
+        exchange_period = st.number_input(
+            "Exchange Period (days)",
+            min_value=0,
+            max_value=365,
+            value=return_settings.get('exchange_period', 60),
+            help="Number of days customers have to exchange items"
+        )
+        
+        allow_partial_exchange = st.checkbox(
+            "Allow Partial Exchanges",
+            value=return_settings.get('allow_partial_exchange', True),
+            help="Allow customers to exchange only some of the returned items"
+        )
+        
+        if st.form_submit_button("Save Settings"):
+            settings['return_settings'] = {
+                'return_period': return_period,
+                'require_receipt': require_receipt,
+                'restocking_fee': restocking_fee,
+                'non_returnable_items': [item.strip() for item in non_returnable_items.split('\n') if item.strip()],
+                'default_refund_method': default_refund_method,
+                'exchange_period': exchange_period,
+                'allow_partial_exchange': allow_partial_exchange
+            }
+            save_data(settings, SETTINGS_FILE)
+            st.success("Return settings saved successfully")
+
+def process_return_tab():
+    st.header("Process Return/Exchange")
+    
+    # Keyed lookups into the cached snapshots; nothing here modifies them
+    inventory = load_data_snapshot(INVENTORY_FILE)
+    tax_rate = load_data_snapshot(SETTINGS_FILE).get('tax_rate', 0.0)
+    
+    # Step 1: Find transaction
+    st.subheader("Step 1: Find Transaction")
+    with st.expander("📷 Scan Receipt with Camera"):
+        codes = camera_scan_panel("return_scan")
+        receipts = [code for code in codes if lookup_transaction(code)]
+        if receipts:
+            st.session_state.return_transaction_id = receipts[0]
+        elif codes:
+            st.warning("The scanned code doesn't match any transaction")
+    transaction_id = st.text_input("Enter Transaction ID or Scan Receipt Barcode", key="return_transaction_id")
+    transaction = lookup_transaction(transaction_id) if transaction_id else None
+    
+    if transaction:
+        returned = returned_items(transaction_id)
+        
+        # Display transaction details
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.info(f"**Date:** {transaction['date']}")
+        with col2:
+            st.info(f"**Total:** {format_currency(transaction['total'])}")
+        with col3:
+            st.info(f"**Payment Method:** {transaction['payment_method']}")
+        
+        # Step 2: Select items to return
+        st.subheader("Step 2: Select Items to Return")
+        
+        return_items = {}
+        for barcode, item in transaction['items'].items():
+            with st.expander(f"{item['name']} - {item['quantity']} x {format_currency(item['price'])}"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    already_returned = returned.get(barcode, {}).get('quantity', 0)
+                    max_returnable = max(item['quantity'] - already_returned, 0)
+                    current_stock = inventory.get(barcode, {}).get('quantity', 0)
+                    st.write(f"**Purchased:** {item['quantity']}")
+                    if already_returned:
+                        st.write(f"**Already Returned:** {already_returned} "
+                                 f"({format_currency(returned[barcode]['refund'])} refunded)")
+                    st.write(f"**Current Stock:** {current_stock}")
+                    
+                    if max_returnable == 0:
+                        st.info("Fully returned")
+                        continue
+                    return_qty = st.number_input(
+                        "Quantity to Return", 
+                        min_value=0, 
+                        max_value=max_returnable, 
+                        value=0, 
+                        key=f"return_{barcode}"
+                    )
+                
+                with col2:
+                    if return_qty > 0:
+                        return_reason = st.selectbox(
+                            "Reason for Return",
+                            ["", "Defective", "Wrong Item", "Customer Changed Mind", 
+                             "Damaged", "Expired", "Quality Issue", "Other"],
+                            key=f"reason_{barcode}"
+                        )
+                        
+                        if return_reason == "Other":
+                            return_reason = st.text_input("Please specify reason", key=f"other_reason_{barcode}")
+                        
+                        condition = st.selectbox(
+                            "Item Condition",
+                            ["", "Unopened", "Opened", "Damaged", "Used"],
+                            key=f"condition_{barcode}"
+                        )
+                        
+                        if return_qty > 0 and return_reason and condition:
+                            return_items[barcode] = {
+                                'name': item['name'],
+                                'quantity': return_qty,
+                                'price': item['price'],
+                                'subtotal': return_qty * item['price'],
+                                'reason': return_reason,
+                                'condition': condition
+                            }
+                            st.success(f"{return_qty} item(s) marked for return")
+        
+        # Step 3: Process return or exchange
+        if return_items:
+            st.subheader("Step 3: Process Return")
+            
+            # Calculate refund amounts
+            total_refund = sum(item['subtotal'] for item in return_items.values())
+            original_tax_rate = transaction['tax'] / transaction['subtotal'] if transaction['subtotal'] > 0 else 0
+            tax_refund = total_refund * original_tax_rate
+            total_refund_amount = total_refund + tax_refund
+            
+            st.write(f"**Subtotal Refund:** {format_currency(total_refund)}")
+            st.write(f"**Tax Refund:** {format_currency(tax_refund)}")
+            st.write(f"**Total Refund:** {format_currency(total_refund_amount)}")
+            
+            # Return/Exchange options
+            st.subheader("Return Options")
+            return_option = st.radio("Select Option", 
+                                   ["Refund", "Exchange", "Store Credit"], 
+                                   help="Choose how to handle the return")
+            
+            exchange_difference = 0
+            exchange_products = []  # Changed to list
+            exchange_subtotal = 0
+            exchange_tax = 0
+            exchange_total = 0
+            refund_method = None
+            
+            if return_option == "Exchange":
+                st.session_state.exchange_mode = True
+                st.session_state.exchange_cart = {}
+                
+                st.info("🔄 Exchange Mode: Select products for exchange")
+                
+                # Display products for exchange
+                products_data = load_data(PRODUCTS_FILE)
+                inventory_data = load_data(INVENTORY_FILE)
+                
+                # Filter available products
+                available_products = {}
+                for barcode, product in products_data.items():
+                    stock = inventory_data.get(barcode, {}).get('quantity', 0)
+                    if stock > 0 and product.get('active', True):
+                        available_products[barcode] = product
+                
+                # Product selection for exchange
+                st.subheader("Select Exchange Products")
+                
+                # Search and filter
+                col1, col2 = st.columns(2)
+                with col1:
+                    search_term = st.text_input("Search Products", placeholder="Product name or barcode")
+                with col2:
+                    categories = load_data(CATEGORIES_FILE).get('categories', [])
+                    selected_category = st.selectbox("Filter by Category", [""] + categories)
+                
+                # Filter products
+                filtered_products = {}
+                for barcode, product in available_products.items():
+                    matches_search = not search_term or (
+                        search_term.lower() in product['name'].lower() or 
+                        search_term.lower() in barcode.lower()
+                    )
+                    matches_category = not selected_category or product.get('category') == selected_category
+                    
+                    if matches_search and matches_category:
+                        filtered_products[barcode] = product
+                
+                # Display products in grid
+                if filtered_products:
+                    cols = st.columns(3)
+                    for idx, (barcode, product) in enumerate(filtered_products.items()):
+                        with cols[idx % 3]:
+                            with st.container():
+                                st.markdown(f"**{product['name']}**")
+                                st.write(f"Price: {format_currency(product['price'])}")
+                                
+                                stock = inventory_data.get(barcode, {}).get('quantity', 0)
+                                st.write(f"Stock: {stock}")
+                                
+                                # Add to exchange cart
+                                exchange_qty = st.number_input("Qty", 0, stock, 1, key=f"ex_qty_{barcode}")
+                                
+                                if st.button(f"Add to Exchange", key=f"add_ex_{barcode}", use_container_width=True):
+                                    if barcode in st.session_state.exchange_cart:
+                                        st.session_state.exchange_cart[barcode]['quantity'] += exchange_qty
+                                    else:
+                                        st.session_state.exchange_cart[barcode] = {
+                                            'name': product['name'],
+                                            'price': product['price'],
+                                            'quantity': exchange_qty
+                                        }
+                                    st.success(f"Added {exchange_qty} {product['name']} to exchange")
+                
+                # Display exchange cart
+                if st.session_state.exchange_cart:
+                    st.subheader("🛒 Exchange Cart")
+                    
+                    exchange_subtotal = 0
+                    for barcode, item in st.session_state.exchange_cart.items():
+                        col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+                        with col1:
+                            st.write(f"**{item['name']}**")
+                        with col2:
+                            st.write(f"Qty: {item['quantity']}")
+                        with col3:
+                            item_total = item['price'] * item['quantity']
+                            st.write(f"{format_currency(item_total)}")
+                        with col4:
+                            if st.button("❌", key=f"remove_ex_{barcode}"):
+                                del st.session_state.exchange_cart[barcode]
+                                st.rerun()
+                        
+                        exchange_subtotal += item_total
+                    
+                    # Calculate exchange tax and total
+                    exchange_tax = exchange_subtotal * tax_rate
+                    exchange_total = exchange_subtotal + exchange_tax
+                    
+                    st.write(f"**Exchange Subtotal:** {format_currency(exchange_subtotal)}")
+                    st.write(f"**Exchange Tax ({tax_rate*100}%):** {format_currency(exchange_tax)}")
+                    st.write(f"**Exchange Total:** {format_currency(exchange_total)}")
+                    
+                    # Calculate difference
+                    exchange_difference = exchange_total - total_refund_amount
+                    if exchange_difference > 0:
+                        st.warning(f"Customer needs to pay: {format_currency(exchange_difference)}")
+                    elif exchange_difference < 0:
+                        st.info(f"Customer gets refund: {format_currency(abs(exchange_difference))}")
+                    else:
+                        st.success("Even exchange - no payment needed")
+                    
+                    # Convert exchange cart to list format for storage
+                    exchange_products = [
+                        {
+                            'barcode': barcode,
+                            'name': item['name'],
+                            'price': item['price'],
+                            'quantity': item['quantity'],
+                            'subtotal': item['price'] * item['quantity']
+                        }
+                        for barcode, item in st.session_state.exchange_cart.items()
+                    ]
+            
+            # Payment method for refund or additional payment
+            if return_option in ["Refund", "Exchange"] and (return_option != "Exchange" or exchange_difference != 0):
+                st.subheader("Payment Details")
+                
+                if return_option == "Refund":
+                    refund_method = st.selectbox(
+                        "Refund Method",
+                        ["Original Payment Method", "Cash", "Store Credit"],
+                        index=0 if transaction['payment_method'] != "Cash" else 1
+                    )
+                else:  # Exchange
+                    if exchange_difference > 0:
+                        refund_method = st.selectbox(
+                            "Additional Payment Method",
+                            ["Cash", "Credit Card", "Debit Card", "Mobile Payment"],
+                            help="Customer needs to pay the difference"
+                        )
+                    else:
+                        refund_method = st.selectbox(
+                            "Refund Method for Difference",
+                            ["Cash", "Store Credit", "Original Payment Method"],
+                            help="Customer gets refund for the difference"
+                        )
+            
+            # Additional notes
+            return_notes = st.text_area("Additional Notes", placeholder="Any special instructions...")
+            
+            if st.button("Process Return", type="primary", use_container_width=True):
+                try:
+                    return_record = process_return(
+                        transaction_id,
+                        return_items,
+                        st.session_state.user_info['username'],
+                        return_option=return_option,
+                        refund_method=refund_method,
+                        exchange_products=exchange_products,
+                        notes=return_notes,
+                        shift_id=st.session_state.shift_id if st.session_state.shift_started else None
+                    )
+                except ServiceError as e:
+                    st.error(str(e))
+                    return
+                return_id = return_record['return_id']
+                
+                st.success(f"Return processed successfully! Return ID: {return_id}")
+                
+                # Show receipt and print options
+                return_receipt = generate_return_receipt(return_record)
+                st.subheader("Return Receipt")
+                st.text(return_receipt)
+                
+                # Print options
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    if st.button("🖨️ Print Receipt", key="print_return_btn"):
+                        st.session_state.print_receipt = True
+                        st.session_state.print_return_id = return_id
+                        st.rerun()
+                with col2:
+                    if st.button("📄 Download PDF", key="dl_pdf_return_btn"):
+                        download_pdf_receipt(return_record, "return")
+                with col3:
+                    st.download_button(
+                        label="📝 Download Text",
+                        data=return_receipt,
+                        file_name=f"return_receipt_{return_id}.txt",
+                        mime="text/plain",
+                        key="dl_txt_return_btn"
+                    )
+                
+                # Reset exchange state
+                st.session_state.exchange_mode = False
+                st.session_state.exchange_cart = {}
+        else:
+            st.info("No items selected for return")
+    elif transaction_id:
+        st.error("Transaction not found. Please check the Transaction ID.")
+
+def return_analytics_tab():
+    st.header("Return Analytics")
+    
+    returns = load_returns()
+    products = load_data(PRODUCTS_FILE)
+    
+    if not returns:
+        st.info("No return data available for analysis")
+        return
+    
+    # Date range selector
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30), key="analytics_start")
+    with col2:
+        end_date = st.date_input("End Date", value=datetime.date.today(), key="analytics_end")
+    
+    # Filter returns by date
+    filtered_returns = []
+    for return_data in returns.values():
+        try:
+            return_date = datetime.datetime.strptime(return_data['return_date'], "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= return_date <= end_date:
+                filtered_returns.append(return_data)
+        except (ValueError, KeyError):
+            continue
+    
+    if not filtered_returns:
+        st.info("No returns in selected date range")
+        return
+    
+    # Calculate analytics
+    total_returns = len(filtered_returns)
+    total_refund_amount = sum(r.get('total_refund', 0) for r in filtered_returns)
+    avg_refund = total_refund_amount / total_returns if total_returns > 0 else 0
+    
+    # Summary metrics
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Returns", total_returns)
+    col2.metric("Total Refund Amount", format_currency(total_refund_amount))
+    col3.metric("Average Refund", format_currency(avg_refund))
+    
+    # Return rate calculation (would need sales data)
+    st.subheader("Return Reasons")
+    return_reasons = {}
+    for return_data in filtered_returns:
+        reason = return_data.get('reason', 'Unknown')
+        return_reasons[reason] = return_reasons.get(reason, 0) + 1
+    
+    if return_reasons:
+        reasons_df = pd.DataFrame({
+            'Reason': list(return_reasons.keys()),
+            'Count': list(return_reasons.values())
+        }).sort_values('Count', ascending=False)
+        
+        st.bar_chart(reasons_df.set_index('Reason'))
+    
+    # Products with most returns
+    st.subheader("Most Returned Products")
+    product_returns = {}
+    for return_data in filtered_returns:
+        for barcode, item in return_data.get('items', {}).items():
+            product_name = products.get(barcode, {}).get('name', 'Unknown')
+            product_returns[product_name] = product_returns.get(product_name, 0) + item.get('quantity', 0)
+    
+    if product_returns:
+        product_df = pd.DataFrame({
+            'Product': list(product_returns.keys()),
+            'Return Quantity': list(product_returns.values())
+        }).sort_values('Return Quantity', ascending=False).head(10)
+        
+        st.bar_chart(product_df.set_index('Product'))
+    
+    # Refund methods
+    st.subheader("Refund Methods")
+    refund_methods = {}
+    for return_data in filtered_returns:
+        method = return_data.get('refund_method', 'Unknown')
+        refund_methods[method] = refund_methods.get(method, 0) + 1
+    
+    if refund_methods:
+        method_df = pd.DataFrame({
+            'Method': list(refund_methods.keys()),
+            'Count': list(refund_methods.values())
+        })
+        
+        st.bar_chart(method_df.set_index('Method'))
+
+def view_returns_tab():
+    st.header("View Returns")
+    
+    returns = load_returns()
+    
+    if not returns:
+        st.info("No returns processed yet")
+        return
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        date_filter = st.selectbox("Date Range", ["Last 7 days", "Last 30 days", "Last 90 days", "All time"], key="view_date_filter")
+    with col2:
+        status_filter = st.selectbox("Status", ["All", "completed", "pending_exchange", "cancelled", "exchange_processed"], key="view_status_filter")
+    with col3:
+        refund_filter = st.selectbox("Refund Method", ["All", "Cash", "Store Credit", "Original Payment Method", "Exchange"], key="view_refund_filter")
+    
+    # Apply filters
+    filtered_returns = []
+    for return_id, return_data in returns.items():
+        # Date filter
+        return_date = datetime.datetime.strptime(return_data['return_date'], "%Y-%m-%d %H:%M:%S")
+        if date_filter == "Last 7 days" and return_date < datetime.datetime.now() - datetime.timedelta(days=7):
+            continue
+        if date_filter == "Last 30 days" and return_date < datetime.datetime.now() - datetime.timedelta(days=30):
+            continue
+        if date_filter == "Last 90 days" and return_date < datetime.datetime.now() - datetime.timedelta(days=90):
+            continue
+        
+        # Status filter
+        if status_filter != "All" and return_data.get('status', 'completed') != status_filter:
+            continue
+        
+        # Refund method filter
+        if refund_filter != "All" and return_data.get('refund_method') != refund_filter:
+            continue
+        
+        filtered_returns.append((return_id, return_data))
+    
+    # Sort by date
+    filtered_returns.sort(key=lambda x: x[1]['return_date'], reverse=True)
+    
+    if not filtered_returns:
+        st.info("No returns match the selected filters")
+        return
+    
+    # Display returns
+    for return_id, return_data in filtered_returns:
+        with st.expander(f"Return #{return_id} - {format_currency(return_data.get('total_refund', 0))} - {return_data['return_date']}"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Original Transaction:** {return_data['transaction_id']}")
+                st.write(f"**Date Processed:** {return_data['return_date']}")
+                st.write(f"**Processed by:** {return_data['processed_by']}")
+                st.write(f"**Refund Method:** {return_data['refund_method']}")
+                st.write(f"**Status:** {return_data.get('status', 'completed').title()}")
+            
+            with col2:
+                st.write(f"**Subtotal Refund:** {format_currency(return_data.get('subtotal_refund', 0))}")
+                st.write(f"**Tax Refund:** {format_currency(return_data.get('tax_refund', 0))}")
+                st.write(f"**Total Refund:** {format_currency(return_data.get('total_refund', 0))}")
+                st.write(f"**Reason:** {return_data.get('reason', 'N/A')}")
+            
+            # Exchange details if any - FIXED: Handle list format
+            if 'exchange_products' in return_data and return_data['exchange_products']:
+                st.write("**Exchange Items:**")
+                # Handle list format for exchange products
+                for item in return_data['exchange_products']:
+                    st.write(f"- {item.get('name', 'Unknown')} x{item.get('quantity', 0)} @ {format_currency(item.get('price', 0))}")
+                
+                if 'exchange_difference' in return_data:
+                    difference = return_data['exchange_difference']
+                    if difference > 0:
+                        st.write(f"**Additional Payment:** {format_currency(difference)}")
+                    elif difference < 0:
+                        st.write(f"**Refund Given:** {format_currency(abs(difference))}")
+            
+            # Items details
+            st.write("**Returned Items:**")
+            for barcode, item in return_data['items'].items():
+                st.write(f"- {item['name']} x{item['quantity']} ({item.get('condition', 'N/A')}) - {format_currency(item.get('subtotal', 0))}")
+            
+            # Actions
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("View Receipt", key=f"view_{return_id}"):
+                    receipt_text = generate_return_receipt(return_data)
+                    st.text_area("Receipt Content", receipt_text, height=200, key=f"receipt_{return_id}")
+            
+            with col2:
+                if st.button("Print Receipt", key=f"print_{return_id}"):
+                    st.session_state.print_receipt = True
+                    st.session_state.print_return_id = return_id
+                    st.rerun()
+            
+            with col3:
+                if is_manager() and return_data.get('status') == 'pending_exchange':
+                    if st.button("Complete Exchange", key=f"complete_{return_id}"):
+                        # The updated record is appended; the log's last line for a return wins
+                        with data_transaction():
+                            completed = dict(return_data, status='completed',
+                                             exchange_completed_date=get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"))
+                            append_return(completed)
+                            record_return(completed)
+                        st.success("Exchange marked as completed")
+                        st.rerun()
+
+def refund_history_tab():
+    st.header("Refund History")
+    
+    returns = load_returns()
+    
+    if not returns:
+        st.info("No refunds processed yet")
+        return
+    
+    # Date range filter
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30), key="refund_start")
+    with col2:
+        end_date = st.date_input("End Date", value=datetime.date.today(), key="refund_end")
+    
+    # Filter returns by date
+    filtered_returns = []
+    for return_data in returns.values():
+        return_date = datetime.datetime.strptime(return_data['return_date'], "%Y-%m-%d %H:%M:%S").date()
+        if start_date <= return_date <= end_date:
+            filtered_returns.append(return_data)
+    
+    if not filtered_returns:
+        st.info("No refunds in selected date range")
+        return
+    
+    # Summary statistics
+    total_refunds = len(filtered_returns)
+    total_amount = sum(r['total_refund'] for r in filtered_returns)
+    avg_refund = total_amount / total_refunds if total_refunds > 0 else 0
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Refunds", total_refunds)
+    with col2:
+        st.metric("Total Amount", format_currency(total_amount))
+    with col3:
+        st.metric("Average Refund", format_currency(avg_refund))
+    with col4:
+        pending = sum(1 for r in filtered_returns if r['status'] == "Pending")
+        st.metric("Pending", pending)
+    
+    # Refund method breakdown
+    st.subheader("Refund Method Breakdown")
+    method_counts = {}
+    for return_data in filtered_returns:
+        method = return_data['refund_method']
+        method_counts[method] = method_counts.get(method, 0) + 1
+    
+    method_df = pd.DataFrame({
+        'Method': list(method_counts.keys()),
+        'Count': list(method_counts.values())
+    })
+    st.bar_chart(method_df.set_index('Method'))
+    
+    # Detailed list
+    st.subheader("Refund Details")
+    for return_data in filtered_returns:
+        with st.expander(f"Return #{return_data['return_id']} - {format_currency(return_data['total_refund'])} - {return_data['status']}"):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**Date:** {return_data['return_date']}")
+                st.write(f"**Original Transaction:** {return_data['transaction_id']}")
+                st.write(f"**Processed by:** {return_data['processed_by']}")
+            with col2:
+                st.write(f"**Refund Method:** {return_data['refund_method']}")
+                st.write(f"**Reason:** {return_data['reason']}")
+                st.write(f"**Status:** {return_data['status']}")
+
+def print_return_receipt(return_id):
+    """Handle return receipt printing"""
+    returns_data = load_returns()
+    
+    if return_id in returns_data:
+        return_data = returns_data[return_id]
+        receipt_text = generate_return_receipt(return_data)
+        
+        st.title("🖨️ Print Return Receipt")
+        
+        # Display the receipt content
+        st.text_area("Receipt Content", receipt_text, height=300, key="receipt_display")
+        
+        # Print options
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if st.button("🖨️ Browser Print", use_container_width=True):
+                print_receipt_browser(receipt_text, "Return Receipt")
+        
+        with col2:
+            if st.button("📄 Download PDF", use_container_width=True):
+                download_pdf_receipt(return_data, "return")
+        
+        with col3:
+            st.download_button(
+                label="📝 Download Text",
+                data=receipt_text,
+                file_name=f"return_receipt_{return_id}.txt",
+                mime="text/plain",
+                key="download_return_txt"
+            )
+        
+        # Back button
+        if st.button("← Back to Returns", use_container_width=True):
+            st.session_state.print_receipt = None
+            st.session_state.print_return_id = None
+            st.rerun()
+    else:
+        st.error("Return not found")
+        if st.button("← Back to Returns"):
+            st.session_state.print_receipt = None
+            st.session_state.print_return_id = None
+            st.rerun()
+
+def print_receipt_browser(receipt_text, title="Receipt"):
+    """Print receipt using browser's print functionality"""
+    js_code = f"""
+    <script>
+    function printReceipt() {{
+        const printWindow = window.open('', '_blank', 'width=400,height=600');
+        const htmlContent = `
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>{title}</title>
+            <style>
+                body {{
+                    font-family: 'Courier New', monospace;
+                    font-size: 12px;
+                    padding: 10px;
+                    line-height: 1.2;
+                }}
+                .receipt {{
+                    white-space: pre-wrap;
+                    word-wrap: break-word;
+                }}
+                @media print {{
+                    body {{
+                        margin: 0;
+                        padding: 10px;
+                    }}
+                    .no-print {{
+                        display: none !important;
+                    }}
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="receipt">{receipt_text}</div>
+        </body>
+        </html>
+        `;
+        
+        printWindow.document.write(htmlContent);
+        printWindow.document.close();
+        
+        printWindow.onload = function() {{
+            printWindow.print();
+            setTimeout(() => printWindow.close(), 500);
+        }};
+    }}
+    
+    setTimeout(printReceipt, 100);
+    </script>
+    """
+    
+    st.components.v1.html(js_code, height=0)
+
+def download_pdf_receipt(return_data, receipt_type="return"):
+    """Download PDF receipt for returns"""
+    try:
+        import fpdf as FPDF
+        pdf = FPDF.FPDF(format=(80, 200))
+        pdf.add_page()
+        pdf.set_font("Courier", size=10)
+        
+        # Store header
+        settings = load_data(SETTINGS_FILE)
+        pdf.cell(0, 5, settings.get('store_name', 'SUPERMARKET POS'), 0, 1, 'C')
+        pdf.set_font("Courier", size=8)
+        pdf.cell(0, 4, settings.get('store_address', ''), 0, 1, 'C')
+        pdf.cell(0, 4, f"Tel: {settings.get('store_phone', '')}", 0, 1, 'C')
+        
+        pdf.ln(2)
+        pdf.set_font("Courier", size=10)
+        
+        if receipt_type == "return":
+            pdf.cell(0, 5, "RETURN RECEIPT", 0, 1, 'C')
+        else:
+            pdf.cell(0, 5, "EXCHANGE RECEIPT", 0, 1, 'C')
+            
+        pdf.line(10, pdf.get_y(), 70, pdf.get_y())
+        pdf.ln(2)
+        
+        # Return information
+        pdf.cell(0, 4, f"Return #: {return_data.get('return_id', 'N/A')}", 0, 1)
+        pdf.cell(0, 4, f"Original Trans: {return_data.get('transaction_id', 'N/A')}", 0, 1)
+        pdf.cell(0, 4, f"Date: {return_data.get('return_date', 'N/A')}", 0, 1)
+        pdf.cell(0, 4, f"Processed by: {return_data.get('processed_by', 'N/A')}", 0, 1)
+        pdf.line(10, pdf.get_y(), 70, pdf.get_y())
+        pdf.ln(2)
+        
+        # Returned items
+        pdf.cell(0, 4, "RETURNED ITEMS:", 0, 1)
+        pdf.line(10, pdf.get_y(), 70, pdf.get_y())
+        
+        for barcode, item in return_data.get('items', {}).items():
+            name = item.get('name', 'Unknown')[:18] + ('..' if len(item.get('name', '')) > 18 else '')
+            pdf.cell(30, 4, name, 0, 0)
+            pdf.cell(15, 4, f"x{item.get('quantity', 0)}", 0, 0, 'R')
+            pdf.cell(25, 4, format_currency(item.get('subtotal', 0)), 0, 1, 'R')
+        
+        pdf.line(10, pdf.get_y(), 70, pdf.get_y())
+        pdf.ln(2)
+        
+        # Exchange products if any - FIXED: Handle list format
+        if 'exchange_products' in return_data and return_data['exchange_products']:
+            pdf.cell(0, 4, "EXCHANGE ITEMS:", 0, 1)
+            pdf.line(10, pdf.get_y(), 70, pdf.get_y())
+            
+            # Handle list format for exchange products
+            for item in return_data['exchange_products']:
+                name = item.get('name', 'Unknown')[:18] + ('..' if len(item.get('name', '')) > 18 else '')
+                item_total = item.get('price', 0) * item.get('quantity', 0)
+                pdf.cell(30, 4, name, 0, 0)
+                pdf.cell(15, 4, f"x{item.get('quantity', 0)}", 0, 0, 'R')
+                pdf.cell(25, 4, format_currency(item_total), 0, 1, 'R')
+            
+            pdf.line(10, pdf.get_y(), 70, pdf.get_y())
+            pdf.ln(2)
+            
+            # Exchange totals
+            if 'exchange_subtotal' in return_data:
+                pdf.cell(45, 4, "Exchange Subtotal:", 0, 0)
+                pdf.cell(25, 4, format_currency(return_data.get('exchange_subtotal', 0)), 0, 1, 'R')
+                
+                pdf.cell(45, 4, "Exchange Tax:", 0, 0)
+                pdf.cell(25, 4, format_currency(return_data.get('exchange_tax', 0)), 0, 1, 'R')
+                
+                pdf.cell(45, 4, "Exchange Total:", 0, 0)
+                pdf.cell(25, 4, format_currency(return_data.get('exchange_total', 0)), 0, 1, 'R')
+            
+            # Exchange difference
+            if 'exchange_difference' in return_data:
+                difference = return_data.get('exchange_difference', 0)
+                if difference > 0:
+                    pdf.cell(45, 4, "Additional Payment:", 0, 0)
+                    pdf.cell(25, 4, format_currency(difference), 0, 1, 'R')
+                elif difference < 0:
+                    pdf.cell(45, 4, "Refund Due:", 0, 0)
+                    pdf.cell(25, 4, format_currency(abs(difference)), 0, 1, 'R')
+        
+        # Totals
+        pdf.cell(45, 4, "Subtotal Refund:", 0, 0)
+        pdf.cell(25, 4, format_currency(return_data.get('subtotal_refund', 0)), 0, 1, 'R')
+        
+        pdf.cell(45, 4, "Tax Refund:", 0, 0)
+        pdf.cell(25, 4, format_currency(return_data.get('tax_refund', 0)), 0, 1, 'R')
+        
+        pdf.set_font("Courier", 'B', 10)
+        pdf.cell(45, 5, "TOTAL REFUND:", 0, 0)
+        pdf.cell(25, 5, format_currency(return_data.get('total_refund', 0)), 0, 1, 'R')
+        
+        pdf.set_font("Courier", size=8)
+        pdf.cell(0, 4, f"Method: {return_data.get('refund_method', 'N/A')}", 0, 1)
+        pdf.cell(0, 4, f"Reason: {return_data.get('reason', 'N/A')}", 0, 1)
+        
+        pdf_data = pdf.output(dest='S').encode('latin1')
+        
+        st.download_button(
+            label="📄 Download PDF Receipt",
+            data=pdf_data,
+            file_name=f"return_receipt_{return_data.get('return_id', 'unknown')}.pdf",
+            mime="application/pdf",
+            key=f"dl_pdf_{return_data.get('return_id', 'unknown')}"
+        )
+        return True
+        
+    except Exception as e:
+        st.error(f"PDF creation failed: {str(e)}")
+        return False
+
+def generate_return_receipt(return_data):
+    settings = load_data(SETTINGS_FILE)
+    receipt = []
+    
+    # Header
+    receipt.append("=" * 50)
+    receipt.append(f"{settings.get('store_name', 'SUPERMARKET POS').center(50)}")
+    receipt.append(f"{settings.get('store_address', '').center(50)}")
+    receipt.append(f"Tel: {settings.get('store_phone', '').center(50)}")
+    receipt.append("=" * 50)
+    
+    if 'exchange_products' in return_data:
+        receipt.append("EXCHANGE RECEIPT".center(50))
+    else:
+        receipt.append("RETURN RECEIPT".center(50))
+    
+    receipt.append("=" * 50)
+    
+    # Return information
+    receipt.append(f"Return ID: {return_data['return_id']}")
+    receipt.append(f"Original Transaction: {return_data['transaction_id']}")
+    receipt.append(f"Date: {return_data['return_date']}")
+    receipt.append(f"Processed by: {return_data['processed_by']}")
+    receipt.append(f"Reason: {return_data['reason']}")
+    receipt.append("-" * 50)
+    
+    # Returned items
+    receipt.append("RETURNED ITEMS:")
+    receipt.append("-" * 50)
+    receipt.append(f"{'ITEM'.ljust(30)}{'QTY'.rjust(5)}{'AMOUNT'.rjust(15)}")
+    receipt.append("-" * 50)
+    
+    for barcode, item in return_data['items'].items():
+        name = item['name'][:28] + ('..' if len(item['name']) > 28 else '')
+        receipt.append(f"{name.ljust(30)}{str(item['quantity']).rjust(5)}{format_currency(item['subtotal']).rjust(15)}")
+    
+    # Exchange items if any - FIXED: Handle list format
+    if 'exchange_products' in return_data and return_data['exchange_products']:
+        receipt.append("-" * 50)
+        receipt.append("EXCHANGE ITEMS:")
+        receipt.append("-" * 50)
+        receipt.append(f"{'ITEM'.ljust(30)}{'QTY'.rjust(5)}{'AMOUNT'.rjust(15)}")
+        receipt.append("-" * 50)
+        
+        # Handle list format for exchange products
+        for item in return_data['exchange_products']:
+            name = item['name'][:28] + ('..' if len(item['name']) > 28 else '')
+            item_total = item['price'] * item['quantity']
+            receipt.append(f"{name.ljust(30)}{str(item['quantity']).rjust(5)}{format_currency(item_total).rjust(15)}")
+    
+    # Totals
+    receipt.append("-" * 50)
+    receipt.append(f"{'Subtotal Refund:'.ljust(35)}{format_currency(return_data['total_refund'] - return_data.get('tax_refund', 0)).rjust(15)}")
+    receipt.append(f"{'Tax Refund:'.ljust(35)}{format_currency(return_data.get('tax_refund', 0)).rjust(15)}")
+    
+    # Exchange totals if any
+    if 'exchange_subtotal' in return_data:
+        receipt.append("-" * 50)
+        receipt.append("EXCHANGE TOTALS:")
+        receipt.append(f"{'Exchange Subtotal:'.ljust(35)}{format_currency(return_data.get('exchange_subtotal', 0)).rjust(15)}")
+        receipt.append(f"{'Exchange Tax:'.ljust(35)}{format_currency(return_data.get('exchange_tax', 0)).rjust(15)}")
+        receipt.append(f"{'Exchange Total:'.ljust(35)}{format_currency(return_data.get('exchange_total', 0)).rjust(15)}")
+    
+    # Exchange difference
+    if 'exchange_difference' in return_data:
+        difference = return_data['exchange_difference']
+        if difference > 0:
+            receipt.append(f"{'Additional Payment:'.ljust(35)}{format_currency(difference).rjust(15)}")
+        elif difference < 0:
+            receipt.append(f"{'Refund Due:'.ljust(35)}{format_currency(abs(difference)).rjust(15)}")
+    
+    receipt.append("=" * 50)
+    receipt.append(f"{'TOTAL REFUND:'.ljust(35)}{format_currency(return_data['total_refund']).rjust(15)}")
+    receipt.append("=" * 50)
+    
+    # Payment information
+    receipt.append(f"Refund Method: {return_data['refund_method']}")
+    receipt.append(f"Status: {return_data['status'].replace('_', ' ').title()}")
+    receipt.append("-" * 50)
+    
+    # Footer
+    if settings.get('receipt_footer', ''):
+        receipt.append(settings['receipt_footer'])
+    receipt.append("Thank you for your business!".center(50))
+    receipt.append("=" * 50)
+    
+    return "\n".join(receipt)
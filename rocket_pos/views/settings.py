@@ -0,0 +1,357 @@
+"""System settings."""
+
+import streamlit as st
+import os
+import pytz
+
+from rocket_pos.core import DATA_DIR, SETTINGS_FILE, is_admin, load_data, save_data
+from rocket_pos.hardware import (
+    barcode_scanner,
+    get_available_com_ports,
+    print_receipt,
+    setup_barcode_scanner,
+)
+from rocket_pos.scanning import RECEIPT_BARCODES, ScanError, scan_settings, scan_video
+
+# System Settings
+def system_settings():
+    if not is_admin():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("System Settings")
+    
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+        "Store Settings", "POS Configuration", "Tax Settings", 
+        "Printer Settings", "Hardware Settings", "Payment Charges"
+    ])
+    
+    with tab1:
+        st.header("Store Information")
+        
+        settings = load_data(SETTINGS_FILE)
+        
+        with st.form("store_settings_form"):
+            store_name = st.text_input("Store Name", value=settings.get('store_name', ''))
+            store_address = st.text_area("Store Address", value=settings.get('store_address', ''))
+            store_phone = st.text_input("Store Phone", value=settings.get('store_phone', ''))
+            store_email = st.text_input("Store Email", value=settings.get('store_email', ''))
+            
+            logo = st.file_uploader("Store Logo", type=['jpg', 'png', 'jpeg'])
+            if logo and 'logo' in settings and os.path.exists(settings['logo']):
+                st.image(settings['logo'], width=150)
+            
+            receipt_header = st.text_area("Receipt Header Text", value=settings.get('receipt_header', ''))
+            receipt_footer = st.text_area("Receipt Footer Text", value=settings.get('receipt_footer', ''))
+            print_logo = st.checkbox("Print Logo on Receipt", value=settings.get('receipt_print_logo', False))
+            barcode_labels = list(RECEIPT_BARCODES.values())
+            receipt_barcode = st.selectbox(
+                "Transaction ID Barcode on Receipt",
+                barcode_labels,
+                index=list(RECEIPT_BARCODES).index(settings.get('receipt_barcode', 'both')),
+                help="Code128 is read by handheld scanners, QR by cameras (Returns scan-to-lookup)"
+            )
+            
+            if st.form_submit_button("Save Store Settings"):
+                settings['store_name'] = store_name
+                settings['store_address'] = store_address
+                settings['store_phone'] = store_phone
+                settings['store_email'] = store_email
+                settings['receipt_header'] = receipt_header
+                settings['receipt_footer'] = receipt_footer
+                settings['receipt_print_logo'] = print_logo
+                settings['receipt_barcode'] = list(RECEIPT_BARCODES)[barcode_labels.index(receipt_barcode)]
+                
+                if logo:
+                    # Remove old logo if exists
+                    if 'logo' in settings and os.path.exists(settings['logo']):
+                        os.remove(settings['logo'])
+                    
+                    # Save new logo
+                    logo_path = os.path.join(DATA_DIR, f"store_logo.{logo.name.split('.')[-1]}")
+                    with open(logo_path, 'wb') as f:
+                        f.write(logo.getbuffer())
+                    settings['logo'] = logo_path
+                
+                save_data(settings, SETTINGS_FILE)
+                st.success("Store settings saved successfully")
+    
+    with tab2:
+        st.header("POS Configuration")
+        
+        settings = load_data(SETTINGS_FILE)
+        
+        with st.form("pos_config_form"):
+            receipt_template = st.selectbox(
+                "Receipt Template",
+                ["Simple", "Detailed", "Modern"],
+                index=["Simple", "Detailed", "Modern"].index(settings.get('receipt_template', 'Simple'))
+            )
+            
+            theme = st.selectbox(
+                "Theme",
+                ["Light", "Dark", "Blue"],
+                index=["Light", "Dark", "Blue"].index(settings.get('theme', 'Light'))
+            )
+            
+            timeout = st.number_input(
+                "Session Timeout (minutes)",
+                min_value=1,
+                max_value=120,
+                value=settings.get('session_timeout', 30)
+            )
+            
+            timezone = st.selectbox(
+                "Timezone",
+                pytz.all_timezones,
+                index=pytz.all_timezones.index(settings.get('timezone', 'UTC'))
+            )
+            
+            currency_symbol = st.text_input(
+                "Currency Symbol",
+                value=settings.get('currency_symbol', '$')
+            )
+            
+            decimal_places = st.number_input(
+                "Decimal Places",
+                min_value=0,
+                max_value=4,
+                value=settings.get('decimal_places', 2)
+            )
+            
+            auto_logout = st.checkbox(
+                "Enable Auto Logout",
+                value=settings.get('auto_logout', True)
+            )
+            
+            if st.form_submit_button("Save POS Configuration"):
+                settings['receipt_template'] = receipt_template
+                settings['theme'] = theme
+                settings['session_timeout'] = timeout
+                settings['timezone'] = timezone
+                settings['currency_symbol'] = currency_symbol
+                settings['decimal_places'] = decimal_places
+                settings['auto_logout'] = auto_logout
+                save_data(settings, SETTINGS_FILE)
+                st.success("POS configuration saved successfully")
+                st.rerun()  # Refresh to apply theme changes
+    
+    with tab3:
+        st.header("Tax Settings")
+        
+        settings = load_data(SETTINGS_FILE)
+        
+        with st.form("tax_settings_form"):
+            tax_rate = st.number_input(
+                "Tax Rate (%)",
+                min_value=0.0,
+                max_value=25.0,
+                value=settings.get('tax_rate', 0.0) * 100,
+                step=0.1
+            )
+            
+            tax_inclusive = st.checkbox(
+                "Prices Include Tax",
+                value=settings.get('tax_inclusive', False)
+            )
+            
+            if st.form_submit_button("Save Tax Settings"):
+                settings['tax_rate'] = tax_rate / 100
+                settings['tax_inclusive'] = tax_inclusive
+                save_data(settings, SETTINGS_FILE)
+                st.success("Tax settings saved successfully")
+    
+   # In the System Settings section (tab4), replace the printer settings with:
+
+    with tab4:
+       st.header("Printer Settings")
+    
+       settings = load_data(SETTINGS_FILE)
+    
+       with st.form("printer_settings_form"):
+         printer_name = st.text_input(
+            "Printer Name (for reference only)",
+            value=settings.get('printer_name', 'Browser Printer')
+         )
+        
+         test_print = st.text_area("Test Receipt Text", 
+                                value="POS System Test Receipt\n====================\nTest Line 1\nTest Line 2\n====================")
+        
+         col1, col2 = st.columns(2)
+         with col1:
+            if st.form_submit_button("Save Printer Settings"):
+                settings['printer_name'] = printer_name
+                save_data(settings, SETTINGS_FILE)
+                st.success("Printer settings saved successfully")
+         with col2:
+            if st.form_submit_button("Test Print"):
+                if print_receipt(test_print):
+                    st.success("Test receipt printed successfully")
+                else:
+                    st.error("Failed to print test receipt")
+    
+   # In the system_settings function, replace the hardware settings section with:
+
+    with tab5:
+     st.header("Hardware Settings")
+    
+     settings = load_data(SETTINGS_FILE)
+     com_ports = get_available_com_ports()
+    
+     with st.form("hardware_settings_form"):
+        barcode_scanner_type = st.selectbox(
+            "Barcode Scanner Type",
+            ["Keyboard", "Serial Scanner"],
+            index=0 if settings.get('barcode_scanner', 'keyboard') == 'keyboard' else 1
+        )
+        
+        barcode_scanner_port = st.selectbox(
+            "Barcode Scanner Port (for serial scanners)",
+            com_ports,
+            index=com_ports.index(settings.get('barcode_scanner_port', 'auto'))
+        )
+        
+        cash_drawer_enabled = st.checkbox(
+            "Enable Cash Drawer",
+            value=settings.get('cash_drawer_enabled', False)
+        )
+        
+        cash_drawer_command = st.text_input(
+            "Cash Drawer Command",
+            value=settings.get('cash_drawer_command', '')
+        )
+        
+        st.subheader("Camera Scanning")
+        camera_source = st.text_input(
+            "Local Camera / Video Source",
+            value=settings.get('camera_source', '0'),
+            help="Camera index (0 = first camera), video file path or stream URL"
+        )
+        scan = scan_settings(settings)
+        col1, col2 = st.columns(2)
+        with col1:
+            scan_frame_skip = st.number_input("Frames to Skip Between Decodes", min_value=0, max_value=30,
+                                              value=scan['frame_skip'], step=1)
+            scan_roi = st.slider("Scan Region (centre of frame)", min_value=0.2, max_value=1.0,
+                                 value=float(scan['roi']), step=0.05)
+        with col2:
+            scan_max_width = st.number_input("Downscale Frames to Width (px)", min_value=160, max_value=3840,
+                                             value=scan['max_width'], step=80)
+            scan_workers = st.number_input("Decoder Threads", min_value=1, max_value=16,
+                                           value=scan['workers'], step=1)
+        
+        if st.form_submit_button("Save Hardware Settings"):
+            # Stop any existing scanner
+            if 'barcode_scanner' in globals() and hasattr(barcode_scanner, 'stop_scanning'):
+                barcode_scanner.stop_scanning()
+            
+            # Update settings
+            settings['barcode_scanner'] = barcode_scanner_type.lower().replace(' ', '_')
+            settings['barcode_scanner_port'] = barcode_scanner_port
+            settings['cash_drawer_enabled'] = cash_drawer_enabled
+            settings['cash_drawer_command'] = cash_drawer_command
+            settings['camera_source'] = camera_source
+            settings['scan_frame_skip'] = scan_frame_skip
+            settings['scan_roi'] = scan_roi
+            settings['scan_max_width'] = scan_max_width
+            settings['scan_workers'] = scan_workers
+            save_data(settings, SETTINGS_FILE)
+            
+            # Reinitialize scanner with new settings
+            setup_barcode_scanner()
+            st.success("Hardware settings saved successfully")
+     
+     with st.expander("📈 Benchmark Camera Scanning"):
+        st.write("Decode a recorded video with the settings above and report the frames per second.")
+        video_path = st.text_input("Video File", placeholder="e.g. /path/to/receipt_scan.avi")
+        if st.button("Run Benchmark") and video_path:
+            try:
+                with st.spinner("Decoding video..."):
+                    result = scan_video(video_path, stop_on_first=False, **scan_settings(load_data(SETTINGS_FILE)))
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Frames per Second", f"{result['fps']:.1f}")
+                col2.metric("Frames Decoded", f"{result['frames_decoded']} / {result['frames_read']}")
+                col3.metric("Time", f"{result['seconds']:.2f}s")
+                st.write(f"Codes found: {', '.join(result['codes']) or 'none'}")
+            except ScanError as e:
+                st.error(str(e))
+    with tab6:
+        st.header("Payment Charges Configuration")
+        
+        settings = load_data(SETTINGS_FILE)
+        payment_charges = settings.get('payment_charges', {
+            "cash": 0.0,
+            "credit_card": 2.0,
+            "debit_card": 1.0,
+            "mobile_payment": 1.5,
+            "bank_transfer": 0.5,
+            "international_card": 3.0
+        })
+        
+        with st.form("payment_charges_form"):
+            st.subheader("Payment Method Charges (%)")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                cash_charge = st.number_input(
+                    "Cash Charge",
+                    min_value=0.0,
+                    max_value=10.0,
+                    value=payment_charges.get('cash', 0.0),
+                    step=0.1,
+                    help="Percentage charge for cash payments (usually 0%)"
+                )
+                credit_card_charge = st.number_input(
+                    "Credit Card Charge",
+                    min_value=0.0,
+                    max_value=10.0,
+                    value=payment_charges.get('credit_card', 2.0),
+                    step=0.1,
+                    help="Percentage charge for credit card payments"
+                )
+                debit_card_charge = st.number_input(
+                    "Debit Card Charge",
+                    min_value=0.0,
+                    max_value=10.0,
+                    value=payment_charges.get('debit_card', 1.0),
+                    step=0.1,
+                    help="Percentage charge for debit card payments"
+                )
+            
+            with col2:
+                mobile_payment_charge = st.number_input(
+                    "Mobile Payment Charge",
+                    min_value=0.0,
+                    max_value=10.0,
+                    value=payment_charges.get('mobile_payment', 1.5),
+                    step=0.1,
+                    help="Percentage charge for mobile payments (Apple Pay, Google Pay, etc.)"
+                )
+                bank_transfer_charge = st.number_input(
+                    "Bank Transfer Charge",
+                    min_value=0.0,
+                    max_value=10.0,
+                    value=payment_charges.get('bank_transfer', 0.5),
+                    step=0.1,
+                    help="Percentage charge for bank transfers"
+                )
+                international_card_charge = st.number_input(
+                    "International Card Charge",
+                    min_value=0.0,
+                    max_value=10.0,
+                    value=payment_charges.get('international_card', 3.0),
+                    step=0.1,
+                    help="Percentage charge for international credit/debit cards"
+                )
+            
+            if st.form_submit_button("Save Payment Charges"):
+                settings['payment_charges'] = {
+                    'cash': cash_charge,
+                    'credit_card': credit_card_charge,
+                    'debit_card': debit_card_charge,
+                    'mobile_payment': mobile_payment_charge,
+                    'bank_transfer': bank_transfer_charge,
+                    'international_card': international_card_charge
+                }
+                save_data(settings, SETTINGS_FILE)
+                st.success("Payment charges saved successfully")
@@ -0,0 +1,448 @@
+"""Shifts management."""
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from rocket_pos import cash_ledger
+from rocket_pos.core import (
+    format_currency,
+    is_cashier,
+)
+from rocket_pos.hardware import open_cash_drawer
+from rocket_pos.shifts import (
+    calculate_shift_duration,
+    empty_shift_totals,
+    end_shift,
+    force_end_shift,
+    load_shifts,
+    shift_transactions,
+    start_shift,
+)
+
+# Shifts Management
+def shifts_management():
+    if is_cashier() and not st.session_state.shift_started:
+        # Cashier view - shift start form in sidebar
+        st.sidebar.subheader("Shift Management")
+        
+        with st.sidebar.form("start_shift_form"):
+            st.write("**Starting Cash**")
+            starting_cash = st.number_input("Enter starting cash amount", min_value=0.0, value=0.0, step=1.0, key="start_cash_input")
+            
+            # Quick amount buttons (using form_submit_button for each)
+            st.write("Quick amounts:")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.form_submit_button("$100", use_container_width=True):
+                    st.session_state.start_cash_input = 100.0
+                    st.rerun()
+            with col2:
+                if st.form_submit_button("$200", use_container_width=True):
+                    st.session_state.start_cash_input = 200.0
+                    st.rerun()
+            with col3:
+                if st.form_submit_button("Clear", use_container_width=True):
+                    st.session_state.start_cash_input = 0.0
+                    st.rerun()
+            
+            # Cash drawer check
+            check_drawer = st.checkbox("I have physically counted the cash drawer", value=False)
+            
+            # Main submit button
+            if st.form_submit_button("🚀 Start New Shift", type="primary", use_container_width=True):
+                if not check_drawer:
+                    st.sidebar.error("Please confirm you've physically counted the cash drawer")
+                else:
+                    start_shift(starting_cash)
+                    st.sidebar.success("Shift started successfully")
+                    st.rerun()
+        
+        # Cash drawer button in sidebar (outside the form)
+        if st.button("💰 FORCE OPEN CASH DRAWER", type="secondary", use_container_width=True):
+           if open_cash_drawer():
+             st.success("Cash drawer opened")
+           else:
+               st.success("Failed to open cash drawer - try manual methods")
+    
+    st.title("Shifts Management")
+    
+    shifts = load_shifts()
+    
+    if is_cashier():
+        # Cashier view - only show their shifts
+        user_shifts = [s for s in shifts.values() if s['user_id'] == st.session_state.user_info['username']]
+        user_shifts = sorted(user_shifts, key=lambda x: x['start_time'], reverse=True)
+        
+        st.header("Your Shifts")
+        
+        if not user_shifts:
+            st.info("No shifts recorded")
+        else:
+            # Display shifts
+            for shift in user_shifts:
+                with st.expander(f"Shift {shift['start_time']} - {shift['status']}"):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**Start Time:** {shift['start_time']}")
+                        st.write(f"**End Time:** {shift.get('end_time', 'Still active')}")
+                        st.write(f"**Status:** {shift['status']}")
+                    with col2:
+                        st.write(f"**Starting Cash:** {format_currency(shift.get('starting_cash', 0))}")
+                        st.write(f"**Ending Cash:** {format_currency(shift.get('ending_cash', 0))}")
+                        if shift['status'] == 'completed':
+                            st.write(f"**Net Cash:** {format_currency(shift.get('ending_cash', 0) - shift.get('starting_cash', 0))}")
+        
+        # Current shift management
+        st.header("Current Shift")
+        
+        if st.session_state.shift_started:
+            current_shift = shifts.get(st.session_state.shift_id, {})
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.info(f"**Started at:** {current_shift.get('start_time', 'N/A')}")
+                st.info(f"**Starting Cash:** {format_currency(current_shift.get('starting_cash', 0))}")
+            
+            # Current cash from the shift's running totals
+            totals = current_shift.get('totals', empty_shift_totals())
+            
+            with col2:
+                st.success(f"**Current Cash:** {format_currency(totals['cash_total'])}")
+                st.success(f"**Cash Transactions:** {totals['cash_count']}")
+            
+            with col3:
+                # Quick actions
+                if st.button("📋 Shift Summary", use_container_width=True):
+                    show_shift_summary(current_shift)
+                
+                if st.button("🔚 End Shift", type="primary", use_container_width=True):
+                    if end_shift():
+                        st.success("Shift ended successfully")
+                        st.rerun()
+                    else:
+                        st.error("Failed to end shift")
+            
+            # Real-time transaction monitoring
+            st.subheader("Live Transactions")
+            recent_transactions = shift_transactions(current_shift)[-5:]
+            if recent_transactions:
+                for transaction in recent_transactions:  # Show last 5 transactions
+                    st.write(f"{transaction['date']} - {format_currency(transaction['total'])} - {transaction['payment_method']}")
+            else:
+                st.info("No transactions yet")
+                
+        else:
+            st.info("No active shift. Use the sidebar to start a new shift.")
+    
+    else:
+        # Manager/Admin view - show all shifts with advanced features
+        st.header("All Shifts")
+        
+        if not shifts:
+            st.info("No shifts recorded")
+        else:
+            # Advanced filtering options
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                user_filter = st.selectbox("Filter by User", ["All"] + list(set(s['user_id'] for s in shifts.values())))
+            with col2:
+                status_filter = st.selectbox("Filter by Status", ["All", "active", "completed"])
+            with col3:
+                date_filter = st.selectbox("Filter by Date", ["All", "Today", "This Week", "This Month", "Custom"])
+            
+            # Custom date range
+            custom_start = None
+            custom_end = None
+            if date_filter == "Custom":
+                custom_col1, custom_col2 = st.columns(2)
+                with custom_col1:
+                    custom_start = st.date_input("Start Date")
+                with custom_col2:
+                    custom_end = st.date_input("End Date")
+            
+            # Apply filters
+            filtered_shifts = shifts.values()
+            if user_filter != "All":
+                filtered_shifts = [s for s in filtered_shifts if s['user_id'] == user_filter]
+            if status_filter != "All":
+                filtered_shifts = [s for s in filtered_shifts if s['status'] == status_filter]
+            
+            # Date filtering
+            if date_filter != "All":
+                today = datetime.date.today()
+                if date_filter == "Today":
+                    filtered_shifts = [s for s in filtered_shifts 
+                                    if datetime.datetime.strptime(s['start_time'], "%Y-%m-%d %H:%M:%S").date() == today]
+                elif date_filter == "This Week":
+                    week_start = today - datetime.timedelta(days=today.weekday())
+                    filtered_shifts = [s for s in filtered_shifts 
+                                    if datetime.datetime.strptime(s['start_time'], "%Y-%m-%d %H:%M:%S").date() >= week_start]
+                elif date_filter == "This Month":
+                    month_start = today.replace(day=1)
+                    filtered_shifts = [s for s in filtered_shifts 
+                                    if datetime.datetime.strptime(s['start_time'], "%Y-%m-%d %H:%M:%S").date() >= month_start]
+                elif date_filter == "Custom" and custom_start and custom_end:
+                    filtered_shifts = [s for s in filtered_shifts 
+                                    if custom_start <= datetime.datetime.strptime(s['start_time'], "%Y-%m-%d %H:%M:%S").date() <= custom_end]
+            
+            if not filtered_shifts:
+                st.info("No shifts match the filters")
+            else:
+                # Display shifts in a table with more details
+                shift_data = []
+                for shift in filtered_shifts:
+                    shift_data.append({
+                        'User': shift['user_id'],
+                        'Start Time': shift['start_time'],
+                        'End Time': shift.get('end_time', 'Active'),
+                        'Duration': calculate_shift_duration(shift),
+                        'Starting Cash': format_currency(shift.get('starting_cash', 0)),
+                        'Ending Cash': format_currency(shift.get('ending_cash', 0)),
+                        'Net Cash': format_currency(shift.get('ending_cash', 0) - shift.get('starting_cash', 0)),
+                        'Status': shift['status']
+                    })
+                
+                shift_df = pd.DataFrame(shift_data)
+                st.dataframe(shift_df, use_container_width=True)
+                
+                # Summary statistics
+                st.subheader("Shift Statistics")
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Total Shifts", len(filtered_shifts))
+                with col2:
+                    active_shifts = len([s for s in filtered_shifts if s['status'] == 'active'])
+                    st.metric("Active Shifts", active_shifts)
+                with col3:
+                    total_cash = sum(s.get('ending_cash', 0) - s.get('starting_cash', 0) for s in filtered_shifts if s['status'] == 'completed')
+                    st.metric("Total Net Cash", format_currency(total_cash))
+                with col4:
+                    avg_shift = total_cash / len([s for s in filtered_shifts if s['status'] == 'completed']) if len([s for s in filtered_shifts if s['status'] == 'completed']) > 0 else 0
+                    st.metric("Avg. Shift Net", format_currency(avg_shift))
+        
+        # Shift details and management for admin
+        if shifts:
+            st.header("Shift Details & Management")
+            
+            shift_options = [f"{s['user_id']} - {s['start_time']} ({s['status']})" for s in shifts.values()]
+            selected_shift = st.selectbox("Select Shift for Details", [""] + shift_options)
+            
+            if selected_shift:
+                shift_id = [k for k, v in shifts.items() if f"{v['user_id']} - {v['start_time']} ({v['status']})" == selected_shift][0]
+                shift = shifts[shift_id]
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.subheader("Shift Information")
+                    st.write(f"**User:** {shift['user_id']}")
+                    st.write(f"**Start Time:** {shift['start_time']}")
+                    st.write(f"**End Time:** {shift.get('end_time', 'Still active')}")
+                    st.write(f"**Status:** {shift['status']}")
+                    st.write(f"**Starting Cash:** {format_currency(shift.get('starting_cash', 0))}")
+                    st.write(f"**Ending Cash:** {format_currency(shift.get('ending_cash', 0))}")
+                    
+                    if shift.get('notes'):
+                        st.write(f"**Notes:** {shift['notes']}")
+                
+                with col2:
+                    st.subheader("Shift Actions")
+                    
+                    if shift['status'] == 'active':
+                        st.warning("This shift is currently active")
+                        
+                        # Admin can force end a shift
+                        if st.button("🛑 Force End Shift", type="secondary"):
+                            if force_end_shift(shift_id):
+                                st.success("Shift ended successfully")
+                                st.rerun()
+                            else:
+                                st.error("Failed to end shift")
+                    
+                    else:
+                        # Show shift summary
+                        totals = shift['totals']
+                        
+                        st.info(f"**Total Transactions:** {totals['transaction_count']}")
+                        st.info(f"**Cash Transactions:** {totals['cash_count']}")
+                        st.info(f"**Non-Cash Transactions:** {totals['non_cash_count']}")
+                        
+                        if st.button("📊 View Detailed Report"):
+                            generate_shift_report(shift)
+                    
+                    # Drawer movements for this shift, read from the days it spans
+                    drawer = cash_ledger.reconcile_shift(shift)
+                    st.write(f"**Drawer Cash In:** {format_currency(drawer['cash_in'])}")
+                    st.write(f"**Drawer Cash Out:** {format_currency(drawer['cash_out'])}")
+                    st.write(f"**Expected in Drawer:** {format_currency(drawer['expected_cash'])}")
+                
+                # Show transactions for this shift
+                st.subheader("Shift Transactions")
+                transactions_for_shift = shift_transactions(shift)
+                
+                if transactions_for_shift:
+                    trans_data = []
+                    for t in transactions_for_shift:
+                        trans_data.append({
+                            'Time': t['date'],
+                            'Amount': format_currency(t['total']),
+                            'Payment Method': t['payment_method'],
+                            'Items': len(t.get('items', {})),
+                            'Cashier': t.get('cashier', 'N/A')
+                        })
+                    
+                    trans_df = pd.DataFrame(trans_data)
+                    st.dataframe(trans_df, use_container_width=True)
+                    
+                    # Export option
+                    if st.button("📈 Export Shift Data"):
+                        export_shift_data(shift, transactions_for_shift)
+                else:
+                    st.info("No transactions for this shift")
+        
+        cash_drawer_ledger()
+
+def cash_drawer_ledger():
+    """Reconcile the cash drawer ledger over a date range"""
+    st.header("Cash Drawer Ledger")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("From", datetime.date.today() - datetime.timedelta(days=7), key="drawer_start")
+    with col2:
+        end_date = st.date_input("To", datetime.date.today(), key="drawer_end")
+    
+    summary = cash_ledger.reconcile_range(start_date, end_date)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Movements", summary['entries'])
+    with col2:
+        st.metric("Cash In", format_currency(summary['cash_in']))
+    with col3:
+        st.metric("Cash Out", format_currency(summary['cash_out']))
+    with col4:
+        st.metric("Net", format_currency(summary['net']))
+    
+    if summary['by_type']:
+        type_df = pd.DataFrame([
+            {'Type': entry_type, 'Count': totals['count'], 'Total': format_currency(totals['total'])}
+            for entry_type, totals in summary['by_type'].items()
+        ])
+        st.dataframe(type_df, use_container_width=True)
+    
+    drawer = cash_ledger.load_drawer()
+    st.write(f"**Current Drawer Balance:** {format_currency(drawer.get('current_balance', 0.0))}")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔍 Verify Balance", use_container_width=True):
+            recorded, computed = cash_ledger.verify_balance()
+            if abs(recorded - computed) < 0.005:
+                st.success(f"Balance matches the ledger ({format_currency(computed)})")
+            else:
+                st.error(f"Balance {format_currency(recorded)} doesn't match the ledger ({format_currency(computed)})")
+    with col2:
+        if st.button("🔄 Rebuild Balance from Ledger", use_container_width=True):
+            drawer = cash_ledger.rebuild_balance()
+            st.success(f"Balance rebuilt: {format_currency(drawer['current_balance'])}")
+
+def show_shift_summary(shift):
+    """Display a summary of the current shift"""
+    totals = shift.get('totals', empty_shift_totals())
+    st.subheader("Shift Summary")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Start Time:** {shift.get('start_time', 'N/A')}")
+        st.write(f"**Starting Cash:** {format_currency(shift.get('starting_cash', 0))}")
+        st.write(f"**Cash Transactions:** {totals['cash_count']}")
+        st.write(f"**Refunds:** {totals['refund_count']} ({format_currency(totals['refund_total'])})")
+    
+    with col2:
+        st.write(f"**Current Cash:** {format_currency(totals['cash_total'])}")
+        st.write(f"**Expected Cash:** {format_currency(shift.get('starting_cash', 0) + totals['cash_total'])}")
+        st.write(f"**Total Transactions:** {totals['transaction_count']}")
+        st.write(f"**Discounts Given:** {format_currency(totals['discount_total'])}")
+    
+    # Transaction breakdown
+    st.subheader("Transaction Breakdown")
+    for method, method_totals in totals['payment_methods'].items():
+        st.write(f"- {method}: {format_currency(method_totals['total'])}")
+
+def generate_shift_report(shift):
+    """Generate a detailed shift report (Z-report totals come from the shift ledger)"""
+    st.subheader("Detailed Shift Report")
+    
+    # Create a DataFrame for better display
+    report_data = []
+    for t in shift_transactions(shift):
+        report_data.append({
+            'Time': t.get('date', ''),
+            'Amount': format_currency(t.get('total', 0)),
+            'Payment Method': t.get('payment_method', ''),
+            'Items': len(t.get('items', {})),
+            'Cashier': t.get('cashier', 'N/A')
+        })
+    
+    if report_data:
+        df = pd.DataFrame(report_data)
+        st.dataframe(df)
+        
+        # Summary
+        st.subheader("Summary")
+        totals = shift['totals']
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Sales", format_currency(totals['sales_total']))
+        with col2:
+            st.metric("Cash Sales", format_currency(totals['cash_total']))
+        with col3:
+            st.metric("Non-Cash Sales", format_currency(totals['non_cash_total']))
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Refunds", format_currency(totals['refund_total']), f"{totals['refund_count']} return(s)",
+                      delta_color="off")
+        with col2:
+            st.metric("Discounts", format_currency(totals['discount_total']))
+        with col3:
+            st.metric("Drawer Movement", format_currency(totals['drawer_net']))
+
+def export_shift_data(shift, transactions):
+    """Export shift data to CSV"""
+    try:
+        # Prepare data for export
+        export_data = []
+        for t in transactions:
+            export_data.append({
+                'transaction_id': t.get('transaction_id', ''),
+                'date': t.get('date', ''),
+                'cashier': t.get('cashier', ''),
+                'payment_method': t.get('payment_method', ''),
+                'subtotal': t.get('subtotal', 0),
+                'tax': t.get('tax', 0),
+                'discount': t.get('discount', 0),
+                'total': t.get('total', 0),
+                'items_count': len(t.get('items', {}))
+            })
+        
+        # Create DataFrame
+        df = pd.DataFrame(export_data)
+        
+        # Convert to CSV
+        csv = df.to_csv(index=False)
+        
+        # Generate filename
+        filename = f"shift_report_{shift.get('start_time', '').replace(':', '').replace(' ', '_')}.csv"
+        
+        # Download button
+        st.download_button(
+            label="📥 Download Shift Report",
+            data=csv,
+            file_name=filename,
+            mime="text/csv"
+        )
+        
+    except Exception as e:
+        st.error(f"Error exporting shift data: {str(e)}")
@@ -0,0 +1,134 @@
+"""Suppliers management."""
+
+import streamlit as st
+import uuid
+
+from rocket_pos.core import SUPPLIERS_FILE, get_current_datetime, is_manager, load_data, save_data
+from rocket_pos.replenishment import DEFAULT_LEAD_TIME_DAYS, DEFAULT_MIN_ORDER_QTY
+
+# Suppliers Management
+def suppliers_management():
+    if not is_manager():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("Suppliers Management")
+    
+    tab1, tab2, tab3 = st.tabs(["Add Supplier", "View/Edit Suppliers", "Delete Supplier"])
+    
+    with tab1:
+        st.header("Add New Supplier")
+        
+        with st.form("add_supplier_form"):
+            name = st.text_input("Supplier Name*")
+            contact_person = st.text_input("Contact Person")
+            phone = st.text_input("Phone Number*")
+            email = st.text_input("Email")
+            address = st.text_area("Address")
+            products_supplied = st.text_area("Products Supplied (comma separated)")
+            payment_terms = st.text_input("Payment Terms")
+            col1, col2 = st.columns(2)
+            with col1:
+                lead_time_days = st.number_input("Lead Time (days)", min_value=0, value=DEFAULT_LEAD_TIME_DAYS, step=1,
+                                                 help="Days from ordering to delivery, used for reorder suggestions")
+            with col2:
+                min_order_qty = st.number_input("Minimum Order Quantity", min_value=1, value=DEFAULT_MIN_ORDER_QTY, step=1,
+                                                help="Smallest quantity per item this supplier accepts")
+            
+            submit_button = st.form_submit_button("Add Supplier")
+            
+            if submit_button:
+                if not name or not phone:
+                    st.error("Name and phone are required")
+                else:
+                    suppliers = load_data(SUPPLIERS_FILE)
+                    supplier_id = str(uuid.uuid4())
+                    
+                    suppliers[supplier_id] = {
+                        'id': supplier_id,
+                        'name': name,
+                        'contact_person': contact_person,
+                        'phone': phone,
+                        'email': email,
+                        'address': address,
+                        'products_supplied': [p.strip() for p in products_supplied.split(',')] if products_supplied else [],
+                        'payment_terms': payment_terms,
+                        'lead_time_days': lead_time_days,
+                        'min_order_qty': min_order_qty,
+                        'date_added': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                        'added_by': st.session_state.user_info['username']
+                    }
+                    
+                    save_data(suppliers, SUPPLIERS_FILE)
+                    st.success("Supplier added successfully")
+    
+    with tab2:
+        st.header("View/Edit Suppliers")
+        
+        suppliers = load_data(SUPPLIERS_FILE)
+        if not suppliers:
+            st.info("No suppliers available")
+        else:
+            search_term = st.text_input("Search Suppliers")
+            
+            if search_term:
+                filtered_suppliers = {k: v for k, v in suppliers.items() 
+                                    if search_term.lower() in v['name'].lower() or 
+                                    search_term.lower() in v['phone'].lower()}
+            else:
+                filtered_suppliers = suppliers
+            
+            for supplier_id, supplier in filtered_suppliers.items():
+                with st.expander(f"{supplier['name']} - {supplier['phone']}"):
+                    with st.form(key=f"edit_{supplier_id}"):
+                        name = st.text_input("Name", value=supplier.get('name', ''))
+                        contact_person = st.text_input("Contact Person", value=supplier.get('contact_person', ''))
+                        phone = st.text_input("Phone Number", value=supplier.get('phone', ''))
+                        email = st.text_input("Email", value=supplier.get('email', ''))
+                        address = st.text_area("Address", value=supplier.get('address', ''))
+                        products_supplied = st.text_area("Products Supplied", 
+                                                        value=", ".join(supplier.get('products_supplied', [])))
+                        payment_terms = st.text_input("Payment Terms", value=supplier.get('payment_terms', ''))
+                        lead_time_days = st.number_input("Lead Time (days)", min_value=0, step=1,
+                                                         value=supplier.get('lead_time_days', DEFAULT_LEAD_TIME_DAYS))
+                        min_order_qty = st.number_input("Minimum Order Quantity", min_value=1, step=1,
+                                                        value=supplier.get('min_order_qty', DEFAULT_MIN_ORDER_QTY))
+                        
+                        if st.form_submit_button("Update Supplier"):
+                            suppliers[supplier_id]['name'] = name
+                            suppliers[supplier_id]['contact_person'] = contact_person
+                            suppliers[supplier_id]['phone'] = phone
+                            suppliers[supplier_id]['email'] = email
+                            suppliers[supplier_id]['address'] = address
+                            suppliers[supplier_id]['products_supplied'] = [p.strip() for p in products_supplied.split(',')] if products_supplied else []
+                            suppliers[supplier_id]['payment_terms'] = payment_terms
+                            suppliers[supplier_id]['lead_time_days'] = lead_time_days
+                            suppliers[supplier_id]['min_order_qty'] = min_order_qty
+                            suppliers[supplier_id]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+                            suppliers[supplier_id]['updated_by'] = st.session_state.user_info['username']
+                            
+                            save_data(suppliers, SUPPLIERS_FILE)
+                            st.success("Supplier updated successfully")
+    
+    with tab3:
+        st.header("Delete Supplier")
+        
+        suppliers = load_data(SUPPLIERS_FILE)
+        if not suppliers:
+            st.info("No suppliers available to delete")
+        else:
+            supplier_options = {f"{v['name']} ({v['phone']})": k for k, v in suppliers.items()}
+            selected_supplier = st.selectbox("Select Supplier to Delete", [""] + list(supplier_options.keys()))
+            
+            if selected_supplier:
+                supplier_id = supplier_options[selected_supplier]
+                supplier = suppliers[supplier_id]
+                
+                st.warning(f"You are about to delete: {supplier['name']}")
+                st.write(f"Phone: {supplier['phone']}")
+                st.write(f"Contact: {supplier.get('contact_person', 'N/A')}")
+                
+                if st.button("Confirm Delete"):
+                    del suppliers[supplier_id]
+                    save_data(suppliers, SUPPLIERS_FILE)
+                    st.success("Supplier deleted successfully")
@@ -0,0 +1,271 @@
+"""Transaction history pages."""
+
+import streamlit as st
+import datetime
+
+from rocket_pos.core import TRANSACTIONS_FILE, LOYALTY_FILE, format_currency, load_data, save_data
+from rocket_pos.hardware import print_receipt
+from rocket_pos.receipts import generate_receipt
+
+def transaction_history():
+    st.title("Transaction History")
+    
+    transactions = load_data(TRANSACTIONS_FILE)
+    
+    if not transactions:
+        st.info("No transactions found")
+        return
+    
+    # Ensure all transactions have required fields
+    defaults = {
+        'discount': 0,
+        'loyalty_discount': 0,
+        'points_discount': 0,
+        'loyalty_points_earned': 0,
+        'loyalty_points_redeemed': 0,
+        'payment_charge_amount': 0,
+        'payment_charge_percent': 0,
+        'order_type': 'regular',  # Default to regular sales
+    }
+    filled = False
+    for transaction in transactions.values():
+        for field, value in defaults.items():
+            if field not in transaction:
+                transaction[field] = value
+                filled = True
+    
+    # Save the updated transactions - only when something was missing, since a
+    # rewrite of transactions.json makes the receipt index rebuild on next use
+    if filled:
+        save_data(transactions, TRANSACTIONS_FILE)
+    
+    # Filters
+    col1, col2, col3, col4 = st.columns(4)  # Added extra column for order type
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=30))
+    with col2:
+        end_date = st.date_input("End Date", value=datetime.date.today())
+    with col3:
+        cashier_filter = st.selectbox("Filter by Cashier", 
+                                    ["All"] + list(set(t.get('cashier', 'Unknown') for t in transactions.values())))
+    with col4:
+        order_type_filter = st.selectbox("Order Type", 
+                                       ["All", "Regular", "Outdoor Delivery"])
+    
+    # Apply filters
+    filtered_transactions = []
+    for transaction_id, transaction in transactions.items():
+        try:
+            trans_date = datetime.datetime.strptime(transaction.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= trans_date <= end_date:
+                if cashier_filter == "All" or transaction.get('cashier', 'Unknown') == cashier_filter:
+                    # Filter by order type
+                    order_type = transaction.get('order_type', 'regular')
+                    if order_type_filter == "All":
+                        filtered_transactions.append((transaction_id, transaction))
+                    elif order_type_filter == "Regular" and order_type == 'regular':
+                        filtered_transactions.append((transaction_id, transaction))
+                    elif order_type_filter == "Outdoor Delivery" and order_type == 'outdoor_delivery':
+                        filtered_transactions.append((transaction_id, transaction))
+        except (ValueError, KeyError):
+            continue
+    
+    # Sort by date (newest first)
+    filtered_transactions.sort(key=lambda x: x[1].get('date', ''), reverse=True)
+    
+    if not filtered_transactions:
+        st.info("No transactions match the selected filters")
+        return
+    
+    st.write(f"**Found {len(filtered_transactions)} transactions**")
+    
+    # Display transactions
+    for transaction_id, transaction in filtered_transactions:
+        # Determine badge for order type
+        order_type = transaction.get('order_type', 'regular')
+        order_badge = "🛍️" if order_type == 'regular' else "🚚"
+        
+        with st.expander(f"{order_badge} Transaction #{transaction_id} - {transaction.get('date', 'Unknown date')} - {format_currency(transaction.get('total', 0))}"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Date:** {transaction.get('date', 'N/A')}")
+                st.write(f"**Cashier:** {transaction.get('cashier', 'N/A')}")
+                st.write(f"**Payment Method:** {transaction.get('payment_method', 'N/A')}")
+                st.write(f"**Order Type:** {'Regular Sale' if order_type == 'regular' else 'Outdoor Delivery'}")
+                
+                # Show outdoor order info if applicable
+                if order_type == 'outdoor_delivery':
+                    st.write(f"**Outdoor Order ID:** {transaction.get('outdoor_order_id', 'N/A')}")
+                    st.write(f"**Delivery Type:** {transaction.get('delivery_type', 'N/A')}")
+                    st.write(f"**Delivery Charge:** {format_currency(transaction.get('delivery_charge', 0))}")
+                
+                if transaction.get('customer_id'):
+                    loyalty_data = load_data(LOYALTY_FILE)
+                    customer = loyalty_data.get('customers', {}).get(transaction['customer_id'], {})
+                    if customer:
+                        st.write(f"**Customer:** {customer.get('name', 'N/A')}")
+                        st.write(f"**Loyalty ID:** {transaction['customer_id']}")
+            
+            with col2:
+                st.write(f"**Subtotal:** {format_currency(transaction.get('subtotal', 0))}")
+                st.write(f"**Tax:** {format_currency(transaction.get('tax', 0))}")
+                
+                if transaction.get('discount', 0) > 0:
+                    st.write(f"**Discount:** -{format_currency(transaction.get('discount', 0))}")
+                
+                if transaction.get('loyalty_discount', 0) > 0:
+                    st.write(f"**Loyalty Discount:** -{format_currency(transaction.get('loyalty_discount', 0))}")
+                
+                st.write(f"**Total:** {format_currency(transaction.get('total', 0))}")
+                
+                if transaction.get('payment_charge_amount', 0) > 0:
+                    st.write(f"**Payment Fee:** {format_currency(transaction.get('payment_charge_amount', 0))}")
+            
+            # Items list
+            st.write("**Items:**")
+            for barcode, item in transaction.get('items', {}).items():
+                st.write(f"- {item.get('name', 'Unknown')} x{item.get('quantity', 0)} @ {format_currency(item.get('price', 0))} each")
+            
+            # Reprint options
+            st.markdown("---")
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                if st.button("🖨️ Reprint Receipt", key=f"print_{transaction_id}"):
+                    receipt_text = generate_receipt(transaction)
+                    if print_receipt(receipt_text, transaction_id):
+                        st.success("Receipt printed successfully")
+                    else:
+                        st.error("Failed to print receipt")
+            
+            with col2:
+                if st.button("📄 View Receipt", key=f"view_{transaction_id}"):
+                    receipt_text = generate_receipt(transaction)
+                    st.text_area("Receipt Content", receipt_text, height=300, key=f"receipt_{transaction_id}")
+            
+            with col3:
+                # Download as text
+                receipt_text = generate_receipt(transaction)
+                st.download_button(
+                    label="📝 Download Text",
+                    data=receipt_text,
+                    file_name=f"receipt_{transaction_id}.txt",
+                    mime="text/plain",
+                    key=f"download_{transaction_id}"
+                )
+
+def export_transactions_to_csv(transactions):
+    """Export transactions to CSV format"""
+    import csv
+    from io import StringIO
+    
+    # Prepare data
+    csv_data = []
+    for transaction_id, transaction in transactions:
+        for barcode, item in transaction.get('items', {}).items():
+            csv_data.append({
+                'transaction_id': transaction_id,
+                'date': transaction.get('date', ''),
+                'cashier': transaction.get('cashier', ''),
+                'product_barcode': barcode,
+                'product_name': item.get('name', ''),
+                'quantity': item.get('quantity', 0),
+                'unit_price': item.get('price', 0),
+                'total_price': item.get('price', 0) * item.get('quantity', 0),
+                'payment_method': transaction.get('payment_method', ''),
+                'transaction_total': transaction.get('total', 0)
+            })
+    
+    # Create CSV
+    output = StringIO()
+    if csv_data:
+        writer = csv.DictWriter(output, fieldnames=csv_data[0].keys())
+        writer.writeheader()
+        writer.writerows(csv_data)
+        
+        st.download_button(
+            label="Download CSV",
+            data=output.getvalue(),
+            file_name=f"transactions_export_{datetime.date.today()}.csv",
+            mime="text/csv"
+        )
+    else:
+        st.warning("No data to export")
+
+# Cashier Transaction History - Simplified version
+def cashier_transaction_history():
+    st.title("My Transaction History")
+    
+    transactions = load_data(TRANSACTIONS_FILE)
+    
+    # Filter to only show current cashier's transactions
+    user_transactions = {k: v for k, v in transactions.items() 
+                        if v.get('cashier') == st.session_state.user_info['username']}
+    
+    if not user_transactions:
+        st.info("No transactions found")
+        return
+    
+    # Simple date filter
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", value=datetime.date.today() - datetime.timedelta(days=7))
+    with col2:
+        end_date = st.date_input("End Date", value=datetime.date.today())
+    
+    # Apply date filter
+    filtered_transactions = []
+    for transaction_id, transaction in user_transactions.items():
+        try:
+            trans_date = datetime.datetime.strptime(transaction.get('date', ''), "%Y-%m-%d %H:%M:%S").date()
+            if start_date <= trans_date <= end_date:
+                filtered_transactions.append((transaction_id, transaction))
+        except (ValueError, KeyError):
+            continue
+    
+    # Sort by date (newest first)
+    filtered_transactions.sort(key=lambda x: x[1].get('date', ''), reverse=True)
+    
+    if not filtered_transactions:
+        st.info("No transactions match the selected filters")
+        return
+    
+    st.write(f"**Found {len(filtered_transactions)} transactions**")
+    
+    # Display transactions
+    for transaction_id, transaction in filtered_transactions:
+        with st.expander(f"Transaction #{transaction_id} - {transaction.get('date', 'Unknown date')} - {format_currency(transaction.get('total', 0))}"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Date:** {transaction.get('date', 'N/A')}")
+                st.write(f"**Payment Method:** {transaction.get('payment_method', 'N/A')}")
+                
+                if transaction.get('customer_id'):
+                    loyalty_data = load_data(LOYALTY_FILE)
+                    customer = loyalty_data.get('customers', {}).get(transaction['customer_id'], {})
+                    if customer:
+                        st.write(f"**Customer:** {customer.get('name', 'N/A')}")
+            
+            with col2:
+                st.write(f"**Subtotal:** {format_currency(transaction.get('subtotal', 0))}")
+                st.write(f"**Tax:** {format_currency(transaction.get('tax', 0))}")
+                
+                if transaction.get('discount', 0) > 0:
+                    st.write(f"**Discount:** -{format_currency(transaction.get('discount', 0))}")
+                
+                st.write(f"**Total:** {format_currency(transaction.get('total', 0))}")
+            
+            # Items list
+            st.write("**Items:**")
+            for barcode, item in transaction.get('items', {}).items():
+                st.write(f"- {item.get('name', 'Unknown')} x{item.get('quantity', 0)} @ {format_currency(item.get('price', 0))} each")
+            
+            # Reprint option only (no export)
+            if st.button("🖨️ Reprint Receipt", key=f"print_{transaction_id}"):
+                receipt_text = generate_receipt(transaction)
+                if print_receipt(receipt_text, transaction_id):
+                    st.success("Receipt printed successfully")
+                else:
+                    st.error("Failed to print receipt")
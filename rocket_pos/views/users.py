@@ -0,0 +1,226 @@
+"""User management."""
+
+import streamlit as st
+import pandas as pd
+
+from rocket_pos.core import (
+    USERS_FILE,
+    get_current_datetime,
+    hash_password,
+    is_admin,
+    load_data,
+    save_data,
+)
+
+# User Management
+def user_management():
+    if not is_admin():
+        st.warning("You don't have permission to access this page")
+        return
+    
+    st.title("User Management")
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["Add User", "View/Edit Users", "Delete User", "Bulk Import"])
+    
+    with tab1:
+        st.header("Add New User")
+        
+        with st.form("add_user_form"):
+            username = st.text_input("Username*")
+            password = st.text_input("Password*", type="password")
+            confirm_password = st.text_input("Confirm Password*", type="password")
+            full_name = st.text_input("Full Name*")
+            email = st.text_input("Email")
+            role = st.selectbox("Role*", ["admin", "manager", "cashier"])
+            active = st.checkbox("Active", value=True)
+            
+            submit_button = st.form_submit_button("Add User")
+            
+            if submit_button:
+                if not username or not password or not full_name:
+                    st.error("Fields marked with * are required")
+                elif password != confirm_password:
+                    st.error("Passwords do not match")
+                else:
+                    users = load_data(USERS_FILE)
+                    
+                    if username in users:
+                        st.error("Username already exists")
+                    else:
+                        users[username] = {
+                            'username': username,
+                            'password': hash_password(password),
+                            'role': role,
+                            'full_name': full_name,
+                            'email': email,
+                            'active': active,
+                            'date_created': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                            'created_by': st.session_state.user_info['username']
+                        }
+                        
+                        save_data(users, USERS_FILE)
+                        st.success(f"User '{username}' added successfully")
+    
+    with tab2:
+        st.header("View/Edit Users")
+        
+        users = load_data(USERS_FILE)
+        if not users:
+            st.info("No users available")
+        else:
+            search_term = st.text_input("Search Users")
+            
+            if search_term:
+                filtered_users = {k: v for k, v in users.items() 
+                                 if search_term.lower() in k.lower() or 
+                                 search_term.lower() in v['full_name'].lower()}
+            else:
+                filtered_users = users
+            
+            for username, user in filtered_users.items():
+                if username == "admin" and st.session_state.user_info['username'] != "admin":
+                    continue  # Only admin can edit admin account
+                
+                with st.expander(f"{user['full_name']} ({username}) - {user['role']}"):
+                    with st.form(key=f"edit_{username}"):
+                        full_name = st.text_input("Full Name", value=user.get('full_name', ''))
+                        email = st.text_input("Email", value=user.get('email', ''))
+                        
+                        if username == "admin":
+                            role = "admin"
+                            st.text("Role: admin (cannot be changed)")
+                        else:
+                            role = st.selectbox("Role", ["admin", "manager", "cashier"], 
+                                               index=["admin", "manager", "cashier"].index(user['role']))
+                        
+                        active = st.checkbox("Active", value=user.get('active', True))
+                        
+                        password = st.text_input("New Password (leave blank to keep current)", type="password")
+                        confirm_password = st.text_input("Confirm New Password", type="password")
+                        
+                        if st.form_submit_button("Update User"):
+                            users[username]['full_name'] = full_name
+                            users[username]['email'] = email
+                            users[username]['role'] = role
+                            users[username]['active'] = active
+                            users[username]['last_updated'] = get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                            users[username]['updated_by'] = st.session_state.user_info['username']
+                            
+                            if password:
+                                if password == confirm_password:
+                                    users[username]['password'] = hash_password(password)
+                                else:
+                                    st.error("Passwords do not match")
+                                    continue
+                            
+                            save_data(users, USERS_FILE)
+                            st.success("User updated successfully")
+    
+    with tab3:
+        st.header("Delete User")
+        
+        users = load_data(USERS_FILE)
+        if not users:
+            st.info("No users available to delete")
+        else:
+            current_user = st.session_state.user_info['username']
+            user_options = {f"{v['full_name']} ({k})": k for k, v in users.items() 
+                          if k != current_user and k != "admin"}  # Can't delete self or admin
+            
+            if not user_options:
+                st.info("No users available to delete (cannot delete yourself or admin)")
+            else:
+                selected_user = st.selectbox("Select User to Delete", [""] + list(user_options.keys()))
+                
+                if selected_user:
+                    username = user_options[selected_user]
+                    user = users[username]
+                    
+                    st.warning(f"You are about to delete: {user['full_name']} ({username})")
+                    st.write(f"Role: {user['role']}")
+                    st.write(f"Status: {'Active' if user['active'] else 'Inactive'}")
+                    
+                    if st.button("Confirm Delete"):
+                        del users[username]
+                        save_data(users, USERS_FILE)
+                        st.success("User deleted successfully")
+    
+    with tab4:
+        st.header("Bulk Import Users")
+        
+        st.info("Download the template file to prepare your user data")
+        
+        # Generate template file
+        template_data = {
+            "username": ["user1", ""],
+            "password": ["password123", ""],
+            "full_name": ["User One", ""],
+            "email": ["user1@example.com", ""],
+            "role": ["cashier", ""],
+            "active": [True, ""]
+        }
+        template_df = pd.DataFrame(template_data)
+        
+        st.download_button(
+            label="Download Template",
+            data=template_df.to_csv(index=False).encode('utf-8'),
+            file_name="user_import_template.csv",
+            mime="text/csv"
+        )
+        
+        uploaded_file = st.file_uploader("Upload CSV file", type=['csv'])
+        
+        if uploaded_file:
+            try:
+                df = pd.read_csv(uploaded_file)
+                st.dataframe(df)
+                
+                if st.button("Import Users"):
+                    users = load_data(USERS_FILE)
+                    imported = 0
+                    updated = 0
+                    errors = 0
+                    
+                    for _, row in df.iterrows():
+                        try:
+                            username = str(row['username']).strip()
+                            if not username:
+                                errors += 1
+                                continue
+                            
+                            password = str(row['password']).strip()
+                            if not password:
+                                errors += 1
+                                continue
+                            
+                            full_name = str(row['full_name']).strip()
+                            if not full_name:
+                                errors += 1
+                                continue
+                            
+                            user_data = {
+                                'username': username,
+                                'password': hash_password(password),
+                                'full_name': full_name,
+                                'email': str(row['email']).strip() if not pd.isna(row['email']) else "",
+                                'role': str(row['role']).strip().lower() if not pd.isna(row['role']) else "cashier",
+                                'active': bool(row['active']) if not pd.isna(row['active']) else True,
+                                'date_created': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S"),
+                                'created_by': st.session_state.user_info['username']
+                            }
+                            
+                            if username in users:
+                                users[username].update(user_data)
+                                updated += 1
+                            else:
+                                users[username] = user_data
+                                imported += 1
+                        
+                        except Exception as e:
+                            errors += 1
+                            continue
+                    
+                    save_data(users, USERS_FILE)
+                    st.success(f"Import completed: {imported} new users, {updated} updated, {errors} errors")
+            except Exception as e:
+                st.error(f"Error reading CSV file: {str(e)}")
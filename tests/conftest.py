@@ -0,0 +1,29 @@
+"""Shared fixtures: every test runs against its own bootstrapped data directory."""
+
+import pytest
+
+from rocket_pos.core import (INVENTORY_FILE, LOYALTY_FILE, PRODUCTS_FILE, SHIFTS_FILE, bootstrap_data_store, load_data,
+                             save_data)
+from rocket_pos.shifts import empty_shift_totals
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A fresh data/ (and backups/) under tmp_path; the data paths are relative to the working directory"""
+    monkeypatch.chdir(tmp_path)
+    bootstrap_data_store()
+    return tmp_path / "data"
+
+@pytest.fixture
+def store(data_dir):
+    """One product (111, 10 in stock), loyalty customer c1 and open shift s1"""
+    save_data({"111": {'name': "Pod", 'price': 10.0, 'cost': 4.0, 'category': "X"}}, PRODUCTS_FILE)
+    save_data({"111": {'quantity': 10, 'reorder_point': 2}}, INVENTORY_FILE)
+    loyalty = load_data(LOYALTY_FILE)
+    loyalty.setdefault('customers', {})["c1"] = {'name': "Ann", 'phone': "555", 'points': 0, 'tier': "Bronze",
+                                                 'total_spent': 0.0, 'visit_count': 0,
+                                                 'date_joined': "2026-01-01 00:00:00"}
+    save_data(loyalty, LOYALTY_FILE)
+    save_data({"s1": {'shift_id': "s1", 'user_id': "admin", 'start_time': "2026-01-01 00:00:00", 'end_time': None,
+                      'starting_cash': 0.0, 'ending_cash': 0.0, 'transactions': [], 'returns': [],
+                      'totals': empty_shift_totals(), 'status': 'active'}}, SHIFTS_FILE)
+    return data_dir
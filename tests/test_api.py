@@ -0,0 +1,78 @@
+"""The HTTP API enforces the roles and shift ownership the UI does."""
+
+import base64
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from rocket_pos.api import make_server
+from rocket_pos.core import SHIFTS_FILE, USERS_FILE, hash_password, load_data, save_data
+from rocket_pos.outdoor_orders import add_order, set_order_status
+
+@pytest.fixture
+def api(store):
+    """Base URL of an API server on the test store; users admin, ann (cashier) and bob (no POS role)"""
+    users = load_data(USERS_FILE)
+    for username, role in (("ann", "cashier"), ("bob", "viewer")):
+        users[username] = {'username': username, 'password': hash_password("pw"), 'role': role, 'active': True}
+    save_data(users, USERS_FILE)
+    server = make_server(port=0, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def _post(url, username, password, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method='POST', headers={
+        'Authorization': "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode(),
+        'Content-Type': "application/json",
+    })
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def _approved_order():
+    add_order({
+        'order_id': "o1", 'customer_id': None, 'customer_name': "Walk-in", 'customer_phone': "",
+        'items': {"111": {'name': "Pod", 'price': 10.0, 'quantity': 1}}, 'subtotal': 10.0,
+        'delivery_charge': 0, 'payment_method': "cash", 'total': 10.0, 'delivery_type': "Standard",
+        'status': 'pending_approval', 'created_by': "admin", 'created_date': "2026-01-01 00:00:00",
+    })
+    set_order_status("o1", 'approved', "admin", "2026-01-01 00:00:00", from_status='pending_approval')
+
+def test_delivery_needs_a_pos_role(api):
+    _approved_order()
+
+    status, _ = _post(f"{api}/outdoor-orders/o1/deliver", "bob", "pw", {})
+    assert status == 403
+
+    status, transaction = _post(f"{api}/outdoor-orders/o1/deliver", "ann", "pw", {})
+    assert status == 200
+    assert transaction['cashier'] == "ann"
+
+@pytest.mark.parametrize("path", ["/sales", "/outdoor-orders/o1/deliver", "/returns"])
+def test_shift_must_be_the_callers_open_shift(api, path):
+    _approved_order()
+    shifts_before = load_data(SHIFTS_FILE)
+
+    # s1 is admin's shift
+    status, error = _post(f"{api}{path}", "ann", "pw", {'items': {"111": 1}, 'shift_id': "s1"})
+    assert status == 422
+    assert "s1" in error['error']
+    assert load_data(SHIFTS_FILE) == shifts_before
+
+def test_own_open_shift_is_accepted(api):
+    status, sale = _post(f"{api}/sales", "admin", "admin123", {'items': {"111": 1}, 'shift_id': "s1"})
+    assert status == 200
+    assert load_data(SHIFTS_FILE)["s1"]['transactions'] == [sale['transaction_id']]
+
+    shifts = load_data(SHIFTS_FILE)
+    shifts["s1"]['status'] = 'completed'
+    save_data(shifts, SHIFTS_FILE)
+    status, _ = _post(f"{api}/sales", "admin", "admin123", {'items': {"111": 1}, 'shift_id': "s1"})
+    assert status == 422
@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+from rocket_pos import backups, core
+from rocket_pos.core import (DATA_LOCK, INVENTORY_FILE, PRODUCTS_FILE, SETTINGS_FILE, data_transaction, load_data,
+                             save_data)
+from rocket_pos.views import backup as backup_view
+
+def _referenced_chunks_exist():
+    referenced = [d for snapshot in backups.list_snapshots() for entry in snapshot['files'].values()
+                  for d in entry['chunks']]
+    referenced += [d for entry in backups.read_journal() for d in entry['chunks']]
+    return referenced and all(os.path.exists(backups._chunk_path(d)) for d in referenced)
+
+def _gc_between_store_and_reference(monkeypatch):
+    """Patch chunking so a collect_garbage() starts right after the chunks are stored; returns its thread"""
+    chunk_file = backups._chunk_file
+    gc = threading.Thread(target=backups.collect_garbage)
+
+    def chunk_then_collect(path):
+        result = chunk_file(path)
+        if not gc.is_alive() and gc.ident is None:
+            gc.start()
+            gc.join(0.2)
+            # Stored chunks aren't referenced yet: GC must wait for the reference
+            assert gc.is_alive()
+        return result
+    monkeypatch.setattr(backups, "_chunk_file", chunk_then_collect)
+    return gc
+
+def test_gc_waits_for_the_journal_line(data_dir, monkeypatch):
+    save_data({"111": {'name': "Pod " * 5000}}, PRODUCTS_FILE)
+    gc = _gc_between_store_and_reference(monkeypatch)
+
+    backups.journal_file(PRODUCTS_FILE)
+    gc.join()
+
+    assert _referenced_chunks_exist()
+
+def test_gc_waits_for_the_snapshot_manifest(data_dir, monkeypatch):
+    save_data({"111": {'name': "Pod " * 5000}}, PRODUCTS_FILE)
+    gc = _gc_between_store_and_reference(monkeypatch)
+
+    backups.create_snapshot("s1", lock=DATA_LOCK)
+    gc.join()
+
+    assert _referenced_chunks_exist()
+    backups.restore_snapshot_files("s1", str(data_dir.parent / "restored"))
+
+def test_snapshot_restores_chunks_collected_after_reuse_check(data_dir, monkeypatch):
+    save_data({"111": {'name': "Pod"}}, PRODUCTS_FILE)
+    backups.create_snapshot("s1")
+
+    # s1 is deleted and its chunks collected between the reuse check (unchanged files
+    # such as users.json keep s1's chunk lists) and the manifest
+    chunk_file = backups._chunk_file
+    def delete_previous_then_chunk(path):
+        if os.path.exists(backups._snapshot_path("s1")):
+            backups.delete_snapshot("s1")
+            later = time.time() + 60
+            with monkeypatch.context() as patch:
+                patch.setattr(backups.time, "time", lambda: later)
+                backups.collect_garbage()
+        return chunk_file(path)
+    save_data({"111": {'name': "Pod"}, "222": {'name': "Vape"}}, PRODUCTS_FILE)
+    monkeypatch.setattr(backups, "_chunk_file", delete_previous_then_chunk)
+
+    backups.create_snapshot("s2")
+
+    assert _referenced_chunks_exist()
+
+def test_gc_leaves_files_newer_than_its_start(data_dir):
+    save_data({"111": {'name': "Pod"}}, PRODUCTS_FILE)
+    backups.create_snapshot("s1")
+    stale = backups._chunk_path("aa" + "0" * 62)
+    fresh = backups._chunk_path("bb" + "0" * 62) + ".tmp"
+    for path, mtime in ((stale, time.time() - 3600), (fresh, time.time() + 3600)):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b"x")
+        os.utime(path, (mtime, mtime))
+
+    removed, _ = backups.collect_garbage()
+
+    assert removed == 1
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+    assert _referenced_chunks_exist()
+
+def test_full_backup_holds_writers_off_while_copying(data_dir, monkeypatch):
+    save_data({"111": {'name': "Pod"}}, PRODUCTS_FILE)
+    save_data({"111": {'quantity': 10}}, INVENTORY_FILE)
+
+    def sale():
+        with data_transaction():
+            save_data({"111": {'name': "Pod", 'sold': True}}, PRODUCTS_FILE)
+            save_data({"111": {'quantity': 9}}, INVENTORY_FILE)
+    writer = threading.Thread(target=sale)
+    copy2 = shutil.copy2
+
+    def copy_while_selling(src, dst):
+        if writer.ident is None:
+            writer.start()
+            writer.join(0.2)
+            # Files are still being collected: the sale must wait, or the backup could hold half of it
+            assert writer.is_alive()
+        return copy2(src, dst)
+    monkeypatch.setattr(shutil, "copy2", copy_while_selling)
+
+    backup_path, _ = backup_view.create_complete_backup("b1", "zip")
+    writer.join()
+
+    with zipfile.ZipFile(backup_path) as zipf:
+        assert json.loads(zipf.read("products.json")) == {"111": {'name': "Pod"}}
+        assert json.loads(zipf.read("inventory.json")) == {"111": {'quantity': 10}}
+    assert load_data(INVENTORY_FILE) == {"111": {'quantity': 9}}
+    assert not [name for name in os.listdir(os.path.dirname(backup_path)) if name.startswith(".frozen")]
+
+def _journaled_files():
+    return [entry['file'] for entry in backups.read_journal()]
+
+def _enable_journal():
+    settings = load_data(SETTINGS_FILE)
+    settings['write_journal'] = True
+    save_data(settings, SETTINGS_FILE)
+
+def test_transaction_is_journaled_on_commit_only(data_dir):
+    _enable_journal()
+    journaled = len(_journaled_files())
+
+    try:
+        with data_transaction():
+            save_data({"111": {'quantity': 1}}, INVENTORY_FILE)
+            raise RuntimeError("rolled back")
+    except RuntimeError:
+        pass
+    assert len(_journaled_files()) == journaled
+
+    with data_transaction():
+        save_data({"111": {'quantity': 2}}, INVENTORY_FILE)
+        # Not in the journal until the block commits
+        assert len(_journaled_files()) == journaled
+    assert _journaled_files()[journaled:] == ["inventory.json"]
+
+def test_commit_interrupted_before_journaling_is_journaled_on_recovery(data_dir, monkeypatch):
+    _enable_journal()
+    journaled = len(_journaled_files())
+
+    def die(files):
+        raise SystemExit("killed after the commit point")
+    with monkeypatch.context() as patch:
+        patch.setattr(core, "_journal_committed", die)
+        try:
+            with data_transaction():
+                save_data({"111": {'quantity': 2}}, INVENTORY_FILE)
+        except SystemExit:
+            pass
+    assert load_data(INVENTORY_FILE) == {"111": {'quantity': 2}}
+    assert len(_journaled_files()) == journaled
+
+    core.recover_data_transaction()
+    assert load_data(INVENTORY_FILE) == {"111": {'quantity': 2}}
+    assert _journaled_files()[journaled:] == ["inventory.json"]
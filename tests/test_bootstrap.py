@@ -0,0 +1,32 @@
+"""Bootstrap migrates the data directory without ever overwriting a file it can't read."""
+
+import glob
+import os
+
+import pytest
+
+from rocket_pos.core import (META_FILE, PRODUCTS_FILE, SETTINGS_FILE, bootstrap_data_store, get_default_data,
+                             load_data, save_data)
+
+@pytest.mark.parametrize("file", [SETTINGS_FILE, PRODUCTS_FILE])
+def test_corrupt_file_is_set_aside_not_overwritten(data_dir, file):
+    with open(file, 'w') as f:
+        f.write('{"truncated": ')
+
+    bootstrap_data_store()
+
+    [corrupt] = glob.glob(f"{file}.corrupt-*")
+    with open(corrupt) as f:
+        assert f.read() == '{"truncated": '
+    assert load_data(file) == get_default_data()[file]
+    assert load_data(META_FILE)['migrated_files'] == [os.path.basename(file)]
+
+def test_missing_keys_are_filled_in(data_dir):
+    save_data({'currency_symbol': "€"}, SETTINGS_FILE)
+
+    bootstrap_data_store()
+
+    settings = load_data(SETTINGS_FILE)
+    assert settings['currency_symbol'] == "€"
+    assert set(get_default_data()[SETTINGS_FILE]) <= set(settings)
+    assert not glob.glob(f"{SETTINGS_FILE}.corrupt-*")
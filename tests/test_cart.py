@@ -0,0 +1,30 @@
+"""Cart.pricing() returns a plain breakdown that can be stored, copied and sent anywhere."""
+
+import copy
+import json
+import pickle
+
+from rocket_pos.cart import Cart
+
+def _cart():
+    cart = Cart()
+    cart.add("111", {'name': "Pod", 'price': 10.0}, 2)
+    return cart
+
+def test_pricing_pickles_copies_and_serializes():
+    pricing = _cart().pricing(customer_id="c1", payment_method="Cash")
+
+    assert type(pricing) is dict
+    assert pickle.loads(pickle.dumps(pricing)) == pricing
+    assert copy.deepcopy(pricing) == pricing
+    assert json.loads(json.dumps(pricing)) == pricing
+
+def test_changing_the_pricing_leaves_the_cart_alone():
+    cart = _cart()
+    pricing = cart.pricing()
+
+    pricing['items']["111"]['quantity'] = 99
+    pricing['net_amount'] = 0
+
+    assert cart.lines["111"]['quantity'] == 2
+    assert cart.pricing() == _cart().pricing()
@@ -0,0 +1,53 @@
+"""The POS checkout commits each cart once, even when the click is replayed or the receipt fails."""
+
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from rocket_pos.core import INVENTORY_FILE, PRODUCTS_FILE, TRANSACTIONS_FILE, load_data, save_data
+from rocket_pos.views import pos
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+@pytest.fixture
+def till(data_dir):
+    save_data({"111": {'name': "Pod", 'price': 10.0, 'category': "X"}}, PRODUCTS_FILE)
+    save_data({"111": {'quantity': 10}}, INVENTORY_FILE)
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    at.text_input[0].input("admin")
+    at.text_input[1].input("admin123")
+    at.button[0].click()
+    at.run()
+    at.session_state["shift_started"] = True
+    at.session_state["shift_id"] = "s1"
+    at.sidebar.radio[0].set_value("POS Terminal")
+    at.run()
+    at.text_input(key="manual_barcode_input").input("111")
+    at.run()
+    return at
+
+def _complete_sale(at):
+    [button for button in at.button if button.label.startswith("✅")][0].click()
+    at.run()
+
+def test_replayed_click_sells_once(till):
+    # AppTest replays the click on the st.rerun() that follows a sale, like a double-click
+    _complete_sale(till)
+
+    assert not till.exception
+    assert len(load_data(TRANSACTIONS_FILE)) == 1
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 9
+    assert not till.session_state["cart"]
+
+def test_receipt_failure_after_commit_still_clears_the_cart(till, monkeypatch):
+    def broken_printer(*args, **kwargs):
+        raise RuntimeError("printer on fire")
+    monkeypatch.setattr(pos, "generate_receipt", broken_printer)
+
+    _complete_sale(till)
+
+    assert len(load_data(TRANSACTIONS_FILE)) == 1
+    assert not till.session_state["cart"]
+    assert "checkout_fingerprint" not in till.session_state
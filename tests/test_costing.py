@@ -0,0 +1,97 @@
+"""Cost layers and COGS totals: a sale rewrites only what it touches, and older layouts migrate."""
+
+import datetime
+import os
+
+import pytest
+
+from rocket_pos import services
+from rocket_pos.core import (INVENTORY_FILE, PRODUCTS_FILE, PURCHASE_ORDERS_FILE, TRANSACTIONS_FILE,
+                             bootstrap_data_store, load_data, save_data)
+from rocket_pos.costing import (COGS_DIR, COST_LAYERS_DIR, LEGACY_COGS_DIR, LEGACY_COST_LAYERS_FILE, _bucket_path,
+                                cogs_summary, load_cost_layers)
+from rocket_pos.services import commit_sale, price_sale, receive_purchase_order
+
+def _contents(directory):
+    contents = {}
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), 'rb') as f:
+            contents[name] = f.read()
+    return contents
+
+def _files(root):
+    """{relative path: bytes} of every file under root"""
+    contents = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+def test_sale_rewrites_only_its_bucket_and_day(store):
+    # 222 hashes to a different bucket from 111
+    assert _bucket_path("222") != _bucket_path("111")
+    products = load_data(PRODUCTS_FILE)
+    products["222"] = {'name': "Coil", 'price': 5.0, 'cost': 2.0, 'category': "Y"}
+    save_data(products, PRODUCTS_FILE)
+    inventory = load_data(INVENTORY_FILE)
+    inventory["222"] = {'quantity': 5}
+    save_data(inventory, INVENTORY_FILE)
+    commit_sale(price_sale({"111": 1, "222": 1}), 100, "admin", "s1", "k1")
+    layers_before, days_before = _contents(COST_LAYERS_DIR), _contents(COGS_DIR)
+
+    sale = commit_sale(price_sale({"111": 2}), 100, "admin", "s1", "k2")
+
+    layers_after, days_after = _contents(COST_LAYERS_DIR), _contents(COGS_DIR)
+    changed = {name for name in layers_after if layers_after[name] != layers_before.get(name)}
+    assert changed == {os.path.basename(_bucket_path("111"))}
+    changed = {name for name in days_after if days_after[name] != days_before.get(name)}
+    assert changed == {f"{sale['date'][:10]}.json"}
+
+    assert load_cost_layers(["111"])["111"] == [{'quantity': 7, 'unit_cost': 4.0, 'date': None, 'source': 'opening'}]
+    day = datetime.date.fromisoformat(sale['date'][:10])
+    summary = cogs_summary(day, day)
+    assert (summary['quantity'], summary['revenue'], summary['cogs']) == (4, 35.0, 14.0)
+
+def test_older_layouts_migrate_on_bootstrap(store):
+    layers = {"111": [{'quantity': 3, 'unit_cost': 2.5, 'date': "2026-01-01 00:00:00", 'source': "PO1"}]}
+    save_data(layers, LEGACY_COST_LAYERS_FILE)
+    os.makedirs(LEGACY_COGS_DIR)
+    save_data({"2026-01-02": {}}, os.path.join(LEGACY_COGS_DIR, "2026-01.json"))
+    save_data({"t1": {'date': "2026-01-02 10:00:00",
+                      'items': {"111": {'name': "Pod", 'price': 10.0, 'quantity': 1, 'unit_cost': 2.5}}}},
+              TRANSACTIONS_FILE)
+    os.rmdir(COGS_DIR)  # the store predates the day files
+
+    bootstrap_data_store()
+
+    assert load_cost_layers() == layers
+    assert not os.path.exists(LEGACY_COST_LAYERS_FILE)
+    assert not os.path.exists(LEGACY_COGS_DIR)
+    summary = cogs_summary(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31))
+    assert (summary['quantity'], summary['revenue'], summary['cogs']) == (1, 10.0, 2.5)
+
+@pytest.mark.parametrize("fault_point", ['record_stock_events', 'save_data'])
+def test_failed_receipt_leaves_no_cost_layer(store, monkeypatch, fault_point):
+    save_data({"PO1": {'status': 'pending', 'items': [{'barcode': "111", 'name': "Pod", 'quantity': 5, 'cost': 3.0}]}},
+              PURCHASE_ORDERS_FILE)
+    received = [{'barcode': "111", 'name': "Pod", 'ordered_quantity': 5, 'received_quantity': 5, 'cost': 3.0}]
+    before = _files(store)
+
+    real_save = services.save_data
+    def fail(*args, **kwargs):
+        # Fails once the PO is saved, before inventory is
+        if fault_point == 'record_stock_events' or args[1] == INVENTORY_FILE:
+            raise OSError("disk full")
+        real_save(*args, **kwargs)
+    with monkeypatch.context() as patch:
+        patch.setattr(services, fault_point, fail)
+        with pytest.raises(OSError):
+            receive_purchase_order("PO1", received, "", "admin")
+
+    assert _files(store) == before
+
+    receive_purchase_order("PO1", received, "", "admin")
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 15
+    assert [layer['quantity'] for layer in load_cost_layers(["111"])["111"]] == [10, 5]
@@ -0,0 +1,11 @@
+"""Customer analytics build on any store, including one with no customers yet."""
+
+import datetime
+
+from rocket_pos.customer_analytics import _build_analytics
+
+def test_empty_store_has_empty_analytics(data_dir):
+    analytics = _build_analytics(datetime.date(2026, 1, 1))
+
+    assert analytics.empty
+    assert 'segment' in analytics.columns
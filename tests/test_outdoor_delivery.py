@@ -0,0 +1,94 @@
+"""Outdoor orders are delivered once, only after approval, and completely or not at all."""
+
+import os
+
+import pytest
+
+from rocket_pos import services
+from rocket_pos.core import INVENTORY_FILE, PRODUCTS_FILE, TRANSACTIONS_FILE, load_data, save_data
+from rocket_pos.outdoor_orders import add_order, load_live_orders, set_order_status
+from rocket_pos.points_ledger import PointsError
+from rocket_pos.services import ServiceError, deliver_outdoor_order
+
+# Every effect of a delivery, in the order deliver_outdoor_order makes them
+FAULT_POINTS = ['cost_sale_lines', 'record_stock_events', 'record_purchase', 'record_transaction',
+                'set_order_status', 'record_shift_transaction']
+
+def _add_order(customer_id=None):
+    return add_order({
+        'order_id': "o1", 'customer_id': customer_id, 'customer_name': "Walk-in", 'customer_phone': "",
+        'items': {"111": {'name': "Pod", 'price': 10.0, 'quantity': 2}}, 'subtotal': 20.0,
+        'delivery_charge': 0, 'payment_method': "cash", 'payment_charge_percent': 0, 'payment_charge_amount': 0,
+        'delivery_type': "Standard", 'total': 20.0, 'delivery_address': "", 'notes': "",
+        'status': 'pending_approval', 'created_by': "admin", 'created_date': "2026-01-01 00:00:00",
+        'approved_by': None, 'approved_date': None, 'delivered_by': None, 'delivery_date': None,
+    })
+
+@pytest.fixture
+def order(data_dir):
+    save_data({"111": {'name': "Pod", 'price': 10.0, 'cost': 4.0, 'category': "X"}}, PRODUCTS_FILE)
+    save_data({"111": {'quantity': 10}}, INVENTORY_FILE)
+    return _add_order()
+
+@pytest.fixture
+def loyalty_order(store):
+    """An approved order for loyalty customer c1"""
+    _add_order("c1")
+    set_order_status("o1", 'approved', "admin", "2026-01-01 00:00:00", from_status='pending_approval')
+
+def _files(root):
+    """{relative path: bytes} of every file under root"""
+    contents = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+def test_pending_order_cannot_be_delivered(order):
+    with pytest.raises(ServiceError, match="approved"):
+        deliver_outdoor_order("o1", "admin")
+
+    assert load_live_orders()["orders"]["o1"]['status'] == 'pending_approval'
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 10
+    assert load_data(TRANSACTIONS_FILE) == {}
+
+def test_approved_order_is_delivered_once(order):
+    set_order_status("o1", 'approved', "admin", "2026-01-01 00:00:00", from_status='pending_approval')
+
+    transaction = deliver_outdoor_order("o1", "admin")
+    with pytest.raises(ServiceError):
+        deliver_outdoor_order("o1", "admin")
+
+    assert "o1" not in load_live_orders()["orders"]
+    assert list(load_data(TRANSACTIONS_FILE)) == [transaction['transaction_id']]
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 8
+
+@pytest.mark.parametrize("fault_point", FAULT_POINTS)
+def test_failure_midway_leaves_no_partial_delivery(store, loyalty_order, monkeypatch, fault_point):
+    before = _files(store)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError(f"injected fault in {fault_point}")
+    with monkeypatch.context() as patch:
+        patch.setattr(services, fault_point, fail)
+        with pytest.raises(RuntimeError, match="injected fault"):
+            deliver_outdoor_order("o1", "admin", shift_id="s1")
+
+    assert _files(store) == before
+
+    transaction = deliver_outdoor_order("o1", "admin", shift_id="s1")
+    assert list(load_data(TRANSACTIONS_FILE)) == [transaction['transaction_id']]
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 8
+
+def test_points_error_is_a_service_error(store, loyalty_order, monkeypatch):
+    before = _files(store)
+
+    def refuse(*args, **kwargs):
+        raise PointsError("account is locked")
+    monkeypatch.setattr(services, "record_purchase", refuse)
+    with pytest.raises(ServiceError, match="Loyalty points"):
+        deliver_outdoor_order("o1", "admin")
+
+    assert _files(store) == before
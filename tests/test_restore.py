@@ -0,0 +1,91 @@
+"""Restores swap the data directory under DATA_LOCK and survive a crash at any point."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from rocket_pos import core
+from rocket_pos.core import PRODUCTS_FILE, SETTINGS_FILE, load_data, recover_data_dir, save_data
+from rocket_pos.views import backup as backup_view
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ORIGINAL = {"111": {'name': "Pod", 'price': 10.0}}
+RESTORED = {"222": {'name': "Mod", 'price': 20.0}}
+
+@pytest.fixture
+def backup_dir(data_dir):
+    """A directory backup holding RESTORED; the live data holds ORIGINAL"""
+    save_data(ORIGINAL, PRODUCTS_FILE)
+    path = data_dir.parent / "b1"
+    path.mkdir()
+    (path / "manifest.json").write_text(json.dumps({'name': "b1"}))
+    (path / "products.json").write_text(json.dumps(RESTORED))
+    return str(path)
+
+def test_writes_during_a_restore_wait_for_the_swap(backup_dir, monkeypatch):
+    swap = backup_view.swap_in_staged_data
+    writer = threading.Thread(target=lambda: save_data({'currency': "EUR"}, SETTINGS_FILE))
+
+    def write_while_staged():
+        # The staged copy already holds the old settings.json; a write now would be swapped away
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+        return swap()
+    monkeypatch.setattr(backup_view, "swap_in_staged_data", write_while_staged)
+
+    assert backup_view.restore_backup(backup_dir, False)
+    writer.join()
+
+    assert load_data(PRODUCTS_FILE) == RESTORED
+    assert load_data(SETTINGS_FILE) == {'currency': "EUR"}
+
+def _read_restore_read():
+    import streamlit as st
+    from rocket_pos.core import PRODUCTS_FILE, load_data_snapshot
+    from rocket_pos.views import backup
+    st.session_state.before = load_data_snapshot(PRODUCTS_FILE)
+    backup.restore_backup(st.session_state.backup_dir, False)
+    st.session_state.after = load_data_snapshot(PRODUCTS_FILE)
+
+def test_restore_drops_cached_reads(backup_dir, monkeypatch):
+    # A clock too coarse to tell the restored file from the old one
+    monkeypatch.setattr(core, "data_version", lambda file: "same")
+    # st.cache_resource only caches inside a Streamlit run
+    at = AppTest.from_function(_read_restore_read)
+    at.session_state["backup_dir"] = backup_dir
+    at.run()
+
+    assert not at.exception
+    assert at.session_state["before"] == ORIGINAL
+    assert at.session_state["after"] == RESTORED
+
+# Where the child dies: while staging (nothing committed) or between the two renames of the swap
+CRASHES = {
+    'staging': ("shutil.copytree", "lambda *args, copytree=shutil.copytree: (copytree(*args), os._exit(17))", ORIGINAL),
+    'swap': ("os.rename", "lambda *args, rename=os.rename: (rename(*args), os._exit(17))", RESTORED),
+}
+
+@pytest.mark.parametrize("crash", CRASHES)
+def test_process_killed_mid_restore_recovers_on_next_start(backup_dir, data_dir, crash):
+    target, replacement, expected = CRASHES[crash]
+    child = f"""
+import os, shutil
+from rocket_pos.views import backup
+{target} = {replacement}
+backup.restore_backup({backup_dir!r}, False)
+"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", child], cwd=data_dir.parent, env=env, capture_output=True)
+    assert result.returncode == 17, result.stderr
+
+    assert recover_data_dir() is not None
+    assert load_data(PRODUCTS_FILE) == expected
+    assert not os.path.exists(core.STAGING_DIR)
+    assert not os.path.exists(core.PREVIOUS_DIR)
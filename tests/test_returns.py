@@ -0,0 +1,97 @@
+"""process_return records a return completely or not at all."""
+
+import os
+
+import pytest
+
+from rocket_pos import services
+from rocket_pos.core import INVENTORY_FILE, RETURNS_FILE, TRANSACTIONS_FILE, load_data, load_data_lines, save_data
+from rocket_pos.returns_index import returnable_quantities
+from rocket_pos.returns_log import RETURNS_LOG_FILE, load_returns
+from rocket_pos.services import ServiceError, commit_sale, price_sale, process_return
+from rocket_pos.transaction_index import lookup_transaction
+
+# Every effect of a return, in the order process_return makes them
+FAULT_POINTS = ['cost_return', 'record_stock_events', 'record_cash', 'append_return', 'record_return',
+                'record_shift_return']
+
+@pytest.fixture
+def sale(store):
+    sale = commit_sale(price_sale({"111": 2}, customer_id="c1"), 100, "admin", "s1", "k1")
+    # The return screen looks the sale up first, which builds the returns index
+    assert returnable_quantities(sale)["111"] == 2
+    return sale
+
+def _files(root):
+    """{relative path: bytes} of every file under root"""
+    contents = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+def _return_one(sale):
+    return process_return(sale['transaction_id'], {"111": {'quantity': 1, 'reason': "Faulty"}}, "admin",
+                          refund_method="Cash", shift_id="s1")
+
+@pytest.mark.parametrize("fault_point", FAULT_POINTS)
+def test_failure_midway_leaves_no_partial_return(store, sale, monkeypatch, fault_point):
+    before = _files(store)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError(f"injected fault in {fault_point}")
+    with monkeypatch.context() as patch:
+        patch.setattr(services, fault_point, fail)
+        with pytest.raises(RuntimeError, match="injected fault"):
+            _return_one(sale)
+
+    assert _files(store) == before
+
+    _return_one(sale)
+    assert len(load_returns()) == 1
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 9
+    assert returnable_quantities(sale)["111"] == 1
+
+def test_failure_saving_inventory_rolls_back_the_return(store, sale, monkeypatch):
+    before = _files(store)
+    save_data = services.save_data
+
+    def failing_save(data, file):
+        if file == INVENTORY_FILE:
+            raise OSError("disk full")
+        save_data(data, file)
+    monkeypatch.setattr(services, "save_data", failing_save)
+    with pytest.raises(OSError):
+        _return_one(sale)
+
+    assert _files(store) == before
+
+def test_return_appends_to_the_log(store, sale):
+    first = _return_one(sale)
+    second = _return_one(sale)
+
+    assert [record['return_id'] for record in load_data_lines(RETURNS_LOG_FILE)] == [first['return_id'],
+                                                                                    second['return_id']]
+    assert load_data(RETURNS_FILE) == {}
+    assert returnable_quantities(sale)["111"] == 0
+
+def test_returns_json_records_move_to_the_log(store, sale):
+    legacy = dict(_return_one(sale), return_id="RET_OLD")
+    save_data({"RET_OLD": legacy}, RETURNS_FILE)
+
+    assert load_returns()["RET_OLD"] == legacy
+    assert load_data(RETURNS_FILE) == {}
+    # The index follows the rewritten log
+    assert returnable_quantities(sale)["111"] == 1
+
+def test_receipt_is_found_by_key(store, sale):
+    assert lookup_transaction(sale['transaction_id']) == sale
+    assert lookup_transaction("missing") is None
+
+    # A transactions.json changed behind the index's back (a restore) is reindexed on next lookup
+    save_data({}, TRANSACTIONS_FILE)
+    assert lookup_transaction(sale['transaction_id']) is None
+    with pytest.raises(ServiceError, match="Transaction not found"):
+        _return_one(sale)
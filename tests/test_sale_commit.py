@@ -0,0 +1,106 @@
+"""commit_sale is exactly-once: retries replay the original sale, failures leave no trace."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from rocket_pos import services
+from rocket_pos.core import (
+    INVENTORY_FILE,
+    TRANSACTIONS_FILE,
+    load_data,
+    recover_data_transaction,
+)
+from rocket_pos.services import ServiceError, commit_sale, price_sale
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Every effect of a sale, in the order commit_sale makes them
+FAULT_POINTS = ['cost_sale_lines', 'record_stock_events', 'record_purchase', 'record_cash',
+                'record_transaction', 'record_sale_key', 'record_shift_transaction']
+
+def _files(root):
+    """{relative path: bytes} of every file under root"""
+    contents = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+def _sell(key="k1"):
+    return commit_sale(price_sale({"111": 2}, customer_id="c1"), 100, "admin", "s1", key)
+
+def test_retry_with_same_key_returns_the_original_sale(store):
+    first = _sell()
+    after_first = _files(store)
+
+    again = _sell()
+
+    assert again['transaction_id'] == first['transaction_id']
+    assert _files(store) == after_first
+    assert len(load_data(TRANSACTIONS_FILE)) == 1
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 8
+
+def test_same_key_for_different_items_is_rejected(store):
+    _sell()
+    with pytest.raises(ServiceError):
+        commit_sale(price_sale({"111": 3}), 100, "admin", "s1", "k1")
+
+@pytest.mark.parametrize("fault_point", FAULT_POINTS)
+def test_failure_midway_leaves_no_partial_sale(store, monkeypatch, fault_point):
+    before = _files(store)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError(f"injected fault in {fault_point}")
+    with monkeypatch.context() as patch:
+        patch.setattr(services, fault_point, fail)
+        with pytest.raises(RuntimeError, match="injected fault"):
+            _sell()
+
+    assert _files(store) == before
+
+    # The till retries with the same key once the fault is gone, and sells once
+    _sell()
+    _sell()
+    assert len(load_data(TRANSACTIONS_FILE)) == 1
+    assert load_data(INVENTORY_FILE)["111"]['quantity'] == 8
+
+def test_failure_saving_inventory_rolls_back_earlier_writes(store, monkeypatch):
+    before = _files(store)
+    save_data = services.save_data
+
+    def failing_save(data, file):
+        if file == INVENTORY_FILE:
+            raise OSError("disk full")
+        save_data(data, file)
+    monkeypatch.setattr(services, "save_data", failing_save)
+    with pytest.raises(OSError):
+        _sell()
+
+    assert _files(store) == before
+
+@pytest.mark.parametrize("fault_point", ['record_stock_events', 'record_cash', 'record_sale_key'])
+def test_process_killed_midway_is_rolled_back_on_next_start(store, fault_point):
+    before = _files(store)
+
+    # A child process commits a sale and dies (no cleanup, no exception handling) at the fault point
+    child = f"""
+import os
+from rocket_pos import services
+services.{fault_point} = lambda *args, **kwargs: os._exit(17)
+services.commit_sale(services.price_sale({{"111": 2}}, customer_id="c1"), 100, "admin", "s1", "k1")
+"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", child], cwd=store.parent, env=env, capture_output=True)
+    assert result.returncode == 17
+    assert _files(store) != before
+
+    assert recover_data_transaction() is not None
+    assert _files(store) == before
+
+    _sell()
+    assert len(load_data(TRANSACTIONS_FILE)) == 1
@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from rocket_pos.core import INVENTORY_FILE, PRODUCTS_FILE, bootstrap_data_store, save_data
+from rocket_pos.services import commit_sale, price_sale
+from rocket_pos.stock_ledger import INVENTORY_FIELDS, STOCK_EVENTS_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LEGACY_ITEM = {
+    'quantity': 10,
+    'reorder_point': 2,
+    'last_updated': "2026-01-05 10:00:00",
+    'updated_by': "admin",
+    'adjustments': [{'date': "2026-01-05 10:00:00", 'type': "Add Stock", 'quantity': 10, 'previous_quantity': 0,
+                     'new_quantity': 10, 'user': "admin", 'reason': "Initial"}],
+}
+
+def _pre_migration_store():
+    """An install from before the stock event log: fat inventory.json, no stock_events/"""
+    shutil.rmtree(STOCK_EVENTS_DIR, ignore_errors=True)
+    save_data({"111": {'name': "Pod", 'price': 10.0, 'category': "X"}}, PRODUCTS_FILE)
+    save_data({"111": dict(LEGACY_ITEM)}, INVENTORY_FILE)
+
+def _inventory_fields():
+    with open(INVENTORY_FILE) as f:
+        return {field for item in json.load(f).values() for field in item}
+
+def test_first_sale_on_pre_migration_inventory_keeps_it_slim(data_dir):
+    _pre_migration_store()
+
+    commit_sale(price_sale({"111": 2}), 100, "admin")
+
+    assert _inventory_fields() <= set(INVENTORY_FIELDS)
+    with open(INVENTORY_FILE) as f:
+        assert json.load(f)["111"]['quantity'] == 8
+
+def test_bootstrap_migrates_before_any_service_runs(data_dir):
+    _pre_migration_store()
+
+    bootstrap_data_store()
+
+    assert _inventory_fields() <= set(INVENTORY_FIELDS)
+    commit_sale(price_sale({"111": 1}), 100, "admin")
+    assert _inventory_fields() <= set(INVENTORY_FIELDS)
+
+def test_bootstrap_and_sale_do_not_import_pandas(data_dir):
+    _pre_migration_store()
+    # A new interpreter: this one has pandas loaded already
+    child = f"""
+import sys
+sys.path.insert(0, {ROOT!r})
+from rocket_pos.core import bootstrap_data_store
+bootstrap_data_store()
+from rocket_pos.services import commit_sale, price_sale
+commit_sale(price_sale({{"111": 1}}), 100, "admin")
+print('pandas' in sys.modules)
+"""
+    result = subprocess.run([sys.executable, "-c", child], cwd=data_dir.parent, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.split()[-1] == "False"